@@ -0,0 +1,63 @@
+"""vendor availability unique per vendor and date
+
+Revision ID: a7c3e9d21f04
+Revises:
+Create Date: 2026-10-18 23:00:00.000000
+
+Bulk availability updates upsert on (vendor_id, date), which needs a unique
+constraint. ``create_all`` only adds it to new tables, so existing databases
+get it here after dropping duplicate days (the most recently updated row of
+each day is kept).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7c3e9d21f04"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = "vendor_availability"
+CONSTRAINT = "uq_vendor_availability_vendor_date"
+
+
+def _has_constraint() -> bool:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(TABLE):
+        return True
+    return any(c["name"] == CONSTRAINT for c in inspector.get_unique_constraints(TABLE))
+
+
+def upgrade() -> None:
+    # New databases already got it from create_all
+    if _has_constraint():
+        return
+
+    op.execute(
+        sa.text(
+            """
+            DELETE FROM vendor_availability
+            WHERE id IN (
+                SELECT id FROM (
+                    SELECT
+                        id,
+                        row_number() OVER (
+                            PARTITION BY vendor_id, date
+                            ORDER BY updated_at DESC NULLS LAST, created_at DESC NULLS LAST, id
+                        ) AS duplicate_rank
+                    FROM vendor_availability
+                ) ranked
+                WHERE ranked.duplicate_rank > 1
+            )
+            """
+        )
+    )
+    op.create_unique_constraint(CONSTRAINT, TABLE, ["vendor_id", "date"])
+
+
+def downgrade() -> None:
+    op.drop_constraint(CONSTRAINT, TABLE, type_="unique")
@@ -11,6 +11,7 @@ from uuid import UUID
 import math
 
 from app.core.database import get_db
+from app.core.pagination import CountStrategy
 from app.core.security import get_current_active_user
 from app.models.user import User
 from app.services.messaging_service import MessagingService
@@ -176,22 +177,22 @@ async def list_conversations(
         event_id=event_id
     )
 
-    conversations, total = await service.list_conversations(
+    conversations, page_info = await service.list_conversations(
         current_user,
         filters,
         page,
-        page_size
+        page_size,
+        count_strategy=CountStrategy.CACHED
     )
 
-    total_pages = math.ceil(total / page_size) if total > 0 else 0
-
     return ConversationListResponse(
         conversations=[ConversationResponse.from_orm(c) for c in conversations],
-        total=total,
+        total=page_info.total,
+        total_is_exact=page_info.total_is_exact,
         page=page,
         page_size=page_size,
-        total_pages=total_pages,
-        has_next=page < total_pages,
+        total_pages=page_info.total_pages,
+        has_next=page_info.has_more,
         has_prev=page > 1
     )
 
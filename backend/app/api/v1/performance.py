@@ -5,13 +5,20 @@ Sprint 22: Performance & Optimization
 API endpoints for performance monitoring, caching, and system health.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 
 from app.core.database import get_db
 from app.core.auth import get_current_user, require_admin
+from app.core.config import settings
+from app.core.loop_watchdog import loop_watchdog
+from app.core.memory_inspector import memory_inspector
+from app.core.profiler import PROFILE_HEADER, request_profiler
+from app.core.startup import startup_timeline
+from app.services.metrics_collector import get_metrics_collector
 from app.models.user import User
 from app.services.performance_service import PerformanceService
 from app.services.cache_service import RedisCacheService, get_cache_service
@@ -249,7 +256,8 @@ async def get_monitoring_dashboard(
     """
     Get real-time monitoring dashboard.
 
-    Returns current system status, metrics, and alerts.
+    Returns current system status, metrics, and alerts, plus event-loop lag
+    and the call sites that blocked the loop.
     """
     health = await performance_service.get_system_health()
     cache_stats = await performance_service.get_cache_stats()
@@ -261,10 +269,27 @@ async def get_monitoring_dashboard(
         "health": health.dict(),
         "cache_stats": cache_stats.dict(),
         "recent_latency": [lb.dict() for lb in latency_breakdown[:10]],
-        "uptime_seconds": 0  # TODO: Track actual uptime
+        "uptime_seconds": startup_timeline.uptime_seconds(),
+        "metrics_collector": get_metrics_collector().stats(),
+        "event_loop": loop_watchdog.snapshot()
     }
 
 
+@router.get("/startup", response_model=Dict[str, Any])
+async def get_startup_timeline(
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get the cold-start timeline of this worker.
+
+    Includes:
+    - Import time per router module (eager and lazily loaded)
+    - Start-up phases such as database initialization
+    - Time until ready and until the first request was served
+    """
+    return startup_timeline.snapshot()
+
+
 # ============================================================================
 # Optimization Endpoints
 # ============================================================================
@@ -290,36 +315,202 @@ async def get_optimization_report(
 # Benchmarking Endpoints
 # ============================================================================
 
+@router.get("/benchmark/operations", response_model=List[Dict[str, str]])
+async def list_benchmark_operations(
+    current_user: User = Depends(require_admin),
+    performance_service: PerformanceService = Depends(get_performance_service)
+):
+    """
+    List the named benchmark operations (admin only).
+    """
+    return performance_service.list_benchmark_operations()
+
+
 @router.post("/benchmark/{operation_name}", response_model=BenchmarkResult)
 async def run_benchmark(
     operation_name: str,
-    iterations: int = 100,
+    iterations: int = Query(100, ge=1, le=10000),
+    concurrency: int = Query(1, ge=1, le=50),
+    warmup_iterations: int = Query(10, ge=0, le=1000),
     current_user: User = Depends(require_admin),
     performance_service: PerformanceService = Depends(get_performance_service)
 ):
     """
-    Run a performance benchmark (admin only).
+    Run a load benchmark of a named operation (admin only).
 
-    Tests:
-    - Database query performance
-    - Cache read/write operations
-    - API endpoint latency
+    Operations (see /benchmark/operations):
+    - vendor_search, conversation_list, conversation_messages
+    - guest_stats, event_analytics
 
-    Returns average, min, max execution times and operations per second.
+    Operations run against the data in the database, cycling through the
+    busiest events, users and conversations. Returns latency percentiles,
+    a throughput curve and error counts.
     """
-    async def sample_operation():
-        """Sample operation for benchmarking"""
-        # In production, this would benchmark actual operations
-        import asyncio
-        await asyncio.sleep(0.001)
-
     return await performance_service.run_benchmark(
         operation_name,
-        sample_operation,
-        iterations
+        iterations=iterations,
+        concurrency=concurrency,
+        warmup_iterations=warmup_iterations
+    )
+
+
+# ============================================================================
+# Profiling Endpoints
+# ============================================================================
+
+@router.post("/profiles/token", response_model=Dict[str, Any])
+async def create_profile_token(
+    ttl_seconds: int = Query(settings.PROFILER_TOKEN_TTL_SECONDS, ge=60, le=86400),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Create a signed profiling token (admin only).
+
+    Requests sent with the token in the X-Profile-Token header are profiled
+    until it expires; their responses carry an X-Profile-Id header.
+    """
+    token, expires_at = request_profiler.sign(str(current_user.id), ttl_seconds)
+    return {"header": PROFILE_HEADER, "token": token, "expires_at": expires_at}
+
+
+@router.get("/profiles", response_model=List[Dict[str, Any]])
+async def list_profiles(
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(require_admin)
+):
+    """
+    List stored request profiles, newest first (admin only).
+
+    Each summary splits the request's wall time into CPU, database wait,
+    other I/O wait and event-loop wait.
+    """
+    return request_profiler.list_profiles(limit)
+
+
+@router.get("/profiles/{profile_id}", response_model=Dict[str, Any])
+async def get_profile(
+    profile_id: str,
+    current_user: User = Depends(require_admin)
+):
+    """Get the summary of a request profile (admin only)"""
+    summary = request_profiler.get_summary(profile_id)
+    if summary is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return summary
+
+
+@router.get("/profiles/{profile_id}/flamegraph", response_class=PlainTextResponse)
+async def get_profile_flamegraph(
+    profile_id: str,
+    current_user: User = Depends(require_admin)
+):
+    """
+    Download a request profile in collapsed-stack format (admin only).
+
+    Render with flamegraph.pl or open in speedscope.
+    """
+    stacks = request_profiler.get_collapsed(profile_id)
+    if stacks is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return PlainTextResponse(
+        stacks,
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'}
     )
 
 
+# ============================================================================
+# Memory Inspection Endpoints
+# ============================================================================
+
+@router.get("/memory", response_model=Dict[str, Any])
+async def get_memory_status(
+    current_user: User = Depends(require_admin)
+):
+    """
+    Get memory tracing state of this worker (admin only).
+
+    Includes RSS, traced memory, tracemalloc's own overhead and the stored
+    snapshots.
+    """
+    return memory_inspector.status()
+
+
+@router.post("/memory/tracing/start", response_model=Dict[str, Any])
+async def start_memory_tracing(
+    frames: int = Query(1, ge=1, le=25),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Start tracing allocations with tracemalloc (admin only).
+
+    Keep ``frames`` low in production; tracing stops by itself after
+    MEMORY_TRACE_MAX_SECONDS.
+    """
+    return memory_inspector.start(frames)
+
+
+@router.post("/memory/tracing/stop", response_model=Dict[str, Any])
+async def stop_memory_tracing(
+    current_user: User = Depends(require_admin)
+):
+    """Stop tracing allocations; snapshots stay available (admin only)"""
+    return memory_inspector.stop()
+
+
+@router.post("/memory/snapshots", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
+async def take_memory_snapshot(
+    label: Optional[str] = Query(None, max_length=100),
+    current_user: User = Depends(require_admin)
+):
+    """Take a memory snapshot of this worker (admin only)"""
+    return memory_inspector.take_snapshot(label)
+
+
+@router.delete("/memory/snapshots/{snapshot_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_memory_snapshot(
+    snapshot_id: str,
+    current_user: User = Depends(require_admin)
+):
+    """Delete a memory snapshot (admin only)"""
+    memory_inspector.delete_snapshot(snapshot_id)
+
+
+@router.get("/memory/snapshots/{before_id}/diff/{after_id}", response_model=Dict[str, Any])
+async def diff_memory_snapshots(
+    before_id: str,
+    after_id: str,
+    group_by: str = Query("lineno", description="lineno, filename or traceback"),
+    limit: int = Query(25, ge=1, le=200),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Compare two memory snapshots (admin only).
+
+    Returns allocation growth grouped by location and object growth by type.
+    """
+    return memory_inspector.diff(before_id, after_id, group_by, limit)
+
+
+@router.get("/memory/containers", response_model=List[Dict[str, Any]])
+async def get_largest_containers(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(require_admin)
+):
+    """
+    List the largest live containers and what holds them (admin only).
+
+    Does not require tracing. Useful to spot unbounded dicts and caches
+    (e.g. per-client tracking in middleware, in-process cache tiers).
+    """
+    return memory_inspector.largest_containers(limit)
+
+
 # ============================================================================
 # Maintenance Endpoints
 # ============================================================================
@@ -4,32 +4,36 @@ Sprint 13: Search & Discovery System
 
 REST API endpoints for search functionality:
 - General search
+- Federated search
 - Autocomplete
 - Saved searches
 - Search suggestions
 - Filter presets
 - Analytics
+- Index status and outbox
 """
 
 from fastapi import APIRouter, Depends, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 from uuid import UUID
 
 from app.core.database import get_db
-from app.core.security import get_current_user, get_optional_user
+from app.core.security import get_current_user, get_optional_user, get_current_admin_user
 from app.models.user import User
 from app.services.search_service import SearchService
 from app.schemas.search import (
     SearchRequest, SearchResponse,
     VendorSearchRequest, EventSearchRequest, ServiceSearchRequest,
+    FederatedSearchRequest, FederatedSearchResponse,
     AutocompleteRequest, AutocompleteResponse,
     SavedSearchCreate, SavedSearchResponse, SavedSearchUpdate,
     SearchSuggestionCreate, SearchSuggestionResponse, SearchSuggestionUpdate,
     FilterPresetCreate, FilterPresetResponse, FilterPresetUpdate,
     SearchAnalyticsSummary, SearchTrendingQuery,
-    VendorMatchingRequest, VendorMatchingScoreResponse
+    VendorMatchingRequest, VendorMatchingScoreResponse,
+    SearchIndexStatusResponse, ReindexRequest
 )
 
 
@@ -120,6 +124,24 @@ async def search_services(
     return await service.search_services(search_request, current_user)
 
 
+@router.post("/federated", response_model=FederatedSearchResponse)
+async def search_federated(
+    search_request: FederatedSearchRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_user)
+):
+    """
+    Search vendors, events and services at once (global search box).
+
+    - One Elasticsearch round trip for all types, facets included
+    - Results interleaved by score normalized per type
+    - Per-type quotas per page (default: an equal share)
+    - Pages end within the first 10000 results (skip + limit), 1000 without signing in
+    """
+    service = SearchService(db)
+    return await service.search_federated(search_request, current_user)
+
+
 # ============================================================================
 # Autocomplete Endpoints
 # ============================================================================
@@ -362,7 +384,8 @@ async def get_trending_queries(
     Get trending search queries.
 
     Returns most popular search queries
-    within the specified time period.
+    within the specified time period, with the
+    change from the period before.
 
     Requires authentication.
     """
@@ -373,7 +396,7 @@ async def get_trending_queries(
         SearchTrendingQuery(
             query=q["query"],
             search_count=q["count"],
-            trend_percentage=0.0  # TODO: Calculate trend
+            trend_percentage=q["trend_percentage"]
         )
         for q in queries
     ]
@@ -408,6 +431,97 @@ async def get_analytics_summary(
     return await service.get_analytics_summary(start_date, end_date)
 
 
+# ============================================================================
+# Index Maintenance Endpoints
+# ============================================================================
+
+@router.get("/index/status", response_model=List[SearchIndexStatusResponse])
+async def get_index_statuses(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Get search index sync status (admin only).
+
+    Outbox lag and pending changes are reported
+    under index_settings.outbox.
+    """
+    service = SearchService(db)
+    return await service.get_index_statuses()
+
+
+@router.get("/index/outbox")
+async def get_outbox_status(
+    index_name: Optional[str] = Query(None, description="Filter dead letters by index"),
+    limit: int = Query(50, ge=1, le=500, description="Dead letters to return"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    Get search index outbox status (admin only).
+
+    Returns indexer counters for this worker, pending
+    changes and lag per index, and recent dead letters.
+    """
+    service = SearchService(db)
+    return await service.get_outbox_status(index_name, limit)
+
+
+@router.post("/index/outbox/retry")
+async def retry_outbox_dead_letters(
+    index_name: Optional[str] = Query(None, description="Only retry entries of this index"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """Queue dead-lettered index changes again (admin only)"""
+    service = SearchService(db)
+    return await service.retry_dead_letters(index_name)
+
+
+@router.post("/index/reindex", status_code=status.HTTP_202_ACCEPTED)
+async def reindex(
+    reindex_request: ReindexRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    Rebuild a search index without downtime (admin only).
+
+    Builds a new versioned index from the database in
+    parallel key ranges, verifies the document count,
+    swaps the alias and replays changes queued meanwhile.
+    Searches keep using the old index until the swap.
+    """
+    service = SearchService(db)
+    return await service.reindex(reindex_request)
+
+
+@router.get("/index/reindex/{index_name}")
+async def get_reindex_progress(
+    index_name: str,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """Get progress and docs/sec of a rebuild started on this worker (admin only)"""
+    service = SearchService(db)
+    return service.get_reindex_progress(index_name)
+
+
+@router.get("/cache")
+async def get_search_cache_stats(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+) -> Dict[str, Any]:
+    """
+    Get search result cache statistics of this worker (admin only).
+
+    Returns cached windows and documents, window and document
+    hit rates per search type, and precomputed facets per index.
+    """
+    service = SearchService(db)
+    return service.get_cache_stats()
+
+
 # ============================================================================
 # Vendor Matching Endpoints
 # ============================================================================
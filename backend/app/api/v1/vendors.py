@@ -10,6 +10,7 @@ from typing import Optional, List
 from datetime import date
 
 from app.core.database import get_db
+from app.core.pagination import CountStrategy
 from app.core.security import get_current_active_user, get_current_admin_user
 from app.models.user import User
 from app.models.vendor import VendorCategory
@@ -131,7 +132,7 @@ async def search_vendors(
     latitude: Optional[float] = Query(None, ge=-90, le=90),
     longitude: Optional[float] = Query(None, ge=-180, le=180),
     radius_km: Optional[int] = Query(None, ge=1, le=500),
-    sort_by: str = Query("relevance", regex="^(relevance|rating|newest|popular)$"),
+    sort_by: str = Query("relevance", regex="^(relevance|rating|newest|popular|distance)$"),
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     db: AsyncSession = Depends(get_db)
@@ -149,8 +150,8 @@ async def search_vendors(
     - **eco_certified_only**: Show only eco-certified vendors
     - **featured_only**: Show only featured vendors
     - **available_on**: Filter by availability date
-    - **latitude/longitude/radius_km**: Location-based search
-    - **sort_by**: Sort order (relevance, rating, newest, popular)
+    - **latitude/longitude/radius_km**: Location-based search (adds distance_km)
+    - **sort_by**: Sort order (relevance, rating, newest, popular, distance)
     - **page**: Page number
     - **page_size**: Items per page
 
@@ -174,14 +175,20 @@ async def search_vendors(
     )
 
     vendor_service = VendorService(db)
-    vendors, total = await vendor_service.search_vendors(filters, page, page_size)
+    vendors, page_info = await vendor_service.search_vendors(
+        filters,
+        page,
+        page_size,
+        count_strategy=CountStrategy.ESTIMATED
+    )
 
     return VendorListResponse(
         vendors=[VendorResponse.from_orm(v) for v in vendors],
-        total=total,
+        total=page_info.total,
+        total_is_exact=page_info.total_is_exact,
         page=page,
         page_size=page_size,
-        has_more=(page * page_size) < total
+        has_more=page_info.has_more
     )
 
 
@@ -0,0 +1,209 @@
+"""
+CelebraTech Event Management System - Autocomplete Trie
+Performance & Optimization
+
+Compressed prefix trie (radix tree) for type-ahead suggestions.
+
+- Keys are normalized (accents removed, case folded, whitespace collapsed),
+  so "dugun" completes "Düğün" and "İstanbul" matches "istanbul"
+- Edges hold whole substrings; chains of single-child nodes are merged
+- Every node keeps the ``top_k`` heaviest completions below it, so a lookup
+  walks the prefix and returns a precomputed list: no subtree scan
+- Several sources (e.g. a suggestion and a vendor) can share one key; the
+  key is listed once, with the weight of its heaviest source
+- Adding, reweighting or removing a source recomputes the top lists only on
+  the path of its key, and stops as soon as a list is unchanged
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import heapq
+import unicodedata
+
+
+# (weight, display text)
+Completion = Tuple[float, str]
+
+
+def normalize(text: str) -> str:
+    """Trie key of a text: no accents, case folded, single spaces"""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    # Turkish dotless i has no decomposition
+    return " ".join(stripped.casefold().replace("ı", "i").split())
+
+
+def _rank(completion: Completion) -> Tuple[float, str]:
+    return -completion[0], completion[1]
+
+
+class _Node:
+    __slots__ = ("label", "children", "sources", "top")
+
+    def __init__(self, label: str):
+        self.label = label
+        # First character of the child's label -> child
+        self.children: Dict[str, "_Node"] = {}
+        # Source id -> completion, for nodes where a key ends
+        self.sources: Optional[Dict[str, Completion]] = None
+        self.top: List[Completion] = []
+
+
+class PrefixTrie:
+    """Radix tree with the heaviest completions cached on every node"""
+
+    def __init__(self, top_k: int = 20):
+        self.top_k = top_k
+        self.root = _Node("")
+        self.keys = 0
+        self.sources = 0
+
+    @classmethod
+    def build(cls, entries: Iterable[Tuple[str, str, float, str]], top_k: int = 20) -> "PrefixTrie":
+        """
+        Bulk-load (key, source, weight, text) entries.
+
+        Top lists are computed once, bottom-up, after all keys are inserted.
+        """
+        trie = cls(top_k)
+        for key, source, weight, text in entries:
+            if key:
+                trie._insert(key, source, weight, text)
+
+        # Children before parents: reversed pre-order
+        order, stack = [], [trie.root]
+        while stack:
+            node = stack.pop()
+            order.append(node)
+            stack.extend(node.children.values())
+        for node in reversed(order):
+            node.top = trie._top_of(node)
+        return trie
+
+    # ========================================================================
+    # Lookup
+    # ========================================================================
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Completion]:
+        """Heaviest completions of a normalized prefix"""
+        node = self.root
+        position = 0
+        while position < len(prefix):
+            child = node.children.get(prefix[position])
+            if child is None:
+                return []
+            # The prefix may end inside the child's label
+            if not child.label.startswith(prefix[position:position + len(child.label)]):
+                return []
+            node = child
+            position += len(child.label)
+        return node.top[:limit]
+
+    # ========================================================================
+    # Updates
+    # ========================================================================
+
+    def add(self, key: str, source: str, weight: float, text: str):
+        """Add a source under a key, or replace its weight and text"""
+        if key:
+            self._update(self._insert(key, source, weight, text))
+
+    def remove(self, key: str, source: str):
+        """Remove a source; the key goes away with its last source"""
+        path = self._path(key)
+        if path is None:
+            return
+        node = path[-1]
+        if not node.sources or source not in node.sources:
+            return
+
+        del node.sources[source]
+        self.sources -= 1
+        if not node.sources:
+            node.sources = None
+            self.keys -= 1
+
+        # Drop empty leaves, then merge a node left with a single child
+        while len(path) > 1 and path[-1].sources is None and not path[-1].children:
+            leaf = path.pop()
+            del path[-1].children[leaf.label[0]]
+        node = path[-1]
+        if len(path) > 1 and node.sources is None and len(node.children) == 1:
+            (child,) = node.children.values()
+            node.label += child.label
+            node.children = child.children
+            node.sources = child.sources
+        self._update(path)
+
+    def _insert(self, key: str, source: str, weight: float, text: str) -> List[_Node]:
+        """Store a source at its key, splitting edges as needed; top lists are not updated"""
+        node = self.root
+        path = [node]
+        position = 0
+        while position < len(key):
+            child = node.children.get(key[position])
+            if child is None:
+                child = node.children[key[position]] = _Node(key[position:])
+                path.append(child)
+                break
+
+            label = child.label
+            common = 1
+            while common < len(label) and position + common < len(key) and label[common] == key[position + common]:
+                common += 1
+            if common < len(label):
+                # Split the edge where the key leaves it
+                middle = _Node(label[:common])
+                middle.top = list(child.top)
+                child.label = label[common:]
+                middle.children[child.label[0]] = child
+                node.children[key[position]] = middle
+                child = middle
+
+            path.append(child)
+            node = child
+            position += common
+
+        terminal = path[-1]
+        if terminal.sources is None:
+            terminal.sources = {}
+            self.keys += 1
+        if source not in terminal.sources:
+            self.sources += 1
+        terminal.sources[source] = (weight, text)
+        return path
+
+    def _path(self, key: str) -> Optional[List[_Node]]:
+        """Nodes from the root to the node where a key ends"""
+        node = self.root
+        path = [node]
+        position = 0
+        while position < len(key):
+            child = node.children.get(key[position])
+            if child is None or not key.startswith(child.label, position):
+                return None
+            path.append(child)
+            node = child
+            position += len(child.label)
+        return path if position == len(key) else None
+
+    def _update(self, path: List[_Node]):
+        """Recompute top lists from the key's node up to the root"""
+        for node in reversed(path):
+            top = self._top_of(node)
+            if top == node.top:
+                # Ancestors only see this node's top list
+                return
+            node.top = top
+
+    def _top_of(self, node: _Node) -> List[Completion]:
+        candidates = [completion for child in node.children.values() for completion in child.top]
+        if node.sources:
+            candidates.append(min(node.sources.values(), key=_rank))
+        return heapq.nsmallest(self.top_k, candidates, key=_rank)
+
+    def node_count(self) -> int:
+        count, stack = 0, [self.root]
+        while stack:
+            node = stack.pop()
+            count += 1
+            stack.extend(node.children.values())
+        return count
@@ -0,0 +1,159 @@
+"""
+CelebraTech Event Management System - Bulk Write Helpers
+Performance & Optimization
+
+Set-based write helpers for repositories. Replaces per-row add/refresh
+loops with multi-row INSERT ... RETURNING, ON CONFLICT upserts and chunked
+executemany, each split into batches of configurable size.
+"""
+from sqlalchemy import insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Executable
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Type, TypeVar
+
+# Rows per statement; keeps parameter counts well below driver limits
+DEFAULT_BATCH_SIZE = 1000
+
+ModelT = TypeVar("ModelT")
+
+
+def chunked(rows: Sequence[Any], batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Sequence[Any]]:
+    """Split a sequence into consecutive batches"""
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    for start in range(0, len(rows), batch_size):
+        yield rows[start:start + batch_size]
+
+
+async def bulk_insert_returning(
+    db: AsyncSession,
+    model: Type[ModelT],
+    rows: Sequence[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> List[ModelT]:
+    """
+    Insert rows with multi-row INSERT ... RETURNING.
+
+    Returned instances are fully loaded (including server defaults) and
+    attached to the session, so no per-row refresh is needed.
+
+    Args:
+        db: Database session
+        model: Mapped model class
+        rows: Column values per row
+        batch_size: Rows per INSERT statement
+
+    Returns:
+        Created instances in input order
+    """
+    created: List[ModelT] = []
+    if not rows:
+        return created
+
+    stmt = insert(model).returning(model, sort_by_parameter_order=True)
+    for batch in chunked(list(rows), batch_size):
+        result = await db.scalars(stmt, list(batch))
+        created.extend(result.all())
+
+    return created
+
+
+def _dialect_insert(db: AsyncSession, table):
+    """Get the dialect-specific INSERT construct supporting ON CONFLICT"""
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        return postgresql.insert(table)
+    if dialect_name == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"ON CONFLICT upserts are not supported on {dialect_name}")
+
+
+def _onupdate_value(column) -> Any:
+    """
+    Value of a column's ``onupdate`` default for a Core UPDATE.
+
+    Core statements skip ORM update defaults, so upserts apply them
+    explicitly from the same source the model uses (a Python callable such
+    as ``datetime.utcnow`` or a SQL expression such as ``func.now()``).
+    """
+    onupdate = column.onupdate
+    if onupdate is None:
+        return None
+    if onupdate.is_callable:
+        return onupdate.arg(None)
+    return onupdate.arg
+
+
+async def bulk_upsert(
+    db: AsyncSession,
+    model: Type[Any],
+    rows: Sequence[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    update_columns: Optional[Iterable[str]] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """
+    Insert rows, updating existing ones on a unique-key conflict.
+
+    Args:
+        db: Database session
+        model: Mapped model class
+        rows: Column values per row (all rows must share the same keys)
+        conflict_columns: Columns of the unique constraint to match on
+        update_columns: Columns to overwrite on conflict
+            (default: every supplied column not in conflict_columns)
+        batch_size: Rows per statement
+
+    Returns:
+        Number of rows inserted or updated
+    """
+    if not rows:
+        return 0
+
+    table = model.__table__
+    if update_columns is None:
+        update_columns = [c for c in rows[0].keys() if c not in conflict_columns]
+    update_columns = list(update_columns)
+
+    affected = 0
+    for batch in chunked(list(rows), batch_size):
+        stmt = _dialect_insert(db, table).values(list(batch))
+        if update_columns:
+            set_ = {col: stmt.excluded[col] for col in update_columns}
+            if "updated_at" in table.c and "updated_at" not in set_:
+                updated_at = _onupdate_value(table.c.updated_at)
+                if updated_at is not None:
+                    set_["updated_at"] = updated_at
+            stmt = stmt.on_conflict_do_update(index_elements=list(conflict_columns), set_=set_)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+
+        result = await db.execute(stmt)
+        affected += max(result.rowcount, 0)
+
+    return affected
+
+
+async def bulk_execute(
+    db: AsyncSession,
+    statement: Executable,
+    params: Sequence[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """
+    Run a statement as chunked executemany.
+
+    Suitable for UPDATE/DELETE statements with bound parameters, e.g.
+    ``update(Guest.__table__).where(Guest.id == bindparam("guest_id"))``.
+
+    Returns:
+        Number of parameter sets executed
+    """
+    executed = 0
+    for batch in chunked(list(params), batch_size):
+        await db.execute(statement, list(batch))
+        executed += len(batch)
+
+    return executed
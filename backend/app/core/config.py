@@ -21,11 +21,15 @@ class Settings(BaseSettings):
     # Server
     HOST: str = "0.0.0.0"
     PORT: int = 8000
+    LAZY_ROUTER_GROUPS: List[str] = []  # Router modules imported on first use, e.g. ["mobile", "integration"]
 
     # Database
     DATABASE_URL: PostgresDsn
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_ADAPTIVE: bool = False  # Let the pool controller raise max_overflow under saturation
+    DATABASE_MAX_OVERFLOW_LIMIT: int = 40  # Upper bound for the adaptive controller
+    DATABASE_SCHEMA_CHECK: bool = True  # Skip create_all when the schema fingerprint matches
 
     # Redis
     REDIS_URL: RedisDsn
@@ -82,6 +86,26 @@ class Settings(BaseSettings):
     # Elasticsearch
     ELASTICSEARCH_URL: str = "http://localhost:9200"
     ELASTICSEARCH_INDEX_PREFIX: str = "celebratech"
+    SEARCH_INDEXER_BATCH_SIZE: int = 500  # Outbox entries per bulk request
+    SEARCH_INDEXER_INTERVAL_SECONDS: float = 1.0
+    SEARCH_INDEXER_MAX_ATTEMPTS: int = 5  # Failed attempts before an entry is dead-lettered
+    AUTOCOMPLETE_TOP_K: int = 20  # Completions kept per trie node (largest autocomplete limit)
+    AUTOCOMPLETE_MAX_VENDORS: int = 20000  # Most booked vendor names loaded
+    AUTOCOMPLETE_REFRESH_SECONDS: float = 30.0
+    AUTOCOMPLETE_REBUILD_SECONDS: float = 3600.0
+    SPELLING_MAX_DISTANCE: int = 2  # Edits of a did-you-mean correction (one for words up to 5 letters)
+    SPELLING_MAX_VENDORS: int = 50000  # Most booked vendors whose words are loaded
+    SPELLING_REFRESH_SECONDS: float = 30.0
+    SPELLING_REBUILD_SECONDS: float = 3600.0
+    SEARCH_CACHE_TTL_SECONDS: float = 30.0  # Lifetime of cached hit windows
+    SEARCH_CACHE_WINDOW_SIZE: int = 100  # Hits per cached window
+    SEARCH_CACHE_MAX_WINDOWS: int = 2000
+    SEARCH_CACHE_MAX_DOCUMENTS: int = 20000
+    SEARCH_FACETS_REFRESH_SECONDS: float = 5.0  # Delay before written indices get fresh facet counts
+    SEARCH_FACETS_MAX_AGE_SECONDS: float = 300.0  # Facets are recomputed at least this often
+    SEARCH_ANALYTICS_BUFFER_SIZE: int = 50000  # Queued analytics rows per worker
+    SEARCH_ANALYTICS_FLUSH_INTERVAL_SECONDS: float = 5.0
+    SEARCH_TRENDING_CAPACITY: int = 200  # Counters per trending sketch
 
     # OpenAI
     OPENAI_API_KEY: Optional[str] = None
@@ -98,6 +122,17 @@ class Settings(BaseSettings):
 
     # Monitoring
     SENTRY_DSN: Optional[str] = None
+    METRICS_BUFFER_SIZE: int = 65536  # Request entries buffered per worker between flushes
+    METRICS_FLUSH_INTERVAL_SECONDS: float = 10.0
+    PROFILER_SAMPLE_RATE: float = 0.0  # Fraction of requests profiled without a token
+    PROFILER_INTERVAL_MS: float = 1.0
+    PROFILER_TOKEN_TTL_SECONDS: int = 900
+    PROFILER_OUTPUT_DIR: Optional[str] = None  # Default: <tmp>/celebratech-profiles
+    PROFILER_MAX_PROFILES: int = 200
+    LOOP_WATCHDOG_INTERVAL_MS: float = 50.0
+    LOOP_BLOCK_THRESHOLD_MS: float = 100.0  # Lag at which the blocking stack is captured
+    MEMORY_TRACE_MAX_SECONDS: float = 1800.0  # tracemalloc stops by itself after this
+    MEMORY_MAX_SNAPSHOTS: int = 5
 
     # Celery
     CELERY_BROKER_URL: RedisDsn
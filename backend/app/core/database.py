@@ -5,9 +5,18 @@ Sprint 1: Infrastructure & Authentication
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.pool import NullPool
-from typing import AsyncGenerator
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, Optional
 
 from app.core.config import settings
+from app.core.pool_telemetry import (
+    AdaptiveOverflowController,
+    InstrumentedAsyncQueuePool,
+    connection_source,
+    pool_telemetry
+)
+from app.core.profiler import request_profiler
+from app.core.schema import compute_schema_fingerprint, read_schema_state, write_schema_state
 
 # Create async engine
 engine = create_async_engine(
@@ -17,7 +26,13 @@ engine = create_async_engine(
     max_overflow=settings.DATABASE_MAX_OVERFLOW,
     pool_pre_ping=True,
     pool_recycle=3600,
+    poolclass=InstrumentedAsyncQueuePool,
 )
+pool_telemetry.attach(engine.sync_engine)
+request_profiler.attach(engine.sync_engine)
+
+# Optional max_overflow controller (started from the app lifespan)
+pool_controller: Optional[AdaptiveOverflowController] = None
 
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -51,17 +66,57 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             await session.close()
 
 
+@asynccontextmanager
+async def background_session(source: str) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for work outside request handlers (middleware, background tasks).
+
+    Connections are reported under ``source`` in the pool telemetry instead
+    of the route that happened to trigger them.
+    """
+    with connection_source(source):
+        async with AsyncSessionLocal() as session:
+            yield session
+
+
+def start_pool_controller() -> None:
+    """Start the adaptive max_overflow controller if enabled"""
+    global pool_controller
+    if not settings.DATABASE_POOL_ADAPTIVE or pool_controller is not None:
+        return
+
+    pool_controller = AdaptiveOverflowController(
+        engine.sync_engine.pool,
+        pool_telemetry,
+        min_overflow=settings.DATABASE_MAX_OVERFLOW,
+        max_overflow=max(settings.DATABASE_MAX_OVERFLOW_LIMIT, settings.DATABASE_MAX_OVERFLOW)
+    )
+    pool_controller.start()
+
+
 async def init_db() -> None:
     """
     Initialize database - create all tables
     Called at application startup
+
+    ``create_all`` is skipped when the Alembic revision and the schema
+    fingerprint match what was recorded after the last successful run.
     """
+    # Import all models to ensure they're registered (routers may load lazily)
+    import app.models  # noqa: F401
+
+    fingerprint = compute_schema_fingerprint(Base.metadata)
+
     async with engine.begin() as conn:
-        # Import all models to ensure they're registered
-        from app.models import user, event, vendor, booking, payment, guest, review, task
+        revision, stored = await conn.run_sync(read_schema_state)
+
+        if settings.DATABASE_SCHEMA_CHECK and stored == (revision, fingerprint):
+            print("⚡ Schema fingerprint unchanged, skipping create_all")
+            return
 
         # Create all tables
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(write_schema_state, revision, fingerprint)
 
 
 async def close_db() -> None:
@@ -69,4 +124,9 @@ async def close_db() -> None:
     Close database connections
     Called at application shutdown
     """
+    global pool_controller
+    if pool_controller is not None:
+        await pool_controller.stop()
+        pool_controller = None
+
     await engine.dispose()
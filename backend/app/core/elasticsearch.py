@@ -3,10 +3,15 @@ Elasticsearch Configuration
 Sprint 13: Search & Discovery System
 
 Elasticsearch client setup and document mappings.
+
+Each search index name is an alias of a versioned index (e.g.
+``vendors_20240101120000``), so an index can be rebuilt next to the live
+one and swapped in atomically.
 """
 
 from elasticsearch import AsyncElasticsearch
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+from datetime import datetime
 import os
 
 
@@ -301,14 +306,47 @@ async def delete_index(client: AsyncElasticsearch, index_name: str) -> bool:
         return False
 
 
+def versioned_index_name(alias: str) -> str:
+    """New concrete index name for an alias"""
+    return f"{alias}_{datetime.utcnow():%Y%m%d%H%M%S}"
+
+
+async def get_alias_indices(client: AsyncElasticsearch, alias: str) -> List[str]:
+    """Concrete indices behind an alias (empty if the alias does not exist)"""
+    if not await client.indices.exists_alias(name=alias):
+        return []
+    response = await client.indices.get_alias(name=alias)
+    return list(response.body.keys())
+
+
+async def create_aliased_index_if_not_exists(
+    client: AsyncElasticsearch,
+    alias: str,
+    mapping: Dict[str, Any]
+) -> bool:
+    """Create a versioned index behind an alias if neither exists"""
+    try:
+        if await client.indices.exists(index=alias):
+            return False
+        await client.indices.create(
+            index=versioned_index_name(alias),
+            settings=mapping["settings"],
+            mappings=mapping["mappings"],
+            aliases={alias: {}}
+        )
+        return True
+    except Exception as e:
+        print(f"Error creating index {alias}: {str(e)}")
+        return False
+
+
 async def initialize_indices():
     """Initialize all search indices"""
     client = ElasticsearchClient.get_client()
 
     # Create indices
-    await create_index_if_not_exists(client, "vendors", VENDOR_INDEX_MAPPING)
-    await create_index_if_not_exists(client, "events", EVENT_INDEX_MAPPING)
-    await create_index_if_not_exists(client, "services", SERVICE_INDEX_MAPPING)
+    for alias, mapping in INDEX_MAPPINGS.items():
+        await create_aliased_index_if_not_exists(client, alias, mapping)
 
 
 # ============================================================================
@@ -318,3 +356,9 @@ async def initialize_indices():
 INDEX_VENDORS = "vendors"
 INDEX_EVENTS = "events"
 INDEX_SERVICES = "services"
+
+INDEX_MAPPINGS = {
+    INDEX_VENDORS: VENDOR_INDEX_MAPPING,
+    INDEX_EVENTS: EVENT_INDEX_MAPPING,
+    INDEX_SERVICES: SERVICE_INDEX_MAPPING,
+}
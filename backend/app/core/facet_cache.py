@@ -0,0 +1,150 @@
+"""
+CelebraTech Event Management System - Facet Cache
+Performance & Optimization
+
+Precomputed facet counts per search index.
+
+Facets of a search without query text depend only on its filters. The
+counts of the unfiltered search and of every single-filter search on an
+enumerable filter (a category, verified, featured, available) are computed
+per index in one aggregation request and served from here, so those
+searches skip aggregations. Searches with query text, several filters or a
+range filter (price, rating, radius) aggregate live.
+
+- An index is recomputed when the indexer writes to it (``invalidate``) and
+  at the latest after ``max_age_seconds``; other workers only see writes
+  after that
+- Until recomputed, the previous counts keep being served: facets may lag
+  index writes by one refresh interval, hits never do
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+import time
+
+from pydantic import BaseModel
+
+
+# Single filters with precomputed counts -> Elasticsearch filter (category
+# values are enumerated with a terms aggregation)
+BOOLEAN_FILTERS = {
+    "verified_only": {"term": {"verified": True}},
+    "featured_only": {"term": {"featured": True}},
+    "available_only": {"term": {"is_available": True}},
+}
+
+# (filter, value); ("", None) is the unfiltered search
+FacetKey = Tuple[str, Any]
+
+UNFILTERED: FacetKey = ("", None)
+
+FACETS_PRECOMPUTED = "precomputed"
+FACETS_LIVE = "live"
+
+
+def facet_key(search_request: BaseModel) -> Optional[FacetKey]:
+    """
+    Precomputed facet entry of a search request.
+
+    Returns:
+        The entry's key, or None when its facets must be aggregated live
+    """
+    if (search_request.query or "").strip():
+        return None
+
+    active = []
+    if search_request.category:
+        active.append(("category", search_request.category))
+    if search_request.price_min is not None or search_request.price_max is not None:
+        active.append(("price", None))
+    if search_request.rating_min is not None:
+        active.append(("rating", None))
+    if search_request.latitude is not None and search_request.longitude is not None and search_request.radius_km:
+        active.append(("location", None))
+    for name in BOOLEAN_FILTERS:
+        if getattr(search_request, name):
+            active.append((name, True))
+
+    if not active:
+        return UNFILTERED
+    if len(active) == 1 and (active[0][0] == "category" or active[0][0] in BOOLEAN_FILTERS):
+        return active[0]
+    return None
+
+
+class FacetCache:
+    """Facet counts per index and precomputed filter"""
+
+    def __init__(self, max_age_seconds: float = 300.0):
+        self.max_age_seconds = max_age_seconds
+        # Index -> facet key -> facets
+        self._facets: Dict[str, Dict[FacetKey, Dict[str, Any]]] = {}
+        self._computed_at: Dict[str, float] = {}
+        self._dirty: Set[str] = set()
+
+        self.hits = 0
+        self.misses = 0
+        self.live = 0
+        self.refreshes = 0
+
+    def get(self, index: str, search_request: BaseModel) -> Optional[Dict[str, Any]]:
+        """Precomputed facets of a search, or None when they must be aggregated live"""
+        key = facet_key(search_request)
+        if key is None:
+            self.live += 1
+            return None
+
+        facets = self._facets.get(index, {}).get(key)
+        if facets is None:
+            # Not computed yet, or a category without documents when computed
+            self.misses += 1
+        else:
+            self.hits += 1
+        return facets
+
+    def put(self, index: str, facets: Dict[FacetKey, Dict[str, Any]]):
+        """Replace the facets of an index"""
+        self._facets[index] = facets
+        self._computed_at[index] = time.monotonic()
+        self._dirty.discard(index)
+        self.refreshes += 1
+
+    def invalidate(self, indices: Iterable[str]):
+        """Recompute the facets of indices that were written to"""
+        self._dirty.update(indices)
+
+    def due(self, indices: Iterable[str]) -> List[str]:
+        """Indices to recompute: written to, too old, or never computed"""
+        now = time.monotonic()
+        return [
+            index for index in indices
+            if index in self._dirty
+            or now - self._computed_at.get(index, float("-inf")) >= self.max_age_seconds
+        ]
+
+    def clear(self):
+        self._facets.clear()
+        self._computed_at.clear()
+        self._dirty.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Entries per index and served/live counters"""
+        now = time.monotonic()
+        served = self.hits + self.misses + self.live
+        return {
+            "indices": {
+                index: {
+                    "entries": len(entries),
+                    "age_seconds": round(now - self._computed_at[index], 3),
+                    "dirty": index in self._dirty
+                }
+                for index, entries in self._facets.items()
+            },
+            "hits": self.hits,
+            "misses": self.misses,
+            "live": self.live,
+            "refreshes": self.refreshes,
+            "precomputed_rate": round(self.hits / served, 4) if served else 0.0
+        }
+
+
+# Global per-worker facet cache
+facet_cache = FacetCache()
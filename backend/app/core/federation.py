@@ -0,0 +1,106 @@
+"""
+CelebraTech Event Management System - Federated Search Merging
+Performance & Optimization
+
+Merging of per-type result lists (vendors, events, services) into one
+ranked list.
+
+- Relevance scores of different indices are not comparable (other fields,
+  boosts and term statistics), so each list is normalized by its own best
+  score: the top hit of every type scores 1.0
+- Lists are interleaved by normalized score; ties keep each list's own
+  order and then the order of the types
+- Each page gives a type at most its quota of slots; slots left free after
+  that (a type with too few hits) are filled by normalized score
+"""
+import heapq
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+
+def normalize_scores(results: List[Dict[str, Any]]) -> List[float]:
+    """
+    Scores of a ranked list divided by its best score (all 1.0 without
+    scores). Scores never increase down the list, so a list sorted by
+    something else than relevance keeps its order.
+    """
+    scores = [result.get("score") or 0.0 for result in results]
+    best = max(scores, default=0.0)
+    if best <= 0:
+        return [1.0] * len(results)
+
+    normalized, ceiling = [], 1.0
+    for score in scores:
+        ceiling = min(ceiling, round(score / best, 6))
+        normalized.append(ceiling)
+    return normalized
+
+
+def default_quotas(types: Sequence[str], limit: int) -> Dict[str, int]:
+    """An equal share of a page per type (rounded up)"""
+    share = -(-limit // len(types)) if types else limit
+    return {search_type: share for search_type in types}
+
+
+def interleave(
+    results_by_type: Dict[str, List[Dict[str, Any]]],
+    skip: int,
+    limit: int,
+    quotas: Optional[Dict[str, int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    One page of the merged list.
+
+    Args:
+        results_by_type: Ranked results per type (at least ``skip + limit``
+            each for exact pages), in type order
+        skip: Merged results before the page
+        limit: Page size
+        quotas: Most results per type and page (default: equal shares)
+
+    Returns:
+        Results of the page, each with its ``normalized_score``
+    """
+    types = list(results_by_type)
+    quotas = {**default_quotas(types, limit), **(quotas or {})}
+    limits = [quotas.get(search_type, limit) for search_type in types]
+    lists = [results_by_type[search_type] for search_type in types]
+    scores = [normalize_scores(results) for results in lists]
+    # Results taken so far per type: always a prefix of its ranked list
+    taken = [0] * len(types)
+
+    def head(order: int) -> Tuple[float, int, int]:
+        # (negated normalized score, rank in its list, type order)
+        return -scores[order][taken[order]], taken[order], order
+
+    def fill(page: List[Tuple[float, int, int]], orders: List[int], capped: bool) -> None:
+        # Merge the heads of the given types by score until the page is full
+        used = [0] * len(types)
+        heads = [head(order) for order in orders]
+        heapq.heapify(heads)
+        while heads and len(page) < limit:
+            candidate = heapq.heappop(heads)
+            order = candidate[2]
+            page.append(candidate)
+            taken[order] += 1
+            used[order] += 1
+            if taken[order] < len(lists[order]) and not (capped and used[order] >= limits[order]):
+                heapq.heappush(heads, head(order))
+
+    merged: List[Dict[str, Any]] = []
+    position = 0
+    while position < skip + limit:
+        # One page: quota pass, then fill free slots by score. Every type
+        # left after the quota pass is at its quota, so the free slots go
+        # to the best results of all types left
+        page: List[Tuple[float, int, int]] = []
+        fill(page, [order for order in range(len(types)) if taken[order] < len(lists[order]) and limits[order] > 0], True)
+        fill(page, [order for order in range(len(types)) if taken[order] < len(lists[order])], False)
+        if not page:
+            break
+
+        for score, rank, order in sorted(page):
+            if skip <= position < skip + limit:
+                merged.append({**lists[order][rank], "normalized_score": -score})
+            position += 1
+
+    return merged
@@ -0,0 +1,71 @@
+"""
+CelebraTech Event Management System - Geo Helpers
+Performance & Optimization
+
+Great-circle distances and bounding boxes for proximity search.
+
+Radius queries first restrict rows to the bounding box of the search circle
+(a range scan on the latitude/longitude index), then keep only rows whose
+haversine distance is within the radius. The same formula is available as
+a SQL expression and in Python, so filtering, sorting and the distance shown
+in responses agree.
+"""
+from typing import Any, List, Tuple
+import math
+
+from sqlalchemy import Float, case, cast, func
+
+
+# Mean Earth radius (IUGG), also used by Elasticsearch for arc distances
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in km"""
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+    a = (
+        math.sin(dlat / 2) ** 2
+        + math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * math.sin(dlng / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(a, 1.0)))
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> Tuple[float, float, List[Tuple[float, float]]]:
+    """
+    Smallest latitude/longitude box containing a search circle.
+
+    Returns:
+        Tuple of (min latitude, max latitude, longitude ranges); a circle
+        crossing the antimeridian has two longitude ranges, one containing
+        a pole spans all longitudes
+    """
+    angular_radius = radius_km / EARTH_RADIUS_KM
+    dlat = math.degrees(angular_radius)
+    min_lat, max_lat = lat - dlat, lat + dlat
+
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), [(-180.0, 180.0)]
+
+    dlng = math.degrees(math.asin(math.sin(angular_radius) / math.cos(math.radians(lat))))
+    min_lng, max_lng = lng - dlng, lng + dlng
+
+    if min_lng < -180:
+        return min_lat, max_lat, [(min_lng + 360, 180.0), (-180.0, max_lng)]
+    if max_lng > 180:
+        return min_lat, max_lat, [(min_lng, 180.0), (-180.0, max_lng - 360)]
+    return min_lat, max_lat, [(min_lng, max_lng)]
+
+
+def haversine_sql(lat_column: Any, lng_column: Any, lat: float, lng: float) -> Any:
+    """Great-circle distance in km from a fixed point, as a SQL expression"""
+    row_lat = cast(lat_column, Float)
+    row_lng = cast(lng_column, Float)
+
+    a = (
+        func.power(func.sin(func.radians(row_lat - lat) / 2), 2)
+        + math.cos(math.radians(lat)) * func.cos(func.radians(row_lat))
+        * func.power(func.sin(func.radians(row_lng - lng) / 2), 2)
+    )
+    # Rounding can push a slightly above 1 for antipodal points
+    return 2 * EARTH_RADIUS_KM * func.asin(func.sqrt(case((a > 1, 1.0), else_=a)))
@@ -0,0 +1,118 @@
+"""
+CelebraTech Event Management System - Heavy Hitters Sketch
+Performance & Optimization
+
+Space-Saving sketch for the most frequent items of a stream (e.g. search
+queries).
+
+- At most ``capacity`` counters are kept; a new item replaces the item with
+  the lowest count and inherits that count as its error, so every count is
+  an upper bound that overestimates by at most ``error``
+- Any item seen more than ``total / capacity`` times is guaranteed to be
+  tracked
+- Sketches merge (per worker, per time bucket) with the same guarantees;
+  an item missing from a full sketch is counted with that sketch's minimum
+"""
+from typing import Any, Dict, List, Tuple
+import heapq
+
+
+class SpaceSaving:
+    """Top-k frequent items with bounded memory"""
+
+    __slots__ = ("capacity", "counters", "total", "_heap")
+
+    def __init__(self, capacity: int = 200):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+
+        self.capacity = capacity
+        # Item -> [count, error]
+        self.counters: Dict[str, List[int]] = {}
+        self.total = 0
+        # (count when pushed, item); counts only grow, so the entry on top
+        # is the minimum once its count is current
+        self._heap: List[Tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self.counters)
+
+    def add(self, item: str, count: int = 1):
+        """Count an item"""
+        self.total += count
+        counter = self.counters.get(item)
+        if counter is not None:
+            counter[0] += count
+            return
+
+        if len(self.counters) < self.capacity:
+            self.counters[item] = [count, 0]
+            heapq.heappush(self._heap, (count, item))
+            return
+
+        # Replace the item with the lowest count
+        while True:
+            pushed, victim = self._heap[0]
+            current = self.counters[victim][0]
+            if current == pushed:
+                break
+            heapq.heapreplace(self._heap, (current, victim))
+
+        del self.counters[victim]
+        self.counters[item] = [current + count, current]
+        heapq.heapreplace(self._heap, (current + count, item))
+
+    def min_count(self) -> int:
+        """Upper bound of the count of any untracked item"""
+        if len(self.counters) < self.capacity:
+            return 0
+        return min(counter[0] for counter in self.counters.values())
+
+    def estimate(self, item: str) -> int:
+        """Upper bound of an item's count"""
+        counter = self.counters.get(item)
+        return counter[0] if counter is not None else self.min_count()
+
+    def top(self, k: int) -> List[Tuple[str, int, int]]:
+        """
+        Most frequent items.
+
+        Returns:
+            List of (item, count, error), highest count first
+        """
+        largest = heapq.nlargest(k, self.counters.items(), key=lambda entry: (entry[1][0], -entry[1][1]))
+        return [(item, count, error) for item, (count, error) in largest]
+
+    def merge(self, other: "SpaceSaving"):
+        """Add another sketch's counts (keeps this sketch's capacity)"""
+        own_min, other_min = self.min_count(), other.min_count()
+        combined: Dict[str, List[int]] = {}
+        for item in self.counters.keys() | other.counters.keys():
+            count, error = self.counters.get(item, (own_min, own_min))
+            other_count, other_error = other.counters.get(item, (other_min, other_min))
+            combined[item] = [count + other_count, error + other_error]
+
+        if len(combined) > self.capacity:
+            kept = heapq.nlargest(self.capacity, combined.items(), key=lambda entry: entry[1][0])
+            combined = dict(kept)
+
+        self.counters = combined
+        self.total += other.total
+        self._heap = [(counter[0], item) for item, counter in combined.items()]
+        heapq.heapify(self._heap)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "total": self.total,
+            "counters": [[item, count, error] for item, (count, error) in self.counters.items()]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SpaceSaving":
+        sketch = cls(data["capacity"])
+        sketch.counters = {item: [count, error] for item, count, error in data["counters"]}
+        sketch.total = data["total"]
+        sketch._heap = [(counter[0], item) for item, counter in sketch.counters.items()]
+        heapq.heapify(sketch._heap)
+        return sketch
@@ -0,0 +1,178 @@
+"""
+CelebraTech Event Management System - Request-scoped Entity Loaders
+Performance & Optimization
+
+DataLoader-style batching for primary-key lookups. Loaders live on the
+database session, and ``get_db`` opens one session per request, so their
+memo is request-scoped without any extra plumbing.
+
+- Lookups issued in the same event-loop tick are coalesced into one
+  ``SELECT ... WHERE id IN (...)`` query
+- The batch runs on the task of the first caller of the tick, never on a
+  task of its own: an AsyncSession does not allow concurrent operations
+- Found entities are memoized for the rest of the request
+
+Repositories opt in from inside their existing ``get_by_id`` methods:
+
+    async def get_by_id(self, vendor_id: str) -> Optional[Vendor]:
+        return await get_loader(self.db, Vendor, Vendor.deleted_at.is_(None)).load(vendor_id)
+"""
+from sqlalchemy import select, inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+from uuid import UUID
+import asyncio
+
+
+class EntityLoader:
+    """Batches and memoizes primary-key lookups for one model"""
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        model: Any,
+        criteria: Tuple[Any, ...] = (),
+        max_batch_size: int = 500
+    ):
+        self.db = db
+        self.model = model
+        self.criteria = criteria
+        self.max_batch_size = max_batch_size
+
+        pk_columns = inspect(model).primary_key
+        if len(pk_columns) != 1:
+            raise ValueError(f"{model.__name__} must have a single-column primary key")
+        self.pk_column = pk_columns[0]
+        self._pk_is_uuid = self._column_python_type() is UUID
+
+        self._cache: Dict[Hashable, Any] = {}
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._in_flight: Dict[Hashable, asyncio.Future] = {}
+        self._dispatching = False
+
+        # Statistics
+        self.stats = {"requested": 0, "memo_hits": 0, "queries": 0}
+
+    async def load(self, key: Any) -> Optional[Any]:
+        """Load one entity by primary key (None if not found)"""
+        key = self._normalize_key(key)
+        self.stats["requested"] += 1
+
+        if key in self._cache:
+            self.stats["memo_hits"] += 1
+            return self._cache[key]
+
+        future = self._pending.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            self._pending[key] = future
+            if not self._dispatching:
+                await self._dispatch()
+
+        return await future
+
+    async def load_many(self, keys: Iterable[Any]) -> List[Optional[Any]]:
+        """Load several entities in one batched query, preserving order"""
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def prime(self, entity: Any):
+        """Add an already-loaded entity to the memo"""
+        key = self._normalize_key(getattr(entity, self.pk_column.key))
+        self._cache[key] = entity
+
+    def clear(self, key: Any = None):
+        """Forget one memoized entity, or all of them"""
+        if key is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(self._normalize_key(key), None)
+
+    async def _dispatch(self):
+        """Resolve all pending keys with IN (...) queries, on the caller's task"""
+        self._dispatching = True
+        try:
+            # Yield once so that every load() issued in this tick is enqueued
+            await asyncio.sleep(0)
+
+            while self._pending:
+                batch = dict(list(self._pending.items())[:self.max_batch_size])
+                for key in batch:
+                    del self._pending[key]
+                self._in_flight = batch
+                await self._run_batch(batch)
+                self._in_flight = {}
+        finally:
+            self._dispatching = False
+            # Only left over when the dispatching caller was cancelled
+            abandoned = [*self._in_flight.values(), *self._pending.values()]
+            self._in_flight, self._pending = {}, {}
+            for future in abandoned:
+                if not future.done():
+                    future.set_exception(RuntimeError("Entity lookup cancelled with its batch"))
+
+    async def _run_batch(self, batch: Dict[Hashable, asyncio.Future]):
+        try:
+            query = select(self.model).where(
+                self.pk_column.in_(list(batch.keys())),
+                *self.criteria
+            )
+            self.stats["queries"] += 1
+            result = await self.db.execute(query)
+            found = {
+                self._normalize_key(getattr(entity, self.pk_column.key)): entity
+                for entity in result.scalars().all()
+            }
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        # Misses are not memoized: the entity may be created later in the request
+        self._cache.update(found)
+        for key, future in batch.items():
+            if not future.done():
+                future.set_result(found.get(key))
+
+    def _normalize_key(self, key: Any) -> Hashable:
+        """Normalize keys so str and UUID ids share memo entries"""
+        if self._pk_is_uuid and not isinstance(key, UUID):
+            return UUID(str(key))
+        return key
+
+    def _column_python_type(self) -> Optional[type]:
+        try:
+            return self.pk_column.type.python_type
+        except NotImplementedError:
+            return None
+
+
+def get_loader(
+    db: AsyncSession,
+    model: Any,
+    *criteria: Any,
+    name: str = "default"
+) -> EntityLoader:
+    """
+    Get the request-scoped loader for a model.
+
+    Loaders are keyed by model and name; criteria (e.g. soft-delete
+    filters) are fixed when the loader is first created, so use a distinct
+    name for a different filter set.
+    """
+    loaders = db.info.setdefault("entity_loaders", {})
+    key = (model, name)
+
+    loader = loaders.get(key)
+    if loader is None:
+        loader = EntityLoader(db, model, criteria)
+        loaders[key] = loader
+
+    return loader
+
+
+def clear_loaders(db: AsyncSession, model: Any = None):
+    """Drop memoized entities for one model, or for every model"""
+    for (loader_model, _), loader in db.info.get("entity_loaders", {}).items():
+        if model is None or loader_model is model:
+            loader.clear()
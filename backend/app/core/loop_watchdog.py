@@ -0,0 +1,200 @@
+"""
+CelebraTech Event Management System - Event Loop Watchdog
+Performance & Optimization
+
+Continuous event-loop lag measurement and blocking-call detection.
+
+- A task on the loop wakes up every ``LOOP_WATCHDOG_INTERVAL_MS`` and
+  records how late it was scheduled (lag histogram)
+- A watcher thread checks the task's heartbeat; when the loop has not come
+  back for ``LOOP_BLOCK_THRESHOLD_MS``, it captures the stack of the loop
+  thread while the blocking code is still running
+- Captured stalls are aggregated by call site (innermost application frame)
+  with their count, total and worst blocked time
+
+Blocking code that holds the GIL without running Python bytecode can delay
+the watcher until it returns; such stalls are still measured but reported
+under ``<not captured>``.
+"""
+from typing import Any, Dict, Optional, Tuple
+import asyncio
+import sys
+import threading
+import time
+
+from app.core.pool_telemetry import LatencyHistogram
+from app.core.profiler import thread_stack
+
+
+# Call site of stalls the watcher thread could not capture
+UNCAPTURED = "<not captured>"
+
+
+class LoopWatchdog:
+    """Measures event-loop lag and finds the code that blocks the loop"""
+
+    def __init__(
+        self,
+        interval_ms: float = 50.0,
+        threshold_ms: float = 100.0,
+        max_offenders: int = 100
+    ):
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self.max_offenders = max_offenders
+
+        self.lag_histogram = LatencyHistogram()
+        self.last_lag_ms = 0.0
+        self.window_max_lag_ms = 0.0
+        self.stalls = 0
+
+        # Call site -> aggregated stalls
+        self.offenders: Dict[str, Dict[str, Any]] = {}
+
+        self._heartbeat = 0.0
+        self._captured: Optional[Tuple[float, Tuple[str, ...]]] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the lag probe and the watcher thread"""
+        if self.running:
+            return
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.perf_counter()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watcher.start()
+
+    async def stop(self):
+        """Stop the lag probe and the watcher thread"""
+        self._stop_watching.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        interval = self.interval_ms / 1000
+        while True:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            self._heartbeat = now
+            self.observe(max(now - expected, 0.0) * 1000)
+
+    def _watch(self):
+        # Poll often enough to catch a stall shortly after the threshold
+        poll_seconds = min(self.interval_ms, self.threshold_ms) / 2000
+        limit_seconds = (self.interval_ms + self.threshold_ms) / 1000
+
+        while not self._stop_watching.wait(poll_seconds):
+            heartbeat = self._heartbeat
+            captured = self._captured
+            if time.perf_counter() - heartbeat < limit_seconds:
+                continue
+            if captured is not None and captured[0] == heartbeat:
+                continue  # Already captured this stall
+
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is not None:
+                self._captured = (heartbeat, thread_stack(frame))
+
+    # ========================================================================
+    # Recording
+    # ========================================================================
+
+    def observe(self, lag_ms: float):
+        """Record one probe; attribute it to a call site when it was a stall"""
+        self.lag_histogram.observe(lag_ms)
+        self.last_lag_ms = lag_ms
+        self.window_max_lag_ms = max(self.window_max_lag_ms, lag_ms)
+
+        if lag_ms < self.threshold_ms:
+            return
+
+        self.stalls += 1
+        captured, self._captured = self._captured, None
+        stack = captured[1] if captured is not None else ()
+        self._record_offender(call_site(stack), stack, lag_ms)
+
+    def _record_offender(self, site: str, stack: Tuple[str, ...], blocked_ms: float):
+        offender = self.offenders.get(site)
+        if offender is None:
+            if len(self.offenders) >= self.max_offenders:
+                # Make room by dropping the call site with the least blocked time
+                least = min(self.offenders, key=lambda key: self.offenders[key]["total_ms"])
+                del self.offenders[least]
+            offender = self.offenders[site] = {
+                "call_site": site,
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "stack": []
+            }
+
+        offender["count"] += 1
+        offender["total_ms"] += blocked_ms
+        offender["last_seen"] = time.time()
+        if blocked_ms >= offender["max_ms"]:
+            offender["max_ms"] = blocked_ms
+            offender["stack"] = list(stack)
+
+    def take_window_max(self) -> float:
+        """Worst lag (ms) since the previous call"""
+        worst, self.window_max_lag_ms = self.window_max_lag_ms, 0.0
+        return worst
+
+    def snapshot(self, top_offenders: int = 20) -> Dict[str, Any]:
+        """Get lag statistics and the worst blocking call sites"""
+        worst = sorted(self.offenders.values(), key=lambda o: o["total_ms"], reverse=True)[:top_offenders]
+        return {
+            "enabled": self.running,
+            "interval_ms": self.interval_ms,
+            "threshold_ms": self.threshold_ms,
+            "last_lag_ms": round(self.last_lag_ms, 3),
+            "lag_ms": self.lag_histogram.to_dict(),
+            "stalls": self.stalls,
+            "offenders": [
+                {**offender, "total_ms": round(offender["total_ms"], 3), "max_ms": round(offender["max_ms"], 3)}
+                for offender in worst
+            ]
+        }
+
+
+def call_site(stack: Tuple[str, ...]) -> str:
+    """Innermost application frame of a stack (innermost frame otherwise)"""
+    if not stack:
+        return UNCAPTURED
+    for label in reversed(stack):
+        if "(app/" in label:
+            return label
+    return stack[-1]
+
+
+# Global watchdog for the worker's event loop
+loop_watchdog = LoopWatchdog()
+
+
+def init_loop_watchdog(interval_ms: float, threshold_ms: float) -> LoopWatchdog:
+    """Configure and start the global watchdog"""
+    loop_watchdog.interval_ms = interval_ms
+    loop_watchdog.threshold_ms = threshold_ms
+    loop_watchdog.start()
+    return loop_watchdog
+
+
+async def close_loop_watchdog():
+    """Stop the global watchdog"""
+    await loop_watchdog.stop()
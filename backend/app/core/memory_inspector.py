@@ -0,0 +1,336 @@
+"""
+CelebraTech Event Management System - Memory Inspector
+Performance & Optimization
+
+On-demand memory inspection for a running worker (admin API).
+
+- tracemalloc is only running between an explicit start and stop, with a
+  small number of frames per allocation, and stops by itself after
+  ``MEMORY_TRACE_MAX_SECONDS``
+- Snapshots record tracemalloc allocations plus live object counts and
+  shallow sizes per type; at most ``MEMORY_MAX_SNAPSHOTS`` are kept
+- Diffs between two snapshots are grouped by file:line (or file, or
+  traceback) and by object type
+- The container report lists the largest live dicts, lists, sets and deques
+  with the attribute or module global that holds them (e.g.
+  ``SuspiciousActivityDetectionMiddleware.request_tracking``)
+
+Snapshots and the container report walk the whole heap under the GIL, so
+they block the worker for a moment; tracing itself costs memory and CPU
+proportional to the number of frames.
+"""
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import gc
+import sys
+import tracemalloc
+import uuid
+
+from fastapi import HTTPException, status
+import psutil
+
+from app.core.config import settings
+
+
+GROUP_BY = ("lineno", "filename", "traceback")
+
+CONTAINER_TYPES = (dict, list, set, frozenset, deque)
+
+# Containers smaller than this are not considered for the container report
+MIN_CONTAINER_LENGTH = 100
+
+
+class MemorySnapshot:
+    """tracemalloc snapshot plus live object statistics by type"""
+
+    def __init__(self, label: Optional[str], trace: tracemalloc.Snapshot, types: Dict[str, Tuple[int, int]]):
+        self.id = uuid.uuid4().hex[:12]
+        self.label = label
+        self.taken_at = datetime.utcnow()
+        self.trace = trace
+        # Type name -> (object count, total shallow size)
+        self.types = types
+        self.rss_bytes = _rss_bytes()
+        self.traced_bytes = sum(stat.size for stat in trace.statistics("filename"))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "taken_at": self.taken_at.isoformat(),
+            "rss_mb": round(self.rss_bytes / (1024 * 1024), 2),
+            "traced_mb": round(self.traced_bytes / (1024 * 1024), 2),
+            "objects": sum(count for count, _ in self.types.values())
+        }
+
+
+class MemoryInspector:
+    """Controls tracemalloc and compares memory snapshots"""
+
+    def __init__(self, max_snapshots: int = 5, max_trace_seconds: float = 1800):
+        self.max_snapshots = max_snapshots
+        self.max_trace_seconds = max_trace_seconds
+        self.snapshots: Dict[str, MemorySnapshot] = {}
+        self.started_at: Optional[datetime] = None
+        self._auto_stop: Optional[asyncio.TimerHandle] = None
+
+    # ========================================================================
+    # Tracing
+    # ========================================================================
+
+    def start(self, frames: int = 1) -> Dict[str, Any]:
+        """Start tracing allocations (stops after max_trace_seconds)"""
+        if tracemalloc.is_tracing():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Memory tracing is already running"
+            )
+
+        tracemalloc.start(frames)
+        self.started_at = datetime.utcnow()
+        self._auto_stop = asyncio.get_running_loop().call_later(self.max_trace_seconds, self.stop)
+        print(f"🧠 Memory tracing started ({frames} frames)")
+        return self.status()
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop tracing; snapshots already taken stay available"""
+        if self._auto_stop is not None:
+            self._auto_stop.cancel()
+            self._auto_stop = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            print("🧠 Memory tracing stopped")
+        self.started_at = None
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        """Tracing state, traced memory and stored snapshots"""
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (0, 0)
+        return {
+            "tracing": tracing,
+            "frames": tracemalloc.get_traceback_limit() if tracing else 0,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "max_trace_seconds": self.max_trace_seconds,
+            "traced_mb": round(current / (1024 * 1024), 2),
+            "traced_peak_mb": round(peak / (1024 * 1024), 2),
+            "tracing_overhead_mb": round(tracemalloc.get_tracemalloc_memory() / (1024 * 1024), 2),
+            "rss_mb": round(_rss_bytes() / (1024 * 1024), 2),
+            "snapshots": [snapshot.to_dict() for snapshot in self.snapshots.values()]
+        }
+
+    # ========================================================================
+    # Snapshots
+    # ========================================================================
+
+    def take_snapshot(self, label: Optional[str] = None) -> Dict[str, Any]:
+        """Take a snapshot; the oldest one is dropped beyond max_snapshots"""
+        if not tracemalloc.is_tracing():
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Memory tracing is not running"
+            )
+
+        # Unreachable cycles would otherwise show up as growth until the next
+        # collection
+        gc.collect()
+        trace = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<unknown>"),
+        ))
+        snapshot = MemorySnapshot(label, trace, _type_statistics())
+
+        self.snapshots[snapshot.id] = snapshot
+        while len(self.snapshots) > self.max_snapshots:
+            del self.snapshots[next(iter(self.snapshots))]
+        return snapshot.to_dict()
+
+    def delete_snapshot(self, snapshot_id: str):
+        self._get(snapshot_id)
+        del self.snapshots[snapshot_id]
+
+    def diff(self, before_id: str, after_id: str, group_by: str = "lineno", limit: int = 25) -> Dict[str, Any]:
+        """
+        Compare two snapshots.
+
+        Args:
+            before_id: Earlier snapshot
+            after_id: Later snapshot
+            group_by: lineno, filename or traceback
+            limit: Entries per report
+
+        Returns:
+            Allocation growth by location and object growth by type
+        """
+        if group_by not in GROUP_BY:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"group_by must be one of: {', '.join(GROUP_BY)}"
+            )
+        before, after = self._get(before_id), self._get(after_id)
+
+        allocations = [
+            {
+                "location": _format_traceback(stat.traceback, group_by),
+                "size_diff_kb": round(stat.size_diff / 1024, 2),
+                "count_diff": stat.count_diff,
+                "size_kb": round(stat.size / 1024, 2),
+                "count": stat.count
+            }
+            for stat in after.trace.compare_to(before.trace, group_by)[:limit]
+        ]
+
+        types = []
+        for name in set(before.types) | set(after.types):
+            count_before, size_before = before.types.get(name, (0, 0))
+            count_after, size_after = after.types.get(name, (0, 0))
+            if count_after != count_before or size_after != size_before:
+                types.append({
+                    "type": name,
+                    "count_diff": count_after - count_before,
+                    "size_diff_kb": round((size_after - size_before) / 1024, 2),
+                    "count": count_after
+                })
+        types.sort(key=lambda entry: abs(entry["size_diff_kb"]), reverse=True)
+
+        return {
+            "before": before.to_dict(),
+            "after": after.to_dict(),
+            "rss_diff_mb": round((after.rss_bytes - before.rss_bytes) / (1024 * 1024), 2),
+            "traced_diff_mb": round((after.traced_bytes - before.traced_bytes) / (1024 * 1024), 2),
+            "group_by": group_by,
+            "allocations": allocations,
+            "types": types[:limit]
+        }
+
+    def _get(self, snapshot_id: str) -> MemorySnapshot:
+        snapshot = self.snapshots.get(snapshot_id)
+        if snapshot is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Snapshot {snapshot_id} not found"
+            )
+        return snapshot
+
+    # ========================================================================
+    # Containers
+    # ========================================================================
+
+    def largest_containers(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Largest live containers with the names that hold them.
+
+        Containers are ranked by length; retained size counts the container,
+        its keys and values, and one more level of nested containers.
+        Works without tracing.
+        """
+        candidates = [
+            obj for obj in gc.get_objects()
+            if isinstance(obj, CONTAINER_TYPES) and len(obj) >= MIN_CONTAINER_LENGTH
+        ]
+        candidates.sort(key=len, reverse=True)
+        # Module globals are owners, not payload; stored snapshots are ours
+        modules = _module_namespaces()
+        own = {id(getattr(snapshot.trace.traces, "_traces", None)) for snapshot in self.snapshots.values()}
+
+        report = []
+        for container in candidates:
+            if id(container) in modules or id(container) in own:
+                continue
+            report.append({
+                "type": type(container).__name__,
+                "length": len(container),
+                "retained_kb": round(_retained_size(container) / 1024, 2),
+                "held_by": _held_by(container, modules)
+            })
+            if len(report) >= limit:
+                break
+        return report
+
+
+def _rss_bytes() -> int:
+    try:
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return 0
+
+
+def _type_statistics() -> Dict[str, Tuple[int, int]]:
+    """Live object count and shallow size per type"""
+    stats: Dict[str, List[int]] = {}
+    for obj in gc.get_objects():
+        name = type(obj).__qualname__
+        entry = stats.get(name)
+        if entry is None:
+            entry = stats[name] = [0, 0]
+        entry[0] += 1
+        entry[1] += sys.getsizeof(obj, 0)
+    return {name: (count, size) for name, (count, size) in stats.items()}
+
+
+def _format_traceback(traceback: tracemalloc.Traceback, group_by: str) -> str:
+    if group_by == "filename":
+        return traceback[0].filename
+    if group_by == "lineno":
+        return f"{traceback[0].filename}:{traceback[0].lineno}"
+    return " <- ".join(f"{frame.filename}:{frame.lineno}" for frame in traceback)
+
+
+def _retained_size(container: Any) -> int:
+    size = sys.getsizeof(container, 0)
+    items = container.items() if isinstance(container, dict) else ((item, None) for item in container)
+    for key, value in items:
+        for member in (key, value):
+            if member is None:
+                continue
+            size += sys.getsizeof(member, 0)
+            if isinstance(member, CONTAINER_TYPES):
+                size += sum(sys.getsizeof(nested, 0) for nested in member)
+    return size
+
+
+def _module_namespaces() -> Dict[int, str]:
+    """Module names by id of the module's __dict__"""
+    namespaces: Dict[int, str] = {}
+    for name, module in list(sys.modules.items()):
+        module_dict = getattr(module, "__dict__", None)
+        if isinstance(module_dict, dict):
+            namespaces[id(module_dict)] = name
+    return namespaces
+
+
+def _attribute_of(namespace: Dict[str, Any], value: Any) -> Optional[str]:
+    return next((key for key, item in namespace.items() if item is value), None)
+
+
+def _held_by(container: Any, modules: Dict[int, str]) -> List[str]:
+    """Module globals and instance attributes referencing a container"""
+    names = []
+    for referrer in gc.get_referrers(container):
+        if isinstance(referrer, dict):
+            module = modules.get(id(referrer))
+            if module is not None:
+                names.append(f"{module}.{_attribute_of(referrer, container)}")
+                continue
+            # Materialized instance __dict__: find the object that owns it
+            for holder in gc.get_referrers(referrer):
+                if getattr(holder, "__dict__", None) is referrer:
+                    names.append(f"{type(holder).__qualname__}.{_attribute_of(referrer, container)}")
+                    break
+        elif not isinstance(referrer, type):
+            # Instance with inline attribute values
+            namespace = getattr(referrer, "__dict__", None)
+            if isinstance(namespace, dict):
+                attribute = _attribute_of(namespace, container)
+                if attribute is not None:
+                    names.append(f"{type(referrer).__qualname__}.{attribute}")
+    return names[:5]
+
+
+memory_inspector = MemoryInspector(
+    max_snapshots=settings.MEMORY_MAX_SNAPSHOTS,
+    max_trace_seconds=settings.MEMORY_TRACE_MAX_SECONDS
+)
@@ -0,0 +1,244 @@
+"""
+CelebraTech Event Management System - OpenMetrics Exposition
+Performance & Optimization
+
+In-process metrics exposed in OpenMetrics text format at ``/metrics``.
+
+- Request counters and latency histograms are fed in batches by the request
+  metrics collector flush, not on the request path
+- Gauges (DB pool, cache tiers, event-loop lag, background queue depths) are
+  sampled from in-memory state by a per-worker task and on every scrape
+- When ``PROMETHEUS_MULTIPROC_DIR`` is set (before the process starts), every
+  worker writes its values to memory-mapped files in that directory and a
+  scrape of any worker aggregates all of them
+
+Scrapes only read process memory and the multiprocess files; they never
+touch the database.
+"""
+from typing import Callable, Dict, Iterable, Optional, Tuple
+import asyncio
+import os
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, REGISTRY, multiprocess
+from prometheus_client.openmetrics.exposition import CONTENT_TYPE_LATEST, generate_latest
+
+from app.core.loop_watchdog import loop_watchdog
+from app.core.pagination import count_cache
+from app.core.search_cache import search_result_cache
+from app.core.pool_telemetry import pool_telemetry
+
+
+MULTIPROC_DIR = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+
+# Seconds between gauge samples (also the event-loop lag probe interval)
+SAMPLE_INTERVAL_SECONDS = 5.0
+
+REQUEST_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf")
+)
+
+
+# ============================================================================
+# Metrics
+# ============================================================================
+
+HTTP_REQUESTS = Counter(
+    "http_requests",
+    "HTTP requests by route template and status class",
+    ["method", "route", "status_class"]
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route"],
+    buckets=REQUEST_LATENCY_BUCKETS
+)
+HTTP_RESPONSE_BYTES = Counter(
+    "http_response_size_bytes",
+    "HTTP response bytes by route template",
+    ["method", "route"]
+)
+
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections",
+    "Database pool connections by state",
+    ["state"],
+    multiprocess_mode="livesum"
+)
+DB_POOL_CHECKOUTS = Counter("db_pool_checkouts", "Database pool checkouts")
+DB_POOL_TIMEOUTS = Counter("db_pool_checkout_timeouts", "Database pool checkouts that timed out")
+
+CACHE_REQUESTS = Counter(
+    "cache_requests",
+    "Cache lookups by tier and result",
+    ["tier", "result"]
+)
+CACHE_ENTRIES = Gauge(
+    "cache_entries",
+    "Entries held in in-process cache tiers",
+    ["tier"],
+    multiprocess_mode="livesum"
+)
+
+EVENT_LOOP_LAG = Gauge(
+    "event_loop_lag_seconds",
+    "Delay of the latest event-loop probe (worst worker)",
+    multiprocess_mode="max"
+)
+
+BACKGROUND_QUEUE_DEPTH = Gauge(
+    "background_queue_depth",
+    "Items waiting in background queues",
+    ["queue"],
+    multiprocess_mode="livesum"
+)
+
+
+def export_requests(entries: Iterable[Tuple[float, str, str, int, float, int]]):
+    """Export drained request metrics collector entries"""
+    for _, method, route, status_code, latency_ms, size in entries:
+        HTTP_REQUESTS.labels(method, route, f"{status_code // 100}xx").inc()
+        HTTP_REQUEST_DURATION.labels(method, route).observe(latency_ms / 1000)
+        if size:
+            HTTP_RESPONSE_BYTES.labels(method, route).inc(size)
+
+
+# ============================================================================
+# Sampling
+# ============================================================================
+
+# Queue name -> callable returning its current depth
+_queue_depths: Dict[str, Callable[[], int]] = {}
+
+
+def register_queue_depth(name: str, depth: Callable[[], int]):
+    """Export the depth of a background queue as background_queue_depth"""
+    _queue_depths[name] = depth
+
+
+class MetricsSampler:
+    """Samples in-memory gauges and probes event-loop lag"""
+
+    def __init__(self, interval_seconds: float = SAMPLE_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self.loop_lag_seconds = 0.0
+        self._task: Optional[asyncio.Task] = None
+        # Totals already exported, to turn running totals into counter increments
+        self._exported: Dict[Tuple[str, ...], int] = {}
+
+    def start(self):
+        """Start periodic sampling"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop sampling"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def sample(self):
+        """Copy current in-memory state into the exported metrics"""
+        pool = pool_telemetry.snapshot(top_sources=0)
+        DB_POOL_CONNECTIONS.labels("size").set(pool["pool_size"])
+        DB_POOL_CONNECTIONS.labels("checked_out").set(pool["checked_out"])
+        DB_POOL_CONNECTIONS.labels("checked_in").set(pool["checked_in"])
+        DB_POOL_CONNECTIONS.labels("overflow").set(pool["overflow_in_use"])
+        self._advance(DB_POOL_CHECKOUTS, ("pool", "checkouts"), pool["checkouts"])
+        self._advance(DB_POOL_TIMEOUTS, ("pool", "timeouts"), pool["timeouts"])
+
+        # Imported lazily: the cache service is created on startup
+        from app.services import cache_service as cache_module
+
+        cache = cache_module.cache_service
+        if cache is not None:
+            stats = cache.get_stats()
+            CACHE_ENTRIES.labels("l1").set(stats["l1_size"])
+            for tier in ("l1", "l2"):
+                for result in ("hits", "misses"):
+                    self._advance(
+                        CACHE_REQUESTS.labels(tier, result),
+                        ("cache", tier, result),
+                        stats[f"{tier}_{result}"]
+                    )
+
+        CACHE_ENTRIES.labels("count").set(len(count_cache))
+        self._advance(CACHE_REQUESTS.labels("count", "hits"), ("cache", "count", "hits"), count_cache.hits)
+        self._advance(CACHE_REQUESTS.labels("count", "misses"), ("cache", "count", "misses"), count_cache.misses)
+
+        CACHE_ENTRIES.labels("search").set(len(search_result_cache))
+        search_totals = search_result_cache.totals()
+        for result in ("hits", "misses"):
+            self._advance(
+                CACHE_REQUESTS.labels("search", result),
+                ("cache", "search", result),
+                search_totals[f"window_{result}"]
+            )
+
+        for name, depth in list(_queue_depths.items()):
+            try:
+                BACKGROUND_QUEUE_DEPTH.labels(name).set(depth())
+            except Exception as e:
+                print(f"Queue depth error ({name}): {e}")
+
+        # The watchdog probes far more often; fall back to the sampler's own probe
+        if loop_watchdog.running:
+            EVENT_LOOP_LAG.set(loop_watchdog.take_window_max() / 1000)
+        else:
+            EVENT_LOOP_LAG.set(self.loop_lag_seconds)
+
+    def _advance(self, counter, key: Tuple[str, ...], total: int):
+        """Increment a counter up to a running total"""
+        delta = total - self._exported.get(key, 0)
+        if delta < 0:
+            # Source was reset (e.g. cache stats cleared)
+            delta = total
+        if delta:
+            counter.inc(delta)
+        self._exported[key] = total
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval_seconds
+            await asyncio.sleep(self.interval_seconds)
+            self.loop_lag_seconds = max(loop.time() - expected, 0.0)
+            self.sample()
+
+
+metrics_sampler = MetricsSampler()
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render all metrics in OpenMetrics text format.
+
+    Returns:
+        (body, content type)
+    """
+    metrics_sampler.sample()
+
+    if MULTIPROC_DIR:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def init_metrics_sampler() -> MetricsSampler:
+    """Start the global metrics sampler"""
+    metrics_sampler.start()
+    return metrics_sampler
+
+
+async def close_metrics_sampler():
+    """Stop the sampler and release this worker's multiprocess gauges"""
+    await metrics_sampler.stop()
+    if MULTIPROC_DIR:
+        multiprocess.mark_process_dead(os.getpid())
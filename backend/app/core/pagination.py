@@ -0,0 +1,323 @@
+"""
+CelebraTech Event Management System - Pagination & Count Strategies
+Performance & Optimization
+
+Shared pagination helper for repository listings. Counting the full result
+set on every page request doubles the cost of a listing, so each caller picks
+a count strategy:
+
+- EXACT: COUNT(*) over the filtered query (previous behaviour)
+- CACHED: exact count memoized per normalized filter set for a short TTL
+  (reported as inexact when served from the cache)
+- ESTIMATED: query planner row estimate, exact count below a threshold
+- HAS_MORE: no count at all, only whether another page exists
+"""
+from sqlalchemy import event, select, func, text
+from sqlalchemy.exc import CompileError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import enum
+import hashlib
+import json
+import time
+
+
+class CountStrategy(str, enum.Enum):
+    """How the total row count of a paginated listing is obtained"""
+    EXACT = "exact"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+    HAS_MORE = "has_more"
+
+
+class PageInfo:
+    """Pagination metadata returned alongside a page of results"""
+
+    def __init__(
+        self,
+        page: int,
+        page_size: int,
+        has_more: bool,
+        total: Optional[int] = None,
+        total_is_exact: bool = True
+    ):
+        self.page = page
+        self.page_size = page_size
+        self.has_more = has_more
+        self.total = total
+        self.total_is_exact = total_is_exact
+
+    @property
+    def total_pages(self) -> Optional[int]:
+        """Number of pages, or None when the total is unknown"""
+        if self.total is None:
+            return None
+        return -(-self.total // self.page_size) if self.total > 0 else 0
+
+    def __repr__(self) -> str:
+        return (
+            f"PageInfo(page={self.page}, total={self.total}, "
+            f"exact={self.total_is_exact}, has_more={self.has_more})"
+        )
+
+
+class CountCache:
+    """
+    In-process TTL cache for exact counts keyed by normalized filter set.
+
+    Counts are a per-worker optimization only. Repositories invalidate
+    their namespace on writes that change listing membership; writes made
+    by other workers are bounded by the TTL.
+    """
+
+    def __init__(self, ttl_seconds: int = 60, max_entries: int = 5000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, int]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[int]:
+        """Get a cached count if it has not expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, total = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return total
+
+    def set(self, key: str, total: int, ttl_seconds: Optional[int] = None):
+        """Cache a count"""
+        if len(self._entries) >= self.max_entries:
+            self._evict()
+
+        ttl = ttl_seconds or self.ttl_seconds
+        self._entries[key] = (time.monotonic() + ttl, total)
+
+    def invalidate(self, namespace: str) -> int:
+        """Drop all cached counts for a namespace"""
+        prefix = f"{namespace}:"
+        keys = [k for k in self._entries if k.startswith(prefix)]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self):
+        """Drop all cached counts"""
+        self._entries.clear()
+
+    def _evict(self):
+        """Remove expired entries, then the oldest ones if still full"""
+        now = time.monotonic()
+        for key in [k for k, (exp, _) in self._entries.items() if exp < now]:
+            del self._entries[key]
+
+        overflow = len(self._entries) - self.max_entries + 1
+        if overflow > 0:
+            for key in sorted(self._entries, key=lambda k: self._entries[k][0])[:overflow]:
+                del self._entries[key]
+
+
+# Global per-worker count cache
+count_cache = CountCache()
+
+# Session.info key of the namespaces to invalidate when the session commits
+PENDING_INVALIDATIONS_KEY = "count_cache.pending"
+
+
+def invalidate_on_commit(db: AsyncSession, namespace: str):
+    """
+    Drop a namespace's cached counts once the session commits.
+
+    For repositories that only flush: invalidating before the commit lets a
+    concurrent listing cache the old count again until the TTL expires.
+    """
+    db.sync_session.info.setdefault(PENDING_INVALIDATIONS_KEY, set()).add(namespace)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_counts(session):
+    for namespace in session.info.pop(PENDING_INVALIDATIONS_KEY, ()):
+        count_cache.invalidate(namespace)
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_pending_invalidations(session):
+    session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+
+# Below this planner estimate an exact count is cheap enough to run
+ESTIMATE_EXACT_THRESHOLD = 10000
+
+
+def normalize_filters(namespace: str, filters: Any = None, **extra: Any) -> str:
+    """
+    Build a cache key for a filter set.
+
+    Unset values are dropped and keys are sorted so that equivalent filter
+    sets map to the same key regardless of how they were constructed.
+    Pagination parameters must not be passed here.
+    """
+    if isinstance(filters, BaseModel):
+        values = filters.model_dump(mode="json", exclude_none=True)
+    else:
+        values = dict(filters or {})
+
+    values.update(extra)
+    values = {
+        k: v for k, v in values.items()
+        if v is not None and v != "" and v != []
+    }
+
+    payload = json.dumps(values, sort_keys=True, default=str)
+    digest = hashlib.sha1(payload.encode()).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+async def count_exact(db: AsyncSession, query: Select) -> int:
+    """Run an exact COUNT(*) over a filtered query"""
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    result = await db.execute(count_query)
+    return result.scalar() or 0
+
+
+async def count_estimate(db: AsyncSession, query: Select) -> Optional[int]:
+    """
+    Get the planner's row estimate for a query.
+
+    Returns None when the estimate cannot be obtained (non-PostgreSQL
+    backend or a query that cannot be rendered with literal values).
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+
+    try:
+        compiled = query.order_by(None).compile(
+            dialect=bind.dialect,
+            compile_kwargs={"literal_binds": True, "render_postcompile": True}
+        )
+    except CompileError:
+        return None
+
+    result = await db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}"))
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (TypeError, KeyError, IndexError, ValueError):
+        return None
+
+
+async def resolve_total(
+    db: AsyncSession,
+    query: Select,
+    strategy: CountStrategy,
+    cache_key: Optional[str] = None,
+    estimate_threshold: int = ESTIMATE_EXACT_THRESHOLD
+) -> Tuple[Optional[int], bool]:
+    """
+    Resolve the total row count for a filtered query.
+
+    Returns:
+        Tuple of (total or None, whether the total is exact)
+    """
+    if strategy == CountStrategy.HAS_MORE:
+        return None, False
+
+    if strategy == CountStrategy.CACHED and cache_key:
+        cached_total = count_cache.get(cache_key)
+        if cached_total is not None:
+            # Up to one TTL old
+            return cached_total, False
+
+        total = await count_exact(db, query)
+        count_cache.set(cache_key, total)
+        return total, True
+
+    if strategy == CountStrategy.ESTIMATED:
+        estimate = await count_estimate(db, query)
+        if estimate is not None and estimate >= estimate_threshold:
+            return estimate, False
+
+    return await count_exact(db, query), True
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    page: int,
+    page_size: int,
+    strategy: CountStrategy = CountStrategy.EXACT,
+    cache_key: Optional[str] = None,
+    order_by: Sequence[Any] = (),
+    options: Sequence[Any] = (),
+    unique: bool = False,
+    offset: Optional[int] = None
+) -> Tuple[List[Any], PageInfo]:
+    """
+    Fetch one page of a filtered query with the requested count strategy.
+
+    The page is fetched with one extra row so ``has_more`` is always
+    accurate, even when the total is estimated or skipped entirely.
+
+    Args:
+        db: Database session
+        query: Filtered query without ordering, paging or loader options
+        page: Page number (1-based)
+        page_size: Items per page
+        strategy: Count strategy
+        cache_key: Normalized filter key, required for CACHED
+        order_by: Ordering clauses for the page query
+        options: Loader options for the page query
+        unique: Deduplicate rows (needed with joined eager loads)
+        offset: Rows to skip instead of whole pages (for windows that do
+            not start on a page boundary; ``page`` is only reported)
+
+    Returns:
+        Tuple of (items, page info)
+    """
+    total, total_is_exact = await resolve_total(db, query, strategy, cache_key)
+
+    page_query = query
+    if order_by:
+        page_query = page_query.order_by(*order_by)
+    if options:
+        page_query = page_query.options(*options)
+    if offset is None:
+        offset = (page - 1) * page_size
+    page_query = page_query.offset(offset).limit(page_size + 1)
+
+    result = await db.execute(page_query)
+    scalars = result.scalars()
+    items = list(scalars.unique().all() if unique else scalars.all())
+
+    has_more = len(items) > page_size
+    items = items[:page_size]
+
+    # On the last page the true total is known for free
+    if not has_more and (items or offset == 0) and not total_is_exact:
+        total = offset + len(items)
+        total_is_exact = True
+
+    return items, PageInfo(
+        page=page,
+        page_size=page_size,
+        has_more=has_more,
+        total=total,
+        total_is_exact=total_is_exact
+    )
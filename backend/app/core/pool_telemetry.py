@@ -0,0 +1,414 @@
+"""
+CelebraTech Event Management System - Connection Pool Telemetry
+Performance & Optimization
+
+Instrumentation for the SQLAlchemy connection pool:
+
+- Checkout wait time (histogram), timeouts and overflow usage, measured by
+  InstrumentedAsyncQueuePool
+- Connection hold time per route, and query timings, from pool and engine
+  events
+- Connection age of pooled connections
+
+Hold time is attributed to the route template of the current request, or
+to an explicit source label for sessions opened outside ``get_db`` (e.g.
+middleware logging through ``background_session``).
+
+AdaptiveOverflowController optionally raises or lowers ``max_overflow``
+within configured bounds based on observed saturation.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from greenlet import getcurrent
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import bisect
+import time
+
+
+# Upper bounds (ms) of the wait-time and hold-time histogram buckets
+LATENCY_BUCKETS_MS: Tuple[float, ...] = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Checkouts that wait longer than this count as saturated
+SATURATION_WAIT_MS = 10.0
+
+# Queries slower than this count as slow
+SLOW_QUERY_MS = 100.0
+
+# Request scope of the current request, set by the app middleware
+current_request_scope: ContextVar[Optional[Dict[str, Any]]] = ContextVar(
+    "current_request_scope", default=None
+)
+
+# Explicit label for connections used outside a routed request
+current_connection_source: ContextVar[Optional[str]] = ContextVar(
+    "current_connection_source", default=None
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, value_ms: float):
+        """Record one observation"""
+        self.counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize with cumulative bucket counts"""
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            cumulative += count
+            buckets[f"le_{bound}"] = cumulative
+
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "max_ms": round(self.max_ms, 3),
+            "buckets": buckets
+        }
+
+
+class PoolWindow:
+    """Counters since the last adaptive-controller evaluation"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.saturated = 0
+        self.timeouts = 0
+        self.peak_overflow = 0
+
+
+class PoolTelemetry:
+    """Collects pool and query statistics for one engine"""
+
+    def __init__(self):
+        self.pool: Optional[Pool] = None
+
+        self.wait_histogram = LatencyHistogram()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.window = PoolWindow()
+
+        self.hold_by_source: Dict[str, LatencyHistogram] = {}
+        self._connected_at: Dict[int, float] = {}
+
+        self.queries = 0
+        self.query_total_ms = 0.0
+        self.slow_queries = 0
+
+    def attach(self, sync_engine: Any):
+        """Register pool and engine event listeners"""
+        self.pool = sync_engine.pool
+        event.listen(sync_engine, "connect", self._on_connect)
+        event.listen(sync_engine, "close", self._on_close)
+        event.listen(sync_engine, "invalidate", self._on_invalidate)
+        event.listen(sync_engine, "checkout", self._on_checkout)
+        event.listen(sync_engine, "checkin", self._on_checkin)
+        event.listen(sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_execute)
+
+    # ========================================================================
+    # Recording
+    # ========================================================================
+
+    def record_wait(self, wait_ms: float):
+        """Record how long a checkout waited for a connection"""
+        self.wait_histogram.observe(wait_ms)
+        self.window.checkouts += 1
+        if wait_ms >= SATURATION_WAIT_MS:
+            self.window.saturated += 1
+
+    def record_timeout(self):
+        """Record a checkout that gave up waiting"""
+        self.timeouts += 1
+        self.window.timeouts += 1
+
+    def _on_connect(self, dbapi_connection, connection_record):
+        self._connected_at[id(connection_record)] = time.monotonic()
+
+    def _on_close(self, dbapi_connection, connection_record):
+        self._connected_at.pop(id(connection_record), None)
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception):
+        self._connected_at.pop(id(connection_record), None)
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy):
+        self.checkouts += 1
+        connection_record.info["checked_out_at"] = time.perf_counter()
+        connection_record.info["checkout_source"] = _current_source()
+
+        if self.pool is not None:
+            checked_out = _pool_value(self.pool, "checkedout")
+            overflow = max(_pool_value(self.pool, "overflow"), 0)
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+            self.window.peak_overflow = max(self.window.peak_overflow, overflow)
+
+    def _on_checkin(self, dbapi_connection, connection_record):
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        source = connection_record.info.pop("checkout_source", None) or "unattributed"
+        if checked_out_at is None:
+            return
+
+        histogram = self.hold_by_source.get(source)
+        if histogram is None:
+            histogram = self.hold_by_source[source] = LatencyHistogram()
+        histogram.observe((time.perf_counter() - checked_out_at) * 1000)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.get("query_started_at")
+        if not started:
+            return
+
+        elapsed_ms = (time.perf_counter() - started.pop()) * 1000
+        self.queries += 1
+        self.query_total_ms += elapsed_ms
+        if elapsed_ms >= SLOW_QUERY_MS:
+            self.slow_queries += 1
+
+    # ========================================================================
+    # Reporting
+    # ========================================================================
+
+    def take_window(self) -> PoolWindow:
+        """Return the current evaluation window and start a new one"""
+        window, self.window = self.window, PoolWindow()
+        return window
+
+    def connection_ages(self) -> Dict[str, float]:
+        """Age statistics of open pooled connections (seconds)"""
+        now = time.monotonic()
+        ages = [now - connected_at for connected_at in self._connected_at.values()]
+        return {
+            "open": len(ages),
+            "avg_age_seconds": round(sum(ages) / len(ages), 1) if ages else 0.0,
+            "max_age_seconds": round(max(ages), 1) if ages else 0.0
+        }
+
+    def snapshot(self, top_sources: int = 20) -> Dict[str, Any]:
+        """Get pool statistics"""
+        pool = self.pool
+        busiest = sorted(
+            self.hold_by_source.items(),
+            key=lambda item: item[1].total_ms,
+            reverse=True
+        )[:top_sources]
+
+        return {
+            "pool_class": type(pool).__name__ if pool is not None else None,
+            "pool_size": _pool_value(pool, "size"),
+            "max_overflow": getattr(pool, "_max_overflow", 0),
+            "checked_out": _pool_value(pool, "checkedout"),
+            "checked_in": _pool_value(pool, "checkedin"),
+            "overflow_in_use": max(_pool_value(pool, "overflow"), 0),
+            "peak_checked_out": self.peak_checked_out,
+            "peak_overflow": self.peak_overflow,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_ms": self.wait_histogram.to_dict(),
+            "connections": self.connection_ages(),
+            "hold_ms_by_route": {source: hist.to_dict() for source, hist in busiest},
+            "queries": {
+                "count": self.queries,
+                "avg_ms": round(self.query_total_ms / self.queries, 3) if self.queries else 0.0,
+                "slow": self.slow_queries,
+                "slow_threshold_ms": SLOW_QUERY_MS
+            }
+        }
+
+
+def _pool_value(pool: Optional[Pool], name: str) -> int:
+    """Read a QueuePool gauge, 0 for pools that do not provide it"""
+    getter = getattr(pool, name, None)
+    if getter is None:
+        return 0
+    try:
+        return int(getter())
+    except (TypeError, NotImplementedError):
+        return 0
+
+
+def _current_source() -> str:
+    """Label for the connection being checked out"""
+    source = current_connection_source.get()
+    if source:
+        return source
+
+    scope = current_request_scope.get()
+    if scope is None:
+        return "unattributed"
+
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}".strip()
+
+
+@contextmanager
+def connection_source(name: str) -> Iterator[None]:
+    """Attribute connections checked out in this block to a named source"""
+    token = current_connection_source.set(name)
+    try:
+        yield
+    finally:
+        current_connection_source.reset(token)
+
+
+# Global telemetry for the application engine
+pool_telemetry = PoolTelemetry()
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that reports checkout wait time and timeouts"""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # _do_get() may recurse; only the outermost call per greenlet is timed
+        self._timed_getters: set = set()
+
+    def _do_get(self):
+        current = getcurrent()
+        if current in self._timed_getters:
+            return super()._do_get()
+
+        self._timed_getters.add(current)
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            pool_telemetry.record_timeout()
+            raise
+        finally:
+            self._timed_getters.discard(current)
+
+        pool_telemetry.record_wait((time.perf_counter() - started) * 1000)
+        return record
+
+
+class AdaptiveOverflowController:
+    """
+    Adjusts the pool's ``max_overflow`` within bounds.
+
+    Every interval the controller looks at the checkouts since the last
+    evaluation:
+
+    - Timeouts, or a share of slow checkouts while overflow is fully used,
+      raise the limit by ``step``
+    - Overflow staying below half the limit for ``cooldown_windows``
+      consecutive intervals lowers it by one
+    """
+
+    def __init__(
+        self,
+        pool: Pool,
+        telemetry: PoolTelemetry,
+        min_overflow: int,
+        max_overflow: int,
+        interval_seconds: float = 30.0,
+        saturation_ratio: float = 0.05,
+        step: int = 2,
+        cooldown_windows: int = 10
+    ):
+        if min_overflow > max_overflow:
+            raise ValueError("min_overflow must not exceed max_overflow")
+
+        self.pool = pool
+        self.telemetry = telemetry
+        self.min_overflow = min_overflow
+        self.max_overflow = max_overflow
+        self.interval_seconds = interval_seconds
+        self.saturation_ratio = saturation_ratio
+        self.step = step
+        self.cooldown_windows = cooldown_windows
+
+        self._idle_windows = 0
+        self._task: Optional[asyncio.Task] = None
+        self.adjustments: List[Dict[str, Any]] = []
+
+    @property
+    def current_overflow(self) -> int:
+        return self.pool._max_overflow
+
+    def evaluate(self, window: PoolWindow) -> int:
+        """Apply one control step and return the new overflow limit"""
+        current = self.current_overflow
+        saturated = window.checkouts and (
+            window.saturated / window.checkouts >= self.saturation_ratio
+        )
+
+        target = current
+        if window.timeouts or (saturated and window.peak_overflow >= current):
+            target = min(current + self.step, self.max_overflow)
+            self._idle_windows = 0
+        elif window.peak_overflow * 2 < current:
+            self._idle_windows += 1
+            if self._idle_windows >= self.cooldown_windows:
+                target = max(current - 1, self.min_overflow)
+                self._idle_windows = 0
+        else:
+            self._idle_windows = 0
+
+        if target != current:
+            self.pool._max_overflow = target
+            self.adjustments.append({
+                "at": time.time(),
+                "from": current,
+                "to": target,
+                "timeouts": window.timeouts,
+                "saturated": window.saturated,
+                "checkouts": window.checkouts
+            })
+            self.adjustments = self.adjustments[-50:]
+            print(f"🔧 Pool max_overflow {current} -> {target}")
+
+        return target
+
+    def start(self):
+        """Start the background control loop"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the background control loop"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                self.evaluate(self.telemetry.take_window())
+            except Exception as e:
+                print(f"Adaptive pool controller error: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get controller state"""
+        return {
+            "enabled": self._task is not None and not self._task.done(),
+            "max_overflow": self.current_overflow,
+            "bounds": [self.min_overflow, self.max_overflow],
+            "recent_adjustments": self.adjustments[-10:]
+        }
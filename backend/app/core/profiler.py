@@ -0,0 +1,431 @@
+"""
+CelebraTech Event Management System - Request Profiler
+Performance & Optimization
+
+Opt-in wall-clock profiler for single requests.
+
+A request is profiled when it carries a valid ``X-Profile-Token`` header
+(signed for an admin by ``POST /performance/profiles/token``) or when it is
+picked by ``PROFILER_SAMPLE_RATE``. Requests that are not picked pay one
+header lookup; the sampler thread, the task factory and the query hooks are
+only active while at least one profile is running.
+
+While a profile runs, a sampler thread looks at the event loop every
+``PROFILER_INTERVAL_MS`` and classifies the request's state:
+
+- on CPU: one of the request's tasks is running; the sample is the stack of
+  the loop thread
+- awaiting database / awaiting I/O: the request's newest task is suspended;
+  the sample is its await chain (coroutine frames)
+- waiting for event loop: the request's task is ready but another task holds
+  the loop
+
+Profiles are written in collapsed-stack format (one ``frame;frame;... weight``
+line per stack, readable by flamegraph.pl and speedscope) with a JSON
+summary next to them. Exact query time per request comes from engine events.
+"""
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+
+PROFILE_HEADER = "X-Profile-Token"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+# Frames from these packages mean the request is waiting on the database
+DATABASE_MODULES = ("/sqlalchemy/", "/asyncpg/", "/aiosqlite/", "/psycopg")
+
+# Loop machinery below the task being run; stacks are cut here
+LOOP_FRAMES = ("asyncio/events.py", "asyncio/base_events.py")
+
+STATE_CPU = "cpu"
+STATE_DATABASE = "awaiting_database"
+STATE_IO = "awaiting_io"
+STATE_LOOP = "waiting_for_loop"
+
+STATE_LABELS = {
+    STATE_DATABASE: "[awaiting database]",
+    STATE_IO: "[awaiting I/O]",
+    STATE_LOOP: "[waiting for event loop]",
+}
+
+# Profile of the current request (inherited by the tasks it creates)
+current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+
+# ============================================================================
+# Profile
+# ============================================================================
+
+class RequestProfile:
+    """Samples and timings of one profiled request"""
+
+    def __init__(self, method: str, path: str, trigger: str, requested_by: Optional[str] = None):
+        self.id = uuid.uuid4().hex
+        self.method = method
+        self.path = path
+        self.route: Optional[str] = None
+        self.status_code: Optional[int] = None
+        self.trigger = trigger
+        self.requested_by = requested_by
+        self.started_at = datetime.utcnow()
+        self.wall_ms = 0.0
+
+        # Sample weights are the microseconds since the previous sample: the
+        # sampler thread only gets the GIL every switch interval while the
+        # loop is busy, so CPU-bound stretches yield fewer, longer samples
+        self.stacks: Dict[Tuple[str, ...], int] = {}
+        self.state_us: Dict[str, int] = {}
+        self.samples = 0
+        self.db_queries = 0
+        self.db_query_ms = 0.0
+
+        # Tasks created while the profile is current, oldest first
+        self.tasks: List[asyncio.Task] = []
+        self._task_ids: Set[int] = set()
+        self._started = self.last_sampled = time.perf_counter()
+        self.context_token = None
+
+    def add_task(self, task: asyncio.Task):
+        if id(task) not in self._task_ids:
+            self._task_ids.add(id(task))
+            self.tasks.append(task)
+
+    def owns(self, task: Optional[asyncio.Task]) -> bool:
+        return task is not None and id(task) in self._task_ids
+
+    def add_sample(self, state: str, stack: Tuple[str, ...], weight_us: int):
+        self.samples += 1
+        self.state_us[state] = self.state_us.get(state, 0) + weight_us
+        self.stacks[stack] = self.stacks.get(stack, 0) + weight_us
+
+    def finish(self, status_code: int, route: Optional[str]):
+        self.wall_ms = (time.perf_counter() - self._started) * 1000
+        self.status_code = status_code
+        self.route = route
+        self.tasks = []
+
+    def collapsed(self) -> str:
+        """Stacks in collapsed (folded) format weighted in microseconds, root frame first"""
+        root = f"{self.method} {self.route or self.path}"
+        lines = [
+            ";".join((root,) + stack) + f" {count}"
+            for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1])
+        ]
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> Dict[str, Any]:
+        """Timing breakdown; sampled states are scaled to the wall time"""
+        sampled_us = sum(self.state_us.values())
+        breakdown = {
+            f"{state}_ms": round(self.wall_ms * self.state_us.get(state, 0) / sampled_us, 3) if sampled_us else 0.0
+            for state in (STATE_CPU, STATE_DATABASE, STATE_IO, STATE_LOOP)
+        }
+
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status_code": self.status_code,
+            "trigger": self.trigger,
+            "requested_by": self.requested_by,
+            "started_at": self.started_at.isoformat(),
+            "wall_ms": round(self.wall_ms, 3),
+            "samples": self.samples,
+            "breakdown": breakdown,
+            "db_queries": self.db_queries,
+            "db_query_ms": round(self.db_query_ms, 3),
+        }
+
+
+def frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if "site-packages/" in filename:
+        filename = filename.rsplit("site-packages/", 1)[1]
+    elif "/app/" in filename:
+        filename = "app/" + filename.rsplit("/app/", 1)[1]
+    elif "/lib/python" in filename:
+        # Standard library: drop the interpreter prefix (".../lib/python3.11/")
+        filename = filename.rsplit("/lib/python", 1)[1].split("/", 1)[-1]
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+
+
+def thread_stack(frame) -> Tuple[str, ...]:
+    """Stack of a running frame down to the loop machinery, root first"""
+    labels = []
+    while frame is not None:
+        if frame.f_code.co_filename.endswith(LOOP_FRAMES):
+            break
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return tuple(labels)
+
+
+def _await_stack(task: asyncio.Task) -> Tuple[str, Tuple[str, ...]]:
+    """State and await chain of a suspended task, root first"""
+    labels = []
+    waits_on_database = False
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+        if frame is None:
+            break
+        labels.append(frame_label(frame))
+        if any(module in frame.f_code.co_filename for module in DATABASE_MODULES):
+            waits_on_database = True
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+
+    if getattr(task, "_fut_waiter", None) is None:
+        state = STATE_LOOP
+    else:
+        state = STATE_DATABASE if waits_on_database else STATE_IO
+    return state, tuple(labels) + (STATE_LABELS[state],)
+
+
+# ============================================================================
+# Profiler
+# ============================================================================
+
+class RequestProfiler:
+    """Starts, samples and stores request profiles"""
+
+    def __init__(
+        self,
+        sample_rate: float = 0.0,
+        interval_ms: float = 1.0,
+        output_dir: Optional[str] = None,
+        max_profiles: int = 200
+    ):
+        self.sample_rate = sample_rate
+        self.interval_seconds = interval_ms / 1000
+        self.output_dir = Path(output_dir or Path(tempfile.gettempdir()) / "celebratech-profiles")
+        self.max_profiles = max_profiles
+
+        self._active: Dict[str, RequestProfile] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._previous_factory = None
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampling = threading.Event()
+
+    # ========================================================================
+    # Triggering
+    # ========================================================================
+
+    def sign(self, user_id: str, ttl_seconds: int) -> Tuple[str, datetime]:
+        """Create a profile token for an admin user"""
+        expires = int(time.time()) + ttl_seconds
+        payload = f"{user_id}.{expires}"
+        return f"{payload}.{self._signature(payload)}", datetime.utcfromtimestamp(expires)
+
+    def verify(self, token: str) -> Optional[str]:
+        """User ID of a valid, unexpired profile token"""
+        try:
+            user_id, expires, signature = token.rsplit(".", 2)
+            expired = int(expires) < time.time()
+        except ValueError:
+            return None
+        if expired or not hmac.compare_digest(signature, self._signature(f"{user_id}.{expires}")):
+            return None
+        return user_id
+
+    @staticmethod
+    def _signature(payload: str) -> str:
+        return hmac.new(
+            settings.SECRET_KEY.encode(), f"request-profile:{payload}".encode(), hashlib.sha256
+        ).hexdigest()
+
+    def select(self, headers) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Decide whether to profile a request.
+
+        Returns:
+            (trigger, requested_by), or None when the request is not profiled
+        """
+        token = headers.get(PROFILE_HEADER)
+        if token is not None:
+            user_id = self.verify(token)
+            if user_id is not None:
+                return "token", user_id
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled", None
+        return None
+
+    # ========================================================================
+    # Lifecycle
+    # ========================================================================
+
+    def start(self, method: str, path: str, trigger: str, requested_by: Optional[str] = None) -> RequestProfile:
+        """Start profiling the current task (call from the event loop)"""
+        profile = RequestProfile(method, path, trigger, requested_by)
+        profile.add_task(asyncio.current_task())
+        profile.context_token = current_profile.set(profile)
+
+        if not self._active:
+            self._activate()
+        self._active[profile.id] = profile
+        return profile
+
+    def finish(self, profile: RequestProfile, status_code: int, route: Optional[str] = None):
+        """Stop profiling a request"""
+        self._active.pop(profile.id, None)
+        profile.finish(status_code, route)
+        current_profile.reset(profile.context_token)
+        if not self._active:
+            self._deactivate()
+
+    def _activate(self):
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+
+        # Tasks created in a profiled context join that profile
+        previous = self._previous_factory = loop.get_task_factory()
+
+        def task_factory(loop, coro, **kwargs):
+            if previous is not None:
+                task = previous(loop, coro, **kwargs)
+            else:
+                task = asyncio.Task(coro, loop=loop, **kwargs)
+            profile = kwargs["context"].get(current_profile) if kwargs.get("context") else current_profile.get()
+            if profile is not None:
+                profile.add_task(task)
+            return task
+
+        loop.set_task_factory(task_factory)
+
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name="request-profiler", daemon=True)
+        self._sampler.start()
+
+    def _deactivate(self):
+        if self._loop is not None:
+            self._loop.set_task_factory(self._previous_factory)
+        self._previous_factory = None
+        self._stop_sampling.set()
+        self._sampler = None
+
+    def _sample_loop(self):
+        while not self._stop_sampling.wait(self.interval_seconds):
+            try:
+                self.sample()
+            except RuntimeError:
+                # Task list changed while it was read; skip this tick
+                continue
+
+    def sample(self):
+        """Take one sample of every active profile"""
+        profiles = list(self._active.values())
+        if not profiles or self._loop is None:
+            return
+
+        now = time.perf_counter()
+        running = asyncio.current_task(self._loop)
+        frame = sys._current_frames().get(self._loop_thread)
+
+        for profile in profiles:
+            weight_us = int((now - profile.last_sampled) * 1_000_000)
+            profile.last_sampled = now
+
+            if profile.owns(running) and frame is not None:
+                profile.add_sample(STATE_CPU, thread_stack(frame), weight_us)
+                continue
+
+            pending = [task for task in list(profile.tasks) if not task.done()]
+            if pending:
+                state, stack = _await_stack(pending[-1])
+                profile.add_sample(state, stack, weight_us)
+
+    # ========================================================================
+    # Engine hooks
+    # ========================================================================
+
+    def attach(self, sync_engine: Any):
+        """Count query time of profiled requests"""
+        event.listen(sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_execute)
+
+    @staticmethod
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        if current_profile.get() is not None:
+            conn.info.setdefault("profile_query_started_at", []).append(time.perf_counter())
+
+    @staticmethod
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = current_profile.get()
+        started = conn.info.get("profile_query_started_at")
+        if profile is None or not started:
+            return
+        profile.db_queries += 1
+        profile.db_query_ms += (time.perf_counter() - started.pop()) * 1000
+
+    # ========================================================================
+    # Storage
+    # ========================================================================
+
+    def save(self, profile: RequestProfile) -> Path:
+        """Write the collapsed stacks and summary, keeping the newest profiles"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stacks_path = self.output_dir / f"{profile.id}.folded"
+        stacks_path.write_text(profile.collapsed())
+        (self.output_dir / f"{profile.id}.json").write_text(json.dumps(profile.summary()))
+
+        summaries = sorted(self.output_dir.glob("*.json"), key=lambda path: path.stat().st_mtime)
+        for stale in summaries[:max(len(summaries) - self.max_profiles, 0)]:
+            stale.unlink(missing_ok=True)
+            stale.with_suffix(".folded").unlink(missing_ok=True)
+        return stacks_path
+
+    def list_profiles(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Summaries of stored profiles, newest first"""
+        if not self.output_dir.exists():
+            return []
+        paths = sorted(self.output_dir.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True)
+        summaries = []
+        for path in paths[:limit]:
+            try:
+                summaries.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue
+        return summaries
+
+    def get_summary(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        path = self._path(profile_id, ".json")
+        return json.loads(path.read_text()) if path is not None else None
+
+    def get_collapsed(self, profile_id: str) -> Optional[str]:
+        path = self._path(profile_id, ".folded")
+        return path.read_text() if path is not None else None
+
+    def _path(self, profile_id: str, suffix: str) -> Optional[Path]:
+        # Profile IDs are hex UUIDs; anything else never names a file
+        if len(profile_id) != 32 or any(c not in "0123456789abcdef" for c in profile_id):
+            return None
+        path = self.output_dir / f"{profile_id}{suffix}"
+        return path if path.exists() else None
+
+
+request_profiler = RequestProfiler(
+    sample_rate=settings.PROFILER_SAMPLE_RATE,
+    interval_ms=settings.PROFILER_INTERVAL_MS,
+    output_dir=settings.PROFILER_OUTPUT_DIR,
+    max_profiles=settings.PROFILER_MAX_PROFILES
+)
@@ -0,0 +1,91 @@
+"""
+CelebraTech Event Management System - Schema Fingerprint
+Performance & Optimization
+
+Lets start-up skip ``Base.metadata.create_all`` when the database is known
+to match the models. ``create_all`` reflects every table on every boot,
+which dominates worker cold start on a large schema.
+
+The fingerprint is a hash of the declared tables, columns, indexes and
+constraints. After a successful ``create_all`` it is stored together with
+the current Alembic revision in a one-row ``schema_state`` table; the next
+boot only reads that row and compares.
+"""
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, delete, inspect, insert, select, text
+from sqlalchemy.engine import Connection
+from typing import Optional, Tuple
+from datetime import datetime
+import hashlib
+
+
+# Kept out of Base.metadata so it never affects the fingerprint itself
+schema_state_metadata = MetaData()
+
+schema_state = Table(
+    "schema_state",
+    schema_state_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("alembic_revision", String(64), nullable=True),
+    Column("fingerprint", String(64), nullable=False),
+    Column("updated_at", DateTime, nullable=False),
+)
+
+
+def compute_schema_fingerprint(metadata: MetaData) -> str:
+    """Hash the declared schema of every table in the metadata"""
+    parts = []
+    for table in metadata.sorted_tables:
+        parts.append(f"table:{table.name}")
+        for column in table.columns:
+            parts.append(
+                f"col:{column.name}:{column.type!r}:{column.nullable}:{column.primary_key}"
+            )
+            for fk in sorted(column.foreign_keys, key=lambda f: f.target_fullname):
+                parts.append(f"fk:{column.name}->{fk.target_fullname}:{fk.ondelete}")
+        for index in sorted(table.indexes, key=lambda i: i.name or ""):
+            columns = ",".join(c.name for c in index.columns)
+            parts.append(f"index:{index.name}:{columns}:{index.unique}")
+        for constraint in sorted(table.constraints, key=lambda c: str(c.name)):
+            columns = ",".join(getattr(constraint, "columns", {}).keys())
+            parts.append(f"constraint:{type(constraint).__name__}:{constraint.name}:{columns}")
+
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def read_schema_state(conn: Connection) -> Tuple[Optional[str], Optional[Tuple[Optional[str], str]]]:
+    """
+    Read the live Alembic revision and the stored schema state.
+
+    Run through ``AsyncConnection.run_sync``.
+
+    Returns:
+        Tuple of (Alembic revision or None, (stored revision, stored fingerprint) or None)
+    """
+    inspector = inspect(conn)
+
+    revision = None
+    if inspector.has_table("alembic_version"):
+        revision = conn.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+    stored = None
+    if inspector.has_table(schema_state.name):
+        row = conn.execute(
+            select(schema_state.c.alembic_revision, schema_state.c.fingerprint)
+            .where(schema_state.c.id == 1)
+        ).first()
+        if row is not None:
+            stored = (row.alembic_revision, row.fingerprint)
+
+    return revision, stored
+
+
+def write_schema_state(conn: Connection, revision: Optional[str], fingerprint: str):
+    """Store the revision and fingerprint the schema was created for"""
+    schema_state_metadata.create_all(conn)
+    conn.execute(delete(schema_state))
+    conn.execute(insert(schema_state).values(
+        id=1,
+        alembic_revision=revision,
+        fingerprint=fingerprint,
+        updated_at=datetime.utcnow()
+    ))
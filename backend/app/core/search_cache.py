@@ -0,0 +1,261 @@
+"""
+CelebraTech Event Management System - Search Result Cache
+Performance & Optimization
+
+Per-worker cache of Elasticsearch search results, in two parts:
+
+- ID windows: for a canonical search (see ``search_cache_key``), the hits of
+  one aligned window of ``window_size`` results (index, id, version, score,
+  highlights) plus the total and facets. Pages inside a window are served
+  from it; pagination is not part of the key. Windows expire after a short
+  TTL and are dropped when the indexer writes to one of their indices
+- Documents: hit sources keyed by concrete index, id and version. A changed
+  document has a new version and a rebuilt index a new name, so entries
+  never go stale and are only evicted by size (LRU)
+
+After an invalidation, windows stored during the next ``refresh_seconds``
+are not served either: Elasticsearch only shows written documents after
+its next refresh.
+
+Other workers see writes once their windows expire (``ttl_seconds``).
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import time
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.pagination import normalize_filters
+
+
+# Request fields that select a page, not a result set
+PAGINATION_FIELDS = {"skip", "limit"}
+
+# Coordinates are rounded to about 10 m so nearby origins share windows
+COORDINATE_DIGITS = 4
+
+DocumentKey = Tuple[str, str, Optional[int]]
+
+
+def search_cache_key(search_request: BaseModel, facets: bool = True) -> str:
+    """
+    Canonical key of a search request.
+
+    The query is case-folded with whitespace collapsed (the analyzers
+    lowercase it anyway), tags are sorted and de-duplicated, coordinates
+    rounded, and pagination left out. Unset values are dropped and keys
+    sorted by ``normalize_filters``. Windows searched without
+    aggregations (``facets=False``) are kept apart.
+    """
+    values = search_request.model_dump(mode="json", exclude=PAGINATION_FIELDS)
+    if not facets:
+        values["without_facets"] = True
+    if values.get("query"):
+        values["query"] = " ".join(values["query"].casefold().split())
+    if values.get("tags"):
+        values["tags"] = sorted(set(values["tags"]))
+    for field in ("latitude", "longitude"):
+        if values.get(field) is not None:
+            values[field] = round(values[field], COORDINATE_DIGITS)
+    return normalize_filters(f"search.{values.get('search_type')}", values)
+
+
+class SearchWindow:
+    """Hits of one window of a search, without their documents"""
+
+    __slots__ = ("indices", "total", "facets", "hits", "stored_at", "expires_at")
+
+    def __init__(self, index: str, es_response: Dict[str, Any], ttl_seconds: float):
+        self.indices = tuple(index.split(","))
+        self.total = es_response.get("hits", {}).get("total", {}).get("value", 0)
+        self.facets = es_response.get("aggregations", {})
+        self.hits = [
+            {key: value for key, value in hit.items() if key != "_source"}
+            for hit in es_response.get("hits", {}).get("hits", [])
+        ]
+        self.stored_at = time.monotonic()
+        self.expires_at = self.stored_at + ttl_seconds
+
+
+def document_key(hit: Dict[str, Any]) -> DocumentKey:
+    return hit["_index"], hit["_id"], hit.get("_version")
+
+
+class SearchResultCache:
+    """ID windows and versioned documents of recent searches"""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        window_size: int = 100,
+        max_windows: int = 2000,
+        max_documents: int = 20000,
+        refresh_seconds: float = 1.0
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.window_size = window_size
+        self.max_windows = max_windows
+        self.max_documents = max_documents
+        self.refresh_seconds = refresh_seconds
+
+        self._windows: Dict[Tuple[str, int], SearchWindow] = {}
+        self._documents: "OrderedDict[DocumentKey, Dict[str, Any]]" = OrderedDict()
+        # Index -> windows stored before this time are stale
+        self._invalidated: Dict[str, float] = {}
+        # Search type -> hit/miss counters
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    # ========================================================================
+    # Windows
+    # ========================================================================
+
+    def windows_for(self, skip: int, limit: int) -> range:
+        """Window numbers covering a page"""
+        return range(skip // self.window_size, (skip + limit - 1) // self.window_size + 1)
+
+    def get_window(self, search_type: str, key: str, number: int) -> Optional[SearchWindow]:
+        """Get a window if it has not expired or been invalidated"""
+        window = self._windows.get((key, number))
+        if window is not None and (
+            window.expires_at < time.monotonic()
+            or any(window.stored_at < self._invalidated.get(index, 0.0) for index in window.indices)
+        ):
+            del self._windows[(key, number)]
+            window = None
+
+        self._count(search_type, "window_hits" if window is not None else "window_misses")
+        return window
+
+    def put_window(
+        self,
+        key: str,
+        number: int,
+        index: str,
+        es_response: Dict[str, Any]
+    ) -> SearchWindow:
+        """Cache a window fetched from Elasticsearch, and the documents of its hits"""
+        if len(self._windows) >= self.max_windows:
+            self._evict()
+
+        window = SearchWindow(index, es_response, self.ttl_seconds)
+        self._windows[(key, number)] = window
+        self.put_documents(es_response.get("hits", {}).get("hits", []))
+        return window
+
+    def invalidate(self, indices: Iterable[str]) -> int:
+        """Drop the windows of indices that were written to"""
+        stale_until = time.monotonic() + self.refresh_seconds
+        indices = set(indices)
+        for index in indices:
+            self._invalidated[index] = stale_until
+
+        keys = [key for key, window in self._windows.items() if indices.intersection(window.indices)]
+        for key in keys:
+            del self._windows[key]
+        return len(keys)
+
+    def clear(self):
+        self._windows.clear()
+        self._documents.clear()
+
+    def _evict(self):
+        """Remove expired windows, then the oldest ones if still full"""
+        now = time.monotonic()
+        for key in [k for k, window in self._windows.items() if window.expires_at < now]:
+            del self._windows[key]
+
+        overflow = len(self._windows) - self.max_windows + 1
+        if overflow > 0:
+            for key in sorted(self._windows, key=lambda k: self._windows[k].expires_at)[:overflow]:
+                del self._windows[key]
+
+    # ========================================================================
+    # Documents
+    # ========================================================================
+
+    def get_documents(
+        self,
+        search_type: str,
+        hits: List[Dict[str, Any]]
+    ) -> Tuple[Dict[DocumentKey, Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Documents of hits from the cache.
+
+        Returns:
+            Tuple of (documents by key, hits whose document is not cached)
+        """
+        documents, missing = {}, []
+        for hit in hits:
+            key = document_key(hit)
+            source = self._documents.get(key)
+            if source is None:
+                missing.append(hit)
+                self._count(search_type, "document_misses")
+                continue
+            self._documents.move_to_end(key)
+            documents[key] = source
+            self._count(search_type, "document_hits")
+        return documents, missing
+
+    def put_documents(self, hits: List[Dict[str, Any]]):
+        """Cache hit sources (hits without a source are skipped)"""
+        for hit in hits:
+            if "_source" not in hit:
+                continue
+            self._documents[document_key(hit)] = hit["_source"]
+            self._documents.move_to_end(document_key(hit))
+        while len(self._documents) > self.max_documents:
+            self._documents.popitem(last=False)
+
+    # ========================================================================
+    # Statistics
+    # ========================================================================
+
+    def _count(self, search_type: str, counter: str):
+        stats = self.stats.get(search_type)
+        if stats is None:
+            stats = self.stats[search_type] = {
+                "window_hits": 0, "window_misses": 0, "document_hits": 0, "document_misses": 0
+            }
+        stats[counter] += 1
+
+    def totals(self) -> Dict[str, int]:
+        """Counters summed over search types"""
+        totals = {"window_hits": 0, "window_misses": 0, "document_hits": 0, "document_misses": 0}
+        for stats in self.stats.values():
+            for counter, value in stats.items():
+                totals[counter] += value
+        return totals
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Sizes and hit rates per search type"""
+        def rate(hits: int, misses: int) -> float:
+            return round(hits / (hits + misses), 4) if hits + misses else 0.0
+
+        return {
+            "windows": len(self._windows),
+            "documents": len(self._documents),
+            "ttl_seconds": self.ttl_seconds,
+            "window_size": self.window_size,
+            "search_types": {
+                search_type: {
+                    **stats,
+                    "window_hit_rate": rate(stats["window_hits"], stats["window_misses"]),
+                    "document_hit_rate": rate(stats["document_hits"], stats["document_misses"])
+                }
+                for search_type, stats in self.stats.items()
+            }
+        }
+
+
+# Global per-worker search cache
+search_result_cache = SearchResultCache(
+    ttl_seconds=settings.SEARCH_CACHE_TTL_SECONDS,
+    window_size=settings.SEARCH_CACHE_WINDOW_SIZE,
+    max_windows=settings.SEARCH_CACHE_MAX_WINDOWS,
+    max_documents=settings.SEARCH_CACHE_MAX_DOCUMENTS
+)
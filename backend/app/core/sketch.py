@@ -0,0 +1,170 @@
+"""
+CelebraTech Event Management System - Mergeable Latency Sketch
+Performance & Optimization
+
+Log-bucketed quantile sketch (DDSketch-style) for latency distributions.
+
+- Every value is stored in a bucket whose bounds grow geometrically, so any
+  quantile is returned within ``relative_accuracy`` of the true value
+- Sketches with the same accuracy merge exactly by adding bucket counts, so
+  per-worker, per-minute sketches can be combined into any window
+- Sketches serialize to a compact binary form (a few hundred bytes for a
+  typical latency distribution)
+"""
+from typing import Dict, Iterable, Optional
+import math
+import struct
+
+
+# Values at or below this are counted in the zero bucket (ms)
+MIN_TRACKED_VALUE = 1e-3
+
+_HEADER = struct.Struct("<BdQdddQI")
+_BUCKET = struct.Struct("<iI")
+_FORMAT_VERSION = 1
+
+
+class LatencySketch:
+    """Mergeable quantile sketch with bounded relative error"""
+
+    __slots__ = ("relative_accuracy", "_gamma", "_log_gamma", "buckets",
+                 "zero_count", "count", "sum", "min", "max")
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float, weight: int = 1):
+        """Record a value"""
+        if value <= MIN_TRACKED_VALUE:
+            self.zero_count += weight
+        else:
+            index = math.ceil(math.log(value) / self._log_gamma)
+            self.buckets[index] = self.buckets.get(index, 0) + weight
+
+        self.count += weight
+        self.sum += value * weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencySketch") -> "LatencySketch":
+        """Add another sketch's counts into this one"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @classmethod
+    def merged(cls, sketches: Iterable["LatencySketch"], relative_accuracy: float = 0.01) -> "LatencySketch":
+        """Merge several sketches into a new one"""
+        result = cls(relative_accuracy)
+        for sketch in sketches:
+            result.merge(sketch)
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile (0 <= q <= 1)"""
+        if self.count == 0:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                value = 2 * self._gamma ** index / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+
+        return self.max
+
+    def count_above(self, threshold: float) -> int:
+        """Estimate how many recorded values exceed a threshold"""
+        if threshold <= MIN_TRACKED_VALUE:
+            return self.count - self.zero_count
+
+        threshold_index = math.ceil(math.log(threshold) / self._log_gamma)
+        return sum(count for index, count in self.buckets.items() if index > threshold_index)
+
+    def percentile(self, p: float) -> float:
+        """Estimate a percentile (0-100)"""
+        return self.quantile(p / 100)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    # ========================================================================
+    # Serialization
+    # ========================================================================
+
+    def to_bytes(self) -> bytes:
+        """Serialize to a compact binary form"""
+        parts = [_HEADER.pack(
+            _FORMAT_VERSION,
+            self.relative_accuracy,
+            self.count,
+            self.sum,
+            self.min if self.count else 0.0,
+            self.max if self.count else 0.0,
+            self.zero_count,
+            len(self.buckets)
+        )]
+        parts.extend(_BUCKET.pack(index, count) for index, count in sorted(self.buckets.items()))
+        return b"".join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "LatencySketch":
+        """Deserialize a sketch produced by ``to_bytes``"""
+        version, accuracy, count, total, minimum, maximum, zero_count, n_buckets = (
+            _HEADER.unpack_from(data, 0)
+        )
+        if version != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported sketch format version {version}")
+
+        sketch = cls(accuracy)
+        sketch.count = count
+        sketch.sum = total
+        sketch.zero_count = zero_count
+        if count:
+            sketch.min = minimum
+            sketch.max = maximum
+
+        offset = _HEADER.size
+        for _ in range(n_buckets):
+            index, bucket_count = _BUCKET.unpack_from(data, offset)
+            sketch.buckets[index] = bucket_count
+            offset += _BUCKET.size
+
+        return sketch
+
+    @classmethod
+    def from_optional_bytes(cls, data: Optional[bytes]) -> "LatencySketch":
+        """Deserialize, treating missing data as an empty sketch"""
+        return cls.from_bytes(data) if data else cls()
@@ -0,0 +1,219 @@
+"""
+CelebraTech Event Management System - Spelling Correction
+Performance & Optimization
+
+Symmetric-delete spelling index for "did you mean" corrections.
+
+- Every vocabulary word is stored under all strings obtained by deleting up
+  to ``max_distance`` characters from its first ``prefix_length`` characters
+- A lookup generates the same deletes of the misspelled word: candidates are
+  the words sharing a delete, verified with the optimal string alignment
+  (Damerau-Levenshtein) distance. No scan of the vocabulary, no generated
+  insertions, replacements or transpositions
+- Words are normalized keys (see ``app.core.autocomplete.normalize``) with a
+  frequency; the most recent surface form of each key (e.g. "düğün" for
+  "dugun") is kept, because the search analyzers do not fold accents
+- Words are counted per occurrence, so adding and removing the words of a
+  changed row keeps the index in sync without rebuilding it
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import re
+
+from app.core.autocomplete import normalize
+
+
+# (word, distance, frequency)
+Candidate = Tuple[str, int, int]
+
+# Shorter words are not corrected: too many words are one edit away
+MIN_WORD_LENGTH = 3
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Case-folded words of a text, without punctuation"""
+    # Case folding leaves a combining dot on the Turkish dotted I
+    return _WORD.findall(text.casefold().replace("i\u0307", "i"))
+
+
+def edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Optimal string alignment distance of two strings.
+
+    Returns:
+        The distance, or None when it is larger than ``max_distance``
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if a == b:
+        return 0
+
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            # Distances never decrease from one row to the next
+            return None
+        previous2, previous = previous, current
+
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+def word_distance(word: str, max_distance: int) -> int:
+    """Edits allowed for a word: one for short words"""
+    return min(max_distance, 1 if len(word) <= 5 else 2)
+
+
+class SymmetricDeleteIndex:
+    """Word frequencies indexed by their deletes"""
+
+    def __init__(self, max_distance: int = 2, prefix_length: int = 7):
+        if prefix_length <= max_distance:
+            raise ValueError("prefix_length must be larger than max_distance")
+
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        # Word -> occurrences
+        self.words: Dict[str, int] = {}
+        # Word -> surface form it was last added with
+        self.forms: Dict[str, str] = {}
+        # Delete -> words it was generated from
+        self._deletes: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    @property
+    def delete_count(self) -> int:
+        return len(self._deletes)
+
+    # ========================================================================
+    # Updates
+    # ========================================================================
+
+    def add(self, word: str, count: int = 1, form: Optional[str] = None):
+        """Count occurrences of a normalized word"""
+        if not word:
+            return
+        if word not in self.words:
+            self.words[word] = 0
+            for variant in self._variants(word[:self.prefix_length], self.max_distance):
+                self._deletes.setdefault(variant, set()).add(word)
+        self.words[word] += count
+        if form:
+            self.forms[word] = form
+
+    def remove(self, word: str, count: int = 1):
+        """Uncount occurrences; the word goes away with its last one"""
+        if word not in self.words:
+            return
+        self.words[word] -= count
+        if self.words[word] > 0:
+            return
+
+        del self.words[word]
+        self.forms.pop(word, None)
+        for variant in self._variants(word[:self.prefix_length], self.max_distance):
+            words = self._deletes.get(variant)
+            if words is not None:
+                words.discard(word)
+                if not words:
+                    del self._deletes[variant]
+
+    def update(self, added: Iterable[Tuple[str, str]], removed: Iterable[str]):
+        """Apply the (word, form) pairs of a new row version and the words of the old one"""
+        for word in removed:
+            self.remove(word)
+        for word, form in added:
+            self.add(word, form=form)
+
+    # ========================================================================
+    # Lookup
+    # ========================================================================
+
+    def lookup(self, word: str, max_distance: Optional[int] = None, limit: int = 1) -> List[Candidate]:
+        """
+        Closest known words of a normalized word.
+
+        Returns:
+            Up to ``limit`` (word, distance, frequency), closest first and
+            most frequent first at the same distance
+        """
+        if max_distance is None:
+            max_distance = self.max_distance
+        max_distance = min(max_distance, self.max_distance)
+
+        if word in self.words:
+            return [(word, 0, self.words[word])]
+
+        seen: Set[str] = set()
+        candidates: List[Candidate] = []
+        for variant in self._variants(word[:self.prefix_length], max_distance):
+            for candidate in self._deletes.get(variant, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = edit_distance(word, candidate, max_distance)
+                if distance is not None:
+                    candidates.append((candidate, distance, self.words[candidate]))
+
+        candidates.sort(key=lambda candidate: (candidate[1], -candidate[2], candidate[0]))
+        return candidates[:limit]
+
+    def corrections(self, text: str, limit: int = 3) -> List[str]:
+        """
+        Corrected versions of a text, best first.
+
+        Each word is replaced by its closest known word (or its known
+        surface form); alternatives swap in the next candidates of one word
+        at a time. The text itself is never returned.
+        """
+        words = tokenize(text)
+        options: List[List[str]] = []
+        for word in words:
+            key = normalize(word)
+            known = key in self.words
+            if not key or key.isdigit() or (not known and len(key) < MIN_WORD_LENGTH):
+                options.append([word])
+                continue
+            if known:
+                options.append([self.forms.get(key, word)])
+                continue
+            candidates = self.lookup(key, word_distance(key, self.max_distance), limit)
+            options.append([self.forms.get(candidate, candidate) for candidate, _, _ in candidates] or [word])
+
+        best = [choices[0] for choices in options]
+        phrases = [" ".join(best)]
+        for position, choices in enumerate(options):
+            for choice in choices[1:]:
+                phrases.append(" ".join(best[:position] + [choice] + best[position + 1:]))
+
+        original = " ".join(words)
+        corrected = []
+        for phrase in phrases:
+            if phrase != original and phrase not in corrected:
+                corrected.append(phrase)
+        return corrected[:limit]
+
+    def _variants(self, word: str, max_distance: int) -> Set[str]:
+        """The word and every string with up to ``max_distance`` characters deleted"""
+        variants = {word}
+        level = {word}
+        for _ in range(max_distance):
+            level = {
+                candidate[:i] + candidate[i + 1:]
+                for candidate in level if len(candidate) > 1
+                for i in range(len(candidate))
+            }
+            variants |= level
+        return variants
@@ -0,0 +1,173 @@
+"""
+CelebraTech Event Management System - Startup Timeline & Lazy Routers
+Performance & Optimization
+
+Cold-start instrumentation for API workers:
+
+- StartupTimeline records import time per router module, named startup
+  phases (e.g. database init), time until the app is ready and time until
+  the first request is served
+- LazyRouterLoader defers importing rarely used router groups until the
+  first request that targets them
+
+``app.main`` imports this module before anything else so that the timeline
+origin is as close to worker start as possible.
+"""
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import importlib
+import time
+
+
+class StartupTimeline:
+    """Records where worker start-up time goes"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.started_at = datetime.utcnow()
+
+        self.imports: List[Dict[str, Any]] = []
+        self.phases: List[Dict[str, Any]] = []
+        self.ready_ms: Optional[float] = None
+        self.first_request_ms: Optional[float] = None
+        self.first_request_path: Optional[str] = None
+
+    def elapsed_ms(self) -> float:
+        """Milliseconds since the timeline origin"""
+        return (time.perf_counter() - self.origin) * 1000
+
+    def uptime_seconds(self) -> float:
+        """Seconds since the worker started"""
+        return round(self.elapsed_ms() / 1000, 3)
+
+    def import_module(self, name: str, lazy: bool = False) -> Any:
+        """
+        Import a module and record how long it took.
+
+        Durations are incremental: shared dependencies (models, services)
+        are charged to the first module that imports them.
+        """
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        self.imports.append({
+            "module": name,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+            "at_ms": round(self.elapsed_ms(), 2),
+            "lazy": lazy
+        })
+        return module
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time a named start-up phase"""
+        started_ms = self.elapsed_ms()
+        try:
+            yield
+        finally:
+            self.phases.append({
+                "phase": name,
+                "started_ms": round(started_ms, 2),
+                "duration_ms": round(self.elapsed_ms() - started_ms, 2)
+            })
+
+    def mark_ready(self):
+        """Record that start-up has finished and the app accepts requests"""
+        self.ready_ms = round(self.elapsed_ms(), 2)
+
+    def mark_first_request(self, path: str):
+        """Record the first request served by this worker"""
+        if self.first_request_ms is None:
+            self.first_request_ms = round(self.elapsed_ms(), 2)
+            self.first_request_path = path
+
+    def slowest_imports(self, limit: int = 5) -> List[Dict[str, Any]]:
+        """Get the slowest module imports"""
+        return sorted(self.imports, key=lambda i: i["duration_ms"], reverse=True)[:limit]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get the full timeline"""
+        eager_imports = [i for i in self.imports if not i["lazy"]]
+        return {
+            "started_at": self.started_at,
+            "uptime_seconds": self.uptime_seconds(),
+            "ready_ms": self.ready_ms,
+            "first_request_ms": self.first_request_ms,
+            "first_request_path": self.first_request_path,
+            "router_import_ms": round(sum(i["duration_ms"] for i in eager_imports), 2),
+            "lazy_import_ms": round(
+                sum(i["duration_ms"] for i in self.imports if i["lazy"]), 2
+            ),
+            "imports": sorted(self.imports, key=lambda i: i["duration_ms"], reverse=True),
+            "phases": list(self.phases)
+        }
+
+
+class LazyRouterLoader:
+    """
+    Defers importing router modules until a request needs them.
+
+    Routes are matched against ``app.router.routes`` on every request, so a
+    router included after start-up is served from the next dispatch on.
+    """
+
+    # Paths that need every route registered (OpenAPI schema and docs)
+    SCHEMA_PATHS = ("/openapi.json", "/docs", "/redoc")
+
+    def __init__(self, app: Any, timeline: StartupTimeline):
+        self.app = app
+        self.timeline = timeline
+        self._pending: Dict[str, Tuple[str, str]] = {}
+        self._lock = asyncio.Lock()
+
+    @property
+    def pending(self) -> List[str]:
+        """Modules not loaded yet"""
+        return list(self._pending.keys())
+
+    def register(self, module_name: str, path_prefix: str, include_prefix: str):
+        """
+        Register a router module for lazy loading.
+
+        Args:
+            module_name: Module exposing ``router``
+            path_prefix: Full URL prefix served by the router
+            include_prefix: Prefix passed to ``include_router``
+        """
+        self._pending[module_name] = (path_prefix, include_prefix)
+
+    async def ensure_loaded(self, path: str):
+        """Load every pending router the request path may need"""
+        if not self._pending:
+            return
+
+        load_all = path in self.SCHEMA_PATHS
+        wanted = [
+            name for name, (prefix, _) in self._pending.items()
+            if load_all or path == prefix or path.startswith(prefix + "/")
+        ]
+        if not wanted:
+            return
+
+        async with self._lock:
+            for module_name in wanted:
+                if module_name in self._pending:
+                    self._load(module_name)
+
+    def load_all(self):
+        """Load every pending router (e.g. for schema export)"""
+        for module_name in list(self._pending):
+            self._load(module_name)
+
+    def _load(self, module_name: str):
+        _, include_prefix = self._pending.pop(module_name)
+        module = self.timeline.import_module(module_name, lazy=True)
+        self.app.include_router(module.router, prefix=include_prefix)
+        # Regenerate the OpenAPI schema with the new routes
+        self.app.openapi_schema = None
+        print(f"📦 Lazily loaded router {module_name}")
+
+
+# Global timeline for this worker
+startup_timeline = StartupTimeline()
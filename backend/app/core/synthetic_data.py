@@ -0,0 +1,574 @@
+"""
+CelebraTech Event Management System - Synthetic Dataset Generator
+Performance & Optimization
+
+Generates production-shaped data for load tests, benchmarks and index
+experiments.
+
+- Volumes come from a DatasetSpec: guests per event and messages per
+  conversation follow log-normal distributions, vendor popularity (booking
+  requests, reviews, behavior events) follows a Zipf distribution
+- Every row is derived from (seed, entity, index): IDs are deterministic, so
+  worker processes generate disjoint partitions without sharing state and
+  children can reference parents generated elsewhere
+- Loading respects foreign keys: users and vendors first, then one subtree
+  per event (event, guests, booking requests, quotes, bookings, reviews,
+  conversations, participants, messages) in dependency order, then user
+  behavior events
+- PostgreSQL (asyncpg) is loaded with COPY, other databases with
+  multi-row inserts; PostgreSQL partitions run in parallel worker processes
+
+Usage:
+    python -m app.core.synthetic_data --database-url postgresql+asyncpg://... --scale 1 --workers 8
+"""
+from bisect import bisect
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field, replace
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Tuple
+import argparse
+import asyncio
+import enum
+import json
+import math
+import os
+import random
+import time
+import uuid
+
+from sqlalchemy import JSON, DateTime, insert
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+
+
+# Rows buffered per table before they are written
+BATCH_ROWS = 20_000
+
+# Events generated per buffer flush inside a partition
+EVENTS_PER_CHUNK = 100
+
+CITIES = ["Istanbul", "Ankara", "Izmir", "Bursa", "Antalya", "Adana", "Konya", "Gaziantep", "London", "Berlin"]
+
+# Entity kinds used in deterministic IDs
+_KINDS = {
+    name: number for number, name in enumerate([
+        "organizer", "vendor_user", "vendor", "event", "booking_request",
+        "quote", "booking", "conversation",
+    ], start=1)
+}
+
+
+# ============================================================================
+# Distributions
+# ============================================================================
+
+@dataclass(frozen=True)
+class LogNormalCount:
+    """Per-parent child count with a given mean and long tail"""
+    mean: float
+    sigma: float = 0.8
+    minimum: int = 0
+    maximum: int = 100_000
+
+    def sample(self, rng: random.Random) -> int:
+        if self.mean <= 0:
+            return 0
+        mu = math.log(self.mean) - self.sigma ** 2 / 2
+        return min(max(int(round(rng.lognormvariate(mu, self.sigma))), self.minimum), self.maximum)
+
+
+class ZipfSampler:
+    """Samples 0..n-1 with probability proportional to 1 / (rank + 1) ** s"""
+
+    def __init__(self, n: int, s: float):
+        self.n = n
+        self._cumulative = []
+        total = 0.0
+        for rank in range(n):
+            total += 1 / (rank + 1) ** s
+            self._cumulative.append(total)
+
+    def sample(self, rng: random.Random) -> int:
+        return min(bisect(self._cumulative, rng.random() * self._cumulative[-1]), self.n - 1)
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Volumes and distributions of a synthetic dataset (~10M rows at scale 1)"""
+    organizers: int = 20_000
+    vendors: int = 50_000
+    events: int = 20_000
+    guests_per_event: LogNormalCount = field(default_factory=lambda: LogNormalCount(150, 0.7, 5, 2_000))
+    requests_per_event: LogNormalCount = field(default_factory=lambda: LogNormalCount(3, 0.5, 0, 20))
+    # Share of booking requests that are accepted and become bookings
+    booking_rate: float = 0.6
+    # Share of bookings that get a review
+    review_rate: float = 0.5
+    messages_per_conversation: LogNormalCount = field(default_factory=lambda: LogNormalCount(80, 1.0, 1, 20_000))
+    behavior_events: int = 2_000_000
+    # Zipf exponent of vendor popularity
+    vendor_popularity: float = 1.1
+
+    def scaled(self, factor: float) -> "DatasetSpec":
+        """Same shape with entity counts multiplied by ``factor``"""
+        return replace(
+            self,
+            organizers=max(int(self.organizers * factor), 1),
+            vendors=max(int(self.vendors * factor), 1),
+            events=max(int(self.events * factor), 1),
+            behavior_events=int(self.behavior_events * factor),
+        )
+
+
+def spec_from_dict(data: Dict[str, Any]) -> DatasetSpec:
+    """Rebuild a spec passed to a worker process"""
+    values = dict(data)
+    for name in ("guests_per_event", "requests_per_event", "messages_per_conversation"):
+        values[name] = LogNormalCount(**values[name])
+    return DatasetSpec(**values)
+
+
+# ============================================================================
+# Deterministic Identity
+# ============================================================================
+
+def entity_id(seed: int, kind: str, index: int) -> uuid.UUID:
+    """Deterministic UUID for the index-th entity of a kind"""
+    return uuid.UUID(int=((seed & 0xFFFFFFFF) << 96) | (_KINDS[kind] << 80) | index, version=4)
+
+
+def entity_rng(seed: int, kind: str, index: int) -> random.Random:
+    """Random generator owned by one entity"""
+    return random.Random(f"{seed}:{kind}:{index}")
+
+
+# ============================================================================
+# Loading
+# ============================================================================
+
+class TableWriter:
+    """Buffers rows per table and writes them with COPY or multi-row inserts"""
+
+    def __init__(self, conn: AsyncConnection, tables: Dict[str, Any]):
+        self.conn = conn
+        self.tables = tables
+        self.use_copy = conn.dialect.name == "postgresql" and conn.dialect.driver == "asyncpg"
+        self.buffers: Dict[str, List[Dict[str, Any]]] = {name: [] for name in tables}
+        self.written: Dict[str, int] = {name: 0 for name in tables}
+        self._defaults = {name: self._python_defaults(table) for name, table in tables.items()}
+
+    def add(self, table_name: str, row: Dict[str, Any]):
+        self.buffers[table_name].append(row)
+
+    async def flush(self, force: bool = False):
+        """Write buffered rows in table (dependency) order"""
+        if not force and not any(len(rows) >= BATCH_ROWS for rows in self.buffers.values()):
+            return
+        for name, rows in self.buffers.items():
+            if rows:
+                await self._write(name, rows)
+                self.written[name] += len(rows)
+                self.buffers[name] = []
+
+    async def _write(self, name: str, rows: List[Dict[str, Any]]):
+        table = self.tables[name]
+        for column, default in self._defaults[name]:
+            for row in rows:
+                if column not in row:
+                    row[column] = default()
+
+        if not self.use_copy:
+            # Databases without array types store NULL instead of empty arrays
+            arrays = [c.name for c in table.columns if isinstance(c.type, ARRAY)]
+            if arrays and self.conn.dialect.name == "sqlite":
+                for row in rows:
+                    for column in arrays:
+                        row[column] = None
+            await self.conn.execute(insert(table), rows)
+            return
+
+        columns = list(rows[0])
+        converters = [self._copy_converter(table.c[column]) for column in columns]
+        records = [
+            tuple(convert(row[column]) for column, convert in zip(columns, converters))
+            for row in rows
+        ]
+        raw = await self.conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            table.name, records=records, columns=columns, schema_name=table.schema
+        )
+
+    @staticmethod
+    def _python_defaults(table) -> List[Tuple[str, Any]]:
+        """Python-side column defaults (COPY bypasses them)"""
+        defaults = []
+        for column in table.columns:
+            default = column.default
+            if default is None or not (default.is_scalar or default.is_callable):
+                continue
+            if default.is_scalar:
+                defaults.append((column.name, lambda value=default.arg: value))
+            else:
+                defaults.append((column.name, lambda fn=default.arg: fn(None)))
+        return defaults
+
+    @staticmethod
+    def _copy_converter(column):
+        """Convert Python values to what COPY expects for a column"""
+        if isinstance(column.type, JSON):
+            return lambda value: json.dumps(value) if value is not None else None
+        if isinstance(column.type, DateTime) and column.type.timezone:
+            return lambda value: value.replace(tzinfo=timezone.utc) if value is not None and value.tzinfo is None else value
+        return lambda value: value.name if isinstance(value, enum.Enum) else value
+
+
+def _tables() -> Dict[str, Any]:
+    """Tables in foreign-key order"""
+    from app.models.user import User
+    from app.models.vendor import Vendor
+    from app.models.event import Event
+    from app.models.guest import Guest
+    from app.models.booking import BookingRequest, Quote, Booking
+    from app.models.review import Review
+    from app.models.messaging import Conversation, ConversationParticipant, Message
+    from app.models.recommendation import UserBehavior
+
+    models = [User, Vendor, Event, Guest, BookingRequest, Quote, Booking, Review,
+              Conversation, ConversationParticipant, Message, UserBehavior]
+    return {model.__tablename__: model.__table__ for model in models}
+
+
+# ============================================================================
+# Generators
+# ============================================================================
+
+class DatasetGenerator:
+    """Generates one partition of a dataset"""
+
+    def __init__(self, spec: DatasetSpec, seed: int, writer: TableWriter):
+        from app.models import user, vendor, event, guest, booking
+        self.models = {"user": user, "vendor": vendor, "event": event, "guest": guest, "booking": booking}
+
+        self.spec = spec
+        self.seed = seed
+        self.writer = writer
+        self.now = datetime.utcnow().replace(microsecond=0)
+        self._popularity: Optional[ZipfSampler] = None
+
+    @property
+    def popularity(self) -> ZipfSampler:
+        if self._popularity is None:
+            self._popularity = ZipfSampler(self.spec.vendors, self.spec.vendor_popularity)
+        return self._popularity
+
+    def organizer_id(self, index: int) -> uuid.UUID:
+        return entity_id(self.seed, "organizer", index)
+
+    async def users_and_vendors(self, start: int, stop: int):
+        """Organizers [start, stop) and vendors (with their users) [start, stop)"""
+        user_model = self.models["user"]
+        vendor_model = self.models["vendor"]
+        categories = list(vendor_model.VendorCategory)
+
+        for i in range(start, min(stop, self.spec.organizers)):
+            self.writer.add("users", self._user_row(self.organizer_id(i), f"organizer{i}", user_model.UserRole.ORGANIZER))
+            await self.writer.flush()
+
+        for i in range(start, min(stop, self.spec.vendors)):
+            rng = entity_rng(self.seed, "vendor", i)
+            user_id = entity_id(self.seed, "vendor_user", i)
+            self.writer.add("users", self._user_row(user_id, f"vendor{i}", user_model.UserRole.VENDOR))
+            self.writer.add("vendors", {
+                "id": entity_id(self.seed, "vendor", i),
+                "user_id": user_id,
+                "business_name": f"Vendor {i}",
+                "category": rng.choice(categories),
+                "description": "Synthetic vendor",
+                "phone": f"+90{rng.randrange(10 ** 9, 10 ** 10)}",
+                "email": f"vendor{i}@synthetic.celebratech.test",
+                "location_city": rng.choice(CITIES),
+                "status": vendor_model.VendorStatus.ACTIVE,
+                "avg_rating": Decimal(f"{rng.uniform(3, 5):.2f}"),
+            })
+            await self.writer.flush()
+
+        await self.writer.flush(force=True)
+
+    def _user_row(self, user_id: uuid.UUID, handle: str, role) -> Dict[str, Any]:
+        return {
+            "id": user_id,
+            "email": f"{handle}@synthetic.celebratech.test",
+            # Not a valid hash: synthetic users cannot log in
+            "password_hash": "!",
+            "first_name": handle.capitalize(),
+            "last_name": "Synthetic",
+            "role": role,
+            "status": self.models["user"].UserStatus.ACTIVE,
+        }
+
+    async def events(self, start: int, stop: int):
+        """Events [start, stop) with their whole subtree"""
+        for chunk_start in range(start, stop, EVENTS_PER_CHUNK):
+            for i in range(chunk_start, min(chunk_start + EVENTS_PER_CHUNK, stop)):
+                self._event_subtree(i)
+            # Chunks end on event boundaries, so every flush is FK-consistent
+            await self.writer.flush()
+        await self.writer.flush(force=True)
+
+    def _event_subtree(self, i: int):
+        event_model = self.models["event"]
+        guest_model = self.models["guest"]
+        spec = self.spec
+        rng = entity_rng(self.seed, "event", i)
+
+        event_id = entity_id(self.seed, "event", i)
+        organizer_id = self.organizer_id(rng.randrange(spec.organizers))
+        event_date = self.now + timedelta(days=rng.randint(-365, 365))
+        self.writer.add("events", {
+            "id": event_id,
+            "type": rng.choice(list(event_model.EventType)),
+            "name": f"Event {i}",
+            "event_date": event_date,
+            "status": event_model.EventStatus.PLANNING,
+            "created_by": organizer_id,
+            "budget_amount": Decimal(rng.randrange(50_000, 2_000_000)),
+        })
+
+        rsvp_statuses = [s.value for s in guest_model.RSVPStatus]
+        for g in range(spec.guests_per_event.sample(rng)):
+            self.writer.add("guests", {
+                "event_id": event_id,
+                "first_name": f"Guest{g}",
+                "last_name": f"Event{i}",
+                "rsvp_status": rng.choice(rsvp_statuses),
+                "checked_in": rng.random() < 0.2,
+                "created_by": organizer_id,
+            })
+
+        for k in range(spec.requests_per_event.sample(rng)):
+            self._booking_chain(rng, i, k, event_id, organizer_id, event_date)
+
+    def _booking_chain(self, rng: random.Random, event_index: int, k: int,
+                       event_id: uuid.UUID, organizer_id: uuid.UUID, event_date: datetime):
+        """Booking request, quote, booking, review and conversation"""
+        booking_model = self.models["booking"]
+        spec = self.spec
+
+        number = event_index * 100 + k
+        vendor_index = self.popularity.sample(rng)
+        vendor_id = entity_id(self.seed, "vendor", vendor_index)
+        vendor_user_id = entity_id(self.seed, "vendor_user", vendor_index)
+        accepted = rng.random() < spec.booking_rate
+
+        request_id = entity_id(self.seed, "booking_request", number)
+        self.writer.add("booking_requests", {
+            "id": request_id,
+            "event_id": event_id,
+            "vendor_id": vendor_id,
+            "organizer_id": organizer_id,
+            "status": booking_model.BookingRequestStatus.ACCEPTED if accepted else booking_model.BookingRequestStatus.PENDING,
+            "title": f"Request {number}",
+            "description": "Synthetic booking request",
+            "event_date": event_date,
+        })
+
+        booking_id = None
+        if accepted:
+            total = Decimal(rng.randrange(5_000, 250_000))
+            quote_id = entity_id(self.seed, "quote", number)
+            self.writer.add("quotes", {
+                "id": quote_id,
+                "booking_request_id": request_id,
+                "vendor_id": vendor_id,
+                "status": booking_model.QuoteStatus.ACCEPTED,
+                "quote_number": f"Q-{self.seed}-{number}",
+                "version": 1,
+                "subtotal": total,
+                "total_amount": total,
+                "valid_until": event_date,
+            })
+
+            booking_id = entity_id(self.seed, "booking", number)
+            deposit = (total * Decimal("0.3")).quantize(Decimal("1"))
+            completed = event_date < self.now
+            self.writer.add("bookings", {
+                "id": booking_id,
+                "booking_request_id": request_id,
+                "quote_id": quote_id,
+                "event_id": event_id,
+                "vendor_id": vendor_id,
+                "organizer_id": organizer_id,
+                "status": booking_model.BookingStatus.COMPLETED if completed else booking_model.BookingStatus.CONFIRMED,
+                "booking_number": f"B-{self.seed}-{number}",
+                "event_date": event_date,
+                "total_amount": total,
+                "deposit_amount": deposit,
+                "amount_due": total - deposit,
+                "payment_status": booking_model.PaymentStatus.DEPOSIT_PAID,
+                "commission_rate": Decimal("0.1000"),
+                "commission_amount": (total * Decimal("0.1")).quantize(Decimal("0.01")),
+            })
+
+            if completed and rng.random() < spec.review_rate:
+                self.writer.add("reviews", {
+                    "booking_id": booking_id,
+                    "vendor_id": vendor_id,
+                    "reviewer_id": organizer_id,
+                    "event_id": event_id,
+                    "overall_rating": rng.choices([1, 2, 3, 4, 5], weights=[2, 3, 10, 35, 50])[0],
+                    "comment": "Synthetic review",
+                    "event_date": event_date,
+                })
+
+        conversation_id = entity_id(self.seed, "conversation", number)
+        message_count = spec.messages_per_conversation.sample(rng)
+        started = event_date - timedelta(days=120)
+        self.writer.add("conversations", {
+            "id": conversation_id,
+            "event_id": event_id,
+            "booking_id": booking_id,
+            "created_by": organizer_id,
+            "last_message_at": started + timedelta(minutes=message_count * 30),
+        })
+        for user_id in (organizer_id, vendor_user_id):
+            self.writer.add("conversation_participants", {"conversation_id": conversation_id, "user_id": user_id})
+
+        senders = (organizer_id, vendor_user_id)
+        for m in range(message_count):
+            sent_at = started + timedelta(minutes=m * 30)
+            self.writer.add("messages", {
+                "conversation_id": conversation_id,
+                "sender_id": senders[rng.random() < 0.5],
+                "content": f"Message {m}",
+                "sent_at": sent_at,
+                "created_at": sent_at,
+            })
+
+    async def behavior(self, start: int, stop: int):
+        """User behavior events [start, stop), vendors by popularity"""
+        rng = entity_rng(self.seed, "behavior", start)
+        interactions = ["view", "view", "view", "click", "search", "bookmark", "inquiry"]
+
+        for _ in range(start, stop):
+            self.writer.add("user_behaviors", {
+                "user_id": self.organizer_id(rng.randrange(self.spec.organizers)),
+                "interaction_type": rng.choice(interactions),
+                "entity_type": "vendor",
+                "entity_id": entity_id(self.seed, "vendor", self.popularity.sample(rng)),
+                "occurred_at": self.now - timedelta(seconds=rng.randrange(90 * 86400)),
+            })
+            await self.writer.flush()
+
+        await self.writer.flush(force=True)
+
+
+# ============================================================================
+# Orchestration
+# ============================================================================
+
+async def load_partition(
+    database_url: str,
+    spec_data: Dict[str, Any],
+    seed: int,
+    phase: str,
+    start: int,
+    stop: int
+) -> Dict[str, int]:
+    """Generate and load one partition in its own transaction"""
+    engine = create_async_engine(database_url)
+    try:
+        async with engine.begin() as conn:
+            writer = TableWriter(conn, _tables())
+            generator = DatasetGenerator(spec_from_dict(spec_data), seed, writer)
+            await getattr(generator, phase)(start, stop)
+            return writer.written
+    finally:
+        await engine.dispose()
+
+
+def _load_partition_process(*args) -> Dict[str, int]:
+    return asyncio.run(load_partition(*args))
+
+
+def _partitions(total: int, parts: int) -> List[Tuple[int, int]]:
+    size = max(math.ceil(total / parts), 1)
+    return [(start, min(start + size, total)) for start in range(0, total, size)]
+
+
+async def generate_dataset(
+    database_url: str,
+    spec: DatasetSpec = DatasetSpec(),
+    workers: int = 4,
+    seed: int = 22
+) -> Dict[str, int]:
+    """
+    Generate and load a dataset.
+
+    Args:
+        database_url: Target database (schema must exist)
+        spec: Volumes and distributions
+        workers: Parallel worker processes (SQLite always loads serially)
+        seed: Seed for all generated values and IDs
+
+    Returns:
+        Rows written per table
+    """
+    serial = database_url.startswith("sqlite") or workers <= 1
+    spec_data = asdict(spec)
+    totals: Dict[str, int] = {}
+    started = time.perf_counter()
+
+    phases = [
+        [("users_and_vendors", max(spec.organizers, spec.vendors))],
+        # Both only reference users and vendors
+        [("events", spec.events), ("behavior", spec.behavior_events)],
+    ]
+
+    executor = None if serial else ProcessPoolExecutor(max_workers=workers)
+    try:
+        for phase_group in phases:
+            jobs = [
+                (database_url, spec_data, seed, phase, start, stop)
+                for phase, total in phase_group
+                for start, stop in _partitions(total, 1 if serial else workers * 2)
+            ]
+            if serial:
+                results = [await load_partition(*job) for job in jobs]
+            else:
+                loop = asyncio.get_running_loop()
+                results = await asyncio.gather(*(
+                    loop.run_in_executor(executor, _load_partition_process, *job) for job in jobs
+                ))
+
+            for written in results:
+                for table, count in written.items():
+                    totals[table] = totals.get(table, 0) + count
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    elapsed = time.perf_counter() - started
+    rows = sum(totals.values())
+    print(f"📦 Generated {rows:,} rows in {elapsed:.1f}s ({rows / elapsed:,.0f} rows/s)")
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load a synthetic CelebraTech dataset")
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"))
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier for entity counts (1 = ~10M rows)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--seed", type=int, default=22)
+    args = parser.parse_args()
+
+    if not args.database_url:
+        parser.error("--database-url or DATABASE_URL is required")
+
+    totals = asyncio.run(generate_dataset(args.database_url, DatasetSpec().scaled(args.scale), args.workers, args.seed))
+    for table, count in totals.items():
+        print(f"  {table}: {count:,}")
+
+
+if __name__ == "__main__":
+    main()
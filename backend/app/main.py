@@ -15,17 +15,32 @@ Sprint 12: Advanced Task Management & Team Collaboration
 Sprint 13: Search & Discovery System
 FastAPI application entry point
 """
+from app.core.startup import startup_timeline, LazyRouterLoader
+
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from fastapi.exceptions import RequestValidationError
 from contextlib import asynccontextmanager
+import asyncio
 import time
 
 from app.core.config import settings
-from app.core.database import init_db, close_db
-from app.api.v1 import auth, events, tasks, vendors, bookings, payments, reviews, messaging, notifications, guests, analytics, documents, task_collaboration, search, calendar, budget, collaboration, recommendation, admin, mobile, mobile_features, integration, performance, security
+from app.core.database import init_db, close_db, start_pool_controller
+from app.core.pool_telemetry import current_request_scope
+from app.core.profiler import PROFILE_ID_HEADER, request_profiler
+from app.core.loop_watchdog import init_loop_watchdog, close_loop_watchdog
+from app.core.metrics import render_metrics, init_metrics_sampler, close_metrics_sampler
+from app.services.latency_histogram_service import init_latency_flusher, close_latency_flusher
+from app.services.metrics_collector import init_metrics_collector, close_metrics_collector
+from app.middleware.performance_middleware import PerformanceMonitoringMiddleware
+from app.services.metric_rollup_service import init_rollup_scheduler, close_rollup_scheduler
+from app.services.search_indexer_service import init_search_indexer, close_search_indexer
+from app.services.autocomplete_service import init_autocomplete, close_autocomplete
+from app.services.spelling_service import init_spelling, close_spelling
+from app.services.search_facet_service import init_search_facets, close_search_facets
+from app.services.search_analytics_service import init_search_analytics, close_search_analytics
 
 
 @asynccontextmanager
@@ -40,13 +55,62 @@ async def lifespan(app: FastAPI):
     print(f"🔧 Debug mode: {settings.DEBUG}")
 
     # Initialize database
-    await init_db()
+    with startup_timeline.phase("init_db"):
+        await init_db()
     print("✅ Database initialized")
+    start_pool_controller()
+    init_latency_flusher()
+    init_metrics_collector(settings.METRICS_BUFFER_SIZE, settings.METRICS_FLUSH_INTERVAL_SECONDS)
+    init_rollup_scheduler()
+    init_metrics_sampler()
+    init_loop_watchdog(settings.LOOP_WATCHDOG_INTERVAL_MS, settings.LOOP_BLOCK_THRESHOLD_MS)
+    init_search_indexer(
+        settings.SEARCH_INDEXER_BATCH_SIZE,
+        settings.SEARCH_INDEXER_INTERVAL_SECONDS,
+        settings.SEARCH_INDEXER_MAX_ATTEMPTS
+    )
+    init_search_analytics(
+        settings.SEARCH_ANALYTICS_BUFFER_SIZE,
+        settings.SEARCH_ANALYTICS_FLUSH_INTERVAL_SECONDS,
+        settings.SEARCH_TRENDING_CAPACITY
+    )
+    init_autocomplete(
+        settings.AUTOCOMPLETE_TOP_K,
+        settings.AUTOCOMPLETE_MAX_VENDORS,
+        settings.AUTOCOMPLETE_REFRESH_SECONDS,
+        settings.AUTOCOMPLETE_REBUILD_SECONDS
+    )
+    init_spelling(
+        settings.SPELLING_MAX_DISTANCE,
+        settings.SPELLING_MAX_VENDORS,
+        settings.SPELLING_REFRESH_SECONDS,
+        settings.SPELLING_REBUILD_SECONDS
+    )
+    init_search_facets(settings.SEARCH_FACETS_REFRESH_SECONDS, settings.SEARCH_FACETS_MAX_AGE_SECONDS)
+
+    startup_timeline.mark_ready()
+    slowest = ", ".join(
+        f"{i['module']} {i['duration_ms']:.0f}ms" for i in startup_timeline.slowest_imports(3)
+    )
+    print(f"⏱️  Ready in {startup_timeline.ready_ms:.0f}ms (slowest imports: {slowest})")
+    if lazy_routers.pending:
+        print(f"📦 Lazy router groups: {', '.join(lazy_routers.pending)}")
 
     yield
 
     # Shutdown
     print("🛑 Shutting down...")
+    # Drain collected requests into the sketches before flushing them
+    await close_metrics_collector()
+    await close_latency_flusher()
+    await close_rollup_scheduler()
+    await close_metrics_sampler()
+    await close_loop_watchdog()
+    await close_search_indexer()
+    await close_autocomplete()
+    await close_spelling()
+    await close_search_facets()
+    await close_search_analytics()
     await close_db()
     print("✅ Database connections closed")
 
@@ -62,6 +126,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Router groups listed in LAZY_ROUTER_GROUPS are imported on first use
+lazy_routers = LazyRouterLoader(app, startup_timeline)
+
 
 # Middleware Configuration
 # -----------------------
@@ -92,14 +159,38 @@ app.add_middleware(
     expose_headers=["X-2FA-Required"]
 )
 
+# Request metrics (latency, status, route) into the per-worker collector;
+# failed requests count as 500s, docs/health/metrics are not recorded
+app.add_middleware(PerformanceMonitoringMiddleware)
+
 
 # Request timing middleware
 @app.middleware("http")
 async def add_process_time_header(request: Request, call_next):
     """Add request processing time to response headers"""
-    start_time = time.time()
-    response = await call_next(request)
-    process_time = time.time() - start_time
+    start_time = time.perf_counter()
+    if startup_timeline.first_request_ms is None:
+        startup_timeline.mark_first_request(request.url.path)
+    await lazy_routers.ensure_loaded(request.url.path)
+    # Lets pool telemetry attribute connection hold time to the route
+    current_request_scope.set(request.scope)
+
+    # Opt-in profiling (signed admin token or sampling rate)
+    selection = request_profiler.select(request.headers)
+    if selection is None:
+        response = await call_next(request)
+    else:
+        profile = request_profiler.start(request.method, request.url.path, *selection)
+        status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+        finally:
+            request_profiler.finish(profile, status_code, getattr(request.scope.get("route"), "path", None))
+            await asyncio.to_thread(request_profiler.save, profile)
+        response.headers[PROFILE_ID_HEADER] = profile.id
+
+    process_time = time.perf_counter() - start_time
     response.headers["X-Process-Time"] = str(process_time)
     return response
 
@@ -160,6 +251,23 @@ async def health_check():
     }
 
 
+# Metrics endpoint (OpenMetrics, rendered from memory)
+@app.get(
+    "/metrics",
+    tags=["Health"],
+    summary="Metrics",
+    description="In-process metrics in OpenMetrics text format"
+)
+async def metrics():
+    """
+    Metrics endpoint
+
+    Returns request, pool, cache, event-loop and queue metrics of all workers
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 # Root endpoint
 @app.get(
     "/",
@@ -183,75 +291,91 @@ async def root():
 
 
 # API v1 routes
-# Sprint 1: Authentication
-app.include_router(auth.router, prefix=settings.API_V1_PREFIX)
+# (router module, router path prefix)
+API_V1_ROUTERS = [
+    # Sprint 1: Authentication
+    ("auth", "/auth"),
+
+    # Sprint 2: Event Management
+    ("events", "/events"),
+    ("tasks", "/events/{event_id}/tasks"),
 
-# Sprint 2: Event Management
-app.include_router(events.router, prefix=settings.API_V1_PREFIX)
-app.include_router(tasks.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 3: Vendor Marketplace
+    ("vendors", "/vendors"),
 
-# Sprint 3: Vendor Marketplace
-app.include_router(vendors.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 4: Booking & Quote System
+    ("bookings", "/bookings"),
 
-# Sprint 4: Booking & Quote System
-app.include_router(bookings.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 5: Payment Gateway & Financial Management
+    ("payments", "/payments"),
 
-# Sprint 5: Payment Gateway & Financial Management
-app.include_router(payments.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 6: Review and Rating System
+    ("reviews", "/reviews"),
 
-# Sprint 6: Review and Rating System
-app.include_router(reviews.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 7: Messaging System
+    ("messaging", "/messaging"),
 
-# Sprint 7: Messaging System
-app.include_router(messaging.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 8: Notification System
+    ("notifications", "/notifications"),
 
-# Sprint 8: Notification System
-app.include_router(notifications.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 9: Guest Management System
+    ("guests", "/guests"),
 
-# Sprint 9: Guest Management System
-app.include_router(guests.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 10: Analytics & Reporting System
+    ("analytics", "/analytics"),
 
-# Sprint 10: Analytics & Reporting System
-app.include_router(analytics.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 11: Document Management System
+    ("documents", "/documents"),
 
-# Sprint 11: Document Management System
-app.include_router(documents.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 12: Advanced Task Management & Team Collaboration
+    ("task_collaboration", "/task-collaboration"),
 
-# Sprint 12: Advanced Task Management & Team Collaboration
-app.include_router(task_collaboration.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 13: Search & Discovery System
+    ("search", "/search"),
 
-# Sprint 13: Search & Discovery System
-app.include_router(search.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 14: Calendar & Scheduling System
+    ("calendar", "/calendar"),
 
-# Sprint 14: Calendar & Scheduling System
-app.include_router(calendar.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 15: Budget Management System
+    ("budget", "/budget"),
 
-# Sprint 15: Budget Management System
-app.include_router(budget.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 16: Collaboration & Sharing System
+    ("collaboration", "/collaboration"),
 
-# Sprint 16: Collaboration & Sharing System
-app.include_router(collaboration.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 17: AI & Recommendation Engine
+    ("recommendation", "/recommendations"),
 
-# Sprint 17: AI & Recommendation Engine
-app.include_router(recommendation.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 21: Admin & Moderation System
+    ("admin", "/admin"),
 
-# Sprint 21: Admin & Moderation System
-app.include_router(admin.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 18: Mobile App Foundation
+    ("mobile", "/mobile"),
 
-# Sprint 18: Mobile App Foundation
-app.include_router(mobile.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 19: Mobile App Features
+    ("mobile_features", "/mobile-features"),
 
-# Sprint 19: Mobile App Features
-app.include_router(mobile_features.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 20: Integration Hub
+    ("integration", "/integrations"),
 
-# Sprint 20: Integration Hub
-app.include_router(integration.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 22: Performance & Optimization
+    ("performance", "/performance"),
 
-# Sprint 22: Performance & Optimization
-app.include_router(performance.router, prefix=settings.API_V1_PREFIX)
+    # Sprint 23: Security Hardening
+    ("security", "/security"),
+]
 
-# Sprint 23: Security Hardening
-app.include_router(security.router, prefix=settings.API_V1_PREFIX)
+for router_module, router_prefix in API_V1_ROUTERS:
+    module_name = f"app.api.v1.{router_module}"
+    # Templated prefixes cannot be matched before the router exists
+    if router_module in settings.LAZY_ROUTER_GROUPS and "{" not in router_prefix:
+        lazy_routers.register(
+            module_name,
+            path_prefix=settings.API_V1_PREFIX + router_prefix,
+            include_prefix=settings.API_V1_PREFIX
+        )
+    else:
+        module = startup_timeline.import_module(module_name)
+        app.include_router(module.router, prefix=settings.API_V1_PREFIX)
 
 
 # Phase 3 complete! Sprints 18-23 done. Sprint 24: Testing & Documentation remaining.
@@ -9,20 +9,17 @@ import time
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from typing import Callable
-import asyncio
 
-from app.schemas.performance import PerformanceMetricCreate
+from app.services.metrics_collector import RequestMetricsCollector, get_metrics_collector
 
 
 class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
     """
     Middleware to track API request performance.
 
-    Automatically records:
-    - Request latency
-    - Request count
-    - Error rates
-    - Response sizes
+    Records latency, status, route template and response size into the
+    per-worker metrics collector. Recording is synchronous and O(1); the
+    collector's flusher aggregates and persists the entries in batches.
     """
 
     def __init__(
@@ -30,18 +27,21 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
         app,
         track_latency: bool = True,
         track_requests: bool = True,
-        excluded_paths: list = None
+        excluded_paths: list = None,
+        collector: RequestMetricsCollector = None
     ):
         super().__init__(app)
         self.track_latency = track_latency
         self.track_requests = track_requests
-        self.excluded_paths = excluded_paths or [
+        self.collector = collector
+        self.excluded_paths = tuple(excluded_paths or [
             "/docs",
             "/redoc",
             "/openapi.json",
             "/health",
-            "/performance/health/ping"
-        ]
+            "/metrics",
+            "/api/v1/performance/health/ping"
+        ])
 
     async def dispatch(
         self,
@@ -50,69 +50,50 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
     ) -> Response:
         """Process request and track performance"""
         # Skip tracking for excluded paths
-        if self._should_exclude(request.url.path):
+        if not (self.track_latency or self.track_requests) or self._should_exclude(request.url.path):
             return await call_next(request)
 
-        # Record start time
-        start_time = time.time()
-
-        # Process request
+        start_time = time.perf_counter()
         response = None
-        error = None
 
         try:
             response = await call_next(request)
-        except Exception as e:
-            error = str(e)
-            raise
         finally:
-            # Calculate latency
-            latency_ms = (time.time() - start_time) * 1000
-
-            # Track metrics (don't await to avoid slowing down requests)
-            asyncio.create_task(
-                self._record_metrics(
-                    request=request,
-                    response=response,
-                    latency_ms=latency_ms,
-                    error=error
-                )
+            latency_ms = (time.perf_counter() - start_time) * 1000
+            record_request(
+                self.collector or get_metrics_collector(),
+                request,
+                response.status_code if response is not None else 500,
+                latency_ms,
+                response
             )
 
         return response
 
     def _should_exclude(self, path: str) -> bool:
         """Check if path should be excluded from tracking"""
-        return any(path.startswith(excluded) for excluded in self.excluded_paths)
-
-    async def _record_metrics(
-        self,
-        request: Request,
-        response: Response,
-        latency_ms: float,
-        error: str = None
-    ):
-        """Record performance metrics (async, non-blocking)"""
-        try:
-            # Get performance service from app state
-            # Note: In production, this would be injected properly
-            # For now, we'll just log the metrics
-
-            endpoint = request.url.path
-            method = request.method
-            status_code = response.status_code if response else 500
-
-            # Log metrics (in production, save to database/metrics system)
-            if self.track_latency:
-                print(f"📊 {method} {endpoint} - {latency_ms:.2f}ms - {status_code}")
-
-            # You can add more detailed tracking here:
-            # - await performance_service.record_api_latency(...)
-            # - await performance_service.record_metric(...)
-
-        except Exception as e:
-            # Don't fail requests if metric recording fails
-            print(f"Metric recording error: {e}")
+        return path.startswith(self.excluded_paths)
+
+
+def record_request(
+    collector: RequestMetricsCollector,
+    request: Request,
+    status_code: int,
+    latency_ms: float,
+    response: Response = None
+):
+    """Record a finished request into the metrics collector"""
+    # Route template keeps per-route cardinality bounded
+    route = request.scope.get("route")
+    content_length = response.headers.get("content-length") if response is not None else None
+
+    collector.record(
+        request.method,
+        getattr(route, "path", None) or "<unmatched>",
+        status_code,
+        latency_ms,
+        int(content_length) if content_length and content_length.isdigit() else 0
+    )
 
 
 class CacheMiddleware(BaseHTTPMiddleware):
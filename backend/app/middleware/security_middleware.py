@@ -11,7 +11,7 @@ from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoin
 from typing import Callable, Pattern, List
 import asyncio
 
-from app.core.database import AsyncSessionLocal
+from app.core.database import background_session
 from app.schemas.security import SecurityEventCreate
 
 
@@ -74,7 +74,7 @@ class IPBlacklistMiddleware(BaseHTTPMiddleware):
     async def _is_ip_blacklisted(self, ip_address: str) -> bool:
         """Check if IP is blacklisted"""
         try:
-            async with AsyncSessionLocal() as db:
+            async with background_session("security.ip_blacklist") as db:
                 from app.repositories.security_repository import SecurityRepository
                 security_repo = SecurityRepository(db)
                 return await security_repo.is_ip_blacklisted(ip_address)
@@ -85,7 +85,7 @@ class IPBlacklistMiddleware(BaseHTTPMiddleware):
     async def _log_blocked_request(self, ip_address: str, path: str):
         """Log blocked request"""
         try:
-            async with AsyncSessionLocal() as db:
+            async with background_session("security.blocked_request") as db:
                 from app.repositories.security_repository import SecurityRepository
                 security_repo = SecurityRepository(db)
 
@@ -243,7 +243,7 @@ class SecurityMonitoringMiddleware(BaseHTTPMiddleware):
     ):
         """Log detected security threats"""
         try:
-            async with AsyncSessionLocal() as db:
+            async with background_session("security.threat_log") as db:
                 from app.repositories.security_repository import SecurityRepository
                 security_repo = SecurityRepository(db)
 
@@ -331,7 +331,7 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
         try:
             client_ip = request.client.host if request.client else "unknown"
 
-            async with AsyncSessionLocal() as db:
+            async with background_session("security.csrf_log") as db:
                 from app.repositories.security_repository import SecurityRepository
                 security_repo = SecurityRepository(db)
 
@@ -469,7 +469,7 @@ class SuspiciousActivityDetectionMiddleware(BaseHTTPMiddleware):
     async def _log_ddos_attempt(self, ip_address: str):
         """Log potential DDoS attempt"""
         try:
-            async with AsyncSessionLocal() as db:
+            async with background_session("security.ddos_log") as db:
                 from app.repositories.security_repository import SecurityRepository
                 security_repo = SecurityRepository(db)
 
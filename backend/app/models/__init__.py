@@ -152,7 +152,9 @@ from app.models.search import (
     SearchSuggestion,
     SearchFilterPreset,
     VendorMatchingScore,
-    SearchIndexStatus
+    SearchIndexStatus,
+    SearchIndexOutbox,
+    SearchTrendingSketch
 )
 
 from app.models.calendar import (
@@ -335,6 +337,8 @@ __all__ = [
     "SearchFilterPreset",
     "VendorMatchingScore",
     "SearchIndexStatus",
+    "SearchIndexOutbox",
+    "SearchTrendingSketch",
     # Calendar & Scheduling models
     "Calendar",
     "CalendarEvent",
@@ -408,6 +412,11 @@ __all__ = [
     "SystemConfig",
     "PerformanceMetric",
     "CacheEntry",
+    "LatencySketchRecord",
+    "MetricRollupMinute",
+    "MetricRollupHour",
+    "MetricRollupDay",
+    "MetricRollupState",
     "SecurityEvent",
     "RateLimitEntry",
     "IPBlacklist",
@@ -418,6 +427,9 @@ __all__ = [
 # Final Sprints (20-24)
 from app.models.integration import Integration, Webhook, WebhookDelivery
 from app.models.admin import AdminAction, ModerationQueue, SystemConfig
-from app.models.performance import PerformanceMetric, CacheEntry
+from app.models.performance import (
+    PerformanceMetric, CacheEntry, LatencySketchRecord,
+    MetricRollupMinute, MetricRollupHour, MetricRollupDay, MetricRollupState
+)
 from app.models.security import SecurityEvent, RateLimitEntry, IPBlacklist
 from app.models.testing import TestRun, APIDocumentation
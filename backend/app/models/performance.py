@@ -1,5 +1,5 @@
 """Performance & Optimization Models - Sprint 22"""
-from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, Index
+from sqlalchemy import Column, String, Integer, Float, DateTime, JSON, Index, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
 import uuid
@@ -26,3 +26,74 @@ class CacheEntry(Base):
     hit_count = Column(Integer, default=0)
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     expires_at = Column(DateTime, nullable=False, index=True)
+
+class LatencySketchRecord(Base):
+    """Serialized latency sketch for one route, worker and time bucket"""
+    __tablename__ = "latency_sketches"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    method = Column(String(10), nullable=False)
+    route = Column(String(500), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    bucket_seconds = Column(Integer, nullable=False, default=60)
+    worker_id = Column(String(100), nullable=False)
+    request_count = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    sketch = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_latency_sketches_bucket_route', 'bucket_start', 'method', 'route'),
+    )
+
+
+class MetricRollupBase(Base):
+    """Shared columns of the metric rollup tiers"""
+    __abstract__ = True
+
+    metric_type = Column(String(100), primary_key=True)
+    dimension = Column(String(500), primary_key=True, default="")
+    bucket_start = Column(DateTime, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    sum = Column(Float, nullable=False, default=0.0)
+    min = Column(Float, nullable=True)
+    max = Column(Float, nullable=True)
+    error_count = Column(Integer, nullable=False, default=0)
+    sketch = Column(LargeBinary, nullable=False)
+
+
+class MetricRollupMinute(MetricRollupBase):
+    """1-minute metric aggregates (daily partitions on PostgreSQL)"""
+    __tablename__ = "metric_rollups_1m"
+    __table_args__ = (
+        Index('ix_metric_rollups_1m_type_bucket', 'metric_type', 'bucket_start'),
+        {"postgresql_partition_by": "RANGE (bucket_start)"},
+    )
+
+
+class MetricRollupHour(MetricRollupBase):
+    """1-hour metric aggregates (monthly partitions on PostgreSQL)"""
+    __tablename__ = "metric_rollups_1h"
+    __table_args__ = (
+        Index('ix_metric_rollups_1h_type_bucket', 'metric_type', 'bucket_start'),
+        {"postgresql_partition_by": "RANGE (bucket_start)"},
+    )
+
+
+class MetricRollupDay(MetricRollupBase):
+    """1-day metric aggregates (yearly partitions on PostgreSQL)"""
+    __tablename__ = "metric_rollups_1d"
+    __table_args__ = (
+        Index('ix_metric_rollups_1d_type_bucket', 'metric_type', 'bucket_start'),
+        {"postgresql_partition_by": "RANGE (bucket_start)"},
+    )
+
+
+class MetricRollupState(Base):
+    """Compaction watermark per rollup tier"""
+    __tablename__ = "metric_rollup_state"
+
+    tier = Column(String(10), primary_key=True)
+    compacted_until = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
@@ -5,21 +5,24 @@ Sprint 13: Search & Discovery System
 Database models for search functionality:
 - Saved searches
 - Search analytics
+- Trending query sketches
 - Search suggestions
 - Search filters
+- Search index outbox
 """
 
 from sqlalchemy import (
-    Column, String, Integer, Float, Boolean, DateTime,
-    Text, ForeignKey, JSON, Index, ARRAY
+    Column, String, Integer, BigInteger, Float, Boolean, DateTime,
+    Text, ForeignKey, JSON, Index, UniqueConstraint, ARRAY, event, insert
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, Session
 from datetime import datetime
 import uuid
 import enum
 
 from app.core.database import Base
+from app.core.elasticsearch import INDEX_VENDORS, INDEX_EVENTS, INDEX_SERVICES
 
 
 # ============================================================================
@@ -185,6 +188,31 @@ class SearchAnalytics(Base):
     )
 
 
+class SearchTrendingSketch(Base):
+    """
+    Heavy-hitters sketch of search queries for one worker, search type and day.
+
+    Each worker upserts the sketch of its current day on every analytics
+    flush; trending queries merge the sketches of a period across workers.
+    """
+    __tablename__ = "search_trending_sketches"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    search_type = Column(String(20), nullable=False)
+    bucket_start = Column(DateTime, nullable=False)
+    worker_id = Column(String(100), nullable=False)
+    search_count = Column(Integer, default=0, nullable=False)
+    counters = Column(JSON, nullable=False)  # SpaceSaving.to_dict()
+
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint('worker_id', 'search_type', 'bucket_start', name='uq_search_trending_sketch'),
+        Index('idx_search_trending_bucket', 'bucket_start', 'search_type'),
+    )
+
+
 # ============================================================================
 # Search Suggestion Models
 # ============================================================================
@@ -401,3 +429,78 @@ class SearchIndexStatus(Base):
         Index('idx_index_status_entity', 'entity_type'),
         Index('idx_index_status_health', 'is_healthy'),
     )
+
+
+# ============================================================================
+# Search Index Outbox
+# ============================================================================
+
+class SearchIndexOutbox(Base):
+    """
+    Pending Elasticsearch document changes (transactional outbox).
+
+    Rows are written in the same transaction as the vendor, service or event
+    change and consumed in id order by the search indexer. Rows that keep
+    failing are kept with ``dead_lettered_at`` set.
+    """
+    __tablename__ = "search_index_outbox"
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+
+    index_name = Column(String(100), nullable=False)
+    document_id = Column(String(64), nullable=False)
+    operation = Column(String(10), nullable=False)  # index, delete
+
+    # Failure tracking
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    dead_lettered_at = Column(DateTime, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index('idx_search_outbox_pending', 'dead_lettered_at', 'id'),
+        Index('idx_search_outbox_document', 'index_name', 'document_id'),
+    )
+
+
+# Table -> (index, attribute holding the document id) of the documents it feeds
+SEARCH_INDEXED_TABLES = {
+    "vendors": ((INDEX_VENDORS, "id"),),
+    "vendor_subcategories": ((INDEX_VENDORS, "vendor_id"),),
+    "vendor_portfolio": ((INDEX_VENDORS, "vendor_id"),),
+    "vendor_certifications": ((INDEX_VENDORS, "vendor_id"),),
+    "vendor_team_members": ((INDEX_VENDORS, "vendor_id"),),
+    "vendor_services": ((INDEX_SERVICES, "id"), (INDEX_VENDORS, "vendor_id")),
+    "events": ((INDEX_EVENTS, "id"),),
+}
+
+
+@event.listens_for(Session, "after_flush")
+def _capture_search_index_changes(session, flush_context):
+    """Append outbox rows for flushed changes to indexed entities"""
+    changes = {}
+    for state, objects in (("new", session.new), ("dirty", session.dirty), ("deleted", session.deleted)):
+        for obj in objects:
+            targets = SEARCH_INDEXED_TABLES.get(getattr(obj, "__tablename__", None))
+            if targets is None or (state == "dirty" and not session.is_modified(obj)):
+                continue
+
+            removed = state == "deleted" or getattr(obj, "deleted_at", None) is not None
+            for index_name, attribute in targets:
+                document_id = getattr(obj, attribute, None)
+                if document_id is None:
+                    continue
+                # Only the entity's own document is removed; parents are re-indexed
+                operation = "delete" if removed and attribute == "id" else "index"
+                changes[(index_name, str(document_id))] = operation
+
+    if changes:
+        session.connection().execute(
+            insert(SearchIndexOutbox.__table__),
+            [
+                {"index_name": index_name, "document_id": document_id, "operation": operation,
+                 "attempts": 0, "created_at": datetime.utcnow()}
+                for (index_name, document_id), operation in changes.items()
+            ]
+        )
@@ -3,7 +3,7 @@ CelebraTech Event Management System - Vendor Models
 Sprint 3: Vendor Profile Foundation
 FR-003: Vendor Marketplace & Discovery
 """
-from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, Integer, Numeric, Enum as SQLEnum, Date, Time
+from sqlalchemy import Column, String, Boolean, DateTime, ForeignKey, Text, Integer, Numeric, Enum as SQLEnum, Date, Time, UniqueConstraint, Index, DDL, event
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -140,10 +140,57 @@ class Vendor(Base):
     reviews = relationship("Review", back_populates="vendor", cascade="all, delete-orphan")
     rating_cache = relationship("VendorRatingCache", back_populates="vendor", uselist=False, cascade="all, delete-orphan")
 
+    # Bounding-box prefilter of radius searches; fuzzy name and city
+    # matching (pg_trgm). The full-text column is below.
+    __table_args__ = (
+        Index('idx_vendors_location', 'location_lat', 'location_lng'),
+        Index(
+            'idx_vendors_business_name_trgm', 'business_name',
+            postgresql_using='gin', postgresql_ops={'business_name': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+        Index(
+            'idx_vendors_location_city_trgm', 'location_city',
+            postgresql_using='gin', postgresql_ops={'location_city': 'gin_trgm_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
+
     def __repr__(self):
         return f"<Vendor {self.business_name} ({self.category})>"
 
 
+# ============================================================================
+# Vendor Search Indexes (PostgreSQL)
+# ============================================================================
+
+# Language-neutral configuration: names and descriptions mix Turkish and
+# English, so words are not stemmed (trigram matching covers near misses)
+VENDOR_SEARCH_CONFIG = "simple"
+
+# Weighted document: name (A), short description (B), description (C)
+VENDOR_SEARCH_DOCUMENT = (
+    f"setweight(to_tsvector('{VENDOR_SEARCH_CONFIG}', coalesce(business_name, '')), 'A') || "
+    f"setweight(to_tsvector('{VENDOR_SEARCH_CONFIG}', coalesce(short_description, '')), 'B') || "
+    f"setweight(to_tsvector('{VENDOR_SEARCH_CONFIG}', coalesce(description, '')), 'C')"
+)
+
+# The search_vector column is generated by PostgreSQL on every write and is
+# not mapped (other databases search with LIKE). Statements are idempotent
+# so they also upgrade existing vendors tables.
+event.listen(
+    Base.metadata, "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql")
+)
+for statement in (
+    f"ALTER TABLE vendors ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    f"GENERATED ALWAYS AS ({VENDOR_SEARCH_DOCUMENT}) STORED",
+    "CREATE INDEX IF NOT EXISTS idx_vendors_search_vector ON vendors USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS idx_vendors_business_name_trgm ON vendors USING gin (business_name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_vendors_location_city_trgm ON vendors USING gin (location_city gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_vendors_location ON vendors (location_lat, location_lng)",
+):
+    event.listen(Base.metadata, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+
 class VendorSubcategory(Base):
     """
     Vendor subcategory model - Additional service categories
@@ -285,6 +332,10 @@ class VendorAvailability(Base):
     # Relationships
     vendor = relationship("Vendor", back_populates="availability")
 
+    __table_args__ = (
+        UniqueConstraint('vendor_id', 'date', name='uq_vendor_availability_vendor_date'),
+    )
+
     def __repr__(self):
         return f"<VendorAvailability {self.date} for vendor {self.vendor_id} - {self.status}>"
 
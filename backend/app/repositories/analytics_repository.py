@@ -103,13 +103,13 @@ class AnalyticsRepository:
         budget_utilization = (budget_spent / budget_allocated * 100) if budget_allocated > 0 else 0.0
 
         # Revenue from bookings
-        revenue_query = select(func.sum(Booking.final_amount)).where(
+        revenue_query = select(func.sum(Booking.total_amount)).where(
             and_(Booking.event_id == event_id, Booking.status == "confirmed")
         )
         total_revenue = float((await self.db.execute(revenue_query)).scalar_one() or 0)
 
         # Reviews
-        reviews_query = select(func.count(Review.id), func.avg(Review.rating)).where(
+        reviews_query = select(func.count(Review.id), func.avg(Review.overall_rating)).where(
             Review.event_id == event_id
         )
         review_result = await self.db.execute(reviews_query)
@@ -153,7 +153,7 @@ class AnalyticsRepository:
             return {}
 
         # Review analytics
-        reviews_query = select(func.count(Review.id), func.avg(Review.rating)).where(
+        reviews_query = select(func.count(Review.id), func.avg(Review.overall_rating)).where(
             Review.vendor_id == vendor_id
         )
         review_result = await self.db.execute(reviews_query)
@@ -176,7 +176,7 @@ class AnalyticsRepository:
         cancelled_bookings = (await self.db.execute(cancelled_bookings_query)).scalar_one()
 
         # Revenue
-        revenue_query = select(func.sum(Booking.final_amount)).where(
+        revenue_query = select(func.sum(Booking.total_amount)).where(
             and_(Booking.vendor_id == vendor_id, Booking.status == "confirmed")
         )
         total_revenue = float((await self.db.execute(revenue_query)).scalar_one() or 0)
@@ -320,7 +320,7 @@ class AnalyticsRepository:
         # Financial summary (for user's events)
         user_events_subquery = select(Event.id).where(Event.created_by == user_id).scalar_subquery()
 
-        revenue_query = select(func.sum(Booking.final_amount)).where(
+        revenue_query = select(func.sum(Booking.total_amount)).where(
             and_(
                 Booking.event_id.in_(user_events_subquery),
                 Booking.status == "confirmed"
@@ -9,6 +9,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 from datetime import datetime
 
+from app.core.loaders import get_loader
 from app.models.event import (
     Event,
     EventOrganizer,
@@ -113,21 +114,22 @@ class EventRepository:
         Returns:
             Event object or None
         """
+        if not load_relationships:
+            # Batched and memoized for the rest of the request
+            return await get_loader(self.db, Event, Event.deleted_at.is_(None)).load(event_id)
+
         query = select(Event).where(
             and_(
                 Event.id == event_id,
                 Event.deleted_at.is_(None)
             )
+        ).options(
+            selectinload(Event.organizers),
+            selectinload(Event.phases),
+            selectinload(Event.milestones),
+            selectinload(Event.cultural_elements)
         )
 
-        if load_relationships:
-            query = query.options(
-                selectinload(Event.organizers),
-                selectinload(Event.phases),
-                selectinload(Event.milestones),
-                selectinload(Event.cultural_elements)
-            )
-
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
@@ -227,6 +229,7 @@ class EventRepository:
         event.deleted_at = datetime.utcnow()
         event.status = EventStatus.CANCELLED
         await self.db.commit()
+        get_loader(self.db, Event, Event.deleted_at.is_(None)).clear(event_id)
         return True
 
     async def advance_phase(self, event_id: str) -> Optional[Event]:
@@ -12,6 +12,7 @@ from typing import Optional, List
 from datetime import datetime
 from uuid import UUID
 
+from app.core.bulk import bulk_insert_returning
 from app.models.guest import (
     Guest, GuestGroup, GuestInvitation, RSVPResponse,
     SeatingArrangement, GuestCheckIn, DietaryRestriction,
@@ -127,21 +128,16 @@ class GuestRepository:
         return True
 
     async def bulk_create_guests(self, guests_data: List[GuestCreate], created_by: UUID) -> List[Guest]:
-        """Bulk create guests"""
-        guests = []
-        for guest_data in guests_data:
-            guest = Guest(
+        """Bulk create guests with multi-row INSERT ... RETURNING"""
+        rows = [
+            {
                 **guest_data.model_dump(exclude={'event_id'}),
-                event_id=guest_data.event_id,
-                created_by=created_by
-            )
-            guests.append(guest)
-            self.db.add(guest)
-
-        await self.db.flush()
-        for guest in guests:
-            await self.db.refresh(guest)
-        return guests
+                'event_id': guest_data.event_id,
+                'created_by': created_by
+            }
+            for guest_data in guests_data
+        ]
+        return await bulk_insert_returning(self.db, Guest, rows)
 
     async def get_guest_count(self, event_id: UUID, **filters) -> int:
         """Get total guest count for an event with filters"""
@@ -11,6 +11,7 @@ from typing import List, Optional, Tuple
 from datetime import datetime, timedelta
 from uuid import UUID
 
+from app.core.pagination import CountStrategy, PageInfo, invalidate_on_commit, paginate, normalize_filters
 from app.models.messaging import (
     Conversation,
     ConversationParticipant,
@@ -33,6 +34,10 @@ from app.schemas.messaging import (
 )
 
 
+# Count cache namespace of the conversation listing
+CONVERSATIONS_COUNT_NAMESPACE = "messaging.conversations"
+
+
 class MessagingRepository:
     """Repository for messaging data access"""
 
@@ -81,6 +86,7 @@ class MessagingRepository:
                 self.db.add(participant)
 
         await self.db.flush()
+        invalidate_on_commit(self.db, CONVERSATIONS_COUNT_NAMESPACE)
         await self.db.refresh(conversation)
 
         return conversation
@@ -156,6 +162,7 @@ class MessagingRepository:
         conversation.updated_at = datetime.utcnow()
 
         await self.db.flush()
+        invalidate_on_commit(self.db, CONVERSATIONS_COUNT_NAMESPACE)
         await self.db.refresh(conversation)
 
         return conversation
@@ -170,6 +177,7 @@ class MessagingRepository:
         conversation.archived_at = datetime.utcnow()
 
         await self.db.flush()
+        invalidate_on_commit(self.db, CONVERSATIONS_COUNT_NAMESPACE)
         return True
 
     async def list_user_conversations(
@@ -177,8 +185,9 @@ class MessagingRepository:
         user_id: UUID,
         filters: Optional[ConversationFilters] = None,
         page: int = 1,
-        page_size: int = 20
-    ) -> Tuple[List[Conversation], int]:
+        page_size: int = 20,
+        count_strategy: CountStrategy = CountStrategy.EXACT
+    ) -> Tuple[List[Conversation], PageInfo]:
         """List conversations for a user"""
         # Base query - conversations where user is a participant
         query = select(Conversation).join(
@@ -211,27 +220,25 @@ class MessagingRepository:
             if filters.event_id:
                 query = query.where(Conversation.event_id == filters.event_id)
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
-
-        # Sort by last message time (most recent first)
-        query = query.order_by(desc(Conversation.last_message_at))
-
-        # Pagination
-        query = query.offset((page - 1) * page_size).limit(page_size)
-
-        # Load relations
-        query = query.options(
-            selectinload(Conversation.participants).joinedload(ConversationParticipant.user)
+        # Count, sort by last message time (most recent first) and paginate
+        return await paginate(
+            self.db,
+            query,
+            page,
+            page_size,
+            strategy=count_strategy,
+            cache_key=normalize_filters(
+                CONVERSATIONS_COUNT_NAMESPACE,
+                filters,
+                user_id=str(user_id)
+            ),
+            order_by=[desc(Conversation.last_message_at)],
+            options=[
+                selectinload(Conversation.participants).joinedload(ConversationParticipant.user)
+            ],
+            unique=True
         )
 
-        result = await self.db.execute(query)
-        conversations = result.scalars().unique().all()
-
-        return list(conversations), total
-
     # ========================================================================
     # Participant Operations
     # ========================================================================
@@ -250,6 +257,7 @@ class MessagingRepository:
 
         self.db.add(participant)
         await self.db.flush()
+        invalidate_on_commit(self.db, CONVERSATIONS_COUNT_NAMESPACE)
         await self.db.refresh(participant)
 
         return participant
@@ -285,6 +293,7 @@ class MessagingRepository:
                 setattr(participant, key, value)
 
         await self.db.flush()
+        invalidate_on_commit(self.db, CONVERSATIONS_COUNT_NAMESPACE)
         await self.db.refresh(participant)
 
         return participant
@@ -303,6 +312,7 @@ class MessagingRepository:
         participant.left_at = datetime.utcnow()
 
         await self.db.flush()
+        invalidate_on_commit(self.db, CONVERSATIONS_COUNT_NAMESPACE)
         return True
 
     async def is_participant(
@@ -387,6 +397,7 @@ class MessagingRepository:
         )
 
         await self.db.flush()
+        invalidate_on_commit(self.db, CONVERSATIONS_COUNT_NAMESPACE)
         await self.db.refresh(message)
 
         return message
@@ -661,6 +672,7 @@ class MessagingRepository:
         )
 
         await self.db.flush()
+        invalidate_on_commit(self.db, CONVERSATIONS_COUNT_NAMESPACE)
 
         return count
 
@@ -0,0 +1,617 @@
+"""
+Metric Rollup Repository
+Sprint 22: Performance & Optimization
+
+Repository layer for pre-aggregated metric rollups.
+
+Raw PerformanceMetric points (and per-minute route latency sketches) are
+compacted into 1-minute, 1-hour and 1-day tiers holding count, sum, min,
+max, error count and a serialized LatencySketch. Window queries are split
+into segments served by the coarsest tier that covers them; only the
+not-yet-compacted tail is read from raw data.
+
+On PostgreSQL each tier table is range-partitioned by bucket_start (daily,
+monthly and yearly partitions) so retention drops whole partitions.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, func, and_, case, cast, literal, text, type_coerce
+from sqlalchemy import DateTime, Integer, String
+from typing import List, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta
+import math
+
+from app.core.bulk import bulk_upsert
+from app.core.sketch import LatencySketch, MIN_TRACKED_VALUE
+from app.models.performance import (
+    PerformanceMetric, LatencySketchRecord,
+    MetricRollupMinute, MetricRollupHour, MetricRollupDay, MetricRollupState
+)
+
+
+# Tiers from finest to coarsest
+TIERS = ("1m", "1h", "1d")
+
+TIER_MODELS = {
+    "1m": MetricRollupMinute,
+    "1h": MetricRollupHour,
+    "1d": MetricRollupDay,
+}
+
+TIER_WIDTH = {
+    "1m": timedelta(minutes=1),
+    "1h": timedelta(hours=1),
+    "1d": timedelta(days=1),
+}
+
+# Partition granularity per tier (PostgreSQL)
+PARTITION_UNIT = {
+    "1m": "day",
+    "1h": "month",
+    "1d": "year",
+}
+
+# Metric type under which per-route request latency sketches are rolled up
+ROUTE_LATENCY = "route_latency"
+
+SKETCH_ACCURACY = 0.01
+
+# Bucket index base of LatencySketch.add at SKETCH_ACCURACY
+SKETCH_LOG_GAMMA = math.log((1 + SKETCH_ACCURACY) / (1 - SKETCH_ACCURACY))
+
+# Bucket truncation per tier: PostgreSQL date_trunc unit, SQLite strftime
+# format in SQLAlchemy's DateTime storage format
+BUCKET_TRUNC_UNIT = {
+    "1m": "minute",
+    "1h": "hour",
+    "1d": "day",
+}
+SQLITE_BUCKET_FORMAT = {
+    "1m": "%Y-%m-%d %H:%M:00.000000",
+    "1h": "%Y-%m-%d %H:00:00.000000",
+    "1d": "%Y-%m-%d 00:00:00.000000",
+}
+
+EPOCH = datetime(1970, 1, 1)
+
+# (metric_type, dimension, bucket_start or None) -> aggregate
+AggregateMap = Dict[Tuple[str, str, Optional[datetime]], "RollupAggregate"]
+
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+def floor_time(value: datetime, width: timedelta) -> datetime:
+    """Align a timestamp down to a bucket boundary"""
+    seconds = int(width.total_seconds())
+    offset = int((value - EPOCH).total_seconds()) // seconds * seconds
+    return EPOCH + timedelta(seconds=offset)
+
+
+def ceil_time(value: datetime, width: timedelta) -> datetime:
+    """Align a timestamp up to a bucket boundary"""
+    floored = floor_time(value, width)
+    return floored if floored == value else floored + width
+
+
+def metric_dimension(metric_type: str, tags: Optional[Dict[str, Any]]) -> str:
+    """Rollup dimension of a raw metric point"""
+    if not tags:
+        return ""
+    if metric_type == "api_latency" and tags.get("endpoint"):
+        return f"{tags.get('method', 'GET')} {tags['endpoint']}"
+    if metric_type == "db_query_time" and tags.get("table"):
+        return f"{tags.get('type', 'SELECT')}:{tags['table']}"
+    return ""
+
+
+def plan_segments(
+    start: datetime,
+    end: datetime,
+    watermarks: Dict[str, datetime],
+    tiers: Tuple[str, ...] = ("1d", "1h", "1m")
+) -> List[Tuple[str, datetime, datetime]]:
+    """
+    Split [start, end) into segments served by the coarsest compacted tier.
+
+    A tier can serve whole buckets that end at or before its watermark;
+    the edges fall through to finer tiers and finally to raw data.
+
+    Returns:
+        List of (tier or "raw", segment start, segment end)
+    """
+    if start >= end:
+        return []
+    if not tiers:
+        return [("raw", start, end)]
+
+    tier, finer = tiers[0], tiers[1:]
+    watermark = watermarks.get(tier)
+    if watermark is None:
+        return plan_segments(start, end, watermarks, finer)
+
+    width = TIER_WIDTH[tier]
+    inner_start = ceil_time(start, width)
+    inner_end = floor_time(min(end, watermark), width)
+    if inner_start >= inner_end:
+        return plan_segments(start, end, watermarks, finer)
+
+    return (
+        plan_segments(start, inner_start, watermarks, finer)
+        + [(tier, inner_start, inner_end)]
+        + plan_segments(inner_end, end, watermarks, finer)
+    )
+
+
+class RollupAggregate:
+    """Count, sum, min, max, errors and sketch of a set of metric points"""
+
+    __slots__ = ("count", "sum", "min", "max", "errors", "sketch")
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.errors = 0
+        self.sketch = LatencySketch(SKETCH_ACCURACY)
+
+    def add(self, value: float, error: bool = False):
+        """Add one raw point"""
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        if error:
+            self.errors += 1
+        self.sketch.add(value)
+
+    def merge_parts(
+        self,
+        count: int,
+        total: float,
+        minimum: Optional[float],
+        maximum: Optional[float],
+        errors: int,
+        sketch: LatencySketch
+    ) -> "RollupAggregate":
+        """Merge a pre-aggregated bucket"""
+        if not count:
+            return self
+        self.count += count
+        self.sum += total
+        if minimum is not None:
+            self.min = minimum if self.min is None else min(self.min, minimum)
+        if maximum is not None:
+            self.max = maximum if self.max is None else max(self.max, maximum)
+        self.errors += errors
+        self.sketch.merge(sketch)
+        return self
+
+    def merge(self, other: "RollupAggregate") -> "RollupAggregate":
+        """Merge another aggregate"""
+        return self.merge_parts(
+            other.count, other.sum, other.min, other.max, other.errors, other.sketch
+        )
+
+    @property
+    def avg(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def to_row(self, metric_type: str, dimension: str, bucket_start: datetime) -> Dict[str, Any]:
+        """Column values for a rollup tier row"""
+        return {
+            "metric_type": metric_type,
+            "dimension": dimension,
+            "bucket_start": bucket_start,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min,
+            "max": self.max,
+            "error_count": self.errors,
+            "sketch": self.sketch.to_bytes()
+        }
+
+
+def _aggregate_for(aggregates: AggregateMap, key: Tuple[str, str, Optional[datetime]]) -> RollupAggregate:
+    aggregate = aggregates.get(key)
+    if aggregate is None:
+        aggregate = aggregates[key] = RollupAggregate()
+    return aggregate
+
+
+class MetricRollupRepository:
+    """Repository for metric rollup tiers"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    # ========================================================================
+    # Watermarks
+    # ========================================================================
+
+    async def get_watermarks(self) -> Dict[str, datetime]:
+        """Get the compaction watermark of every tier"""
+        result = await self.db.execute(
+            select(MetricRollupState.tier, MetricRollupState.compacted_until)
+        )
+        return {tier: until for tier, until in result.all()}
+
+    async def set_watermark(self, tier: str, compacted_until: datetime):
+        """Advance a tier's compaction watermark"""
+        await bulk_upsert(
+            self.db,
+            MetricRollupState,
+            [{"tier": tier, "compacted_until": compacted_until, "updated_at": datetime.utcnow()}],
+            conflict_columns=["tier"]
+        )
+
+    async def get_earliest_source_time(self, tier: str) -> Optional[datetime]:
+        """Earliest data point a tier would be compacted from"""
+        if tier == "1m":
+            raw_result = await self.db.execute(select(func.min(PerformanceMetric.recorded_at)))
+            sketch_result = await self.db.execute(select(func.min(LatencySketchRecord.bucket_start)))
+            candidates = [t for t in (raw_result.scalar(), sketch_result.scalar()) if t is not None]
+            return min(candidates) if candidates else None
+
+        source_model = TIER_MODELS[TIERS[TIERS.index(tier) - 1]]
+        result = await self.db.execute(select(func.min(source_model.bucket_start)))
+        return result.scalar()
+
+    # ========================================================================
+    # Source Aggregation
+    # ========================================================================
+
+    async def aggregate_raw(
+        self,
+        start: datetime,
+        end: datetime,
+        metric_type: Optional[str] = None,
+        bucket_width: Optional[timedelta] = None
+    ) -> AggregateMap:
+        """
+        Aggregate raw points in [start, end).
+
+        Reads PerformanceMetric rows and, for ROUTE_LATENCY, the per-minute
+        route latency sketches.
+
+        Args:
+            bucket_width: Group by time bucket of this width (None: whole range)
+        """
+        aggregates: AggregateMap = {}
+
+        if metric_type != ROUTE_LATENCY:
+            filters = [
+                PerformanceMetric.recorded_at >= start,
+                PerformanceMetric.recorded_at < end
+            ]
+            if metric_type:
+                filters.append(PerformanceMetric.metric_type == metric_type)
+
+            stmt = select(
+                PerformanceMetric.metric_type,
+                PerformanceMetric.metric_value,
+                PerformanceMetric.tags,
+                PerformanceMetric.recorded_at
+            ).where(and_(*filters)).execution_options(yield_per=5000)
+
+            result = await self.db.stream(stmt)
+            async for m_type, value, tags, recorded_at in result:
+                bucket = floor_time(recorded_at, bucket_width) if bucket_width else None
+                key = (m_type, metric_dimension(m_type, tags), bucket)
+                _aggregate_for(aggregates, key).add(
+                    value, error=bool(tags and tags.get("error"))
+                )
+
+        if metric_type in (None, ROUTE_LATENCY):
+            stmt = select(
+                LatencySketchRecord.method,
+                LatencySketchRecord.route,
+                LatencySketchRecord.bucket_start,
+                LatencySketchRecord.error_count,
+                LatencySketchRecord.sketch
+            ).where(and_(
+                LatencySketchRecord.bucket_start >= start,
+                LatencySketchRecord.bucket_start < end
+            ))
+
+            result = await self.db.execute(stmt)
+            for method, route, bucket_start, error_count, data in result.all():
+                sketch = LatencySketch.from_bytes(data)
+                bucket = floor_time(bucket_start, bucket_width) if bucket_width else None
+                key = (ROUTE_LATENCY, f"{method} {route}", bucket)
+                _aggregate_for(aggregates, key).merge_parts(
+                    sketch.count, sketch.sum, sketch.min, sketch.max, error_count, sketch
+                )
+
+        return aggregates
+
+    async def aggregate_raw_buckets(self, start: datetime, end: datetime, tier: str = "1m") -> AggregateMap:
+        """
+        Aggregate raw points in [start, end) per bucket of a tier, grouped
+        by the database.
+
+        Count, sum, min, max and errors come from one GROUP BY; the sketches
+        from a second one per sketch bucket index, so only grouped rows are
+        read whatever the point volume. Route latency sketches are merged
+        as in ``aggregate_raw``.
+        """
+        tags = PerformanceMetric.tags
+        metric_type = PerformanceMetric.metric_type
+        value = PerformanceMetric.metric_value
+
+        endpoint, table = self._tag(tags, "endpoint"), self._tag(tags, "table")
+        dimension = case(
+            (
+                and_(metric_type == "api_latency", func.coalesce(endpoint, "") != ""),
+                func.coalesce(self._tag(tags, "method"), "GET") + " " + endpoint
+            ),
+            (
+                and_(metric_type == "db_query_time", func.coalesce(table, "") != ""),
+                func.coalesce(self._tag(tags, "type"), "SELECT") + ":" + table
+            ),
+            else_=""
+        )
+        error = case(
+            (func.coalesce(self._tag(tags, "error"), "").in_(["", "false", "0"]), 0),
+            else_=1
+        )
+        sketch_index = case(
+            (value <= MIN_TRACKED_VALUE, None),
+            else_=cast(func.ceil(func.ln(value) / literal(SKETCH_LOG_GAMMA)), Integer)
+        )
+
+        points = select(
+            metric_type.label("metric_type"),
+            dimension.label("dimension"),
+            self._bucket_start(PerformanceMetric.recorded_at, tier).label("bucket_start"),
+            value.label("value"),
+            error.label("error"),
+            sketch_index.label("sketch_index")
+        ).where(and_(
+            PerformanceMetric.recorded_at >= start,
+            PerformanceMetric.recorded_at < end
+        )).subquery()
+        key_columns = (points.c.metric_type, points.c.dimension, points.c.bucket_start)
+
+        # Sketch bucket counts per rollup bucket (None: zero bucket)
+        sketches: Dict[Tuple[str, str, datetime], LatencySketch] = {}
+        result = await self.db.execute(
+            select(*key_columns, points.c.sketch_index, func.count())
+            .group_by(*key_columns, points.c.sketch_index)
+        )
+        for m_type, dimension_value, bucket, index, count in result.all():
+            sketch = sketches.get((m_type, dimension_value, bucket))
+            if sketch is None:
+                sketch = sketches[(m_type, dimension_value, bucket)] = LatencySketch(SKETCH_ACCURACY)
+            if index is None:
+                sketch.zero_count += count
+            else:
+                sketch.buckets[int(index)] = count
+
+        aggregates: AggregateMap = {}
+        result = await self.db.execute(
+            select(
+                *key_columns,
+                func.count(), func.sum(points.c.value), func.min(points.c.value),
+                func.max(points.c.value), func.sum(points.c.error)
+            ).group_by(*key_columns)
+        )
+        for m_type, dimension_value, bucket, count, total, minimum, maximum, errors in result.all():
+            sketch = sketches.get((m_type, dimension_value, bucket)) or LatencySketch(SKETCH_ACCURACY)
+            sketch.count, sketch.sum, sketch.min, sketch.max = count, total, minimum, maximum
+            _aggregate_for(aggregates, (m_type, dimension_value, bucket)).merge_parts(
+                count, total, minimum, maximum, errors or 0, sketch
+            )
+
+        route_latency = await self.aggregate_raw(
+            start, end, metric_type=ROUTE_LATENCY, bucket_width=TIER_WIDTH[tier]
+        )
+        for key, aggregate in route_latency.items():
+            _aggregate_for(aggregates, key).merge(aggregate)
+
+        return aggregates
+
+    @staticmethod
+    def _tag(tags, name: str):
+        """A JSON tag as text (NULL when missing)"""
+        return cast(tags[name].as_string(), String)
+
+    def _bucket_start(self, column, tier: str):
+        """Start of a timestamp's bucket in a tier, computed by the database"""
+        dialect_name = self.db.get_bind().dialect.name
+        if dialect_name == "postgresql":
+            bucket = func.date_trunc(BUCKET_TRUNC_UNIT[tier], column)
+        elif dialect_name == "sqlite":
+            bucket = func.strftime(SQLITE_BUCKET_FORMAT[tier], column)
+        else:
+            raise NotImplementedError(f"Metric compaction is not supported on {dialect_name}")
+        return type_coerce(bucket, DateTime)
+
+    async def aggregate_tier(
+        self,
+        tier: str,
+        start: datetime,
+        end: datetime,
+        metric_type: Optional[str] = None,
+        bucket_width: Optional[timedelta] = None
+    ) -> AggregateMap:
+        """Aggregate stored buckets of a tier in [start, end)"""
+        model = TIER_MODELS[tier]
+        filters = [model.bucket_start >= start, model.bucket_start < end]
+        if metric_type:
+            filters.append(model.metric_type == metric_type)
+
+        stmt = select(
+            model.metric_type, model.dimension, model.bucket_start,
+            model.count, model.sum, model.min, model.max,
+            model.error_count, model.sketch
+        ).where(and_(*filters))
+
+        aggregates: AggregateMap = {}
+        result = await self.db.execute(stmt)
+        for m_type, dimension, bucket_start, count, total, minimum, maximum, errors, data in result.all():
+            bucket = floor_time(bucket_start, bucket_width) if bucket_width else None
+            _aggregate_for(aggregates, (m_type, dimension, bucket)).merge_parts(
+                count, total, minimum, maximum, errors, LatencySketch.from_bytes(data)
+            )
+
+        return aggregates
+
+    async def upsert_rollups(self, tier: str, aggregates: AggregateMap) -> int:
+        """Write time-bucketed aggregates into a tier"""
+        rows = [
+            aggregate.to_row(m_type, dimension, bucket)
+            for (m_type, dimension, bucket), aggregate in aggregates.items()
+            if bucket is not None and aggregate.count
+        ]
+        if not rows:
+            return 0
+
+        await self.ensure_partitions(
+            tier,
+            min(row["bucket_start"] for row in rows),
+            max(row["bucket_start"] for row in rows)
+        )
+        return await bulk_upsert(
+            self.db,
+            TIER_MODELS[tier],
+            rows,
+            conflict_columns=["metric_type", "dimension", "bucket_start"]
+        )
+
+    # ========================================================================
+    # Queries
+    # ========================================================================
+
+    async def get_aggregates(
+        self,
+        metric_type: str,
+        start: datetime,
+        end: Optional[datetime] = None
+    ) -> Dict[str, RollupAggregate]:
+        """
+        Aggregate a metric per dimension over [start, end).
+
+        The window start is aligned down to the minute; each segment is read
+        from the coarsest tier compacted for it.
+        """
+        end = end or datetime.utcnow()
+        start = floor_time(start, TIER_WIDTH["1m"])
+        watermarks = await self.get_watermarks()
+
+        by_dimension: Dict[str, RollupAggregate] = {}
+        for tier, seg_start, seg_end in plan_segments(start, end, watermarks):
+            if tier == "raw":
+                aggregates = await self.aggregate_raw(seg_start, seg_end, metric_type)
+            else:
+                aggregates = await self.aggregate_tier(tier, seg_start, seg_end, metric_type)
+
+            for (_, dimension, _), aggregate in aggregates.items():
+                if dimension in by_dimension:
+                    by_dimension[dimension].merge(aggregate)
+                else:
+                    by_dimension[dimension] = aggregate
+
+        return by_dimension
+
+    async def get_total(
+        self,
+        metric_type: str,
+        start: datetime,
+        end: Optional[datetime] = None
+    ) -> RollupAggregate:
+        """Aggregate a metric over [start, end) across all dimensions"""
+        total = RollupAggregate()
+        for aggregate in (await self.get_aggregates(metric_type, start, end)).values():
+            total.merge(aggregate)
+        return total
+
+    # ========================================================================
+    # Partitions & Retention
+    # ========================================================================
+
+    def _is_postgresql(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    @staticmethod
+    def partition_bounds(tier: str, moment: datetime) -> Tuple[datetime, datetime]:
+        """Range of the partition containing a timestamp"""
+        unit = PARTITION_UNIT[tier]
+        if unit == "day":
+            lower = datetime(moment.year, moment.month, moment.day)
+            return lower, lower + timedelta(days=1)
+        if unit == "month":
+            lower = datetime(moment.year, moment.month, 1)
+            upper = datetime(moment.year + moment.month // 12, moment.month % 12 + 1, 1)
+            return lower, upper
+        lower = datetime(moment.year, 1, 1)
+        return lower, datetime(moment.year + 1, 1, 1)
+
+    @staticmethod
+    def partition_name(tier: str, lower: datetime) -> str:
+        fmt = {"day": "%Y%m%d", "month": "%Y%m", "year": "%Y"}[PARTITION_UNIT[tier]]
+        return f"{TIER_MODELS[tier].__tablename__}_p{lower.strftime(fmt)}"
+
+    async def ensure_partitions(self, tier: str, start: datetime, end: datetime):
+        """Create the partitions covering [start, end] (PostgreSQL only)"""
+        if not self._is_postgresql():
+            return
+
+        parent = TIER_MODELS[tier].__tablename__
+        lower, upper = self.partition_bounds(tier, start)
+        while lower <= end:
+            name = self.partition_name(tier, lower)
+            await self.db.execute(text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{parent}" '
+                f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+            ))
+            lower, upper = self.partition_bounds(tier, upper)
+
+    async def drop_expired(self, tier: str, cutoff: datetime) -> int:
+        """
+        Remove tier data older than the cutoff.
+
+        PostgreSQL drops every partition that ends at or before the cutoff;
+        other databases fall back to a range DELETE.
+
+        Returns:
+            Dropped partitions (PostgreSQL) or deleted rows
+        """
+        model = TIER_MODELS[tier]
+        if not self._is_postgresql():
+            result = await self.db.execute(delete(model).where(model.bucket_start < cutoff))
+            return result.rowcount
+
+        result = await self.db.execute(text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent"
+        ), {"parent": model.__tablename__})
+
+        fmt = {"day": "%Y%m%d", "month": "%Y%m", "year": "%Y"}[PARTITION_UNIT[tier]]
+        prefix = f"{model.__tablename__}_p"
+
+        dropped = 0
+        for (name,) in result.all():
+            if not name.startswith(prefix):
+                continue
+            try:
+                lower = datetime.strptime(name[len(prefix):], fmt)
+            except ValueError:
+                continue
+            _, upper = self.partition_bounds(tier, lower)
+            if upper <= cutoff:
+                await self.db.execute(text(f'DROP TABLE IF EXISTS "{name}"'))
+                dropped += 1
+
+        return dropped
+
+    async def delete_latency_sketches_before(self, cutoff: datetime) -> int:
+        """Delete per-minute route latency sketches older than the cutoff"""
+        result = await self.db.execute(
+            delete(LatencySketchRecord).where(LatencySketchRecord.bucket_start < cutoff)
+        )
+        return result.rowcount
@@ -5,12 +5,13 @@ FR-008: Multi-channel Notification System
 Data access layer for notifications
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, desc, asc, update, delete
+from sqlalchemy import select, insert, func, and_, or_, desc, asc, update, delete
 from sqlalchemy.orm import joinedload, selectinload
 from typing import List, Optional, Tuple, Dict
 from datetime import datetime, timedelta
 from uuid import UUID
 
+from app.core.bulk import bulk_insert_returning, bulk_execute
 from app.models.notification import (
     Notification,
     NotificationDelivery,
@@ -78,6 +79,51 @@ class NotificationRepository:
 
         return notification
 
+    async def bulk_create_notifications(
+        self,
+        notifications_data: List[NotificationCreate]
+    ) -> List[Notification]:
+        """
+        Create many notifications with set-based inserts
+
+        Notifications are inserted with multi-row INSERT ... RETURNING and
+        their per-channel delivery records with chunked executemany.
+        """
+        rows = [
+            {
+                "user_id": data.user_id,
+                "type": data.type.value,
+                "priority": data.priority.value,
+                "title": data.title,
+                "message": data.message,
+                "data": data.data,
+                "action_url": data.action_url,
+                "action_text": data.action_text,
+                "context_type": data.context_type,
+                "context_id": data.context_id,
+                "actor_id": data.actor_id,
+                "channels": [ch.value for ch in data.channels],
+                "group_key": data.group_key,
+                "expires_at": data.expires_at,
+                "status": NotificationStatus.PENDING.value
+            }
+            for data in notifications_data
+        ]
+        notifications = await bulk_insert_returning(self.db, Notification, rows)
+
+        delivery_rows = [
+            {
+                "notification_id": notification.id,
+                "channel": channel.value,
+                "status": DeliveryStatus.PENDING.value
+            }
+            for notification, data in zip(notifications, notifications_data)
+            for channel in data.channels
+        ]
+        await bulk_execute(self.db, insert(NotificationDelivery), delivery_rows)
+
+        return notifications
+
     async def get_notification_by_id(
         self,
         notification_id: UUID,
@@ -6,13 +6,14 @@ Repository layer for performance metrics, caching, and monitoring.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete, func, and_, or_, desc
+from sqlalchemy import select, delete, insert, func, and_, or_, desc
 from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from datetime import datetime, timedelta
-import statistics
 
-from app.models.performance import PerformanceMetric, CacheEntry
+from app.core.bulk import bulk_execute
+from app.models.performance import PerformanceMetric, CacheEntry, LatencySketchRecord
+from app.repositories.metric_rollup_repository import MetricRollupRepository, ROUTE_LATENCY
 from app.schemas.performance import (
     PerformanceMetricCreate, PerformanceMetricQuery,
     CacheEntryCreate
@@ -45,6 +46,13 @@ class PerformanceRepository:
         await self.db.flush()
         return metric
 
+    async def record_metrics_batch(
+        self,
+        rows: List[Dict[str, Any]]
+    ) -> int:
+        """Record pre-aggregated metric points in one batch"""
+        return await bulk_execute(self.db, insert(PerformanceMetric), rows)
+
     async def get_metric_by_id(
         self,
         metric_id: UUID
@@ -88,19 +96,13 @@ class PerformanceRepository:
         start_date: datetime,
         end_date: datetime
     ) -> Dict[str, Any]:
-        """Get aggregated statistics for a metric type"""
-        stmt = select(PerformanceMetric).where(
-            and_(
-                PerformanceMetric.metric_type == metric_type,
-                PerformanceMetric.recorded_at >= start_date,
-                PerformanceMetric.recorded_at <= end_date
-            )
+        """Get aggregated statistics for a metric type from rollups"""
+        # Rollup windows are half-open; points recorded at end_date count
+        total = await MetricRollupRepository(self.db).get_total(
+            metric_type, start_date, end_date + timedelta(microseconds=1)
         )
 
-        result = await self.db.execute(stmt)
-        metrics = result.scalars().all()
-
-        if not metrics:
+        if not total.count:
             return {
                 "count": 0,
                 "avg": 0,
@@ -111,17 +113,14 @@ class PerformanceRepository:
                 "p99": 0
             }
 
-        values = [m.metric_value for m in metrics]
-        values_sorted = sorted(values)
-
         return {
-            "count": len(values),
-            "avg": statistics.mean(values),
-            "min": min(values),
-            "max": max(values),
-            "p50": self._percentile(values_sorted, 50),
-            "p95": self._percentile(values_sorted, 95),
-            "p99": self._percentile(values_sorted, 99)
+            "count": total.count,
+            "avg": total.avg,
+            "min": total.min,
+            "max": total.max,
+            "p50": total.sketch.percentile(50),
+            "p95": total.sketch.percentile(95),
+            "p99": total.sketch.percentile(99)
         }
 
     async def get_metric_types(self) -> List[str]:
@@ -132,17 +131,31 @@ class PerformanceRepository:
 
     async def delete_old_metrics(
         self,
-        days_to_keep: int = 30
+        days_to_keep: int = 30,
+        batch_size: int = 10000
     ) -> int:
-        """Delete metrics older than specified days"""
+        """
+        Delete raw metrics older than specified days.
+
+        Deletes in batches so a large backlog does not hold locks or bloat
+        one transaction; aggregated history lives in the rollup tiers.
+        """
         cutoff_date = datetime.utcnow() - timedelta(days=days_to_keep)
 
-        stmt = delete(PerformanceMetric).where(
-            PerformanceMetric.recorded_at < cutoff_date
-        )
+        deleted = 0
+        while True:
+            batch = select(PerformanceMetric.id).where(
+                PerformanceMetric.recorded_at < cutoff_date
+            ).limit(batch_size)
 
-        result = await self.db.execute(stmt)
-        return result.rowcount
+            stmt = delete(PerformanceMetric).where(
+                PerformanceMetric.id.in_(batch.scalar_subquery())
+            )
+            result = await self.db.execute(stmt)
+            deleted += max(result.rowcount, 0)
+
+            if result.rowcount < batch_size:
+                return deleted
 
     async def get_recent_metrics_by_type(
         self,
@@ -295,62 +308,37 @@ class PerformanceRepository:
     # Analytics & Aggregations
     # ========================================================================
 
+    async def save_latency_sketches(
+        self,
+        records: List[Dict[str, Any]]
+    ) -> int:
+        """Persist serialized latency sketches in one batch"""
+        return await bulk_execute(self.db, insert(LatencySketchRecord), records)
+
     async def get_latency_by_endpoint(
         self,
         hours_back: int = 24
     ) -> List[Dict[str, Any]]:
-        """Get latency breakdown by endpoint"""
+        """Get latency breakdown by endpoint from merged route sketches"""
         since_date = datetime.utcnow() - timedelta(hours=hours_back)
+        by_route = await MetricRollupRepository(self.db).get_aggregates(ROUTE_LATENCY, since_date)
 
-        stmt = select(PerformanceMetric).where(
-            and_(
-                PerformanceMetric.metric_type == 'api_latency',
-                PerformanceMetric.recorded_at >= since_date
-            )
-        )
-
-        result = await self.db.execute(stmt)
-        metrics = result.scalars().all()
-
-        # Group by endpoint
-        endpoint_data = {}
-        for metric in metrics:
-            if not metric.tags or 'endpoint' not in metric.tags:
-                continue
-
-            endpoint = metric.tags['endpoint']
-            method = metric.tags.get('method', 'GET')
-            key = f"{method} {endpoint}"
-
-            if key not in endpoint_data:
-                endpoint_data[key] = {
-                    "endpoint": endpoint,
-                    "method": method,
-                    "values": [],
-                    "errors": 0
-                }
-
-            endpoint_data[key]["values"].append(metric.metric_value)
-            if metric.tags.get('error'):
-                endpoint_data[key]["errors"] += 1
-
-        # Calculate statistics for each endpoint
         results = []
-        for key, data in endpoint_data.items():
-            values = sorted(data["values"])
-            request_count = len(values)
-            error_count = data["errors"]
+        for dimension, aggregate in by_route.items():
+            if not aggregate.count:
+                continue
 
+            method, _, endpoint = dimension.partition(" ")
             results.append({
-                "endpoint": data["endpoint"],
-                "method": data["method"],
-                "avg_latency_ms": statistics.mean(values),
-                "p50_latency_ms": self._percentile(values, 50),
-                "p95_latency_ms": self._percentile(values, 95),
-                "p99_latency_ms": self._percentile(values, 99),
-                "request_count": request_count,
-                "error_count": error_count,
-                "error_rate": (error_count / request_count * 100) if request_count > 0 else 0
+                "endpoint": endpoint,
+                "method": method,
+                "avg_latency_ms": aggregate.avg,
+                "p50_latency_ms": aggregate.sketch.percentile(50),
+                "p95_latency_ms": aggregate.sketch.percentile(95),
+                "p99_latency_ms": aggregate.sketch.percentile(99),
+                "request_count": aggregate.count,
+                "error_count": aggregate.errors,
+                "error_rate": aggregate.errors / aggregate.count * 100
             })
 
         return sorted(results, key=lambda x: x["avg_latency_ms"], reverse=True)
@@ -359,20 +347,11 @@ class PerformanceRepository:
         self,
         hours_back: int = 1
     ) -> Dict[str, Any]:
-        """Get throughput statistics"""
+        """Get throughput statistics from rollups"""
         since_date = datetime.utcnow() - timedelta(hours=hours_back)
+        total = await MetricRollupRepository(self.db).get_total("request_count", since_date)
 
-        stmt = select(PerformanceMetric).where(
-            and_(
-                PerformanceMetric.metric_type == 'request_count',
-                PerformanceMetric.recorded_at >= since_date
-            )
-        )
-
-        result = await self.db.execute(stmt)
-        metrics = result.scalars().all()
-
-        total_requests = sum(m.metric_value for m in metrics)
+        total_requests = total.sum
         duration_hours = hours_back
 
         return {
@@ -387,52 +366,26 @@ class PerformanceRepository:
         self,
         hours_back: int = 24
     ) -> List[Dict[str, Any]]:
-        """Get database query statistics"""
+        """Get database query statistics from rollups"""
         since_date = datetime.utcnow() - timedelta(hours=hours_back)
+        by_query = await MetricRollupRepository(self.db).get_aggregates("db_query_time", since_date)
 
-        stmt = select(PerformanceMetric).where(
-            and_(
-                PerformanceMetric.metric_type == 'db_query_time',
-                PerformanceMetric.recorded_at >= since_date
-            )
-        )
-
-        result = await self.db.execute(stmt)
-        metrics = result.scalars().all()
-
-        # Group by query type and table
-        query_data = {}
-        for metric in metrics:
-            if not metric.tags or 'table' not in metric.tags:
-                continue
-
-            table = metric.tags['table']
-            query_type = metric.tags.get('type', 'SELECT')
-            key = f"{query_type}:{table}"
-
-            if key not in query_data:
-                query_data[key] = {
-                    "query_type": query_type,
-                    "table_name": table,
-                    "values": []
-                }
-
-            query_data[key]["values"].append(metric.metric_value)
-
-        # Calculate statistics
         results = []
-        for key, data in query_data.items():
-            values = data["values"]
-            slow_threshold = 50  # ms
+        slow_threshold = 50  # ms
+        for dimension, aggregate in by_query.items():
+            # Points without a table tag have no dimension
+            if not dimension or not aggregate.count:
+                continue
 
+            query_type, _, table = dimension.partition(":")
             results.append({
-                "query_type": data["query_type"],
-                "table_name": data["table_name"],
-                "avg_execution_time_ms": statistics.mean(values),
-                "min_execution_time_ms": min(values),
-                "max_execution_time_ms": max(values),
-                "total_executions": len(values),
-                "slow_query_count": sum(1 for v in values if v > slow_threshold)
+                "query_type": query_type,
+                "table_name": table,
+                "avg_execution_time_ms": aggregate.avg,
+                "min_execution_time_ms": aggregate.min,
+                "max_execution_time_ms": aggregate.max,
+                "total_executions": aggregate.count,
+                "slow_query_count": aggregate.sketch.count_above(slow_threshold)
             })
 
         return sorted(results, key=lambda x: x["avg_execution_time_ms"], reverse=True)
@@ -441,22 +394,6 @@ class PerformanceRepository:
     # Utility Methods
     # ========================================================================
 
-    def _percentile(self, sorted_values: List[float], percentile: int) -> float:
-        """Calculate percentile from sorted values"""
-        if not sorted_values:
-            return 0.0
-
-        index = (len(sorted_values) - 1) * percentile / 100
-        floor = int(index)
-        ceil = floor + 1
-
-        if ceil >= len(sorted_values):
-            return sorted_values[floor]
-
-        # Linear interpolation
-        fraction = index - floor
-        return sorted_values[floor] + (sorted_values[ceil] - sorted_values[floor]) * fraction
-
     async def get_metric_count_by_type(
         self,
         hours_back: int = 24
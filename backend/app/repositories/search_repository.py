@@ -6,22 +6,29 @@ Data access layer for search operations and Elasticsearch integration.
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, update, delete, desc
+from sqlalchemy import select, insert, func, and_, or_, update, delete, desc, case, bindparam, text
 from sqlalchemy.orm import selectinload
-from typing import Optional, List, Dict, Any
-from datetime import datetime, timedelta
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime
 from uuid import UUID
+import time
 from elasticsearch import AsyncElasticsearch
 
 from app.models.search import (
     SavedSearch, SearchAnalytics, SearchSuggestion,
-    SearchFilterPreset, VendorMatchingScore, SearchIndexStatus
+    SearchFilterPreset, VendorMatchingScore, SearchIndexStatus, SearchIndexOutbox,
+    SearchTrendingSketch
 )
+from app.core.bulk import bulk_execute, bulk_upsert
 from app.core.elasticsearch import (
     ElasticsearchClient, INDEX_VENDORS, INDEX_EVENTS, INDEX_SERVICES
 )
 
 
+# Last clock-based document version of this process (see next_document_version)
+_last_clock_version = 0
+
+
 class SearchRepository:
     """Repository for search operations"""
 
@@ -111,38 +118,36 @@ class SearchRepository:
         await self.db.refresh(analytics)
         return analytics
 
-    async def get_trending_queries(
-        self,
-        search_type: Optional[str] = None,
-        days: int = 7,
-        limit: int = 10
-    ) -> List[Dict[str, Any]]:
-        """Get trending search queries"""
-        since = datetime.utcnow() - timedelta(days=days)
-
-        query = select(
-            SearchAnalytics.query_text,
-            func.count(SearchAnalytics.id).label('search_count')
-        ).where(
-            and_(
-                SearchAnalytics.searched_at >= since,
-                SearchAnalytics.query_text.isnot(None),
-                SearchAnalytics.query_text != ''
-            )
+    async def create_search_analytics_batch(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert queued search analytics rows (caller commits)"""
+        return await bulk_execute(self.db, insert(SearchAnalytics), rows)
+
+    async def save_trending_sketches(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert or replace trending sketches per worker, search type and day (caller commits)"""
+        return await bulk_upsert(
+            self.db, SearchTrendingSketch, rows, ["worker_id", "search_type", "bucket_start"]
         )
 
+    async def get_trending_sketches(
+        self,
+        since: datetime,
+        search_type: Optional[str] = None
+    ) -> List[Any]:
+        """Trending sketches of all workers from a day on"""
+        query = select(SearchTrendingSketch.bucket_start, SearchTrendingSketch.counters).where(
+            SearchTrendingSketch.bucket_start >= since
+        )
         if search_type:
-            query = query.where(SearchAnalytics.search_type == search_type)
-
-        query = query.group_by(SearchAnalytics.query_text)
-        query = query.order_by(desc('search_count'))
-        query = query.limit(limit)
-
+            query = query.where(SearchTrendingSketch.search_type == search_type)
         result = await self.db.execute(query)
-        return [
-            {"query": row.query_text, "count": row.search_count}
-            for row in result
-        ]
+        return result.all()
+
+    async def delete_trending_sketches_before(self, cutoff: datetime) -> int:
+        """Expire old trending sketches (caller commits)"""
+        result = await self.db.execute(
+            delete(SearchTrendingSketch).where(SearchTrendingSketch.bucket_start < cutoff)
+        )
+        return result.rowcount
 
     async def get_search_analytics_summary(
         self,
@@ -442,6 +447,155 @@ class SearchRepository:
         )
         return result.scalars().all()
 
+    async def claim_index_sync(self, index_name: str, force: bool = False) -> bool:
+        """
+        Mark an index as being rebuilt.
+
+        Returns False when a rebuild is already marked in progress (unless
+        forced, e.g. after a rebuild that did not finish).
+        """
+        if await self.get_index_status(index_name) is None:
+            await self.create_or_update_index_status({"index_name": index_name, "entity_type": index_name})
+
+        query = update(SearchIndexStatus).where(SearchIndexStatus.index_name == index_name)
+        if not force:
+            query = query.where(SearchIndexStatus.sync_in_progress.isnot(True))
+        result = await self.db.execute(query.values(sync_in_progress=True))
+        await self.db.commit()
+        return result.rowcount == 1
+
+    async def get_indices_in_sync(self) -> List[str]:
+        """Names of indices currently being rebuilt"""
+        result = await self.db.execute(
+            select(SearchIndexStatus.index_name).where(SearchIndexStatus.sync_in_progress.is_(True))
+        )
+        return list(result.scalars().all())
+
+    # ========================================================================
+    # Search Index Outbox Operations
+    # ========================================================================
+
+    async def try_lock_outbox(self, lock_key: int) -> bool:
+        """
+        Take the outbox consumer lock for the current transaction.
+
+        Only one consumer processes the outbox at a time, which keeps the
+        changes of each document in order. Always granted on databases
+        without advisory locks.
+        """
+        if self.db.bind.dialect.name != "postgresql":
+            return True
+        result = await self.db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": lock_key}
+        )
+        return bool(result.scalar())
+
+    async def next_document_version(self) -> int:
+        """
+        External Elasticsearch version for the documents of one batch.
+
+        Taken under the consumer lock, so versions follow processing order:
+        documents are rebuilt from the rows as they are now, so a later batch
+        always holds the newer state, whatever the ids of its entries. Drawn
+        from the outbox id sequence, which is above every version written
+        before. Without advisory locks (a single consumer) the clock is used.
+        """
+        global _last_clock_version
+        if self.db.bind.dialect.name != "postgresql":
+            _last_clock_version = max(time.time_ns() // 1000, _last_clock_version + 1)
+            return _last_clock_version
+        result = await self.db.execute(
+            text("SELECT nextval(pg_get_serial_sequence('search_index_outbox', 'id'))")
+        )
+        return int(result.scalar())
+
+    async def get_outbox_batch(
+        self,
+        limit: int,
+        exclude_indices: Optional[List[str]] = None
+    ) -> List[SearchIndexOutbox]:
+        """Oldest pending outbox entries (not dead-lettered)"""
+        query = select(SearchIndexOutbox).where(SearchIndexOutbox.dead_lettered_at.is_(None))
+        if exclude_indices:
+            query = query.where(SearchIndexOutbox.index_name.notin_(exclude_indices))
+        result = await self.db.execute(query.order_by(SearchIndexOutbox.id).limit(limit))
+        return result.scalars().all()
+
+    async def delete_outbox_entries(self, entry_ids: List[int]) -> int:
+        """Remove processed outbox entries (caller commits)"""
+        if not entry_ids:
+            return 0
+        result = await self.db.execute(
+            delete(SearchIndexOutbox).where(SearchIndexOutbox.id.in_(entry_ids))
+        )
+        return result.rowcount
+
+    async def record_outbox_failures(self, errors: Dict[int, str], max_attempts: int) -> int:
+        """
+        Count a failed attempt per entry (caller commits).
+
+        Entries reaching ``max_attempts`` are dead-lettered.
+        """
+        if not errors:
+            return 0
+        table = SearchIndexOutbox.__table__
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("entry_id"))
+            .values(
+                attempts=table.c.attempts + 1,
+                last_error=bindparam("error"),
+                dead_lettered_at=case(
+                    (table.c.attempts + 1 >= max_attempts, bindparam("failed_at")),
+                    else_=None
+                )
+            )
+        )
+        now = datetime.utcnow()
+        return await bulk_execute(self.db, statement, [
+            {"entry_id": entry_id, "error": error[:2000], "failed_at": now}
+            for entry_id, error in errors.items()
+        ])
+
+    async def get_outbox_lag(self) -> Dict[str, Dict[str, Any]]:
+        """Pending entries, oldest pending change and dead letters per index"""
+        pending = SearchIndexOutbox.dead_lettered_at.is_(None)
+        result = await self.db.execute(
+            select(
+                SearchIndexOutbox.index_name,
+                func.count().filter(pending),
+                func.min(SearchIndexOutbox.created_at).filter(pending),
+                func.count().filter(SearchIndexOutbox.dead_lettered_at.isnot(None))
+            ).group_by(SearchIndexOutbox.index_name)
+        )
+        return {
+            index_name: {"pending": pending_count, "oldest_pending_at": oldest, "dead_letters": dead}
+            for index_name, pending_count, oldest, dead in result.all()
+        }
+
+    async def get_outbox_dead_letters(
+        self,
+        index_name: Optional[str] = None,
+        limit: int = 50
+    ) -> List[SearchIndexOutbox]:
+        """Dead-lettered outbox entries, newest first"""
+        query = select(SearchIndexOutbox).where(SearchIndexOutbox.dead_lettered_at.isnot(None))
+        if index_name:
+            query = query.where(SearchIndexOutbox.index_name == index_name)
+        result = await self.db.execute(
+            query.order_by(SearchIndexOutbox.dead_lettered_at.desc()).limit(limit)
+        )
+        return result.scalars().all()
+
+    async def retry_outbox_dead_letters(self, index_name: Optional[str] = None) -> int:
+        """Put dead-lettered entries back in the queue"""
+        query = update(SearchIndexOutbox).where(SearchIndexOutbox.dead_lettered_at.isnot(None))
+        if index_name:
+            query = query.where(SearchIndexOutbox.index_name == index_name)
+        result = await self.db.execute(query.values(dead_lettered_at=None, attempts=0))
+        await self.db.commit()
+        return result.rowcount
+
     # ========================================================================
     # Elasticsearch Operations
     # ========================================================================
@@ -452,8 +606,8 @@ class SearchRepository:
         query: Dict[str, Any],
         from_: int = 0,
         size: int = 20
-    ) -> Dict[str, Any]:
-        """Perform Elasticsearch search"""
+    ) -> Optional[Dict[str, Any]]:
+        """Perform Elasticsearch search (None when Elasticsearch fails)"""
         try:
             response = await self.es_client.search(
                 index=index,
@@ -464,7 +618,50 @@ class SearchRepository:
             return response
         except Exception as e:
             print(f"Elasticsearch search error: {str(e)}")
-            return {"hits": {"total": {"value": 0}, "hits": []}}
+            return None
+
+    async def msearch_elasticsearch(
+        self,
+        searches: List[Tuple[str, Dict[str, Any], int, int]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Perform several searches in one request.
+
+        Args:
+            searches: (index, query, from, size) per search
+
+        Returns:
+            Response per search, None for searches that failed
+        """
+        body = []
+        for index, query, from_, size in searches:
+            body.append({"index": index})
+            body.append({**query, "from": from_, "size": size})
+        try:
+            response = await self.es_client.msearch(searches=body)
+        except Exception as e:
+            print(f"Elasticsearch msearch error: {str(e)}")
+            return [None] * len(searches)
+
+        responses = []
+        for item in response["responses"]:
+            if "error" in item:
+                print(f"Elasticsearch msearch error: {item['error']}")
+                responses.append(None)
+            else:
+                responses.append(item)
+        return responses
+
+    async def get_documents(self, hits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Current documents of search hits; deleted ones are left out"""
+        try:
+            response = await self.es_client.mget(
+                docs=[{"_index": hit["_index"], "_id": hit["_id"]} for hit in hits]
+            )
+            return [doc for doc in response["docs"] if doc.get("found")]
+        except Exception as e:
+            print(f"Elasticsearch mget error: {str(e)}")
+            return []
 
     async def index_document(
         self,
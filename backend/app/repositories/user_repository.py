@@ -19,6 +19,7 @@ from app.models.user import (
     UserStatus
 )
 from app.schemas.user import UserCreate, UserUpdate
+from app.core.loaders import get_loader
 from app.core.security import get_password_hash
 
 
@@ -67,15 +68,8 @@ class UserRepository:
         Returns:
             User object or None
         """
-        result = await self.db.execute(
-            select(User).where(
-                and_(
-                    User.id == user_id,
-                    User.deleted_at.is_(None)
-                )
-            )
-        )
-        return result.scalar_one_or_none()
+        # Batched and memoized for the rest of the request
+        return await get_loader(self.db, User, User.deleted_at.is_(None)).load(user_id)
 
     async def get_by_email(self, email: str) -> Optional[User]:
         """
@@ -158,6 +152,7 @@ class UserRepository:
         user.deleted_at = datetime.utcnow()
         user.status = UserStatus.DELETED
         await self.db.commit()
+        get_loader(self.db, User, User.deleted_at.is_(None)).clear(user_id)
         return True
 
     async def update_last_login(self, user_id: str) -> None:
@@ -5,13 +5,18 @@ FR-003: Vendor Marketplace & Discovery
 Data access layer for vendor operations
 """
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_, case, cast, Float
+from sqlalchemy import select, func, and_, or_, case, cast, Float, literal, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import selectinload, joinedload
 from typing import Optional, List, Tuple
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 from uuid import UUID
 
+from app.core.bulk import bulk_upsert
+from app.core.geo import bounding_box, haversine_km, haversine_sql
+from app.core.loaders import get_loader
+from app.core.pagination import CountStrategy, PageInfo, count_cache, paginate, normalize_filters
 from app.models.vendor import (
     Vendor,
     VendorSubcategory,
@@ -23,7 +28,8 @@ from app.models.vendor import (
     VendorWorkingHours,
     VendorCategory,
     VendorStatus,
-    AvailabilityStatus
+    AvailabilityStatus,
+    VENDOR_SEARCH_CONFIG
 )
 from app.schemas.vendor import (
     VendorCreate,
@@ -44,6 +50,40 @@ from app.schemas.vendor import (
 )
 
 
+# Generated, unmapped column (PostgreSQL only, see app.models.vendor)
+vendor_search_vector = literal_column("vendors.search_vector", type_=TSVECTOR)
+
+# Count cache namespace of the vendor search listing
+SEARCH_COUNT_NAMESPACE = "vendors.search"
+
+
+def _coordinate(value: float) -> Decimal:
+    return Decimal(f"{value:.8f}")
+
+
+def vendor_text_search(term: str):
+    """
+    Full-text match with trigram fallback, and its rank (PostgreSQL).
+
+    Matches the weighted search vector (name > short description >
+    description) or a fuzzy match of the business name, so misspelled and
+    partial names are still found. Both use GIN indexes.
+
+    Returns:
+        Tuple of (where clause, rank expression)
+    """
+    tsquery = func.websearch_to_tsquery(literal_column(f"'{VENDOR_SEARCH_CONFIG}'::regconfig"), term)
+    name_similarity = func.word_similarity(term, Vendor.business_name)
+
+    match = or_(
+        vendor_search_vector.op("@@")(tsquery),
+        literal(term).op("<%")(Vendor.business_name)
+    )
+    # ts_rank_cd normalized to [0, 1) (flag 32) plus name similarity [0, 1]
+    rank = func.ts_rank_cd(vendor_search_vector, tsquery, 32) + name_similarity
+    return match, rank
+
+
 class VendorRepository:
     """Repository for vendor data access"""
 
@@ -102,6 +142,7 @@ class VendorRepository:
                 self.db.add(subcat)
 
         await self.db.commit()
+        count_cache.invalidate(SEARCH_COUNT_NAMESPACE)
         await self.db.refresh(vendor)
 
         return vendor
@@ -121,23 +162,24 @@ class VendorRepository:
         Returns:
             Vendor instance or None
         """
+        if not load_relationships:
+            # Batched and memoized for the rest of the request
+            return await get_loader(self.db, Vendor, Vendor.deleted_at.is_(None)).load(vendor_id)
+
         query = select(Vendor).where(
             and_(
                 Vendor.id == UUID(vendor_id),
                 Vendor.deleted_at.is_(None)
             )
+        ).options(
+            selectinload(Vendor.subcategories),
+            selectinload(Vendor.services),
+            selectinload(Vendor.portfolio),
+            selectinload(Vendor.team_members),
+            selectinload(Vendor.certifications),
+            selectinload(Vendor.working_hours)
         )
 
-        if load_relationships:
-            query = query.options(
-                selectinload(Vendor.subcategories),
-                selectinload(Vendor.services),
-                selectinload(Vendor.portfolio),
-                selectinload(Vendor.team_members),
-                selectinload(Vendor.certifications),
-                selectinload(Vendor.working_hours)
-            )
-
         result = await self.db.execute(query)
         return result.scalar_one_or_none()
 
@@ -185,6 +227,7 @@ class VendorRepository:
                 setattr(vendor, field, value)
 
         await self.db.commit()
+        count_cache.invalidate(SEARCH_COUNT_NAMESPACE)
         await self.db.refresh(vendor)
 
         return vendor
@@ -207,6 +250,8 @@ class VendorRepository:
         vendor.status = VendorStatus.DELETED
 
         await self.db.commit()
+        count_cache.invalidate(SEARCH_COUNT_NAMESPACE)
+        get_loader(self.db, Vendor, Vendor.deleted_at.is_(None)).clear(vendor_id)
         return True
 
     # ========================================================================
@@ -482,43 +527,31 @@ class VendorRepository:
         Returns:
             Number of dates updated
         """
+        rows = []
         current_date = bulk_data.start_date
-        count = 0
 
         while current_date <= bulk_data.end_date:
             # Check if we should process this day
-            if bulk_data.days_of_week:
-                if current_date.weekday() not in bulk_data.days_of_week:
-                    current_date += timedelta(days=1)
-                    continue
-
-            # Set availability
-            query = select(VendorAvailability).where(
-                and_(
-                    VendorAvailability.vendor_id == UUID(vendor_id),
-                    VendorAvailability.date == current_date
-                )
-            )
-            result = await self.db.execute(query)
-            availability = result.scalar_one_or_none()
-
-            if availability:
-                availability.status = bulk_data.status
-                availability.notes = bulk_data.notes
-            else:
-                availability = VendorAvailability(
-                    vendor_id=UUID(vendor_id),
-                    date=current_date,
-                    status=bulk_data.status,
-                    notes=bulk_data.notes
-                )
-                self.db.add(availability)
-
-            count += 1
+            if not bulk_data.days_of_week or current_date.weekday() in bulk_data.days_of_week:
+                rows.append({
+                    "vendor_id": UUID(vendor_id),
+                    "date": current_date,
+                    "status": bulk_data.status,
+                    "notes": bulk_data.notes
+                })
             current_date += timedelta(days=1)
 
+        # Single upsert per batch instead of SELECT + INSERT per day
+        await bulk_upsert(
+            self.db,
+            VendorAvailability,
+            rows,
+            conflict_columns=["vendor_id", "date"],
+            update_columns=["status", "notes"]
+        )
+
         await self.db.commit()
-        return count
+        return len(rows)
 
     async def get_availability(
         self,
@@ -735,8 +768,10 @@ class VendorRepository:
         self,
         filters: VendorSearchFilters,
         page: int = 1,
-        page_size: int = 20
-    ) -> Tuple[List[Vendor], int]:
+        page_size: int = 20,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        offset: Optional[int] = None
+    ) -> Tuple[List[Vendor], PageInfo]:
         """
         Search vendors with filters
 
@@ -744,9 +779,12 @@ class VendorRepository:
             filters: Search filters
             page: Page number
             page_size: Items per page
+            count_strategy: How the total count is obtained
+            offset: Rows to skip instead of whole pages
 
         Returns:
-            Tuple of (vendors list, total count)
+            Tuple of (vendors list, page info); with a search location,
+            each vendor carries ``distance_km``
         """
         # Base query
         query = select(Vendor).where(
@@ -760,9 +798,15 @@ class VendorRepository:
         if filters.category:
             query = query.where(Vendor.category == filters.category)
 
-        # Location filters
+        full_text = self.db.bind.dialect.name == "postgresql"
+        rank = None
+
+        # Location filters (trigram-indexed on PostgreSQL, tolerating typos)
         if filters.city:
-            query = query.where(Vendor.location_city.ilike(f"%{filters.city}%"))
+            city_match = Vendor.location_city.ilike(f"%{filters.city}%")
+            if full_text:
+                city_match = or_(city_match, Vendor.location_city.op("%")(filters.city))
+            query = query.where(city_match)
 
         if filters.district:
             query = query.where(Vendor.location_district.ilike(f"%{filters.district}%"))
@@ -791,7 +835,10 @@ class VendorRepository:
             )
 
         # Text search
-        if filters.query:
+        if filters.query and full_text:
+            text_match, rank = vendor_text_search(filters.query)
+            query = query.where(text_match)
+        elif filters.query:
             search_term = f"%{filters.query}%"
             query = query.where(
                 or_(
@@ -801,20 +848,24 @@ class VendorRepository:
                 )
             )
 
-        # Location-based search (radius)
-        if filters.latitude and filters.longitude and filters.radius_km:
-            # Using Haversine formula for distance calculation
-            lat1 = filters.latitude
-            lon1 = filters.longitude
-            radius = filters.radius_km
-
-            # This is a simplified version - in production, use PostGIS
-            query = query.where(
-                and_(
-                    Vendor.location_lat.isnot(None),
-                    Vendor.location_lng.isnot(None)
+        # Location-based search
+        origin = distance = None
+        if filters.latitude is not None and filters.longitude is not None:
+            origin = (float(filters.latitude), float(filters.longitude))
+            distance = haversine_sql(Vendor.location_lat, Vendor.location_lng, *origin)
+
+            if filters.radius_km:
+                # Bounding box on the (lat, lng) index, then exact distance.
+                # Bounds are bound as Decimal so the NUMERIC index is usable.
+                min_lat, max_lat, lng_ranges = bounding_box(*origin, filters.radius_km)
+                query = query.where(
+                    Vendor.location_lat.between(_coordinate(min_lat), _coordinate(max_lat)),
+                    or_(*(
+                        Vendor.location_lng.between(_coordinate(low), _coordinate(high))
+                        for low, high in lng_ranges
+                    )),
+                    distance <= filters.radius_km
                 )
-            )
 
         # Availability filter
         if filters.available_on:
@@ -827,29 +878,63 @@ class VendorRepository:
             )
             query = query.where(Vendor.id.in_(avail_subquery))
 
-        # Count total
-        count_query = select(func.count()).select_from(query.subquery())
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar()
+        # Price filter: an active service priced within the range
+        if filters.min_price is not None or filters.max_price is not None:
+            price_subquery = select(VendorService.vendor_id).where(VendorService.is_active == True)
+            if filters.min_price is not None:
+                price_subquery = price_subquery.where(VendorService.base_price >= filters.min_price)
+            if filters.max_price is not None:
+                price_subquery = price_subquery.where(VendorService.base_price <= filters.max_price)
+            query = query.where(Vendor.id.in_(price_subquery))
 
         # Sorting
-        if filters.sort_by == "rating":
-            query = query.order_by(Vendor.avg_rating.desc())
+        if filters.sort_by in ("price_low", "price_high"):
+            # Cheapest active service ascending, or dearest descending;
+            # vendors without priced services last
+            price = select(
+                func.min(VendorService.base_price) if filters.sort_by == "price_low"
+                else func.max(VendorService.base_price)
+            ).where(
+                VendorService.vendor_id == Vendor.id,
+                VendorService.is_active == True
+            ).correlate(Vendor).scalar_subquery()
+            order_by = [
+                price.asc().nulls_last() if filters.sort_by == "price_low" else price.desc().nulls_last(),
+                Vendor.id
+            ]
+        elif filters.sort_by == "rating":
+            order_by = [Vendor.avg_rating.desc()]
         elif filters.sort_by == "newest":
-            query = query.order_by(Vendor.created_at.desc())
+            order_by = [Vendor.created_at.desc()]
         elif filters.sort_by == "popular":
-            query = query.order_by(Vendor.booking_count.desc())
+            order_by = [Vendor.booking_count.desc()]
+        elif distance is not None and (filters.sort_by == "distance" or rank is None):
+            # Nearest first; vendors without coordinates last
+            order_by = [distance.asc().nulls_last(), Vendor.id]
+        elif rank is not None:  # relevance to the search text
+            order_by = [rank.desc(), Vendor.featured.desc(), Vendor.avg_rating.desc()]
         else:  # relevance (default)
-            query = query.order_by(Vendor.featured.desc(), Vendor.avg_rating.desc())
-
-        # Pagination
-        query = query.offset((page - 1) * page_size).limit(page_size)
-
-        # Execute
-        result = await self.db.execute(query)
-        vendors = list(result.scalars().all())
+            order_by = [Vendor.featured.desc(), Vendor.avg_rating.desc()]
+
+        # Count and paginate
+        vendors, page_info = await paginate(
+            self.db,
+            query,
+            page,
+            page_size,
+            strategy=count_strategy,
+            cache_key=normalize_filters(SEARCH_COUNT_NAMESPACE, filters.model_copy(update={"sort_by": None})),
+            order_by=order_by,
+            offset=offset
+        )
 
-        return vendors, total
+        if origin is not None:
+            for vendor in vendors:
+                vendor.distance_km = (
+                    round(haversine_km(*origin, float(vendor.location_lat), float(vendor.location_lng)), 3)
+                    if vendor.location_lat is not None and vendor.location_lng is not None else None
+                )
+        return vendors, page_info
 
     # ========================================================================
     # Statistics and Analytics
@@ -938,6 +1023,7 @@ class VendorRepository:
             vendor.status = VendorStatus.ACTIVE
 
         await self.db.commit()
+        count_cache.invalidate(SEARCH_COUNT_NAMESPACE)
         await self.db.refresh(vendor)
 
         return vendor
@@ -964,6 +1050,7 @@ class VendorRepository:
         vendor.status = new_status
 
         await self.db.commit()
+        count_cache.invalidate(SEARCH_COUNT_NAMESPACE)
         await self.db.refresh(vendor)
 
         return vendor
@@ -993,6 +1080,7 @@ class VendorRepository:
         vendor.featured_until = featured_until
 
         await self.db.commit()
+        count_cache.invalidate(SEARCH_COUNT_NAMESPACE)
         await self.db.refresh(vendor)
 
         return vendor
@@ -414,10 +414,11 @@ class MessageSearch(BaseModel):
 class ConversationListResponse(BaseModel):
     """Paginated list of conversations"""
     conversations: List[ConversationResponse]
-    total: int
+    total: Optional[int] = None
+    total_is_exact: bool = True
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
     has_next: bool
     has_prev: bool
 
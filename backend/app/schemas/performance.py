@@ -131,6 +131,11 @@ class DatabaseHealth(BaseModel):
     idle_connections: int
     avg_query_time_ms: float
     slow_queries: int
+    max_overflow: int = 0
+    overflow_in_use: int = 0
+    checkout_timeouts: int = 0
+    avg_checkout_wait_ms: float = 0.0
+    pool: Optional[Dict[str, Any]] = Field(None, description="Detailed pool telemetry")
 
 
 class RedisHealth(BaseModel):
@@ -366,15 +371,31 @@ class MonitoringDashboard(BaseModel):
 # Benchmark Schemas
 # ============================================================================
 
+class ThroughputPoint(BaseModel):
+    """Schema for one slice of a benchmark throughput curve"""
+    elapsed_seconds: float
+    ops_per_second: float
+
+
 class BenchmarkResult(BaseModel):
     """Schema for benchmark result"""
     benchmark_name: str
     operation: str
     iterations: int
+    concurrency: int = 1
+    warmup_iterations: int = 0
     avg_time_ms: float
     min_time_ms: float
     max_time_ms: float
+    p50_time_ms: float = 0.0
+    p90_time_ms: float = 0.0
+    p95_time_ms: float = 0.0
+    p99_time_ms: float = 0.0
     ops_per_second: float
+    duration_seconds: float = 0.0
+    error_count: int = 0
+    errors: Dict[str, int] = {}
+    throughput_curve: List[ThroughputPoint] = []
     timestamp: datetime
 
 
@@ -5,7 +5,7 @@ Sprint 13: Search & Discovery System
 Pydantic schemas for search functionality.
 """
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, root_validator, validator
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from uuid import UUID
@@ -91,6 +91,47 @@ class ServiceSearchRequest(SearchRequest):
     service_category: Optional[str] = None
 
 
+FEDERATED_SEARCH_TYPES = ["vendor", "event", "service"]
+
+# Every type is fetched up to the page end (skip + limit); Elasticsearch
+# rejects windows past its max_result_window (10000 by default)
+FEDERATED_MAX_WINDOW = 10000
+# Deep pages cost every type's whole window; anonymous callers stop earlier
+FEDERATED_ANONYMOUS_MAX_WINDOW = 1000
+
+
+class FederatedSearchRequest(SearchRequest):
+    """Search several types at once, merged into one ranked list"""
+    search_type: str = Field("all", description="Always all: see search_types")
+    search_types: List[str] = Field(default_factory=lambda: list(FEDERATED_SEARCH_TYPES))
+    quotas: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Most results per type and page (default: an equal share of the page)"
+    )
+
+    @validator('search_types')
+    def validate_search_types(cls, v):
+        unknown = set(v) - set(FEDERATED_SEARCH_TYPES)
+        if unknown or not v:
+            raise ValueError(f'search_types must be a non-empty subset of {FEDERATED_SEARCH_TYPES}')
+        return list(dict.fromkeys(v))
+
+    @validator('quotas')
+    def validate_quotas(cls, v, values):
+        if any(quota < 0 for quota in v.values()):
+            raise ValueError('quotas must not be negative')
+        unknown = set(v) - set(values.get('search_types') or FEDERATED_SEARCH_TYPES)
+        if unknown:
+            raise ValueError(f'quotas given for types not searched: {sorted(unknown)}')
+        return v
+
+    @root_validator(skip_on_failure=True)
+    def validate_window(cls, values):
+        if values['skip'] + values['limit'] > FEDERATED_MAX_WINDOW:
+            raise ValueError(f'skip + limit must not exceed {FEDERATED_MAX_WINDOW} for federated search')
+        return values
+
+
 # ============================================================================
 # Search Response Schemas
 # ============================================================================
@@ -172,14 +213,36 @@ class SearchResponse(BaseModel):
 
     results: List[Any]  # Mix of VendorSearchResult, EventSearchResult, etc.
 
-    # Facets for filtering
+    # Facets for filtering; "precomputed" (cached counts) or "live"
     facets: Dict[str, Any] = Field(default_factory=dict)
+    facets_source: str = "live"
 
-    # Suggestions
+    # Spelling corrections of a query without hits; when did_you_mean is
+    # set, the results are those of the corrected query
     suggestions: List[str] = Field(default_factory=list)
     did_you_mean: Optional[str] = None
 
 
+class FederatedSearchResponse(BaseModel):
+    """Merged results of several search types"""
+    query: Optional[str]
+    search_types: List[str]
+    total_results: int
+    totals_by_type: Dict[str, int]
+    results_shown: int
+    page: int
+    search_duration_ms: int
+
+    # Results of all types by normalized score (each has type and normalized_score)
+    results: List[Any]
+
+    # Facets per search type, and whether each was "precomputed" or "live"
+    facets: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    facets_source: Dict[str, str] = Field(default_factory=dict)
+
+    suggestions: List[str] = Field(default_factory=list)
+
+
 # ============================================================================
 # Saved Search Schemas
 # ============================================================================
@@ -507,6 +570,8 @@ class SearchIndexStatusResponse(BaseModel):
     sync_in_progress: bool
     last_error: Optional[str]
 
+    index_settings: Optional[Dict[str, Any]] = None
+
     updated_at: datetime
 
     class Config:
@@ -518,3 +583,5 @@ class ReindexRequest(BaseModel):
     index_name: str
     full_reindex: bool = False
     batch_size: int = Field(1000, ge=100, le=10000)
+    slices: int = Field(4, ge=1, le=32, description="Parallel key ranges loaded at once")
+    force: bool = Field(False, description="Rebuild even if a previous rebuild did not finish")
@@ -399,6 +399,9 @@ class VendorResponse(VendorBase):
     created_at: datetime
     updated_at: datetime
 
+    # Location search only
+    distance_km: Optional[float] = None
+
     class Config:
         from_attributes = True
 
@@ -454,7 +457,7 @@ class VendorSearchFilters(BaseModel):
     # Sorting
     sort_by: Optional[str] = Field(
         "relevance",
-        regex="^(relevance|rating|price_low|price_high|newest|popular|distance)$"
+        pattern="^(relevance|rating|price_low|price_high|newest|popular|distance)$"
     )
 
     @validator('max_price')
@@ -464,18 +467,18 @@ class VendorSearchFilters(BaseModel):
                 raise ValueError('max_price must be greater than or equal to min_price')
         return v
 
-    @root_validator
+    @root_validator(skip_on_failure=True)
     def validate_location_search(cls, values):
         lat = values.get('latitude')
         lng = values.get('longitude')
         radius = values.get('radius_km')
 
-        # If doing radius search, need both lat/lng and radius
-        if any([lat, lng, radius]):
-            if not all([lat, lng, radius]):
-                raise ValueError(
-                    'For location-based search, latitude, longitude, and radius_km are all required'
-                )
+        # Coordinates come in pairs (0 is a valid coordinate); a radius
+        # needs them. Coordinates without a radius only sort by distance.
+        if (lat is None) != (lng is None):
+            raise ValueError('For location-based search, latitude and longitude are both required')
+        if radius is not None and lat is None:
+            raise ValueError('For radius search, latitude and longitude are required')
 
         return values
 
@@ -483,7 +486,8 @@ class VendorSearchFilters(BaseModel):
 class VendorListResponse(BaseModel):
     """Response schema for vendor list with pagination"""
     vendors: List[VendorResponse]
-    total: int
+    total: Optional[int] = None
+    total_is_exact: bool = True
     page: int
     page_size: int
     has_more: bool
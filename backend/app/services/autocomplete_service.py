@@ -0,0 +1,354 @@
+"""
+Autocomplete Service
+Sprint 22: Performance & Optimization
+
+Per-worker autocomplete from memory.
+
+- Active search suggestions and the names of the most booked vendors are
+  loaded into one prefix trie per suggestion type (``app.core.autocomplete``)
+- Lookups walk the trie and return the precomputed heaviest completions:
+  no database or Elasticsearch round trip
+- Suggestions created or updated through this worker are applied at once;
+  every ``refresh_seconds`` rows changed since the last load are applied
+  to the trie of every worker
+- A full rebuild every ``rebuild_seconds`` drops deleted rows and vendors
+  that left the top list; it is built off the event loop and swapped in
+"""
+
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import time
+
+from sqlalchemy import func, select
+
+from app.core.autocomplete import PrefixTrie, normalize
+from app.services.search_indexer_service import HIDDEN_VENDOR_STATUSES, vendor_searchable
+
+
+VENDOR_TYPE = "vendor"
+
+FEATURED_BOOST = 2.0
+TRENDING_BOOST = 1.5
+
+# Re-read rows this far behind the last change seen: a transaction that
+# started earlier can commit an older updated_at after it was read
+CHANGE_OVERLAP = timedelta(seconds=60)
+
+# (key, source, weight, text)
+Entry = Tuple[str, str, float, str]
+
+
+def suggestion_weight(suggestion: Any) -> float:
+    """Popularity of a suggestion: searches scaled by relevance"""
+    weight = (1 + (suggestion.search_count or 0)) * (1 + (suggestion.relevance_score or 0.0))
+    if suggestion.is_featured:
+        weight *= FEATURED_BOOST
+    if suggestion.is_trending:
+        weight *= TRENDING_BOOST
+    return weight
+
+
+def vendor_weight(vendor: Any) -> float:
+    """Popularity of a vendor name: bookings and reviews scaled by rating"""
+    activity = 1 + (vendor.booking_count or 0) + (vendor.review_count or 0)
+    return activity * (1 + float(vendor.avg_rating or 0) / 5)
+
+
+def suggestion_entry(suggestion: Any) -> Tuple[str, Optional[Entry]]:
+    """Trie and entry of a suggestion row (no entry when it is inactive)"""
+    source = f"suggestion:{suggestion.id}"
+    search_type = suggestion.suggestion_type or VENDOR_TYPE
+    if not suggestion.is_active:
+        return search_type, None
+    text = suggestion.suggestion_text
+    return search_type, (normalize(text), source, suggestion_weight(suggestion), text)
+
+
+def vendor_entry(vendor: Any) -> Tuple[str, Optional[Entry]]:
+    """Trie and entry of a vendor row (no entry when it is not searchable)"""
+    if not vendor_searchable(vendor):
+        return VENDOR_TYPE, None
+    text = vendor.business_name
+    return VENDOR_TYPE, (normalize(text), f"vendor:{vendor.id}", vendor_weight(vendor), text)
+
+
+class AutocompleteEngine:
+    """In-memory suggestion tries of one worker, kept in sync with the database"""
+
+    def __init__(
+        self,
+        top_k: int = 20,
+        max_vendors: int = 20000,
+        refresh_seconds: float = 30.0,
+        rebuild_seconds: float = 3600.0
+    ):
+        self.top_k = top_k
+        self.max_vendors = max_vendors
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_seconds = rebuild_seconds
+
+        # Suggestion type -> trie
+        self.tries: Dict[str, PrefixTrie] = {}
+        # Source -> (suggestion type, key) it is stored under
+        self._placed: Dict[str, Tuple[str, str]] = {}
+        self._suggestions_changed_at = None
+        self._vendors_changed_at = None
+
+        self.built_at: Optional[float] = None
+        self.build_seconds = 0.0
+        self.refreshed_at: Optional[float] = None
+        self.lookups = 0
+        self.misses = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.built_at is not None
+
+    # ========================================================================
+    # Lookup
+    # ========================================================================
+
+    def complete(self, prefix: str, search_type: Optional[str] = None, limit: int = 10) -> Optional[List[str]]:
+        """
+        Heaviest completions of a prefix.
+
+        Returns:
+            Suggestion texts, or None while the tries are not loaded yet
+        """
+        if not self.ready:
+            return None
+
+        key = normalize(prefix)
+        if search_type:
+            tries = [self.tries[search_type]] if search_type in self.tries else []
+        else:
+            tries = list(self.tries.values())
+
+        completions = sorted(
+            (completion for trie in tries for completion in trie.complete(key, limit)),
+            key=lambda completion: (-completion[0], completion[1])
+        )
+        # The same text can be a suggestion of several types
+        suggestions, seen = [], set()
+        for _, text in completions:
+            if text.casefold() not in seen:
+                seen.add(text.casefold())
+                suggestions.append(text)
+                if len(suggestions) == limit:
+                    break
+
+        self.lookups += 1
+        if not suggestions:
+            self.misses += 1
+        return suggestions
+
+    # ========================================================================
+    # Updates
+    # ========================================================================
+
+    def apply_suggestion(self, suggestion: Any):
+        """Add, reweight or remove a suggestion row"""
+        self._apply(*suggestion_entry(suggestion), f"suggestion:{suggestion.id}")
+
+    def apply_vendor(self, vendor: Any):
+        """Add, reweight or remove a vendor name"""
+        self._apply(*vendor_entry(vendor), f"vendor:{vendor.id}")
+
+    def _apply(self, search_type: str, entry: Optional[Entry], source: str):
+        if not self.ready:
+            # Picked up by the first build
+            return
+
+        placed = self._placed.get(source)
+        if placed is not None and (entry is None or placed != (search_type, entry[0])):
+            # Removed, renamed or moved to another type
+            previous_type, previous_key = placed
+            self.tries[previous_type].remove(previous_key, source)
+            del self._placed[source]
+        if entry is None:
+            return
+
+        trie = self.tries.get(search_type)
+        if trie is None:
+            trie = self.tries[search_type] = PrefixTrie(self.top_k)
+        trie.add(*entry)
+        self._placed[source] = (search_type, entry[0])
+
+    # ========================================================================
+    # Loading
+    # ========================================================================
+
+    async def rebuild(self):
+        """Load all suggestions and the top vendor names into new tries"""
+        from app.core.database import background_session
+        from app.models.search import SearchSuggestion
+        from app.models.vendor import Vendor, VendorStatus
+
+        started = time.perf_counter()
+        async with background_session("search.autocomplete") as db:
+            # Read the change marks first: rows changed while loading are re-applied
+            suggestions_changed_at = await db.scalar(select(func.max(SearchSuggestion.updated_at)))
+            vendors_changed_at = await db.scalar(select(func.max(Vendor.updated_at)))
+
+            suggestions = (await db.execute(
+                select(*self._suggestion_columns(SearchSuggestion))
+                .where(SearchSuggestion.is_active == True)
+            )).all()
+            vendors = (await db.execute(
+                select(*self._vendor_columns(Vendor))
+                .where(
+                    Vendor.deleted_at.is_(None),
+                    Vendor.status.notin_([VendorStatus(s) for s in HIDDEN_VENDOR_STATUSES])
+                )
+                .order_by(Vendor.booking_count.desc())
+                .limit(self.max_vendors)
+            )).all()
+
+        # Building is pure CPU: keep it off the event loop
+        tries, placed = await asyncio.to_thread(self._build, suggestions, vendors)
+        self.tries, self._placed = tries, placed
+        self._suggestions_changed_at = suggestions_changed_at
+        self._vendors_changed_at = vendors_changed_at
+        self.built_at = self.refreshed_at = time.time()
+        self.build_seconds = time.perf_counter() - started
+        print(
+            f"🔤 Autocomplete loaded: {len(placed):,} entries "
+            f"({len(suggestions):,} suggestions, {len(vendors):,} vendors) in {self.build_seconds:.2f}s"
+        )
+
+    def _build(
+        self,
+        suggestions: List[Any],
+        vendors: List[Any]
+    ) -> Tuple[Dict[str, PrefixTrie], Dict[str, Tuple[str, str]]]:
+        entries: Dict[str, List[Entry]] = {}
+        placed: Dict[str, Tuple[str, str]] = {}
+        rows = [suggestion_entry(row) for row in suggestions] + [vendor_entry(row) for row in vendors]
+        for search_type, entry in rows:
+            if entry is not None and entry[0]:
+                entries.setdefault(search_type, []).append(entry)
+                placed[entry[1]] = (search_type, entry[0])
+        tries = {
+            search_type: PrefixTrie.build(type_entries, self.top_k)
+            for search_type, type_entries in entries.items()
+        }
+        return tries, placed
+
+    async def refresh(self) -> int:
+        """Apply suggestions and vendors changed since the last load"""
+        from app.core.database import background_session
+        from app.models.search import SearchSuggestion
+        from app.models.vendor import Vendor
+
+        async with background_session("search.autocomplete") as db:
+            suggestions = await self._changed(
+                db, SearchSuggestion, self._suggestion_columns(SearchSuggestion), self._suggestions_changed_at
+            )
+            vendors = await self._changed(
+                db, Vendor, self._vendor_columns(Vendor), self._vendors_changed_at
+            )
+
+        for row in suggestions:
+            self.apply_suggestion(row)
+        for row in vendors:
+            self.apply_vendor(row)
+        if suggestions:
+            self._suggestions_changed_at = max(row.updated_at for row in suggestions)
+        if vendors:
+            self._vendors_changed_at = max(row.updated_at for row in vendors)
+        self.refreshed_at = time.time()
+        return len(suggestions) + len(vendors)
+
+    async def _changed(self, db, model, columns, since) -> List[Any]:
+        query = select(*columns)
+        if since is not None:
+            query = query.where(model.updated_at >= since - CHANGE_OVERLAP)
+        return (await db.execute(query)).all()
+
+    @staticmethod
+    def _suggestion_columns(model) -> List[Any]:
+        return [
+            model.id, model.suggestion_text, model.suggestion_type, model.search_count,
+            model.relevance_score, model.is_featured, model.is_trending, model.is_active,
+            model.updated_at
+        ]
+
+    @staticmethod
+    def _vendor_columns(model) -> List[Any]:
+        return [
+            model.id, model.business_name, model.booking_count, model.review_count,
+            model.avg_rating, model.status, model.deleted_at, model.updated_at
+        ]
+
+    # ========================================================================
+    # Background refresh
+    # ========================================================================
+
+    def start(self):
+        """Load the tries and keep them in sync in the background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                if not self.ready or time.time() - self.built_at >= self.rebuild_seconds:
+                    await self.rebuild()
+                else:
+                    await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Lookups keep using the current tries (or the database until loaded)
+                print(f"⚠️  Autocomplete refresh failed: {e}")
+            await asyncio.sleep(self.refresh_seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Trie sizes and lookup statistics"""
+        return {
+            "ready": self.ready,
+            "built_at": self.built_at,
+            "build_seconds": round(self.build_seconds, 3),
+            "refreshed_at": self.refreshed_at,
+            "lookups": self.lookups,
+            "miss_rate": round(self.misses / self.lookups, 4) if self.lookups else 0.0,
+            "tries": {
+                search_type: {"keys": trie.keys, "sources": trie.sources, "nodes": trie.node_count()}
+                for search_type, trie in self.tries.items()
+            }
+        }
+
+
+# Global engine of this worker
+autocomplete_engine = AutocompleteEngine()
+
+
+def init_autocomplete(
+    top_k: int,
+    max_vendors: int,
+    refresh_seconds: float,
+    rebuild_seconds: float
+) -> AutocompleteEngine:
+    """Configure the global engine and start loading it"""
+    autocomplete_engine.top_k = top_k
+    autocomplete_engine.max_vendors = max_vendors
+    autocomplete_engine.refresh_seconds = refresh_seconds
+    autocomplete_engine.rebuild_seconds = rebuild_seconds
+    autocomplete_engine.start()
+    return autocomplete_engine
+
+
+async def close_autocomplete():
+    """Stop the background refresh"""
+    await autocomplete_engine.stop()
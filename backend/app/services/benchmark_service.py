@@ -0,0 +1,355 @@
+"""
+Benchmark Service
+Sprint 22: Performance & Optimization
+
+Load benchmark engine and registry of named operations.
+
+- Iterations are spread over ``concurrency`` workers; each worker holds its
+  own database session, so concurrent operations do not share a connection
+- Warm-up iterations run first and are not measured; the run fails when
+  not every worker is ready within ``ready_timeout_seconds``
+- Every call is timed with ``time.perf_counter``; results include exact
+  percentiles, error counts per exception type and a throughput curve
+- Named operations run real repository calls against the seeded dataset;
+  their targets (events, users, filters) are sampled from existing rows
+"""
+
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, desc
+from typing import Any, AsyncContextManager, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import math
+import time
+
+
+# Number of targets sampled for each named operation
+DEFAULT_TARGET_COUNT = 50
+
+# Slices of the measured run in the throughput curve
+DEFAULT_CURVE_POINTS = 20
+
+# Longest a warmed-up worker waits for the others before the run fails
+DEFAULT_READY_TIMEOUT_SECONDS = 300.0
+
+# A worker receives an iteration number and runs one operation
+WorkerCall = Callable[[int], Awaitable[Any]]
+
+
+# ============================================================================
+# Engine
+# ============================================================================
+
+@dataclass
+class LoadRun:
+    """Raw results of a load benchmark"""
+    iterations: int
+    concurrency: int
+    warmup_iterations: int
+    duration_seconds: float
+    latencies_ms: List[float]
+    completed_at: List[float]
+    errors: Dict[str, int] = field(default_factory=dict)
+    curve_points: int = DEFAULT_CURVE_POINTS
+
+    @property
+    def error_count(self) -> int:
+        return sum(self.errors.values())
+
+    @property
+    def ops_per_second(self) -> float:
+        return len(self.latencies_ms) / self.duration_seconds if self.duration_seconds > 0 else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Exact percentile (nearest rank) of successful calls"""
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        rank = max(math.ceil(p / 100 * len(ordered)) - 1, 0)
+        return ordered[min(rank, len(ordered) - 1)]
+
+    def throughput_curve(self) -> List[Dict[str, float]]:
+        """Completed operations per second in equal slices of the run"""
+        if not self.completed_at or self.duration_seconds <= 0:
+            return []
+
+        points = min(self.curve_points, len(self.completed_at))
+        width = self.duration_seconds / points
+        counts = [0] * points
+        for offset in self.completed_at:
+            counts[min(int(offset / width), points - 1)] += 1
+
+        return [
+            {
+                "elapsed_seconds": round(width * (i + 1), 4),
+                "ops_per_second": round(count / width, 2)
+            }
+            for i, count in enumerate(counts)
+        ]
+
+
+@asynccontextmanager
+async def plain_worker(operation_func: Callable[[], Awaitable[Any]]):
+    """Worker for a zero-argument operation"""
+    async def call(_: int):
+        return await operation_func()
+    yield call
+
+
+async def run_load(
+    worker_factory: Callable[[], AsyncContextManager[WorkerCall]],
+    iterations: int,
+    concurrency: int = 1,
+    warmup_iterations: int = 0,
+    curve_points: int = DEFAULT_CURVE_POINTS,
+    ready_timeout_seconds: float = DEFAULT_READY_TIMEOUT_SECONDS
+) -> LoadRun:
+    """
+    Run a closed-loop load benchmark.
+
+    Args:
+        worker_factory: Opens per-worker resources and yields the call to time
+        iterations: Measured calls (across all workers)
+        concurrency: Number of concurrent workers
+        warmup_iterations: Unmeasured calls before the measured phase
+        curve_points: Slices of the throughput curve
+        ready_timeout_seconds: Longest a warmed-up worker waits for the
+            others (a worker stuck opening resources or warming up)
+
+    Returns:
+        LoadRun with per-call latencies and errors
+
+    Raises:
+        TimeoutError: Not every worker was ready in time
+    """
+    concurrency = max(1, min(concurrency, iterations or 1))
+    latencies: List[float] = []
+    completed_at: List[float] = []
+    errors: Dict[str, int] = {}
+
+    # Shared iteration counters; workers run on one loop, so no lock is needed
+    next_warmup = 0
+    next_iteration = 0
+    ready = 0
+    measuring = asyncio.Event()
+    started = 0.0
+
+    async def worker():
+        nonlocal next_warmup, next_iteration, ready, started
+
+        async with worker_factory() as call:
+            while next_warmup < warmup_iterations:
+                next_warmup += 1
+                try:
+                    await call(next_warmup - 1)
+                except Exception:
+                    pass
+
+            # Start the clock once every worker has finished warming up
+            ready += 1
+            if ready == concurrency:
+                started = time.perf_counter()
+                measuring.set()
+            try:
+                await asyncio.wait_for(measuring.wait(), ready_timeout_seconds)
+            except asyncio.TimeoutError:
+                raise TimeoutError(
+                    f"Only {ready} of {concurrency} benchmark workers were ready "
+                    f"after {ready_timeout_seconds}s"
+                )
+
+            while next_iteration < iterations:
+                iteration = next_iteration
+                next_iteration += 1
+
+                call_started = time.perf_counter()
+                try:
+                    await call(warmup_iterations + iteration)
+                except Exception as e:
+                    name = type(e).__name__
+                    errors[name] = errors.get(name, 0) + 1
+                    continue
+
+                finished = time.perf_counter()
+                latencies.append((finished - call_started) * 1000)
+                completed_at.append(finished - started)
+
+    workers = [asyncio.ensure_future(worker()) for _ in range(concurrency)]
+    try:
+        await asyncio.gather(*workers)
+    except BaseException:
+        # One failed worker fails the run; don't leave the others waiting
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        raise
+
+    return LoadRun(
+        iterations=iterations,
+        concurrency=concurrency,
+        warmup_iterations=warmup_iterations,
+        duration_seconds=time.perf_counter() - started if started else 0.0,
+        latencies_ms=latencies,
+        completed_at=completed_at,
+        errors=errors,
+        curve_points=curve_points
+    )
+
+
+# ============================================================================
+# Named Operations
+# ============================================================================
+
+@dataclass
+class BenchmarkOperation:
+    """A named operation benchmarked against the seeded dataset"""
+    name: str
+    description: str
+    # Samples targets from existing rows
+    load_targets: Callable[[AsyncSession, int], Awaitable[List[Any]]]
+    # Runs the operation once for a target
+    run: Callable[[AsyncSession, Any], Awaitable[Any]]
+
+
+benchmark_operations: Dict[str, BenchmarkOperation] = {}
+
+
+def register_benchmark_operation(
+    name: str,
+    description: str,
+    load_targets: Callable[[AsyncSession, int], Awaitable[List[Any]]]
+):
+    """Register the decorated coroutine as a named benchmark operation"""
+    def decorator(run: Callable[[AsyncSession, Any], Awaitable[Any]]):
+        benchmark_operations[name] = BenchmarkOperation(name, description, load_targets, run)
+        return run
+    return decorator
+
+
+def operation_worker(
+    operation: BenchmarkOperation,
+    targets: List[Any],
+    session_factory: Optional[Callable[[], AsyncContextManager[AsyncSession]]] = None
+):
+    """
+    Worker factory running a named operation on its own session.
+
+    Args:
+        operation: Registered operation
+        targets: Targets cycled through by iteration number
+        session_factory: Opens a session per worker (default: the
+            application pool, attributed to ``benchmark.<name>``)
+    """
+    @asynccontextmanager
+    async def factory():
+        if session_factory is not None:
+            session_context = session_factory()
+        else:
+            # Imported lazily: the database module imports app settings
+            from app.core.database import background_session
+            session_context = background_session(f"benchmark.{operation.name}")
+
+        async with session_context as db:
+            async def call(iteration: int):
+                result = await operation.run(db, targets[iteration % len(targets)])
+                # Keep the identity map from growing over the run
+                db.expunge_all()
+                return result
+            yield call
+
+    return factory
+
+
+async def _busiest_events(db: AsyncSession, limit: int) -> List[Any]:
+    """Events with the most guests"""
+    from app.models.guest import Guest
+
+    result = await db.execute(
+        select(Guest.event_id)
+        .group_by(Guest.event_id)
+        .order_by(desc(func.count()))
+        .limit(limit)
+    )
+    return [row[0] for row in result.all()]
+
+
+async def _busiest_participants(db: AsyncSession, limit: int) -> List[Any]:
+    """Users in the most conversations"""
+    from app.models.messaging import ConversationParticipant
+
+    result = await db.execute(
+        select(ConversationParticipant.user_id)
+        .group_by(ConversationParticipant.user_id)
+        .order_by(desc(func.count()))
+        .limit(limit)
+    )
+    return [row[0] for row in result.all()]
+
+
+async def _busiest_conversations(db: AsyncSession, limit: int) -> List[Any]:
+    """Conversations with the most messages"""
+    from app.models.messaging import Message
+
+    result = await db.execute(
+        select(Message.conversation_id)
+        .group_by(Message.conversation_id)
+        .order_by(desc(func.count()))
+        .limit(limit)
+    )
+    return [row[0] for row in result.all()]
+
+
+async def _vendor_filters(db: AsyncSession, limit: int) -> List[Any]:
+    """Unfiltered search plus the most common categories and cities"""
+    from app.models.vendor import Vendor
+    from app.schemas.vendor import VendorSearchFilters
+
+    per_kind = max(limit // 2, 1)
+    categories = await db.execute(
+        select(Vendor.category).group_by(Vendor.category).order_by(desc(func.count())).limit(per_kind)
+    )
+    cities = await db.execute(
+        select(Vendor.location_city).group_by(Vendor.location_city).order_by(desc(func.count())).limit(per_kind)
+    )
+
+    filters = [VendorSearchFilters()]
+    filters.extend(VendorSearchFilters(category=row[0]) for row in categories.all())
+    filters.extend(VendorSearchFilters(city=row[0]) for row in cities.all())
+    return filters if len(filters) > 1 else []
+
+
+@register_benchmark_operation("vendor_search", "VendorRepository.search (first page)", _vendor_filters)
+async def _vendor_search(db: AsyncSession, filters: Any):
+    from app.repositories.vendor_repository import VendorRepository
+    return await VendorRepository(db).search(filters, page=1, page_size=20)
+
+
+@register_benchmark_operation(
+    "conversation_list", "MessagingRepository.list_user_conversations", _busiest_participants
+)
+async def _conversation_list(db: AsyncSession, user_id: Any):
+    from app.repositories.messaging_repository import MessagingRepository
+    return await MessagingRepository(db).list_user_conversations(user_id)
+
+
+@register_benchmark_operation(
+    "conversation_messages", "MessagingRepository.list_conversation_messages", _busiest_conversations
+)
+async def _conversation_messages(db: AsyncSession, conversation_id: Any):
+    from app.repositories.messaging_repository import MessagingRepository
+    return await MessagingRepository(db).list_conversation_messages(conversation_id)
+
+
+@register_benchmark_operation("guest_stats", "GuestRepository.get_guest_statistics", _busiest_events)
+async def _guest_stats(db: AsyncSession, event_id: Any):
+    from app.repositories.guest_repository import GuestRepository
+    return await GuestRepository(db).get_guest_statistics(event_id)
+
+
+@register_benchmark_operation(
+    "event_analytics", "AnalyticsRepository.calculate_event_analytics", _busiest_events
+)
+async def _event_analytics(db: AsyncSession, event_id: Any):
+    from app.repositories.analytics_repository import AnalyticsRepository
+    return await AnalyticsRepository(db).calculate_event_analytics(event_id)
@@ -0,0 +1,210 @@
+"""
+Latency Histogram Service
+Sprint 22: Performance & Optimization
+
+Per-worker latency sketches per route and method.
+
+Requests are recorded into in-memory LatencySketch instances keyed by
+(method, route template) for the current time bucket. A background flusher
+periodically writes closed buckets as serialized sketches; percentile
+queries merge the stored sketches across workers and buckets instead of
+scanning raw metric rows.
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from uuid import uuid4
+import asyncio
+import os
+import socket
+import time
+
+from app.core.metrics import register_queue_depth
+from app.core.sketch import LatencySketch
+
+
+# Width of a sketch time bucket (seconds)
+SKETCH_BUCKET_SECONDS = 60
+
+# Relative accuracy of stored sketches (1%)
+SKETCH_RELATIVE_ACCURACY = 0.01
+
+# Unique per process start: a restarted worker can get the same pid (pid 1 in
+# a container) and must not upsert over the rows of its predecessor
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class RouteLatency:
+    """Sketch and counters for one route in one time bucket"""
+
+    __slots__ = ("sketch", "errors")
+
+    def __init__(self):
+        self.sketch = LatencySketch(SKETCH_RELATIVE_ACCURACY)
+        self.errors = 0
+
+
+class LatencyHistogramRegistry:
+    """In-memory latency sketches for the current worker"""
+
+    def __init__(self, bucket_seconds: int = SKETCH_BUCKET_SECONDS):
+        self.bucket_seconds = bucket_seconds
+        # bucket start (epoch seconds) -> (method, route) -> RouteLatency
+        self._buckets: Dict[int, Dict[Tuple[str, str], RouteLatency]] = {}
+
+    def observe(
+        self,
+        method: str,
+        route: str,
+        latency_ms: float,
+        error: bool = False,
+        at: Optional[float] = None
+    ):
+        """Record one request"""
+        timestamp = at if at is not None else time.time()
+        bucket = int(timestamp // self.bucket_seconds) * self.bucket_seconds
+
+        routes = self._buckets.get(bucket)
+        if routes is None:
+            routes = self._buckets[bucket] = {}
+
+        entry = routes.get((method, route))
+        if entry is None:
+            entry = routes[(method, route)] = RouteLatency()
+
+        entry.sketch.add(latency_ms)
+        if error:
+            entry.errors += 1
+
+    def drain(self, include_open: bool = False) -> List[Dict]:
+        """
+        Remove and return buckets ready to be persisted.
+
+        Args:
+            include_open: Also drain the current, still open bucket
+                (used on shutdown)
+        """
+        current_bucket = int(time.time() // self.bucket_seconds) * self.bucket_seconds
+
+        records = []
+        for bucket in sorted(self._buckets):
+            if bucket >= current_bucket and not include_open:
+                continue
+
+            for (method, route), entry in self._buckets.pop(bucket).items():
+                records.append({
+                    "method": method,
+                    "route": route,
+                    "bucket_start": datetime.utcfromtimestamp(bucket),
+                    "bucket_seconds": self.bucket_seconds,
+                    "worker_id": WORKER_ID,
+                    "request_count": entry.sketch.count,
+                    "error_count": entry.errors,
+                    "sketch": entry.sketch.to_bytes()
+                })
+
+        return records
+
+    def restore(self, records: List[Dict]):
+        """Put drained records back after a failed flush"""
+        for record in records:
+            bucket = int((record["bucket_start"] - EPOCH).total_seconds())
+            routes = self._buckets.setdefault(bucket, {})
+            entry = routes.get((record["method"], record["route"]))
+            if entry is None:
+                entry = routes[(record["method"], record["route"])] = RouteLatency()
+            entry.sketch.merge(LatencySketch.from_bytes(record["sketch"]))
+            entry.errors += record["error_count"]
+
+    def pending_routes(self) -> int:
+        """Number of (bucket, route) sketches not flushed yet"""
+        return sum(len(routes) for routes in self._buckets.values())
+
+
+class LatencySketchFlusher:
+    """Background task that persists closed sketch buckets"""
+
+    def __init__(
+        self,
+        registry: LatencyHistogramRegistry,
+        interval_seconds: float = SKETCH_BUCKET_SECONDS
+    ):
+        self.registry = registry
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self.flushed_records = 0
+        self.failed_flushes = 0
+
+    def start(self):
+        """Start periodic flushing"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop flushing and persist everything still in memory"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush(include_open=True)
+
+    async def flush(self, include_open: bool = False) -> int:
+        """Write drained buckets in one batch"""
+        records = self.registry.drain(include_open=include_open)
+        if not records:
+            return 0
+
+        # Imported lazily: the database module imports app settings
+        from app.core.database import background_session
+        from app.repositories.performance_repository import PerformanceRepository
+
+        try:
+            async with background_session("metrics.latency_sketches") as db:
+                await PerformanceRepository(db).save_latency_sketches(records)
+                await db.commit()
+        except Exception as e:
+            self.failed_flushes += 1
+            self.registry.restore(records)
+            print(f"Latency sketch flush error: {e}")
+            return 0
+
+        self.flushed_records += len(records)
+        return len(records)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await self.flush()
+
+
+# Global registry for this worker
+latency_histograms = LatencyHistogramRegistry()
+
+latency_flusher: Optional[LatencySketchFlusher] = None
+
+register_queue_depth("latency_sketches", latency_histograms.pending_routes)
+
+
+def init_latency_flusher() -> LatencySketchFlusher:
+    """Start the global sketch flusher"""
+    global latency_flusher
+
+    if latency_flusher is None:
+        latency_flusher = LatencySketchFlusher(latency_histograms)
+    latency_flusher.start()
+    return latency_flusher
+
+
+async def close_latency_flusher():
+    """Stop the global sketch flusher, flushing pending sketches"""
+    global latency_flusher
+
+    if latency_flusher:
+        await latency_flusher.stop()
+        latency_flusher = None
@@ -10,6 +10,7 @@ from typing import List, Optional, Tuple
 from datetime import datetime
 from uuid import UUID
 
+from app.core.pagination import CountStrategy, PageInfo
 from app.repositories.messaging_repository import MessagingRepository
 from app.models.user import User, UserRole
 from app.models.messaging import ConversationType, ParticipantRole
@@ -173,14 +174,16 @@ class MessagingService:
         current_user: User,
         filters: Optional[ConversationFilters] = None,
         page: int = 1,
-        page_size: int = 20
-    ) -> Tuple[List, int]:
+        page_size: int = 20,
+        count_strategy: CountStrategy = CountStrategy.EXACT
+    ) -> Tuple[List, PageInfo]:
         """List user's conversations"""
         return await self.repo.list_user_conversations(
             current_user.id,
             filters,
             page,
-            page_size
+            page_size,
+            count_strategy
         )
 
     # ========================================================================
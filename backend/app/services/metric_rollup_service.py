@@ -0,0 +1,249 @@
+"""
+Metric Rollup Service
+Sprint 22: Performance & Optimization
+
+Compaction and retention for the metric rollup tiers.
+
+- Raw points and route latency sketches are compacted into the 1-minute
+  tier once a minute is older than a short grace period; the database
+  groups the raw points, so only grouped rows reach the worker
+- Complete hours of the 1-minute tier are compacted into the 1-hour tier,
+  complete days of the 1-hour tier into the 1-day tier
+- Every compaction re-rolls a lookback window before the watermark, so
+  points arriving after their minute was compacted are still rolled up
+  before raw retention drops them
+- Retention is configured per tier; rollup tiers drop whole partitions
+
+A background scheduler runs compaction every minute. On PostgreSQL an
+advisory lock ensures only one worker compacts at a time.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from typing import Dict, Optional
+from datetime import datetime, timedelta
+import asyncio
+
+from app.repositories.metric_rollup_repository import (
+    MetricRollupRepository, TIERS, TIER_WIDTH, floor_time
+)
+from app.repositories.performance_repository import PerformanceRepository
+
+
+# Late points (e.g. sketches flushed at the end of their minute) still land
+# in raw data before the minute is compacted
+COMPACTION_GRACE = timedelta(minutes=3)
+
+# Points up to this late (past the grace period) are still rolled up
+LATE_ARRIVAL_LOOKBACK = timedelta(minutes=30)
+
+# Recomputed before each tier's watermark: coarser tiers also re-roll the
+# buckets the finer tier's recomputed buckets fall into
+REROLL_LOOKBACK = {
+    "1m": LATE_ARRIVAL_LOOKBACK,
+    "1h": LATE_ARRIVAL_LOOKBACK + timedelta(hours=1),
+    "1d": LATE_ARRIVAL_LOOKBACK + timedelta(hours=1) + timedelta(days=1),
+}
+
+# Source range compacted per transaction
+COMPACTION_CHUNK = {
+    "1m": timedelta(hours=1),
+    "1h": timedelta(days=1),
+    "1d": timedelta(days=31),
+}
+
+# Days of data kept per tier ("raw" covers PerformanceMetric rows and route
+# latency sketches)
+RETENTION_DAYS = {
+    "raw": 7,
+    "1m": 3,
+    "1h": 90,
+    "1d": 730,
+}
+
+# Advisory lock key for cluster-wide compaction
+COMPACTION_LOCK_KEY = 22_0032
+
+
+class MetricRollupService:
+    """Service for compacting and expiring metric rollups"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.rollup_repo = MetricRollupRepository(db)
+        self.perf_repo = PerformanceRepository(db)
+
+    async def compact(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Compact every tier up to its closed buckets.
+
+        Returns:
+            Rollup rows written per tier
+        """
+        now = now or datetime.utcnow()
+
+        written = {}
+        for tier in TIERS:
+            written[tier] = await self._compact_tier(tier, now)
+        return written
+
+    async def _compact_tier(self, tier: str, now: datetime) -> int:
+        """Compact one tier from its source in chunks"""
+        width = TIER_WIDTH[tier]
+        source_tier = "raw" if tier == "1m" else TIERS[TIERS.index(tier) - 1]
+        watermarks = await self.rollup_repo.get_watermarks()
+
+        # Compact only buckets that are complete in the source
+        if source_tier == "raw":
+            source_until = now - COMPACTION_GRACE
+        else:
+            source_until = watermarks.get(source_tier)
+            if source_until is None:
+                return 0
+        target = floor_time(source_until, width)
+
+        oldest_kept = now - timedelta(days=RETENTION_DAYS[source_tier])
+        watermark = watermarks.get(tier)
+        if watermark is None:
+            earliest = await self.rollup_repo.get_earliest_source_time(tier)
+            start = floor_time(max(earliest, oldest_kept), width) if earliest else target
+        else:
+            start = floor_time(max(watermark - REROLL_LOOKBACK[tier], oldest_kept), width)
+
+        written = 0
+        chunk = COMPACTION_CHUNK[tier]
+        while start < target:
+            # Recomputing a chunk is idempotent, so losing the lock only
+            # means another worker carries on from here
+            if not await self._try_lock():
+                break
+
+            end = min(start + chunk, target)
+            if source_tier == "raw":
+                aggregates = await self.rollup_repo.aggregate_raw_buckets(start, end, tier)
+            else:
+                aggregates = await self.rollup_repo.aggregate_tier(
+                    source_tier, start, end, bucket_width=width
+                )
+
+            written += await self.rollup_repo.upsert_rollups(tier, aggregates)
+            # Re-rolled chunks never move the watermark back
+            await self.rollup_repo.set_watermark(tier, max(end, watermark or end))
+            await self.db.commit()
+            start = end
+
+        return written
+
+    async def apply_retention(
+        self,
+        now: Optional[datetime] = None,
+        raw_days: Optional[int] = None
+    ) -> Dict[str, int]:
+        """
+        Expire data past each tier's retention.
+
+        Args:
+            now: Reference time (default: now)
+            raw_days: Override the raw data retention
+
+        Returns:
+            Deleted raw rows and dropped partitions (or rows) per tier
+        """
+        now = now or datetime.utcnow()
+        raw_days = raw_days if raw_days is not None else RETENTION_DAYS["raw"]
+        raw_cutoff = now - timedelta(days=raw_days)
+
+        removed = {
+            "raw": await self.perf_repo.delete_old_metrics(raw_days),
+            "latency_sketches": await self.rollup_repo.delete_latency_sketches_before(raw_cutoff),
+        }
+        for tier in TIERS:
+            cutoff = now - timedelta(days=RETENTION_DAYS[tier])
+            removed[tier] = await self.rollup_repo.drop_expired(tier, cutoff)
+
+        await self.db.commit()
+        return removed
+
+    async def _try_lock(self) -> bool:
+        """Take the compaction lock until the next commit (PostgreSQL only)"""
+        if self.db.get_bind().dialect.name != "postgresql":
+            return True
+
+        result = await self.db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:key)"),
+            {"key": COMPACTION_LOCK_KEY}
+        )
+        return bool(result.scalar())
+
+
+class MetricRollupScheduler:
+    """Background task running compaction and retention"""
+
+    def __init__(
+        self,
+        compaction_interval_seconds: float = 60.0,
+        retention_interval_seconds: float = 3600.0
+    ):
+        self.compaction_interval_seconds = compaction_interval_seconds
+        self.retention_interval_seconds = retention_interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._last_retention = 0.0
+
+    def start(self):
+        """Start the scheduler"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the scheduler"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_once(self):
+        """Run one compaction (and retention when due)"""
+        # Imported lazily: the database module imports app settings
+        from app.core.database import background_session
+
+        async with background_session("metrics.rollups") as db:
+            service = MetricRollupService(db)
+            await service.compact()
+
+            loop_time = asyncio.get_running_loop().time()
+            if loop_time - self._last_retention >= self.retention_interval_seconds:
+                await service.apply_retention()
+                self._last_retention = loop_time
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.compaction_interval_seconds)
+            try:
+                await self.run_once()
+            except Exception as e:
+                print(f"Metric rollup error: {e}")
+
+
+rollup_scheduler: Optional[MetricRollupScheduler] = None
+
+
+def init_rollup_scheduler() -> MetricRollupScheduler:
+    """Start the global rollup scheduler"""
+    global rollup_scheduler
+
+    if rollup_scheduler is None:
+        rollup_scheduler = MetricRollupScheduler()
+    rollup_scheduler.start()
+    return rollup_scheduler
+
+
+async def close_rollup_scheduler():
+    """Stop the global rollup scheduler"""
+    global rollup_scheduler
+
+    if rollup_scheduler:
+        await rollup_scheduler.stop()
+        rollup_scheduler = None
@@ -83,9 +83,8 @@ class NotificationService:
                 detail="Admin access required"
             )
 
-        notifications = []
-        for user_id in bulk_data.user_ids:
-            notification_data = NotificationCreate(
+        notifications_data = [
+            NotificationCreate(
                 user_id=user_id,
                 type=bulk_data.type,
                 title=bulk_data.title,
@@ -97,10 +96,10 @@ class NotificationService:
                 context_type=bulk_data.context_type,
                 context_id=bulk_data.context_id
             )
+            for user_id in bulk_data.user_ids
+        ]
 
-            notification = await self.repo.create_notification(notification_data)
-            notifications.append(notification)
-
+        notifications = await self.repo.bulk_create_notifications(notifications_data)
         await self.db.commit()
 
         return {
@@ -5,6 +5,7 @@ Sprint 22: Performance & Optimization
 Service layer for performance metrics, monitoring, and optimization.
 """
 
+from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
@@ -13,6 +14,14 @@ import asyncio
 import psutil
 import time
 
+from app.core import database
+from app.core.loop_watchdog import loop_watchdog
+from app.core.pool_telemetry import pool_telemetry
+from app.services.latency_histogram_service import latency_histograms
+from app.services.metric_rollup_service import MetricRollupService
+from app.services.benchmark_service import (
+    benchmark_operations, operation_worker, run_load, plain_worker, DEFAULT_TARGET_COUNT
+)
 from app.repositories.performance_repository import PerformanceRepository
 from app.services.cache_service import RedisCacheService
 from app.schemas.performance import (
@@ -83,6 +92,10 @@ class PerformanceService:
         error: Optional[str] = None
     ):
         """Record API endpoint latency"""
+        latency_histograms.observe(
+            method, endpoint, latency_ms, error=bool(error) or status_code >= 500
+        )
+
         metric_data = PerformanceMetricCreate(
             metric_type="api_latency",
             metric_value=latency_ms,
@@ -243,7 +256,7 @@ class PerformanceService:
             for comp in components.values()
         )
 
-        status = "healthy" if all_healthy else "degraded"
+        health_status = "healthy" if all_healthy else "degraded"
 
         # Get resource metrics
         resource_usage = self._get_resource_usage()
@@ -252,7 +265,7 @@ class PerformanceService:
         alerts = await self._generate_alerts()
 
         return SystemHealthResponse(
-            status=status,
+            status=health_status,
             timestamp=datetime.utcnow(),
             components=components,
             metrics={
@@ -264,15 +277,33 @@ class PerformanceService:
         )
 
     async def _get_database_health(self) -> DatabaseHealth:
-        """Get database health metrics"""
-        # In production, query actual database pool stats
+        """Get database health metrics from pool telemetry"""
+        pool = pool_telemetry.snapshot()
+        if database.pool_controller is not None:
+            pool["adaptive_overflow"] = database.pool_controller.snapshot()
+
+        # Exhausted: every connection (including overflow) is in use
+        capacity = pool["pool_size"] + pool["max_overflow"]
+        exhausted = capacity > 0 and pool["checked_out"] >= capacity
+
+        health_status = "healthy"
+        if exhausted or pool["wait_ms"]["avg_ms"] >= self.thresholds["db_query_warning"]:
+            health_status = "degraded"
+        if pool["queries"]["avg_ms"] >= self.thresholds["db_query_critical"]:
+            health_status = "degraded"
+
         return DatabaseHealth(
-            status="healthy",
-            connection_pool_size=10,
-            active_connections=2,
-            idle_connections=8,
-            avg_query_time_ms=15.5,
-            slow_queries=0
+            status=health_status,
+            connection_pool_size=pool["pool_size"],
+            active_connections=pool["checked_out"],
+            idle_connections=pool["checked_in"],
+            avg_query_time_ms=pool["queries"]["avg_ms"],
+            slow_queries=pool["queries"]["slow"],
+            max_overflow=pool["max_overflow"],
+            overflow_in_use=pool["overflow_in_use"],
+            checkout_timeouts=pool["timeouts"],
+            avg_checkout_wait_ms=pool["wait_ms"]["avg_ms"],
+            pool=pool
         )
 
     async def _get_redis_health(self) -> RedisHealth:
@@ -509,7 +540,8 @@ class PerformanceService:
     def _get_resource_usage(self) -> Dict[str, float]:
         """Get current resource usage"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=0.1)
+            # Non-blocking: CPU usage since the previous call
+            cpu_percent = psutil.cpu_percent(interval=None)
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
 
@@ -518,7 +550,9 @@ class PerformanceService:
                 "memory_percent": memory.percent,
                 "disk_percent": disk.percent,
                 "memory_used_mb": memory.used / (1024 * 1024),
-                "disk_used_gb": disk.used / (1024 * 1024 * 1024)
+                "disk_used_gb": disk.used / (1024 * 1024 * 1024),
+                "event_loop_lag_ms": loop_watchdog.last_lag_ms,
+                "event_loop_max_lag_ms": loop_watchdog.lag_histogram.max_ms
             }
         except Exception as e:
             print(f"Error getting resource usage: {e}")
@@ -527,7 +561,9 @@ class PerformanceService:
                 "memory_percent": 0,
                 "disk_percent": 0,
                 "memory_used_mb": 0,
-                "disk_used_gb": 0
+                "disk_used_gb": 0,
+                "event_loop_lag_ms": 0,
+                "event_loop_max_lag_ms": 0
             }
 
     # ========================================================================
@@ -537,40 +573,91 @@ class PerformanceService:
     async def run_benchmark(
         self,
         operation_name: str,
-        operation_func,
-        iterations: int = 100
+        operation_func=None,
+        iterations: int = 100,
+        concurrency: int = 1,
+        warmup_iterations: int = 0
     ) -> BenchmarkResult:
-        """Run a benchmark on an operation"""
-        times = []
+        """
+        Run a load benchmark on an operation.
+
+        Args:
+            operation_name: Name of a registered operation, or a label for
+                ``operation_func``
+            operation_func: Zero-argument coroutine function to benchmark
+                instead of a registered operation
+            iterations: Measured calls
+            concurrency: Concurrent workers (one session each)
+            warmup_iterations: Unmeasured calls before measuring
+
+        Returns:
+            Latency percentiles, throughput curve and error counts
+        """
+        if operation_func is not None:
+            worker_factory = lambda: plain_worker(operation_func)
+        else:
+            operation = benchmark_operations.get(operation_name)
+            if operation is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Unknown benchmark operation. Available: {', '.join(sorted(benchmark_operations))}"
+                )
 
-        for _ in range(iterations):
-            start_time = time.time()
-            await operation_func()
-            end_time = time.time()
-            times.append((end_time - start_time) * 1000)  # Convert to ms
+            targets = await operation.load_targets(self.db, DEFAULT_TARGET_COUNT)
+            if not targets:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"No data to benchmark '{operation_name}' against; seed the dataset first"
+                )
+            worker_factory = operation_worker(operation, targets)
 
-        avg_time = sum(times) / len(times)
-        min_time = min(times)
-        max_time = max(times)
-        ops_per_second = 1000 / avg_time if avg_time > 0 else 0
+        try:
+            run = await run_load(
+                worker_factory,
+                iterations=iterations,
+                concurrency=concurrency,
+                warmup_iterations=warmup_iterations
+            )
+        except TimeoutError as e:
+            raise HTTPException(
+                status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                detail=str(e)
+            )
 
+        latencies = run.latencies_ms
         return BenchmarkResult(
             benchmark_name=f"benchmark_{operation_name}",
             operation=operation_name,
             iterations=iterations,
-            avg_time_ms=avg_time,
-            min_time_ms=min_time,
-            max_time_ms=max_time,
-            ops_per_second=ops_per_second,
+            concurrency=run.concurrency,
+            warmup_iterations=warmup_iterations,
+            avg_time_ms=sum(latencies) / len(latencies) if latencies else 0.0,
+            min_time_ms=min(latencies) if latencies else 0.0,
+            max_time_ms=max(latencies) if latencies else 0.0,
+            p50_time_ms=run.percentile(50),
+            p90_time_ms=run.percentile(90),
+            p95_time_ms=run.percentile(95),
+            p99_time_ms=run.percentile(99),
+            ops_per_second=run.ops_per_second,
+            duration_seconds=run.duration_seconds,
+            error_count=run.error_count,
+            errors=run.errors,
+            throughput_curve=run.throughput_curve(),
             timestamp=datetime.utcnow()
         )
 
+    def list_benchmark_operations(self) -> List[Dict[str, str]]:
+        """List the registered benchmark operations"""
+        return [
+            {"name": op.name, "description": op.description}
+            for op in sorted(benchmark_operations.values(), key=lambda op: op.name)
+        ]
+
     # ========================================================================
     # Cleanup
     # ========================================================================
 
     async def cleanup_old_metrics(self, days_to_keep: int = 30) -> int:
-        """Delete old performance metrics"""
-        count = await self.perf_repo.delete_old_metrics(days_to_keep)
-        await self.db.commit()
-        return count
+        """Delete old raw metrics and expire rollup tiers past their retention"""
+        removed = await MetricRollupService(self.db).apply_retention(raw_days=days_to_keep)
+        return removed["raw"]
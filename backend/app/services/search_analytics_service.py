@@ -0,0 +1,289 @@
+"""
+Search Analytics Service
+Sprint 22: Performance & Optimization
+
+Search analytics off the request path.
+
+- A search only appends its analytics row to an in-memory queue (no I/O)
+- A background flusher bulk-inserts queued rows every few seconds and
+  counts their queries in Space-Saving sketches (``app.core.heavy_hitters``)
+  per search type and day
+- The sketches of the current day are upserted per worker on every flush;
+  trending queries merge the sketches of a period across workers instead of
+  grouping raw analytics rows, and compare them with the period before
+- Merged periods are cached for ``TRENDING_CACHE_SECONDS``, so a trending
+  lookup is a slice of a ranked list
+"""
+
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+import asyncio
+import time
+
+from app.core.heavy_hitters import SpaceSaving
+from app.core.metrics import register_queue_depth
+from app.services.latency_histogram_service import WORKER_ID
+
+
+DEFAULT_BUFFER_SIZE = 50000
+
+DEFAULT_FLUSH_INTERVAL_SECONDS = 5.0
+
+DEFAULT_SKETCH_CAPACITY = 200
+
+# Width of a trending sketch bucket (one day)
+TRENDING_BUCKET_SECONDS = 86400
+
+# Twice the longest trending period (30 days): current and previous period
+TRENDING_RETENTION_DAYS = 60
+
+TRENDING_CACHE_SECONDS = 60.0
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def normalize_query(query: Optional[str]) -> Optional[str]:
+    """Trending key of a query: case folded, single spaces"""
+    if not query:
+        return None
+    return " ".join(query.casefold().split()) or None
+
+
+def bucket_start(at: datetime) -> datetime:
+    """Start of the trending bucket containing a time"""
+    seconds = int((at - EPOCH).total_seconds())
+    return EPOCH + timedelta(seconds=seconds - seconds % TRENDING_BUCKET_SECONDS)
+
+
+class SearchAnalyticsQueue:
+    """Queued analytics rows and trending sketches of one worker"""
+
+    def __init__(self, capacity: int = DEFAULT_BUFFER_SIZE, sketch_capacity: int = DEFAULT_SKETCH_CAPACITY):
+        self.capacity = capacity
+        self.sketch_capacity = sketch_capacity
+        self._rows: deque = deque()
+        # Rows of failed inserts, retried on the next flush
+        self._failed: List[Dict[str, Any]] = []
+
+        # (bucket start, search type) -> sketch
+        self.sketches: Dict[Tuple[datetime, str], SpaceSaving] = {}
+        self._dirty: Set[Tuple[datetime, str]] = set()
+
+        self.recorded = 0
+        self.dropped = 0
+        self.inserted = 0
+        self.flushes = 0
+        self.flush_errors = 0
+        self.last_flush_ms = 0.0
+        self._expired_at = 0.0
+
+    @property
+    def pending(self) -> int:
+        return len(self._rows) + len(self._failed)
+
+    def record(self, row: Dict[str, Any]):
+        """Queue one analytics row (the oldest row is dropped when full)"""
+        if len(self._rows) >= self.capacity:
+            self._rows.popleft()
+            self.dropped += 1
+        self._rows.append(row)
+        self.recorded += 1
+
+    def observe(self, rows: List[Dict[str, Any]]):
+        """Count the queries of rows in the trending sketches"""
+        for row in rows:
+            query = normalize_query(row.get("query_text"))
+            if query is None:
+                continue
+            key = (bucket_start(row["searched_at"]), row.get("search_type") or "vendor")
+            sketch = self.sketches.get(key)
+            if sketch is None:
+                sketch = self.sketches[key] = SpaceSaving(self.sketch_capacity)
+            sketch.add(query)
+            self._dirty.add(key)
+
+    async def flush(self) -> int:
+        """Insert queued rows and save changed sketches"""
+        started = time.perf_counter()
+        rows = list(self._rows)
+        self._rows.clear()
+        self.observe(rows)
+
+        rows = self._failed + rows
+        self._failed = []
+        if not rows and not self._dirty:
+            return 0
+
+        # Imported lazily: the database module imports app settings
+        from app.core.database import background_session
+        from app.repositories.search_repository import SearchRepository
+
+        dirty = list(self._dirty)
+        try:
+            async with background_session("search.analytics") as db:
+                repo = SearchRepository(db)
+                await repo.create_search_analytics_batch(rows)
+                await repo.save_trending_sketches([
+                    {
+                        "search_type": search_type,
+                        "bucket_start": start,
+                        "worker_id": WORKER_ID,
+                        "search_count": self.sketches[(start, search_type)].total,
+                        "counters": self.sketches[(start, search_type)].to_dict()
+                    }
+                    for start, search_type in dirty
+                ])
+                if time.time() - self._expired_at >= TRENDING_BUCKET_SECONDS / 24:
+                    await repo.delete_trending_sketches_before(
+                        datetime.utcnow() - timedelta(days=TRENDING_RETENTION_DAYS)
+                    )
+                    self._expired_at = time.time()
+                await db.commit()
+        except Exception as e:
+            self.flush_errors += 1
+            # Sketches stay dirty; rows are retried up to the queue capacity
+            self._failed = rows[-self.capacity:]
+            print(f"Search analytics flush error: {e}")
+            return 0
+        finally:
+            self.flushes += 1
+            self.last_flush_ms = (time.perf_counter() - started) * 1000
+
+        self.inserted += len(rows)
+        self._dirty.difference_update(dirty)
+        # Past days are final once saved
+        today = bucket_start(datetime.utcnow())
+        for key in [key for key in self.sketches if key[0] < today and key not in self._dirty]:
+            del self.sketches[key]
+        return len(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "recorded": self.recorded,
+            "pending": self.pending,
+            "dropped": self.dropped,
+            "inserted": self.inserted,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "sketches": len(self.sketches)
+        }
+
+
+class TrendingQueries:
+    """Trending queries from merged sketches, cached per search type and period"""
+
+    def __init__(self, sketch_capacity: int = DEFAULT_SKETCH_CAPACITY, cache_seconds: float = TRENDING_CACHE_SECONDS):
+        self.sketch_capacity = sketch_capacity
+        self.cache_seconds = cache_seconds
+        # (search type, days) -> (expires at, ranked queries)
+        self._cache: Dict[Tuple[Optional[str], int], Tuple[float, List[Dict[str, Any]]]] = {}
+
+    async def get(self, repo, search_type: Optional[str], days: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Most searched queries of the last ``days`` days (including today).
+
+        Counts are Space-Saving estimates (upper bounds); trend_percentage
+        compares them with the ``days`` days before.
+        """
+        key = (search_type, days)
+        cached = self._cache.get(key)
+        if cached is None or cached[0] < time.monotonic():
+            ranked = await self._rank(repo, search_type, days)
+            cached = self._cache[key] = (time.monotonic() + self.cache_seconds, ranked)
+        return cached[1][:limit]
+
+    async def _rank(self, repo, search_type: Optional[str], days: int) -> List[Dict[str, Any]]:
+        period_start = bucket_start(datetime.utcnow()) - timedelta(days=days - 1)
+        previous_start = period_start - timedelta(days=days)
+
+        current = SpaceSaving(self.sketch_capacity)
+        previous = SpaceSaving(self.sketch_capacity)
+        for start, counters in await repo.get_trending_sketches(previous_start, search_type):
+            sketch = SpaceSaving.from_dict(counters)
+            (current if start >= period_start else previous).merge(sketch)
+
+        ranked = []
+        for query, count, _ in current.top(self.sketch_capacity):
+            before = previous.estimate(query)
+            ranked.append({
+                "query": query,
+                "count": count,
+                "trend_percentage": round((count - before) / before * 100, 1) if before else 100.0
+            })
+        return ranked
+
+
+class SearchAnalyticsFlusher:
+    """Background task flushing the analytics queue every interval"""
+
+    def __init__(self, queue: SearchAnalyticsQueue, interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS):
+        self.queue = queue
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start periodic flushing"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop flushing and flush what is left"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.queue.flush()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.queue.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Failed outside the database write; keep flushing on the next tick
+                self.queue.flush_errors += 1
+                print(f"Search analytics flush error: {e}")
+
+
+# Global queue and trending view for this worker
+search_analytics = SearchAnalyticsQueue()
+trending_queries = TrendingQueries()
+
+search_analytics_flusher: Optional[SearchAnalyticsFlusher] = None
+
+register_queue_depth("search_analytics", lambda: search_analytics.pending)
+
+
+def init_search_analytics(
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+    sketch_capacity: int = DEFAULT_SKETCH_CAPACITY
+) -> SearchAnalyticsFlusher:
+    """Configure the global queue and start its flusher"""
+    global search_analytics_flusher
+
+    search_analytics.capacity = buffer_size
+    search_analytics.sketch_capacity = sketch_capacity
+    trending_queries.sketch_capacity = sketch_capacity
+
+    if search_analytics_flusher is None:
+        search_analytics_flusher = SearchAnalyticsFlusher(search_analytics, flush_interval_seconds)
+    search_analytics_flusher.start()
+    return search_analytics_flusher
+
+
+async def close_search_analytics():
+    """Stop the flusher, flushing queued rows"""
+    global search_analytics_flusher
+
+    if search_analytics_flusher:
+        await search_analytics_flusher.stop()
+        search_analytics_flusher = None
@@ -0,0 +1,105 @@
+"""
+Search Facet Service
+Sprint 22: Performance & Optimization
+
+Background refresh of the precomputed facets (``app.core.facet_cache``).
+
+- Every ``interval_seconds`` the indices that were written to, are older
+  than the cache's ``max_age_seconds`` or were never computed get one
+  aggregation request each (``SearchService.precompute_facets``)
+- A failed refresh keeps the previous facets and is retried on the next
+  tick; searches aggregate live until an index is first computed
+"""
+
+from typing import Optional
+import asyncio
+
+from app.core.elasticsearch import INDEX_EVENTS, INDEX_SERVICES, INDEX_VENDORS
+from app.core.facet_cache import FacetCache, facet_cache
+
+
+FACET_INDICES = (INDEX_VENDORS, INDEX_EVENTS, INDEX_SERVICES)
+
+DEFAULT_INTERVAL_SECONDS = 5.0
+
+
+class FacetRefresher:
+    """Background task keeping the precomputed facets current"""
+
+    def __init__(self, cache: FacetCache, interval_seconds: float = DEFAULT_INTERVAL_SECONDS):
+        self.cache = cache
+        self.interval_seconds = interval_seconds
+        self.errors = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start periodic refreshing"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refresh(self) -> int:
+        """Recompute the facets of the indices that are due"""
+        due = self.cache.due(FACET_INDICES)
+        if not due:
+            return 0
+
+        # Imported lazily: the database module imports app settings, the
+        # search service the models
+        from app.core.database import background_session
+        from app.services.search_service import SearchService
+
+        refreshed = 0
+        async with background_session("search.facets") as db:
+            service = SearchService(db)
+            for index in due:
+                if await service.precompute_facets(index):
+                    refreshed += 1
+                else:
+                    self.errors += 1
+        return refreshed
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️  Facet refresh failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+
+facet_refresher: Optional[FacetRefresher] = None
+
+
+def init_search_facets(
+    interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+    max_age_seconds: float = 300.0
+) -> FacetRefresher:
+    """Configure the global facet cache and start refreshing it"""
+    global facet_refresher
+
+    facet_cache.max_age_seconds = max_age_seconds
+    if facet_refresher is None:
+        facet_refresher = FacetRefresher(facet_cache, interval_seconds)
+    facet_refresher.start()
+    return facet_refresher
+
+
+async def close_search_facets():
+    """Stop the background refresh"""
+    global facet_refresher
+
+    if facet_refresher:
+        await facet_refresher.stop()
+        facet_refresher = None
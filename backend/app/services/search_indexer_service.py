@@ -0,0 +1,538 @@
+"""
+Search Indexer Service
+Sprint 22: Performance & Optimization
+
+Keeps the Elasticsearch indices in sync with the database through the
+search index outbox.
+
+- Vendor, service and event changes add outbox rows in the same transaction
+  as the change itself (see ``app.models.search``), so no change is lost when
+  Elasticsearch is down and none is indexed when the transaction rolls back
+- One consumer at a time (PostgreSQL advisory lock) claims the oldest
+  entries, reloads the current rows and writes them in one bulk request
+- Each batch takes a new external version under the lock, so versions
+  follow processing order: a late or retried write never overwrites a
+  document built from newer rows
+- Entries that keep failing are dead-lettered after ``max_attempts``; lag,
+  pending entries and dead letters are reported per index
+- Entries of an index being rebuilt (``sync_in_progress``) stay queued and
+  are replayed into the new index after its alias swap
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+import asyncio
+import time
+
+from elasticsearch.helpers import async_bulk
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.elasticsearch import ElasticsearchClient, INDEX_VENDORS, INDEX_EVENTS, INDEX_SERVICES
+from app.core.metrics import register_queue_depth
+from app.core.facet_cache import facet_cache
+from app.core.search_cache import search_result_cache
+
+
+INDEXED = (INDEX_VENDORS, INDEX_SERVICES, INDEX_EVENTS)
+
+# pg_try_advisory_xact_lock key of the outbox consumer
+OUTBOX_LOCK_KEY = 7_301_041
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_INTERVAL_SECONDS = 1.0
+DEFAULT_MAX_ATTEMPTS = 5
+
+MAX_BACKOFF_SECONDS = 60.0
+STATUS_INTERVAL_SECONDS = 30.0
+
+# Vendor statuses that are not searchable
+HIDDEN_VENDOR_STATUSES = {"SUSPENDED", "INACTIVE", "DELETED"}
+
+
+# ============================================================================
+# Documents
+# ============================================================================
+
+def _value(value: Any) -> Any:
+    """Enum value or the value itself"""
+    return getattr(value, "value", value)
+
+
+def _float(value: Any) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def _iso(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def vendor_searchable(vendor: Any) -> bool:
+    return vendor.deleted_at is None and _value(vendor.status) not in HIDDEN_VENDOR_STATUSES
+
+
+def service_searchable(service: Any) -> bool:
+    return bool(service.is_active) and service.vendor is not None and vendor_searchable(service.vendor)
+
+
+def event_searchable(event: Any) -> bool:
+    # Only public events are searchable; everything else is removed from the index
+    return event.deleted_at is None and _value(event.visibility) == "PUBLIC"
+
+
+def vendor_document(vendor: Any) -> Dict[str, Any]:
+    """Vendor row (with services, subcategories, portfolio, certifications, team) -> document"""
+    document = {
+        "id": str(vendor.id),
+        "business_name": vendor.business_name,
+        "description": vendor.description,
+        "category": _value(vendor.category),
+        "subcategories": [item.subcategory for item in vendor.subcategories],
+        "services": [
+            {
+                "id": str(service.id),
+                "name": service.service_name,
+                "description": service.description,
+                "price": _float(service.base_price),
+                "category": service.service_category
+            }
+            for service in vendor.services if service.is_active
+        ],
+        "city": vendor.location_city,
+        "region": vendor.location_district,
+        "address": vendor.location_address,
+        "rating": _float(vendor.avg_rating) or 0.0,
+        "review_count": vendor.review_count or 0,
+        "verified": bool(vendor.verified),
+        "featured": bool(vendor.featured),
+        "portfolio_items": [
+            {
+                "title": item.title,
+                "description": item.description,
+                "tags": [item.event_type] if item.event_type else []
+            }
+            for item in vendor.portfolio
+        ],
+        "certifications": [item.certification_name for item in vendor.certifications],
+        "team_size": len(vendor.team_members),
+        "created_at": _iso(vendor.created_at),
+        "updated_at": _iso(vendor.updated_at),
+        "is_active": _value(vendor.status) == "ACTIVE"
+    }
+    if vendor.location_lat is not None and vendor.location_lng is not None:
+        document["location"] = {"lat": float(vendor.location_lat), "lon": float(vendor.location_lng)}
+    return document
+
+
+def service_document(service: Any) -> Dict[str, Any]:
+    """Vendor service row (with vendor) -> document"""
+    return {
+        "id": str(service.id),
+        "vendor_id": str(service.vendor_id),
+        "vendor_name": service.vendor.business_name if service.vendor is not None else None,
+        "service_name": service.service_name,
+        "description": service.description,
+        "category": service.service_category,
+        "price": _float(service.base_price),
+        "price_type": _value(service.price_unit),
+        "duration": _float(service.duration_hours),
+        "duration_unit": "hours" if service.duration_hours is not None else None,
+        "capacity": service.max_capacity,
+        "is_available": bool(service.is_active),
+        "created_at": _iso(service.created_at),
+        "updated_at": _iso(service.updated_at)
+    }
+
+
+def event_document(event: Any) -> Dict[str, Any]:
+    """Event row -> document"""
+    return {
+        "id": str(event.id),
+        "name": event.name,
+        "description": event.description,
+        "event_type": _value(event.type),
+        "status": _value(event.status),
+        "organizer_id": str(event.created_by),
+        "event_date": _iso(event.event_date),
+        "venue_name": event.venue_name,
+        "guest_count": event.guest_count_estimate,
+        "budget_total": _float(event.budget_amount),
+        "cultural_elements": [event.cultural_type] if event.cultural_type else [],
+        "is_public": _value(event.visibility) == "PUBLIC",
+        "created_at": _iso(event.created_at),
+        "updated_at": _iso(event.updated_at)
+    }
+
+
+def document_sources() -> Dict[str, Tuple[Any, List[Any], Callable[[Any], bool], Callable[[Any], Dict[str, Any]]]]:
+    """Index -> (model, loader options, searchable predicate, document builder)"""
+    from app.models.vendor import Vendor, VendorService
+    from app.models.event import Event
+
+    return {
+        INDEX_VENDORS: (
+            Vendor,
+            [
+                selectinload(Vendor.services),
+                selectinload(Vendor.subcategories),
+                selectinload(Vendor.portfolio),
+                selectinload(Vendor.certifications),
+                selectinload(Vendor.team_members)
+            ],
+            vendor_searchable,
+            vendor_document
+        ),
+        INDEX_SERVICES: (VendorService, [selectinload(VendorService.vendor)], service_searchable, service_document),
+        INDEX_EVENTS: (Event, [], event_searchable, event_document),
+    }
+
+
+async def load_documents(db: AsyncSession, index_name: str, document_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    Current documents by id.
+
+    Rows that no longer exist or are not searchable map to None.
+    """
+    model, options, searchable, build = document_sources()[index_name]
+    result = await db.execute(
+        select(model).options(*options).where(model.id.in_([UUID(i) for i in document_ids]))
+    )
+    documents: Dict[str, Optional[Dict[str, Any]]] = dict.fromkeys(document_ids)
+    for row in result.scalars():
+        documents[str(row.id)] = build(row) if searchable(row) else None
+    return documents
+
+
+# ============================================================================
+# Outbox Batches
+# ============================================================================
+
+class DocumentChange:
+    """Latest pending change of one document within a batch"""
+
+    def __init__(self, index_name: str, document_id: str, operation: str, version: int, entry_ids: List[int]):
+        self.index_name = index_name
+        self.document_id = document_id
+        self.operation = operation
+        # External document version of the batch
+        self.version = version
+        self.entry_ids = entry_ids
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.index_name, self.document_id)
+
+
+def collapse_entries(entries: List[Any], version: int) -> List[DocumentChange]:
+    """One change per document of a batch; the latest entry (highest id) wins"""
+    changes: Dict[Tuple[str, str], DocumentChange] = {}
+    for entry in sorted(entries, key=lambda e: e.id):
+        change = changes.get((entry.index_name, entry.document_id))
+        if change is None:
+            changes[(entry.index_name, entry.document_id)] = DocumentChange(
+                entry.index_name, entry.document_id, entry.operation, version, [entry.id]
+            )
+        else:
+            change.operation = entry.operation
+            change.entry_ids.append(entry.id)
+    return list(changes.values())
+
+
+def bulk_action(change: DocumentChange, document: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Bulk index or delete action with external versioning"""
+    action = {
+        "_index": change.index_name,
+        "_id": change.document_id,
+        "version": change.version,
+        "version_type": "external"
+    }
+    if change.operation == "delete" or document is None:
+        action["_op_type"] = "delete"
+    else:
+        action["_op_type"] = "index"
+        action["_source"] = document
+    return action
+
+
+def bulk_failures(errors: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Failed document ids from async_bulk errors.
+
+    Version conflicts mean a newer version is already indexed, and deleting
+    a missing document leaves the index as intended; neither is a failure.
+    Responses name the concrete index behind an alias, so failures are
+    keyed by document id only (ids are UUIDs).
+    """
+    failures = {}
+    for item in errors:
+        op_type, result = next(iter(item.items()))
+        status_code = result.get("status")
+        if status_code == 409 or (op_type == "delete" and status_code == 404):
+            continue
+        failures[str(result.get("_id"))] = str(result.get("error") or f"status {status_code}")
+    return failures
+
+
+# ============================================================================
+# Indexer
+# ============================================================================
+
+class SearchIndexer:
+    """Background consumer of the search index outbox"""
+
+    def __init__(
+        self,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    ):
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.max_attempts = max_attempts
+
+        self.batches = 0
+        self.last_batch_ms = 0.0
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[datetime] = None
+        self.pending = 0
+        # Per index: documents written since the last status report
+        self.indexed = dict.fromkeys(INDEXED, 0)
+        self.totals = {"indexed": 0, "failed": 0}
+
+        self._backoff = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start consuming the outbox"""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop consuming; unprocessed entries stay in the outbox"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        next_report = 0.0
+        while True:
+            processed = 0
+            try:
+                processed = await self.run_once()
+                self._backoff = 0.0
+            except Exception as e:
+                # Nothing was committed; entries are retried without counting an attempt
+                self._backoff = min(max(self._backoff * 2, self.interval_seconds), MAX_BACKOFF_SECONDS)
+                self._record_error(e)
+                print(f"⚠️  Search indexer failed, retrying in {self._backoff:.0f}s: {e}")
+
+            if time.monotonic() >= next_report:
+                try:
+                    await self.report_status()
+                except Exception as e:
+                    print(f"⚠️  Search index status update failed: {e}")
+                next_report = time.monotonic() + STATUS_INTERVAL_SECONDS
+
+            if self._backoff:
+                await asyncio.sleep(self._backoff)
+            elif processed < self.batch_size:
+                # A full batch means more is waiting
+                await asyncio.sleep(self.interval_seconds)
+
+    def _record_error(self, error: Exception):
+        self.last_error = str(error)[:2000]
+        self.last_error_at = datetime.utcnow()
+
+    async def run_once(self) -> int:
+        """
+        Process one batch of outbox entries.
+
+        Returns:
+            Number of outbox entries claimed (0 when another worker holds the lock)
+        """
+        from app.core.database import background_session
+        from app.repositories.search_repository import SearchRepository
+
+        started = time.perf_counter()
+        async with background_session("search.indexer") as db:
+            repo = SearchRepository(db)
+            if not await repo.try_lock_outbox(OUTBOX_LOCK_KEY):
+                return 0
+
+            # Changes to an index being rebuilt wait for its alias swap
+            paused = set(await repo.get_indices_in_sync())
+            if INDEX_SERVICES in paused:
+                # Vendor changes re-index services as well
+                paused.add(INDEX_VENDORS)
+            entries = await repo.get_outbox_batch(self.batch_size, list(paused))
+            if not entries:
+                await db.commit()
+                return 0
+
+            # Outbox ids are assigned at flush, not in commit order: the
+            # version comes from processing order instead
+            changes = collapse_entries(entries, await repo.next_document_version())
+            changes += await self._cascade_vendor_changes(db, changes)
+
+            actions = []
+            for index_name in INDEXED:
+                batch = [change for change in changes if change.index_name == index_name]
+                if not batch:
+                    continue
+                documents = await load_documents(db, index_name, [change.document_id for change in batch])
+                actions += [bulk_action(change, documents[change.document_id]) for change in batch]
+
+            # Transport errors raise here and roll the batch back
+            _, errors = await async_bulk(
+                ElasticsearchClient.get_client(),
+                actions,
+                chunk_size=self.batch_size,
+                max_retries=3,
+                raise_on_error=False,
+                stats_only=False
+            )
+            failures = bulk_failures(errors)
+
+            failed_entries: Dict[int, str] = {}
+            for change in changes:
+                error = failures.get(change.document_id)
+                if error is None:
+                    self.indexed[change.index_name] += 1
+                    continue
+                for entry_id in change.entry_ids:
+                    failed_entries[entry_id] = error
+
+            await repo.delete_outbox_entries([e.id for e in entries if e.id not in failed_entries])
+            await repo.record_outbox_failures(failed_entries, self.max_attempts)
+            await db.commit()
+
+        # Cached searches of these indices may now miss or show changed documents
+        search_result_cache.invalidate({change.index_name for change in changes})
+        facet_cache.invalidate({change.index_name for change in changes})
+
+        self.batches += 1
+        self.totals["indexed"] += len(changes) - len(failures)
+        self.totals["failed"] += len(failures)
+        self.last_batch_ms = (time.perf_counter() - started) * 1000
+        if failures:
+            self.last_error = next(iter(failures.values()))
+            self.last_error_at = datetime.utcnow()
+        return len(entries)
+
+    async def _cascade_vendor_changes(self, db: AsyncSession, changes: List[DocumentChange]) -> List[DocumentChange]:
+        """
+        Re-index the services of changed vendors.
+
+        Service documents carry the vendor name and are only searchable
+        while their vendor is. The derived changes share the vendor's entry
+        ids, so a failure retries the vendor entry.
+        """
+        from app.models.vendor import VendorService
+
+        vendors = {c.document_id: c for c in changes if c.index_name == INDEX_VENDORS}
+        if not vendors:
+            return []
+
+        result = await db.execute(
+            select(VendorService.id, VendorService.vendor_id)
+            .where(VendorService.vendor_id.in_([UUID(i) for i in vendors]))
+        )
+        pending = {c.document_id for c in changes if c.index_name == INDEX_SERVICES}
+        derived = []
+        for service_id, vendor_id in result.all():
+            if str(service_id) in pending:
+                continue
+            vendor = vendors[str(vendor_id)]
+            derived.append(DocumentChange(INDEX_SERVICES, str(service_id), "index", vendor.version, list(vendor.entry_ids)))
+        return derived
+
+    # ========================================================================
+    # Status
+    # ========================================================================
+
+    async def report_status(self):
+        """Write health, lag and counts of each index to search_index_status"""
+        from app.core.database import background_session
+        from app.repositories.search_repository import SearchRepository
+
+        now = datetime.utcnow()
+        async with background_session("search.indexer") as db:
+            repo = SearchRepository(db)
+            lag = await repo.get_outbox_lag()
+            self.pending = sum(entry["pending"] for entry in lag.values())
+
+            for index_name in INDEXED:
+                outbox = lag.get(index_name, {"pending": 0, "oldest_pending_at": None, "dead_letters": 0})
+                oldest = outbox["oldest_pending_at"]
+                existing = await repo.get_index_status(index_name)
+                indexed_before = (existing.indexed_documents or 0) if existing else 0
+                index_settings = dict(existing.index_settings or {}) if existing else {}
+                # Lag lives in index_settings to avoid a migration of the status table
+                index_settings["outbox"] = {
+                    "pending": outbox["pending"],
+                    "oldest_pending_at": _iso(oldest),
+                    "lag_seconds": round((now - oldest).total_seconds(), 3) if oldest else 0.0,
+                    "indexer_running": self.running
+                }
+
+                await repo.create_or_update_index_status({
+                    "index_name": index_name,
+                    "entity_type": index_name,
+                    "is_healthy": not outbox["dead_letters"] and self._backoff == 0.0,
+                    "last_sync_at": now,
+                    "indexed_documents": indexed_before + self.indexed[index_name],
+                    "failed_documents": outbox["dead_letters"],
+                    "last_error": self.last_error,
+                    "index_settings": index_settings
+                })
+                self.indexed[index_name] = 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Indexer counters (this worker)"""
+        return {
+            "running": self.running,
+            "batch_size": self.batch_size,
+            "max_attempts": self.max_attempts,
+            "batches": self.batches,
+            "indexed": self.totals["indexed"],
+            "failed": self.totals["failed"],
+            "pending": self.pending,
+            "last_batch_ms": round(self.last_batch_ms, 3),
+            "backoff_seconds": self._backoff,
+            "last_error": self.last_error,
+            "last_error_at": _iso(self.last_error_at)
+        }
+
+
+# Global indexer for this worker
+search_indexer = SearchIndexer()
+
+register_queue_depth("search_outbox", lambda: search_indexer.pending)
+
+
+def init_search_indexer(
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    interval_seconds: float = DEFAULT_INTERVAL_SECONDS,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+) -> SearchIndexer:
+    """Configure and start the global indexer"""
+    search_indexer.batch_size = batch_size
+    search_indexer.interval_seconds = interval_seconds
+    search_indexer.max_attempts = max_attempts
+    search_indexer.start()
+    return search_indexer
+
+
+async def close_search_indexer():
+    """Stop the global indexer"""
+    await search_indexer.stop()
@@ -0,0 +1,313 @@
+"""
+Search Reindex Service
+Sprint 22: Performance & Optimization
+
+Zero-downtime rebuild of a search index, e.g. after a mapping change.
+
+1. The index is marked ``sync_in_progress``; the outbox indexer keeps its
+   changes queued from then on
+2. A new versioned index is created with refresh disabled and no replicas
+3. Rows are streamed from the database with server-side cursors, split
+   into parallel primary-key ranges, and bulk-loaded
+4. The document count is verified, refresh and replicas are restored
+5. The alias is moved to the new index in one atomic alias update and the
+   old index is removed
+6. Changes queued during the build are replayed from the outbox
+
+Usage:
+    python -m app.services.search_reindex_service vendors --slices 8
+"""
+
+from copy import deepcopy
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+import argparse
+import asyncio
+import time
+
+from elasticsearch.helpers import async_bulk
+from fastapi import HTTPException, status
+from sqlalchemy import select
+
+from app.core.elasticsearch import (
+    ElasticsearchClient, INDEX_MAPPINGS, get_alias_indices, versioned_index_name
+)
+from app.core.facet_cache import facet_cache
+from app.core.search_cache import search_result_cache
+from app.services.search_indexer_service import INDEXED, document_sources, search_indexer
+
+
+DEFAULT_SLICES = 4
+DEFAULT_BATCH_SIZE = 1000
+
+# Lowest external version: every change replayed from the outbox supersedes it
+BUILD_VERSION = 0
+
+
+def key_ranges(slices: int) -> List[Tuple[Optional[UUID], Optional[UUID]]]:
+    """
+    Split the UUID key space into equal [lower, upper) ranges.
+
+    Primary keys are random (uuid4), so equal ranges hold about the same
+    number of rows without scanning the table first.
+    """
+    bounds = [UUID(int=(i << 128) // slices) for i in range(1, slices)]
+    return list(zip([None] + bounds, bounds + [None]))
+
+
+def build_settings(mapping: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+    """Index settings for bulk loading, and the replica count to restore"""
+    settings = deepcopy(mapping["settings"])
+    index_settings = settings.setdefault("index", {})
+    replicas = index_settings.get("number_of_replicas", 1)
+    index_settings["number_of_replicas"] = 0
+    index_settings["refresh_interval"] = "-1"
+    return settings, replicas
+
+
+class IndexRebuild:
+    """One rebuild of one search index"""
+
+    def __init__(self, alias: str, batch_size: int = DEFAULT_BATCH_SIZE, slices: int = DEFAULT_SLICES):
+        if alias not in INDEXED:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown index: {alias}"
+            )
+        self.alias = alias
+        self.batch_size = batch_size
+        self.slices = slices
+        self.index: Optional[str] = None
+        self.progress: Dict[str, Any] = {
+            "index_name": alias,
+            "state": "pending",
+            "slices": [{"documents": 0, "failed": 0, "docs_per_second": 0.0} for _ in range(slices)]
+        }
+
+    async def claim(self, force: bool = False):
+        """Mark the index as being rebuilt (409 if a rebuild is already marked)"""
+        from app.core.database import background_session
+        from app.repositories.search_repository import SearchRepository
+
+        async with background_session("search.reindex") as db:
+            if not await SearchRepository(db).claim_index_sync(self.alias, force):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"A rebuild of {self.alias} is already in progress"
+                )
+
+    async def run(self) -> Dict[str, Any]:
+        """Build, verify and swap in a new index; the old index stays live on failure"""
+        client = ElasticsearchClient.get_client()
+        mapping = INDEX_MAPPINGS[self.alias]
+        settings, replicas = build_settings(mapping)
+        started = time.perf_counter()
+        self.progress.update(state="building", started_at=datetime.utcnow().isoformat())
+
+        try:
+            self.index = versioned_index_name(self.alias)
+            await client.indices.create(index=self.index, settings=settings, mappings=mapping["mappings"])
+            print(f"🔨 Rebuilding {self.alias} into {self.index} ({self.slices} slices)")
+
+            await asyncio.gather(*(
+                self._load_slice(position, lower, upper)
+                for position, (lower, upper) in enumerate(key_ranges(self.slices))
+            ))
+            build_seconds = time.perf_counter() - started
+            documents = sum(s["documents"] for s in self.progress["slices"])
+            failed = sum(s["failed"] for s in self.progress["slices"])
+
+            self.progress["state"] = "verifying"
+            await client.indices.put_settings(
+                index=self.index,
+                settings={"index": {"number_of_replicas": replicas, "refresh_interval": None}}
+            )
+            await client.indices.refresh(index=self.index)
+            indexed = (await client.count(index=self.index))["count"]
+            if failed or indexed != documents - failed:
+                raise RuntimeError(
+                    f"Count mismatch: {documents} rows, {failed} failed, {indexed} documents indexed"
+                )
+
+            self.progress["state"] = "swapping"
+            previous = await self._swap_alias(client)
+        except Exception as e:
+            self.progress.update(state="failed", error=str(e))
+            if self.index is not None:
+                await client.indices.delete(index=self.index, ignore_unavailable=True)
+            await self._finish(None, error=str(e))
+            print(f"❌ Rebuild of {self.alias} failed, {self.alias} unchanged: {e}")
+            raise
+
+        self.progress.update(
+            state="replaying",
+            documents=indexed,
+            build_seconds=round(build_seconds, 3),
+            docs_per_second=round(indexed / build_seconds, 1) if build_seconds else 0.0,
+            previous_indices=previous
+        )
+        await self._finish(indexed)
+        self.progress["replayed"] = await self._replay()
+        self.progress.update(state="completed", total_seconds=round(time.perf_counter() - started, 3))
+        print(
+            f"✅ Rebuilt {self.alias}: {indexed:,} documents in {build_seconds:.1f}s "
+            f"({self.progress['docs_per_second']:,.0f} docs/s), {self.progress['replayed']} changes replayed"
+        )
+        return self.progress
+
+    async def _load_slice(self, position: int, lower: Optional[UUID], upper: Optional[UUID]):
+        """Stream one key range from the database into the new index"""
+        from app.core.database import background_session
+
+        model, options, searchable, build = document_sources()[self.alias]
+        query = select(model).options(*options).order_by(model.id)
+        if lower is not None:
+            query = query.where(model.id >= lower)
+        if upper is not None:
+            query = query.where(model.id < upper)
+        stats = self.progress["slices"][position]
+        started = time.perf_counter()
+
+        async def actions():
+            async with background_session(f"search.reindex.{self.alias}") as db:
+                # Server-side cursor: rows arrive batch_size at a time
+                result = await db.stream(query.execution_options(yield_per=self.batch_size))
+                async for row in result.scalars():
+                    if not searchable(row):
+                        continue
+                    stats["documents"] += 1
+                    stats["docs_per_second"] = round(stats["documents"] / (time.perf_counter() - started), 1)
+                    yield {
+                        "_index": self.index,
+                        "_id": str(row.id),
+                        "_source": build(row),
+                        "version": BUILD_VERSION,
+                        "version_type": "external"
+                    }
+
+        _, errors = await async_bulk(
+            ElasticsearchClient.get_client(),
+            actions(),
+            chunk_size=self.batch_size,
+            max_retries=3,
+            raise_on_error=False,
+            stats_only=False
+        )
+        stats["failed"] = len(errors)
+
+    async def _swap_alias(self, client) -> List[str]:
+        """Point the alias at the new index in one update; remove the old index"""
+        previous = await get_alias_indices(client, self.alias)
+        actions = [{"remove": {"index": index, "alias": self.alias}} for index in previous]
+        if not previous and await client.indices.exists(index=self.alias):
+            # Concrete index from before indices were aliased
+            actions.append({"remove_index": {"index": self.alias}})
+            previous = [self.alias]
+        actions.append({"add": {"index": self.index, "alias": self.alias}})
+        await client.indices.update_aliases(actions=actions)
+        search_result_cache.invalidate([self.alias])
+        facet_cache.invalidate([self.alias])
+
+        stale = [index for index in previous if index != self.alias]
+        if stale:
+            await client.indices.delete(index=",".join(stale), ignore_unavailable=True)
+        return previous
+
+    async def _finish(self, documents: Optional[int], error: Optional[str] = None):
+        """Clear sync_in_progress (resumes the outbox) and record the result"""
+        from app.core.database import background_session
+        from app.repositories.search_repository import SearchRepository
+
+        async with background_session("search.reindex") as db:
+            repo = SearchRepository(db)
+            existing = await repo.get_index_status(self.alias)
+            index_settings = dict(existing.index_settings or {}) if existing else {}
+            index_settings["last_reindex"] = {
+                key: value for key, value in self.progress.items() if key != "slices"
+            }
+            status_data = {
+                "index_name": self.alias,
+                "entity_type": self.alias,
+                "sync_in_progress": False,
+                "index_settings": index_settings
+            }
+            if documents is not None:
+                status_data.update(total_documents=documents, last_full_reindex_at=datetime.utcnow())
+            else:
+                status_data["last_error"] = error
+            await repo.create_or_update_index_status(status_data)
+
+    async def _replay(self) -> int:
+        """Drain outbox changes queued during the build"""
+        from app.core.database import background_session
+        from app.repositories.search_repository import SearchRepository
+
+        replayed = 0
+        while True:
+            async with background_session("search.reindex") as db:
+                pending = (await SearchRepository(db).get_outbox_lag()).get(self.alias, {}).get("pending", 0)
+            if not pending:
+                return replayed
+            processed = await search_indexer.run_once()
+            if not processed:
+                # Another worker's indexer holds the outbox and replays them
+                return replayed
+            replayed += processed
+
+
+# Rebuilds started from this worker, by index
+reindex_jobs: Dict[str, IndexRebuild] = {}
+_reindex_tasks: Dict[str, asyncio.Task] = {}
+
+
+async def start_reindex(
+    alias: str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    slices: int = DEFAULT_SLICES,
+    force: bool = False
+) -> IndexRebuild:
+    """Claim the index and rebuild it in the background"""
+    task = _reindex_tasks.get(alias)
+    if task is not None and not task.done():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A rebuild of {alias} is already in progress"
+        )
+
+    rebuild = IndexRebuild(alias, batch_size, slices)
+    await rebuild.claim(force)
+    reindex_jobs[alias] = rebuild
+    _reindex_tasks[alias] = asyncio.get_running_loop().create_task(rebuild.run())
+    # Failures are recorded in the job progress and the index status
+    _reindex_tasks[alias].add_done_callback(lambda t: t.cancelled() or t.exception())
+    return rebuild
+
+
+async def _reindex_command(args: argparse.Namespace):
+    from app.core.database import close_db
+
+    try:
+        rebuild = IndexRebuild(args.index, args.batch_size, args.slices)
+        await rebuild.claim(args.force)
+        result = await rebuild.run()
+        for position, stats in enumerate(result["slices"]):
+            print(f"  slice {position}: {stats['documents']:,} documents, {stats['docs_per_second']:,.0f} docs/s")
+    finally:
+        await ElasticsearchClient.close()
+        await close_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild a search index and swap it in without downtime")
+    parser.add_argument("index", choices=INDEXED)
+    parser.add_argument("--slices", type=int, default=DEFAULT_SLICES, help="Parallel key ranges")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--force", action="store_true", help="Rebuild even if a previous rebuild did not finish")
+    args = parser.parse_args()
+
+    asyncio.run(_reindex_command(args))
+
+
+if __name__ == "__main__":
+    main()
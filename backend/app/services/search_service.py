@@ -8,20 +8,33 @@ and vendor matching algorithms.
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
+from decimal import Decimal
 from uuid import UUID
 import time
 
 from app.repositories.search_repository import SearchRepository
+from app.repositories.vendor_repository import VendorRepository
 from app.models.user import User
+from app.models.vendor import VendorCategory
+from app.schemas.vendor import VendorSearchFilters
 from app.schemas.search import (
     SearchRequest, VendorSearchRequest, EventSearchRequest, ServiceSearchRequest,
+    FederatedSearchRequest, FEDERATED_ANONYMOUS_MAX_WINDOW,
     SavedSearchCreate, SavedSearchUpdate,
     SearchSuggestionCreate, SearchSuggestionUpdate,
-    FilterPresetCreate, FilterPresetUpdate
+    FilterPresetCreate, FilterPresetUpdate,
+    ReindexRequest
 )
 from app.core.elasticsearch import INDEX_VENDORS, INDEX_EVENTS, INDEX_SERVICES
+from app.core.facet_cache import BOOLEAN_FILTERS, FACETS_LIVE, FACETS_PRECOMPUTED, UNFILTERED, facet_cache
+from app.core.federation import interleave
+from app.core.geo import haversine_km
+from app.core.search_cache import document_key, search_cache_key, search_result_cache
+from app.services.autocomplete_service import autocomplete_engine
+from app.services.search_analytics_service import search_analytics, trending_queries
+from app.services.spelling_service import spelling_engine
 
 
 class SearchService:
@@ -43,28 +56,47 @@ class SearchService:
         """Perform a search across specified index"""
         start_time = time.time()
 
-        # Build Elasticsearch query
-        es_query = self._build_search_query(search_request)
-
         # Determine index
         index = self._get_index_for_search_type(search_request.search_type)
 
-        # Execute search
-        es_response = await self.repo.search_elasticsearch(
-            index=index,
-            query=es_query,
-            from_=search_request.skip,
-            size=search_request.limit
-        )
+        # Build Elasticsearch query (without aggregations when the facets
+        # are precomputed)
+        facets = facet_cache.get(index, search_request)
+        es_query = self._build_search_query(search_request, aggregations=facets is None)
+
+        # Execute search (through the result cache)
+        es_response = await self._cached_search(search_request, index, es_query)
+        if es_response is None:
+            if search_request.search_type == "vendor":
+                # Elasticsearch unavailable: database full-text search
+                return await self._search_vendors_in_database(search_request, start_time, current_user)
+            es_response = {"hits": {"total": {"value": 0}, "hits": []}}
+
+        # Get total results
+        total_results = es_response.get("hits", {}).get("total", {}).get("value", 0)
+
+        # No hits: retry once with the spelling correction instead of
+        # waiting for the user to retype the query
+        suggestions, did_you_mean = [], None
+        if total_results == 0:
+            suggestions = spelling_engine.suggest(search_request.query)
+            if suggestions:
+                corrected = search_request.model_copy(update={"query": suggestions[0]})
+                corrected_response = await self._cached_search(
+                    corrected, index, self._build_search_query(corrected)
+                )
+                corrected_total = (corrected_response or {}).get("hits", {}).get("total", {}).get("value", 0)
+                if corrected_total:
+                    es_response, total_results, did_you_mean = corrected_response, corrected_total, suggestions[0]
+                    # Facets of the corrected query
+                    facets = None
 
         # Calculate search duration
         duration_ms = int((time.time() - start_time) * 1000)
 
         # Parse results
-        results = self._parse_search_results(es_response, search_request.search_type)
-
-        # Get total results
-        total_results = es_response.get("hits", {}).get("total", {}).get("value", 0)
+        origin = (search_request.latitude, search_request.longitude) if self._has_location(search_request) else None
+        results = self._parse_search_results(es_response, search_request.search_type, origin)
 
         # Build response
         response = {
@@ -76,13 +108,14 @@ class SearchService:
             "total_pages": (total_results + search_request.limit - 1) // search_request.limit,
             "search_duration_ms": duration_ms,
             "results": results,
-            "facets": self._extract_facets(es_response),
-            "suggestions": [],
-            "did_you_mean": None
+            "facets": facets if facets is not None else self._extract_facets(es_response),
+            "facets_source": FACETS_PRECOMPUTED if facets is not None else FACETS_LIVE,
+            "suggestions": suggestions,
+            "did_you_mean": did_you_mean
         }
 
         # Record analytics
-        await self._record_search_analytics(
+        self._record_search_analytics(
             search_request=search_request,
             results_count=total_results,
             duration_ms=duration_ms,
@@ -91,6 +124,230 @@ class SearchService:
 
         return response
 
+    async def _cached_search(
+        self,
+        search_request: SearchRequest,
+        index: str,
+        es_query: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get the requested page from cached hit windows and documents.
+
+        Missing windows are searched in Elasticsearch, documents missing
+        from the cache are fetched by id.
+
+        Returns:
+            Elasticsearch-style response for the page, or None when
+            Elasticsearch fails
+        """
+        return (await self._cached_msearch([(search_request, index, es_query)]))[0]
+
+    async def _cached_msearch(
+        self,
+        searches: List[Tuple[SearchRequest, str, Dict[str, Any]]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Pages of several searches (see ``_cached_search``).
+
+        Windows missing for any of the searches are fetched in one
+        Elasticsearch request (``msearch`` when there are several), and
+        missing documents in one ``mget``.
+
+        Returns:
+            Elasticsearch-style response per search, None for searches
+            that failed
+        """
+        cache = search_result_cache
+        keys = [
+            search_cache_key(search_request, facets="aggs" in es_query)
+            for search_request, _, es_query in searches
+        ]
+        numbers = [cache.windows_for(search_request.skip, search_request.limit) for search_request, _, _ in searches]
+
+        windows: List[Dict[int, Any]] = [{} for _ in searches]
+        missing = []
+        for position, (search_request, index, es_query) in enumerate(searches):
+            for number in numbers[position]:
+                window = cache.get_window(search_request.search_type, keys[position], number)
+                if window is None:
+                    missing.append((position, number))
+                else:
+                    windows[position][number] = window
+
+        if len(missing) == 1:
+            position, number = missing[0]
+            fetched = [await self.repo.search_elasticsearch(
+                index=searches[position][1],
+                query=searches[position][2],
+                from_=number * cache.window_size,
+                size=cache.window_size
+            )]
+        elif missing:
+            fetched = await self.repo.msearch_elasticsearch([
+                (searches[position][1], searches[position][2], number * cache.window_size, cache.window_size)
+                for position, number in missing
+            ])
+        else:
+            fetched = []
+
+        failed = set()
+        for (position, number), es_response in zip(missing, fetched):
+            if es_response is None:
+                failed.add(position)
+            else:
+                windows[position][number] = cache.put_window(keys[position], number, searches[position][1], es_response)
+
+        pages: List[Optional[List[Dict[str, Any]]]] = []
+        for position, (search_request, _, _) in enumerate(searches):
+            if position in failed:
+                pages.append(None)
+                continue
+            offset = search_request.skip - numbers[position][0] * cache.window_size
+            hits = [hit for number in numbers[position] for hit in windows[position][number].hits]
+            pages.append(hits[offset:offset + search_request.limit])
+
+        documents, missing_documents = {}, []
+        for (search_request, _, _), hits in zip(searches, pages):
+            if hits is not None:
+                found, not_cached = cache.get_documents(search_request.search_type, hits)
+                documents.update(found)
+                missing_documents.extend(not_cached)
+        fetched_documents = {}
+        if missing_documents:
+            # Evicted, or changed since the window was stored
+            found = await self.repo.get_documents(missing_documents)
+            cache.put_documents(found)
+            fetched_documents = {(doc["_index"], doc["_id"]): doc["_source"] for doc in found}
+
+        responses: List[Optional[Dict[str, Any]]] = []
+        for position, hits in enumerate(pages):
+            if hits is None:
+                responses.append(None)
+                continue
+            page = []
+            for hit in hits:
+                source = documents.get(document_key(hit)) or fetched_documents.get((hit["_index"], hit["_id"]))
+                if source is not None:
+                    page.append({**hit, "_source": source})
+            first = windows[position][numbers[position][0]]
+            responses.append({
+                "hits": {"total": {"value": first.total}, "hits": page},
+                "aggregations": first.facets
+            })
+        return responses
+
+    async def _search_vendors_in_database(
+        self,
+        search_request: SearchRequest,
+        start_time: float,
+        current_user: Optional[User] = None
+    ) -> Dict[str, Any]:
+        """Vendor search served by the database (PostgreSQL full-text and trigram)"""
+        filters = self._to_vendor_filters(search_request)
+        page = search_request.skip // search_request.limit + 1
+        if filters is None:
+            vendors, total_results = [], 0
+        else:
+            vendors, page_info = await VendorRepository(self.db).search(
+                filters, page, search_request.limit, offset=search_request.skip
+            )
+            total_results = page_info.total or 0
+
+        suggestions, did_you_mean = [], None
+        if total_results == 0 and filters is not None:
+            suggestions = spelling_engine.suggest(search_request.query)
+            if suggestions:
+                corrected = self._to_vendor_filters(search_request.model_copy(update={"query": suggestions[0]}))
+                corrected_vendors, page_info = await VendorRepository(self.db).search(
+                    corrected, page, search_request.limit, offset=search_request.skip
+                )
+                if page_info.total:
+                    vendors, total_results, did_you_mean = corrected_vendors, page_info.total, suggestions[0]
+
+        duration_ms = int((time.time() - start_time) * 1000)
+        self._record_search_analytics(
+            search_request=search_request,
+            results_count=total_results,
+            duration_ms=duration_ms,
+            user_id=current_user.id if current_user else None,
+            elasticsearch_used=False
+        )
+
+        return {
+            "query": search_request.query,
+            "search_type": search_request.search_type,
+            "total_results": total_results,
+            "results_shown": len(vendors),
+            "page": page,
+            "total_pages": (total_results + search_request.limit - 1) // search_request.limit,
+            "search_duration_ms": duration_ms,
+            "results": [self._vendor_result(vendor) for vendor in vendors],
+            "facets": {},
+            "facets_source": FACETS_LIVE,
+            "suggestions": suggestions,
+            "did_you_mean": did_you_mean
+        }
+
+    def _to_vendor_filters(self, search_request: SearchRequest) -> Optional[VendorSearchFilters]:
+        """Map a search request to vendor repository filters (None if nothing can match)"""
+        category = None
+        if search_request.category:
+            try:
+                category = VendorCategory(search_request.category.upper())
+            except ValueError:
+                return None
+
+        # Coordinates without a radius only sort by distance; a radius of 0
+        # means none (as on Elasticsearch)
+        location = {}
+        if self._has_location(search_request):
+            location = {
+                "latitude": Decimal(str(search_request.latitude)),
+                "longitude": Decimal(str(search_request.longitude)),
+                "radius_km": (
+                    min(max(int(search_request.radius_km), 1), 500) if search_request.radius_km else None
+                )
+            }
+
+        query = (search_request.query or "").strip()[:200]
+        sort_by = {
+            "rating": "rating", "newest": "newest", "popularity": "popular", "distance": "distance",
+            "price_low": "price_low", "price_high": "price_high"
+        }
+        return VendorSearchFilters(
+            query=query if len(query) >= 2 else None,
+            category=category,
+            city=search_request.city[:100] if search_request.city else None,
+            district=search_request.region[:100] if search_request.region else None,
+            min_rating=Decimal(str(search_request.rating_min)) if search_request.rating_min else None,
+            min_price=Decimal(str(search_request.price_min)) if search_request.price_min is not None else None,
+            max_price=Decimal(str(search_request.price_max)) if search_request.price_max is not None else None,
+            verified_only=search_request.verified_only,
+            featured_only=search_request.featured_only,
+            sort_by=sort_by.get(search_request.sort_by, "relevance"),
+            **location
+        )
+
+    def _vendor_result(self, vendor) -> Dict[str, Any]:
+        """Vendor row as a search result (fields of the vendors index)"""
+        return {
+            "id": str(vendor.id),
+            "type": "vendor",
+            "score": None,
+            "highlights": [],
+            "business_name": vendor.business_name,
+            "description": vendor.description,
+            "category": getattr(vendor.category, "value", vendor.category),
+            "city": vendor.location_city,
+            "region": vendor.location_district,
+            "address": vendor.location_address,
+            "rating": float(vendor.avg_rating or 0),
+            "review_count": vendor.review_count or 0,
+            "verified": bool(vendor.verified),
+            "featured": bool(vendor.featured),
+            "distance_km": getattr(vendor, "distance_km", None)
+        }
+
     async def search_vendors(
         self,
         search_request: VendorSearchRequest,
@@ -115,6 +372,80 @@ class SearchService:
         """Search for services"""
         return await self.search(search_request, current_user)
 
+    async def search_federated(
+        self,
+        search_request: FederatedSearchRequest,
+        current_user: Optional[User] = None
+    ) -> Dict[str, Any]:
+        """
+        Search several types at once (global search box).
+
+        Every type is searched with the same query and filters; searches
+        missing from the result cache go to Elasticsearch in one msearch,
+        facets included. Results are merged by normalized score with
+        per-type quotas (see ``app.core.federation``).
+        """
+        if current_user is None and search_request.skip + search_request.limit > FEDERATED_ANONYMOUS_MAX_WINDOW:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"skip + limit must not exceed {FEDERATED_ANONYMOUS_MAX_WINDOW} without signing in"
+            )
+
+        start_time = time.time()
+        origin = (search_request.latitude, search_request.longitude) if self._has_location(search_request) else None
+
+        # Plain requests share cached windows with single-type searches;
+        # each type could fill every merged result up to the page end
+        searches, facets, facets_source = [], {}, {}
+        for search_type in search_request.search_types:
+            typed = SearchRequest(**{
+                **search_request.model_dump(exclude={"search_types", "quotas"}),
+                "search_type": search_type,
+                "skip": 0
+            }).model_copy(update={"limit": search_request.skip + search_request.limit})
+            index = self._get_index_for_search_type(search_type)
+            precomputed = facet_cache.get(index, typed)
+            if precomputed is not None:
+                facets[search_type] = precomputed
+            facets_source[search_type] = FACETS_PRECOMPUTED if precomputed is not None else FACETS_LIVE
+            searches.append((typed, index, self._build_search_query(typed, aggregations=precomputed is None)))
+
+        # Types whose search failed contribute no results
+        responses = await self._cached_msearch(searches)
+        results_by_type, totals_by_type = {}, {}
+        for search_type, es_response in zip(search_request.search_types, responses):
+            es_response = es_response or {"hits": {"total": {"value": 0}, "hits": []}}
+            results_by_type[search_type] = self._parse_search_results(es_response, search_type, origin)
+            totals_by_type[search_type] = es_response.get("hits", {}).get("total", {}).get("value", 0)
+            if search_type not in facets:
+                facets[search_type] = self._extract_facets(es_response)
+
+        results = interleave(results_by_type, search_request.skip, search_request.limit, search_request.quotas)
+        total_results = sum(totals_by_type.values())
+        duration_ms = int((time.time() - start_time) * 1000)
+
+        # One analytics row for the whole search
+        self._record_search_analytics(
+            search_request=search_request,
+            results_count=total_results,
+            duration_ms=duration_ms,
+            user_id=current_user.id if current_user else None
+        )
+
+        return {
+            "query": search_request.query,
+            "search_types": search_request.search_types,
+            "total_results": total_results,
+            "totals_by_type": totals_by_type,
+            "results_shown": len(results),
+            "page": search_request.skip // search_request.limit + 1,
+            "search_duration_ms": duration_ms,
+            "results": results,
+            "facets": facets,
+            "facets_source": facets_source,
+            "suggestions": spelling_engine.suggest(search_request.query) if total_results == 0 else []
+        }
+
     # ========================================================================
     # Autocomplete
     # ========================================================================
@@ -126,16 +457,20 @@ class SearchService:
         limit: int = 10
     ) -> List[str]:
         """Get autocomplete suggestions"""
-        # First, try database suggestions
-        suggestions = await self.repo.get_suggestions_by_prefix(
-            prefix=prefix,
-            search_type=search_type,
-            limit=limit
-        )
+        # In-memory tries of this worker: suggestions and top vendor names
+        suggestions = autocomplete_engine.complete(prefix, search_type, limit)
+
+        if suggestions is None:
+            # Not loaded yet: database suggestions
+            rows = await self.repo.get_suggestions_by_prefix(
+                prefix=prefix,
+                search_type=search_type,
+                limit=limit
+            )
+            suggestions = [s.suggestion_text for s in rows]
 
-        # If we have database suggestions, return them
         if suggestions:
-            return [s.suggestion_text for s in suggestions]
+            return suggestions
 
         # Otherwise, try Elasticsearch completion suggester
         index = self._get_index_for_search_type(search_type or "vendor")
@@ -279,7 +614,9 @@ class SearchService:
             )
 
         data = suggestion_data.model_dump()
-        return await self.repo.create_search_suggestion(data)
+        suggestion = await self.repo.create_search_suggestion(data)
+        autocomplete_engine.apply_suggestion(suggestion)
+        return suggestion
 
     async def get_trending_suggestions(
         self,
@@ -303,7 +640,10 @@ class SearchService:
             )
 
         data = suggestion_data.model_dump(exclude_unset=True)
-        return await self.repo.update_search_suggestion(suggestion_id, data)
+        suggestion = await self.repo.update_search_suggestion(suggestion_id, data)
+        if suggestion is not None:
+            autocomplete_engine.apply_suggestion(suggestion)
+        return suggestion
 
     # ========================================================================
     # Filter Preset Methods
@@ -378,8 +718,8 @@ class SearchService:
         days: int = 7,
         limit: int = 10
     ):
-        """Get trending search queries"""
-        return await self.repo.get_trending_queries(search_type, days, limit)
+        """Get trending search queries from the merged trending sketches"""
+        return await trending_queries.get(self.repo, search_type, days, limit)
 
     async def get_analytics_summary(
         self,
@@ -390,11 +730,11 @@ class SearchService:
         summary = await self.repo.get_search_analytics_summary(start_date, end_date)
 
         # Get trending queries
-        trending = await self.repo.get_trending_queries(days=7, limit=10)
+        trending = await trending_queries.get(self.repo, None, days=7, limit=10)
 
         summary["top_queries"] = [t["query"] for t in trending[:5]]
         summary["trending_queries"] = [
-            {"query": t["query"], "search_count": t["count"], "trend_percentage": 0.0}
+            {"query": t["query"], "search_count": t["count"], "trend_percentage": t["trend_percentage"]}
             for t in trending
         ]
         summary["period_start"] = start_date
@@ -404,6 +744,129 @@ class SearchService:
 
         return summary
 
+    # ========================================================================
+    # Index Maintenance Methods
+    # ========================================================================
+
+    async def get_index_statuses(self):
+        """Get the sync status of all search indices"""
+        return await self.repo.get_all_index_statuses()
+
+    async def get_outbox_status(
+        self,
+        index_name: Optional[str] = None,
+        dead_letter_limit: int = 50
+    ) -> Dict[str, Any]:
+        """Get indexer counters, outbox lag per index and recent dead letters"""
+        from app.services.search_indexer_service import search_indexer
+
+        now = datetime.utcnow()
+        lag = await self.repo.get_outbox_lag()
+        dead_letters = await self.repo.get_outbox_dead_letters(index_name, dead_letter_limit)
+
+        return {
+            "indexer": search_indexer.snapshot(),
+            "indices": {
+                name: {
+                    "pending": entry["pending"],
+                    "dead_letters": entry["dead_letters"],
+                    "oldest_pending_at": entry["oldest_pending_at"],
+                    "lag_seconds": round((now - entry["oldest_pending_at"]).total_seconds(), 3)
+                    if entry["oldest_pending_at"] else 0.0
+                }
+                for name, entry in lag.items()
+            },
+            "dead_letters": [
+                {
+                    "id": entry.id,
+                    "index_name": entry.index_name,
+                    "document_id": entry.document_id,
+                    "operation": entry.operation,
+                    "attempts": entry.attempts,
+                    "last_error": entry.last_error,
+                    "created_at": entry.created_at,
+                    "dead_lettered_at": entry.dead_lettered_at
+                }
+                for entry in dead_letters
+            ]
+        }
+
+    async def retry_dead_letters(self, index_name: Optional[str] = None) -> Dict[str, Any]:
+        """Queue dead-lettered outbox entries again"""
+        if index_name and index_name not in (INDEX_VENDORS, INDEX_EVENTS, INDEX_SERVICES):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown index: {index_name}"
+            )
+
+        requeued = await self.repo.retry_outbox_dead_letters(index_name)
+        return {"message": f"{requeued} outbox entries queued for indexing", "requeued": requeued}
+
+    async def reindex(self, reindex_request: ReindexRequest) -> Dict[str, Any]:
+        """Start a zero-downtime rebuild of an index in the background"""
+        from app.services.search_reindex_service import start_reindex
+
+        rebuild = await start_reindex(
+            reindex_request.index_name,
+            batch_size=reindex_request.batch_size,
+            slices=reindex_request.slices,
+            force=reindex_request.force
+        )
+        return {"message": f"Rebuild of {rebuild.alias} started", "progress": rebuild.progress}
+
+    def get_reindex_progress(self, index_name: str) -> Dict[str, Any]:
+        """Progress of the last rebuild started from this worker"""
+        from app.services.search_reindex_service import reindex_jobs
+
+        rebuild = reindex_jobs.get(index_name)
+        if rebuild is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"No rebuild of {index_name} started on this worker"
+            )
+        return rebuild.progress
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Search result and facet caches of this worker, with hit rates per search type"""
+        return {**search_result_cache.snapshot(), "facets": facet_cache.snapshot()}
+
+    async def precompute_facets(self, index: str) -> bool:
+        """
+        Compute the facets of an index for the unfiltered search and every
+        precomputed single filter, in one aggregation request.
+
+        Returns:
+            False when Elasticsearch fails (the previous facets are kept)
+        """
+        search_type = {INDEX_VENDORS: "vendor", INDEX_EVENTS: "event", INDEX_SERVICES: "service"}[index]
+        aggs = self._build_aggregations(search_type)
+        body = {
+            "query": {"match_all": {}},
+            "aggs": {
+                **aggs,
+                "by_category": {"terms": {"field": "category", "size": 100}, "aggs": aggs},
+                **{f"by_{name}": {"filter": clause, "aggs": aggs} for name, clause in BOOLEAN_FILTERS.items()}
+            }
+        }
+        es_response = await self.repo.search_elasticsearch(index=index, query=body, size=0)
+        if es_response is None:
+            return False
+
+        def facets_of(aggregations: Dict[str, Any]) -> Dict[str, Any]:
+            # Facet aggregations only: buckets also hold their key and doc_count
+            return self._extract_facets({
+                "aggregations": {name: aggregations[name] for name in aggs if name in aggregations}
+            })
+
+        results = es_response.get("aggregations", {})
+        facets = {UNFILTERED: facets_of(results)}
+        for bucket in results["by_category"]["buckets"]:
+            facets[("category", bucket["key"])] = facets_of(bucket)
+        for name in BOOLEAN_FILTERS:
+            facets[(name, True)] = facets_of(results[f"by_{name}"])
+        facet_cache.put(index, facets)
+        return True
+
     # ========================================================================
     # Vendor Matching Methods
     # ========================================================================
@@ -425,8 +888,8 @@ class SearchService:
     # Helper Methods
     # ========================================================================
 
-    def _build_search_query(self, search_request: SearchRequest) -> Dict[str, Any]:
-        """Build Elasticsearch query from search request"""
+    def _build_search_query(self, search_request: SearchRequest, aggregations: bool = True) -> Dict[str, Any]:
+        """Build Elasticsearch query from search request (facet aggregations optional)"""
         must = []
         should = []
         filters = []
@@ -461,11 +924,12 @@ class SearchService:
                 "range": {"rating": {"gte": search_request.rating_min}}
             })
 
-        # Location-based search
-        if search_request.latitude and search_request.longitude:
+        # Location-based search (same radius semantics as the database path)
+        if self._has_location(search_request) and search_request.radius_km:
             filters.append({
                 "geo_distance": {
-                    "distance": f"{search_request.radius_km or 50}km",
+                    "distance": f"{search_request.radius_km}km",
+                    "distance_type": "arc",
                     "location": {
                         "lat": search_request.latitude,
                         "lon": search_request.longitude
@@ -492,9 +956,6 @@ class SearchService:
         # Add sorting
         sort = self._build_sort(search_request)
 
-        # Add aggregations for facets
-        aggs = self._build_aggregations(search_request.search_type)
-
         # Add highlighting
         highlight = {
             "fields": {
@@ -503,13 +964,23 @@ class SearchService:
             }
         }
 
-        return {
+        es_query = {
             "query": query,
             "sort": sort,
-            "aggs": aggs,
-            "highlight": highlight
+            "highlight": highlight,
+            # Document versions key the result cache
+            "version": True
         }
 
+        # Add aggregations for facets
+        if aggregations:
+            es_query["aggs"] = self._build_aggregations(search_request.search_type)
+
+        return es_query
+
+    def _has_location(self, search_request: SearchRequest) -> bool:
+        return search_request.latitude is not None and search_request.longitude is not None
+
     def _get_index_for_search_type(self, search_type: str) -> str:
         """Get Elasticsearch index name for search type"""
         mapping = {
@@ -552,8 +1023,10 @@ class SearchService:
         }
 
         # Distance sorting (if location provided)
-        if search_request.latitude and search_request.longitude:
-            if search_request.sort_by == "distance":
+        if self._has_location(search_request):
+            if search_request.sort_by == "distance" or (
+                search_request.sort_by == "relevance" and not search_request.query
+            ):
                 return [
                     {
                         "_geo_distance": {
@@ -562,7 +1035,8 @@ class SearchService:
                                 "lon": search_request.longitude
                             },
                             "order": "asc",
-                            "unit": "km"
+                            "unit": "km",
+                            "distance_type": "arc"
                         }
                     },
                     "_score"
@@ -606,9 +1080,10 @@ class SearchService:
     def _parse_search_results(
         self,
         es_response: Dict[str, Any],
-        search_type: str
+        search_type: str,
+        origin: Optional[Tuple[float, float]] = None
     ) -> List[Dict[str, Any]]:
-        """Parse Elasticsearch response to search results"""
+        """Parse Elasticsearch response to search results (with distance_km from origin)"""
         results = []
 
         for hit in es_response.get("hits", {}).get("hits", []):
@@ -632,6 +1107,10 @@ class SearchService:
                 **source
             }
 
+            location = source.get("location")
+            if origin is not None and location:
+                result["distance_km"] = round(haversine_km(*origin, location["lat"], location["lon"]), 3)
+
             results.append(result)
 
         return results
@@ -650,14 +1129,15 @@ class SearchService:
 
         return facets
 
-    async def _record_search_analytics(
+    def _record_search_analytics(
         self,
         search_request: SearchRequest,
         results_count: int,
         duration_ms: int,
-        user_id: Optional[UUID] = None
+        user_id: Optional[UUID] = None,
+        elasticsearch_used: bool = True
     ):
-        """Record search analytics"""
+        """Queue search analytics (inserted in batches by the analytics flusher)"""
         analytics_data = {
             "user_id": user_id,
             "search_type": search_request.search_type,
@@ -675,11 +1155,8 @@ class SearchService:
             "results_count": results_count,
             "results_shown": search_request.limit,
             "search_duration_ms": duration_ms,
-            "elasticsearch_used": True
+            "elasticsearch_used": elasticsearch_used,
+            "searched_at": datetime.utcnow()
         }
 
-        try:
-            await self.repo.create_search_analytics(analytics_data)
-        except Exception as e:
-            # Don't fail the search if analytics recording fails
-            print(f"Failed to record search analytics: {str(e)}")
+        search_analytics.record(analytics_data)
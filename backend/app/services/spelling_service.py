@@ -0,0 +1,258 @@
+"""
+Spelling Service
+Sprint 22: Performance & Optimization
+
+Per-worker "did you mean" corrections from memory.
+
+- The words of searchable vendor names, their cities and the vendor
+  categories are counted in a symmetric-delete index
+  (``app.core.spelling``); a correction is a few dictionary lookups
+- Every ``refresh_seconds`` vendors changed since the last load are applied
+  by uncounting their previous words and counting the new ones
+- A full rebuild every ``rebuild_seconds`` drops vendors that left the
+  loaded set; it is built off the event loop and swapped in
+"""
+
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import asyncio
+import time
+
+from sqlalchemy import func, select
+
+from app.core.autocomplete import normalize
+from app.core.spelling import SymmetricDeleteIndex, tokenize
+from app.services.search_indexer_service import HIDDEN_VENDOR_STATUSES, vendor_searchable
+
+
+# Re-read rows this far behind the last change seen (see autocomplete)
+CHANGE_OVERLAP = timedelta(seconds=60)
+
+# Categories are known words even without vendors
+CATEGORY_SOURCE = "categories"
+
+# (key, surface form)
+Word = Tuple[str, str]
+
+
+def text_words(text: Optional[str]) -> List[Word]:
+    """Index words of a text"""
+    if not text:
+        return []
+    words = []
+    for token in tokenize(text.replace("_", " ")):
+        key = normalize(token)
+        if key:
+            words.append((key, token))
+    return words
+
+
+def vendor_words(vendor: Any) -> List[Word]:
+    """Words of a vendor row (none when it is not searchable)"""
+    if not vendor_searchable(vendor):
+        return []
+    category = getattr(vendor.category, "value", vendor.category)
+    return text_words(vendor.business_name) + text_words(vendor.location_city) + text_words(category)
+
+
+class SpellingEngine:
+    """In-memory spelling index of one worker, kept in sync with the database"""
+
+    def __init__(
+        self,
+        max_distance: int = 2,
+        max_vendors: int = 50000,
+        refresh_seconds: float = 30.0,
+        rebuild_seconds: float = 3600.0
+    ):
+        self.max_distance = max_distance
+        self.max_vendors = max_vendors
+        self.refresh_seconds = refresh_seconds
+        self.rebuild_seconds = rebuild_seconds
+
+        self.index = SymmetricDeleteIndex(max_distance)
+        # Source -> keys it counted
+        self._counted: Dict[str, List[str]] = {}
+        self._vendors_changed_at = None
+
+        self.built_at: Optional[float] = None
+        self.build_seconds = 0.0
+        self.refreshed_at: Optional[float] = None
+        self.lookups = 0
+        self.corrected = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.built_at is not None
+
+    # ========================================================================
+    # Lookup
+    # ========================================================================
+
+    def suggest(self, query: Optional[str], limit: int = 3) -> List[str]:
+        """Corrected queries, best first (empty when nothing needs correcting)"""
+        if not self.ready or not query:
+            return []
+
+        corrections = self.index.corrections(query[:200], limit)
+        self.lookups += 1
+        if corrections:
+            self.corrected += 1
+        return corrections
+
+    # ========================================================================
+    # Updates
+    # ========================================================================
+
+    def apply_vendor(self, vendor: Any):
+        """Recount the words of a changed vendor"""
+        if not self.ready:
+            # Picked up by the first build
+            return
+        self._apply(self.index, self._counted, f"vendor:{vendor.id}", vendor_words(vendor))
+
+    @staticmethod
+    def _apply(index: SymmetricDeleteIndex, counted: Dict[str, List[str]], source: str, words: List[Word]):
+        index.update(words, counted.pop(source, []))
+        if words:
+            counted[source] = [key for key, _ in words]
+
+    # ========================================================================
+    # Loading
+    # ========================================================================
+
+    async def rebuild(self):
+        """Load the words of the searchable vendors into a new index"""
+        from app.core.database import background_session
+        from app.models.vendor import Vendor, VendorStatus
+
+        started = time.perf_counter()
+        async with background_session("search.spelling") as db:
+            # Read the change mark first: rows changed while loading are re-applied
+            vendors_changed_at = await db.scalar(select(func.max(Vendor.updated_at)))
+            vendors = (await db.execute(
+                select(*self._vendor_columns(Vendor))
+                .where(
+                    Vendor.deleted_at.is_(None),
+                    Vendor.status.notin_([VendorStatus(s) for s in HIDDEN_VENDOR_STATUSES])
+                )
+                .order_by(Vendor.booking_count.desc())
+                .limit(self.max_vendors)
+            )).all()
+
+        # Building is pure CPU: keep it off the event loop
+        index, counted = await asyncio.to_thread(self._build, vendors)
+        self.index, self._counted = index, counted
+        self._vendors_changed_at = vendors_changed_at
+        self.built_at = self.refreshed_at = time.time()
+        self.build_seconds = time.perf_counter() - started
+        print(
+            f"🔤 Spelling index loaded: {len(index):,} words, {index.delete_count:,} deletes "
+            f"({len(vendors):,} vendors) in {self.build_seconds:.2f}s"
+        )
+
+    def _build(self, vendors: List[Any]) -> Tuple[SymmetricDeleteIndex, Dict[str, List[str]]]:
+        from app.models.vendor import VendorCategory
+
+        index = SymmetricDeleteIndex(self.max_distance)
+        counted: Dict[str, List[str]] = {}
+        categories = [word for category in VendorCategory for word in text_words(category.value)]
+        self._apply(index, counted, CATEGORY_SOURCE, categories)
+        for vendor in vendors:
+            self._apply(index, counted, f"vendor:{vendor.id}", vendor_words(vendor))
+        return index, counted
+
+    async def refresh(self) -> int:
+        """Apply vendors changed since the last load"""
+        from app.core.database import background_session
+        from app.models.vendor import Vendor
+
+        query = select(*self._vendor_columns(Vendor))
+        if self._vendors_changed_at is not None:
+            query = query.where(Vendor.updated_at >= self._vendors_changed_at - CHANGE_OVERLAP)
+        async with background_session("search.spelling") as db:
+            vendors = (await db.execute(query)).all()
+
+        for row in vendors:
+            self.apply_vendor(row)
+        if vendors:
+            self._vendors_changed_at = max(row.updated_at for row in vendors)
+        self.refreshed_at = time.time()
+        return len(vendors)
+
+    @staticmethod
+    def _vendor_columns(model) -> List[Any]:
+        return [
+            model.id, model.business_name, model.location_city, model.category,
+            model.status, model.deleted_at, model.updated_at
+        ]
+
+    # ========================================================================
+    # Background refresh
+    # ========================================================================
+
+    def start(self):
+        """Load the index and keep it in sync in the background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                if not self.ready or time.time() - self.built_at >= self.rebuild_seconds:
+                    await self.rebuild()
+                else:
+                    await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Corrections keep using the current index (or are skipped until loaded)
+                print(f"⚠️  Spelling index refresh failed: {e}")
+            await asyncio.sleep(self.refresh_seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Index size and correction statistics"""
+        return {
+            "ready": self.ready,
+            "built_at": self.built_at,
+            "build_seconds": round(self.build_seconds, 3),
+            "refreshed_at": self.refreshed_at,
+            "words": len(self.index),
+            "deletes": self.index.delete_count,
+            "lookups": self.lookups,
+            "correction_rate": round(self.corrected / self.lookups, 4) if self.lookups else 0.0
+        }
+
+
+# Global engine of this worker
+spelling_engine = SpellingEngine()
+
+
+def init_spelling(
+    max_distance: int,
+    max_vendors: int,
+    refresh_seconds: float,
+    rebuild_seconds: float
+) -> SpellingEngine:
+    """Configure the global engine and start loading it"""
+    spelling_engine.max_distance = max_distance
+    spelling_engine.max_vendors = max_vendors
+    spelling_engine.refresh_seconds = refresh_seconds
+    spelling_engine.rebuild_seconds = rebuild_seconds
+    spelling_engine.start()
+    return spelling_engine
+
+
+async def close_spelling():
+    """Stop the background refresh"""
+    await spelling_engine.stop()
@@ -9,6 +9,7 @@ from fastapi import HTTPException, status
 from typing import Optional, List, Tuple
 from datetime import date
 
+from app.core.pagination import CountStrategy, PageInfo
 from app.models.user import User, UserRole
 from app.models.vendor import Vendor, VendorStatus
 from app.schemas.vendor import (
@@ -520,8 +521,9 @@ class VendorService:
         self,
         filters: VendorSearchFilters,
         page: int = 1,
-        page_size: int = 20
-    ) -> Tuple[List[Vendor], int]:
+        page_size: int = 20,
+        count_strategy: CountStrategy = CountStrategy.EXACT
+    ) -> Tuple[List[Vendor], PageInfo]:
         """
         Search vendors with filters
 
@@ -529,11 +531,12 @@ class VendorService:
             filters: Search filters
             page: Page number
             page_size: Items per page
+            count_strategy: How the total count is obtained
 
         Returns:
-            Tuple of (vendors list, total count)
+            Tuple of (vendors list, page info)
         """
-        return await self.repo.search(filters, page, page_size)
+        return await self.repo.search(filters, page, page_size, count_strategy)
 
     # ========================================================================
     # Statistics and Analytics
@@ -0,0 +1,167 @@
+"""
+Benchmark Fixtures
+Performance & Optimization
+
+Seeded dataset and p95 regression gate for repository benchmarks.
+
+The dataset is generated by app.core.synthetic_data once per database: a
+file-based SQLite database by default, or a local PostgreSQL via
+BENCHMARK_DATABASE_URL. Environment:
+
+- BENCHMARK_DATABASE_URL: database to seed and benchmark
+- BENCHMARK_SCALE: fraction of the full volumes (default 1.0 = ~100k guests,
+  ~1M messages, 50k vendors)
+- BENCHMARK_P95_TOLERANCE: allowed p95 regression (default 0.25 = +25%)
+- BENCHMARK_UPDATE_BASELINES=1: record the current run as the new baseline
+
+Baselines are only written when recording is requested; a benchmark
+without a baseline for the current dialect and scale is skipped. The
+committed baselines cover the default run (SQLite, scale 1); timings depend
+on the machine, so re-record them where the gate is enforced.
+"""
+
+import json
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict
+
+import pytest
+from sqlalchemy import ARRAY as GENERIC_ARRAY, func, select
+from sqlalchemy.dialects.postgresql import ARRAY, INET, JSONB, UUID
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+from app.core.database import Base
+from app.core.synthetic_data import DatasetSpec, LogNormalCount, generate_dataset
+
+
+BENCHMARK_DATABASE_URL = os.environ.get(
+    "BENCHMARK_DATABASE_URL",
+    f"sqlite+aiosqlite:///{Path(tempfile.gettempdir()) / 'celebratech_benchmark.db'}"
+)
+BENCHMARK_SCALE = float(os.environ.get("BENCHMARK_SCALE", "1.0"))
+P95_TOLERANCE = float(os.environ.get("BENCHMARK_P95_TOLERANCE", "0.25"))
+UPDATE_BASELINES = os.environ.get("BENCHMARK_UPDATE_BASELINES") == "1"
+
+# Absolute slack so sub-millisecond timings do not fail on noise
+NOISE_FLOOR_MS = 0.5
+
+BASELINES_PATH = Path(__file__).parent / "baselines.json"
+
+# ~100k guests, ~1M messages and 50k vendors at scale 1
+BENCHMARK_SPEC = DatasetSpec(
+    organizers=1_000,
+    vendors=50_000,
+    events=1_000,
+    guests_per_event=LogNormalCount(100, 0.7, 5, 2_000),
+    requests_per_event=LogNormalCount(4, 0.5, 1, 20),
+    messages_per_conversation=LogNormalCount(250, 1.0, 1, 20_000),
+    behavior_events=0,
+)
+
+
+# PostgreSQL-only column types, rendered as their closest SQLite equivalents
+@compiles(JSONB, "sqlite")
+@compiles(ARRAY, "sqlite")
+@compiles(GENERIC_ARRAY, "sqlite")
+def _compile_json_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@compiles(INET, "sqlite")
+def _compile_inet_sqlite(type_, compiler, **kw):
+    return "VARCHAR(45)"
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid_sqlite(type_, compiler, **kw):
+    return "CHAR(36)"
+
+
+@pytest.fixture(scope="session")
+async def benchmark_engine():
+    """Engine for the seeded benchmark database (seeded on first use)"""
+    from app.models.guest import Guest
+
+    engine = create_async_engine(BENCHMARK_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        seeded = await conn.scalar(select(func.count()).select_from(Guest.__table__))
+
+    if not seeded:
+        await generate_dataset(BENCHMARK_DATABASE_URL, BENCHMARK_SPEC.scaled(BENCHMARK_SCALE))
+
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def benchmark_sessions(benchmark_engine):
+    """Session factory for benchmark workers"""
+    return async_sessionmaker(benchmark_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+# ============================================================================
+# Regression Gate
+# ============================================================================
+
+class BaselineStore:
+    """p95 baselines per database dialect and dataset scale"""
+
+    def __init__(self, path: Path, key: str):
+        self.path = path
+        self.key = key
+        self.data = json.loads(path.read_text()) if path.exists() else {}
+
+    def get(self, name: str) -> Dict[str, Any]:
+        return self.data.get(self.key, {}).get(name)
+
+    def put(self, name: str, result: Dict[str, Any]):
+        self.data.setdefault(self.key, {})[name] = result
+        self.path.write_text(json.dumps(self.data, indent=2, sort_keys=True) + "\n")
+
+
+@pytest.fixture(scope="session")
+def p95_gate(benchmark_engine):
+    """
+    Compare a run against its stored baseline.
+
+    Records the run when updating baselines, skips when no baseline exists
+    and fails when p95 exceeds the baseline by more than the tolerance.
+    """
+    store = BaselineStore(BASELINES_PATH, f"{benchmark_engine.dialect.name}:scale={BENCHMARK_SCALE:g}")
+
+    def check(name: str, run):
+        result = {
+            "p50_ms": round(run.percentile(50), 3),
+            "p95_ms": round(run.percentile(95), 3),
+            "p99_ms": round(run.percentile(99), 3),
+            "ops_per_second": round(run.ops_per_second, 1),
+            "iterations": run.iterations,
+            "recorded_at": datetime.utcnow().isoformat(timespec="seconds"),
+        }
+        print(f"\n{name}: p50 {result['p50_ms']}ms, p95 {result['p95_ms']}ms, "
+              f"p99 {result['p99_ms']}ms, {result['ops_per_second']} ops/s")
+
+        assert run.error_count == 0, f"{name} raised errors: {run.errors}"
+
+        if UPDATE_BASELINES:
+            store.put(name, result)
+            return
+
+        baseline = store.get(name)
+        if baseline is None:
+            pytest.skip(
+                f"No p95 baseline for {name} ({store.key}) in {store.path.name}; "
+                f"record one with BENCHMARK_UPDATE_BASELINES=1"
+            )
+
+        allowed = baseline["p95_ms"] * (1 + P95_TOLERANCE) + NOISE_FLOOR_MS
+        assert result["p95_ms"] <= allowed, (
+            f"{name} p95 regressed: {result['p95_ms']}ms > {allowed:.3f}ms "
+            f"(baseline {baseline['p95_ms']}ms + {P95_TOLERANCE:.0%})"
+        )
+
+    return check
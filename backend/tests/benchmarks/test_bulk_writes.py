@@ -0,0 +1,167 @@
+"""
+Bulk Write Benchmarks
+Performance & Optimization
+
+Per-row cost of the shared bulk write helpers at 10k rows, compared with
+the add/flush/refresh loop they replace. Runs against in-memory SQLite.
+
+Run with: pytest tests/benchmarks/test_bulk_writes.py -m performance -s
+"""
+
+import time
+import uuid
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import Column, Date, DateTime, Integer, String, Text, UniqueConstraint, Uuid, func, select, update, bindparam
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import declarative_base
+
+from app.core.bulk import bulk_execute, bulk_insert_returning, bulk_upsert
+
+
+ROW_COUNT = 10000
+
+BenchBase = declarative_base()
+
+
+class BenchGuest(BenchBase):
+    """Guest-shaped table used for write benchmarks"""
+    __tablename__ = "bench_guests"
+
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    event_id = Column(Uuid, nullable=False, index=True)
+    first_name = Column(String(100), nullable=False)
+    last_name = Column(String(100), nullable=False)
+    email = Column(String(255), nullable=True)
+    status = Column(String(20), default="pending")
+    notes = Column(Text, nullable=True)
+    created_at = Column(DateTime, server_default=func.now())
+
+
+class BenchAvailability(BenchBase):
+    """Availability-shaped table used for upsert benchmarks"""
+    __tablename__ = "bench_availability"
+
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    vendor_id = Column(Integer, nullable=False)
+    date = Column(Date, nullable=False)
+    status = Column(String(20), nullable=False)
+    notes = Column(Text, nullable=True)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (UniqueConstraint("vendor_id", "date"),)
+
+
+@pytest.fixture
+async def bench_session():
+    """Fresh in-memory database with benchmark tables"""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(BenchBase.metadata.create_all)
+
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        yield session
+
+    await engine.dispose()
+
+
+def _guest_rows(count: int) -> list:
+    event_id = uuid.uuid4()
+    return [
+        {
+            "event_id": event_id,
+            "first_name": f"Guest{i}",
+            "last_name": "Benchmark",
+            "email": f"guest{i}@example.com",
+            "notes": None
+        }
+        for i in range(count)
+    ]
+
+
+def _report(label: str, elapsed: float, rows: int) -> float:
+    per_row_us = elapsed / rows * 1_000_000
+    print(f"\n{label}: {rows} rows in {elapsed * 1000:.1f}ms ({per_row_us:.1f}us/row)")
+    return per_row_us
+
+
+@pytest.mark.asyncio
+@pytest.mark.performance
+@pytest.mark.slow
+class TestBulkWriteBenchmark:
+    """Per-row cost of set-based writes at 10k rows"""
+
+    async def test_insert_returning_vs_row_loop(self, bench_session: AsyncSession):
+        """Multi-row INSERT ... RETURNING beats add + refresh per row"""
+        rows = _guest_rows(ROW_COUNT)
+
+        start = time.perf_counter()
+        guests = []
+        for row in rows:
+            guest = BenchGuest(**row)
+            bench_session.add(guest)
+            guests.append(guest)
+        await bench_session.flush()
+        for guest in guests:
+            await bench_session.refresh(guest)
+        loop_us = _report("row loop (add + refresh)", time.perf_counter() - start, ROW_COUNT)
+
+        start = time.perf_counter()
+        created = await bulk_insert_returning(bench_session, BenchGuest, _guest_rows(ROW_COUNT))
+        bulk_us = _report("bulk_insert_returning", time.perf_counter() - start, ROW_COUNT)
+
+        assert len(created) == ROW_COUNT
+        assert all(g.created_at is not None for g in created)
+        assert bulk_us < loop_us
+
+    async def test_upsert_vs_select_then_insert(self, bench_session: AsyncSession):
+        """ON CONFLICT upsert beats SELECT + INSERT per row"""
+        start_date = date(2026, 1, 1)
+        days = [start_date + timedelta(days=i) for i in range(ROW_COUNT)]
+
+        start = time.perf_counter()
+        for day in days:
+            result = await bench_session.execute(
+                select(BenchAvailability).where(
+                    BenchAvailability.vendor_id == 1,
+                    BenchAvailability.date == day
+                )
+            )
+            availability = result.scalar_one_or_none()
+            if availability:
+                availability.status = "available"
+            else:
+                bench_session.add(BenchAvailability(vendor_id=1, date=day, status="available"))
+        await bench_session.flush()
+        loop_us = _report("row loop (select + insert)", time.perf_counter() - start, ROW_COUNT)
+
+        rows = [
+            {"vendor_id": 2, "date": day, "status": "available", "notes": None}
+            for day in days
+        ]
+        start = time.perf_counter()
+        await bulk_upsert(bench_session, BenchAvailability, rows, conflict_columns=["vendor_id", "date"])
+        # Second pass exercises the conflict/update path
+        await bulk_upsert(bench_session, BenchAvailability, rows, conflict_columns=["vendor_id", "date"])
+        bulk_us = _report("bulk_upsert (2 passes)", time.perf_counter() - start, ROW_COUNT * 2)
+
+        total = await bench_session.scalar(
+            select(func.count()).select_from(BenchAvailability).where(BenchAvailability.vendor_id == 2)
+        )
+        assert total == ROW_COUNT
+        assert bulk_us < loop_us
+
+    async def test_chunked_executemany_update(self, bench_session: AsyncSession):
+        """Chunked executemany updates 10k rows"""
+        created = await bulk_insert_returning(bench_session, BenchGuest, _guest_rows(ROW_COUNT))
+        table = BenchGuest.__table__
+        stmt = update(table).where(table.c.id == bindparam("guest_id")).values(status=bindparam("new_status"))
+
+        for batch_size in (100, 1000, 5000):
+            params = [{"guest_id": g.id, "new_status": f"batch_{batch_size}"} for g in created]
+            start = time.perf_counter()
+            executed = await bulk_execute(bench_session, stmt, params, batch_size=batch_size)
+            _report(f"bulk_execute update (batch_size={batch_size})", time.perf_counter() - start, ROW_COUNT)
+            assert executed == ROW_COUNT
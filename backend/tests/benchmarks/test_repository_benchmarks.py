@@ -0,0 +1,55 @@
+"""
+Repository Benchmarks
+Performance & Optimization
+
+p95 latency of the hot repository queries on the seeded dataset (100k
+guests, 1M messages, 50k vendors at full scale), gated against the
+baselines in baselines.json.
+
+Run with: pytest tests/benchmarks/test_repository_benchmarks.py -m performance -s
+Record new baselines: BENCHMARK_UPDATE_BASELINES=1 pytest ... -m performance
+"""
+
+import os
+
+import pytest
+
+from app.services.benchmark_service import benchmark_operations, operation_worker, run_load
+
+
+ITERATIONS = int(os.environ.get("BENCHMARK_ITERATIONS", "200"))
+WARMUP_ITERATIONS = int(os.environ.get("BENCHMARK_WARMUP_ITERATIONS", "20"))
+CONCURRENCY = int(os.environ.get("BENCHMARK_CONCURRENCY", "1"))
+
+# Targets cycled through per operation (busiest events, users, conversations)
+TARGET_COUNT = 20
+
+
+@pytest.mark.asyncio
+@pytest.mark.performance
+@pytest.mark.slow
+class TestRepositoryBenchmarks:
+    """p95 regression gates for hot repository queries"""
+
+    @pytest.mark.parametrize("operation_name", [
+        "vendor_search",
+        "guest_stats",
+        "event_analytics",
+        "conversation_messages",
+    ])
+    async def test_p95_within_baseline(self, operation_name, benchmark_sessions, p95_gate):
+        """The operation's p95 stays within tolerance of its baseline"""
+        operation = benchmark_operations[operation_name]
+
+        async with benchmark_sessions() as db:
+            targets = await operation.load_targets(db, TARGET_COUNT)
+        assert targets, f"No seeded data for {operation_name}"
+
+        run = await run_load(
+            operation_worker(operation, targets, session_factory=benchmark_sessions),
+            iterations=ITERATIONS,
+            concurrency=CONCURRENCY,
+            warmup_iterations=WARMUP_ITERATIONS
+        )
+
+        p95_gate(operation_name, run)
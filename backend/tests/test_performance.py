@@ -275,3 +275,1687 @@ class TestOptimizationReport:
         assert "overall_score" in data
         assert "recommendations" in data
         assert 0 <= data["overall_score"] <= 100
+
+
+@pytest.mark.unit
+class TestCountStrategies:
+    """Test pagination count strategy helpers"""
+
+    def test_normalize_filters_ignores_unset_values(self):
+        """Equivalent filter sets share a cache key"""
+        from app.core.pagination import normalize_filters
+
+        key_a = normalize_filters("vendors.search", {"city": "Istanbul", "category": None})
+        key_b = normalize_filters("vendors.search", {"category": None, "city": "Istanbul"})
+        key_c = normalize_filters("vendors.search", {"city": "Ankara"})
+
+        assert key_a == key_b
+        assert key_a != key_c
+        assert key_a.startswith("vendors.search:")
+
+    def test_count_cache_invalidate_namespace(self):
+        """Cached counts can be dropped per namespace"""
+        from app.core.pagination import CountCache
+
+        cache = CountCache(ttl_seconds=60)
+        cache.set("vendors:a", 10)
+        cache.set("messaging:b", 5)
+
+        assert cache.get("vendors:a") == 10
+        assert cache.invalidate("vendors") == 1
+        assert cache.get("vendors:a") is None
+        assert cache.get("messaging:b") == 5
+
+    def test_page_info_unknown_total(self):
+        """has_more mode reports no total and no page count"""
+        from app.core.pagination import PageInfo
+
+        info = PageInfo(page=1, page_size=20, has_more=True, total=None, total_is_exact=False)
+        assert info.total_pages is None
+
+        info = PageInfo(page=1, page_size=20, has_more=True, total=45)
+        assert info.total_pages == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestPaginate:
+    """Test paginate with each count strategy"""
+
+    @staticmethod
+    async def _run(check):
+        from sqlalchemy import Column, Integer, select
+        from sqlalchemy.orm import declarative_base
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        PageBase = declarative_base()
+
+        class PageItem(PageBase):
+            __tablename__ = "page_items"
+            id = Column(Integer, primary_key=True)
+
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(PageBase.metadata.create_all)
+
+            async with async_sessionmaker(engine)() as db:
+                db.add_all([PageItem(id=i) for i in range(1, 26)])
+                await db.commit()
+                await check(db, select(PageItem), [PageItem.id])
+        finally:
+            await engine.dispose()
+
+    async def test_exact_counts_every_row(self):
+        """EXACT reports the full total on every page"""
+        from app.core.pagination import CountStrategy, paginate
+
+        async def check(db, query, order_by):
+            items, info = await paginate(db, query, 1, 10, CountStrategy.EXACT, order_by=order_by)
+            assert [item.id for item in items] == list(range(1, 11))
+            assert (info.total, info.total_is_exact, info.has_more) == (25, True, True)
+            assert info.total_pages == 3
+
+        await self._run(check)
+
+    async def test_has_more_skips_count_until_last_page(self):
+        """HAS_MORE has no total before the last page"""
+        from app.core.pagination import CountStrategy, paginate
+
+        async def check(db, query, order_by):
+            _, info = await paginate(db, query, 2, 10, CountStrategy.HAS_MORE, order_by=order_by)
+            assert (info.total, info.total_is_exact, info.has_more) == (None, False, True)
+
+            items, info = await paginate(db, query, 3, 10, CountStrategy.HAS_MORE, order_by=order_by)
+            assert len(items) == 5
+            assert (info.total, info.total_is_exact, info.has_more) == (25, True, False)
+
+        await self._run(check)
+
+    async def test_cached_count_is_reported_inexact(self):
+        """A count served from the cache is not exact; invalidation drops it"""
+        from app.core.pagination import CountStrategy, count_cache, paginate
+
+        async def check(db, query, order_by):
+            key = "tests.paginate:all"
+            count_cache.invalidate("tests.paginate")
+            try:
+                _, info = await paginate(db, query, 1, 10, CountStrategy.CACHED, key, order_by=order_by)
+                assert (info.total, info.total_is_exact) == (25, True)
+
+                _, info = await paginate(db, query, 1, 10, CountStrategy.CACHED, key, order_by=order_by)
+                assert (info.total, info.total_is_exact) == (25, False)
+
+                # The last page corrects a cached total
+                count_cache.set(key, 40)
+                _, info = await paginate(db, query, 3, 10, CountStrategy.CACHED, key, order_by=order_by)
+                assert (info.total, info.total_is_exact) == (25, True)
+
+                count_cache.invalidate("tests.paginate")
+                assert count_cache.get(key) is None
+            finally:
+                count_cache.invalidate("tests.paginate")
+
+        await self._run(check)
+
+    async def test_invalidation_waits_for_commit(self):
+        """Writes that only flush drop cached counts when their transaction commits"""
+        from app.core.pagination import count_cache, invalidate_on_commit
+
+        async def check(db, query, order_by):
+            key = "tests.paginate:all"
+            try:
+                count_cache.set(key, 25)
+                await db.execute(query)
+                invalidate_on_commit(db, "tests.paginate")
+                await db.rollback()
+                await db.commit()
+                assert count_cache.get(key) == 25
+
+                await db.execute(query)
+                invalidate_on_commit(db, "tests.paginate")
+                assert count_cache.get(key) == 25
+                await db.commit()
+                assert count_cache.get(key) is None
+            finally:
+                count_cache.invalidate("tests.paginate")
+
+        await self._run(check)
+
+    async def test_offset_window_between_pages(self):
+        """An offset that is not on a page boundary returns exactly that window"""
+        from app.core.pagination import CountStrategy, paginate
+
+        async def check(db, query, order_by):
+            items, info = await paginate(
+                db, query, 3, 10, CountStrategy.HAS_MORE, order_by=order_by, offset=23
+            )
+            assert [item.id for item in items] == [24, 25]
+            assert (info.total, info.total_is_exact, info.has_more) == (25, True, False)
+
+            items, _ = await paginate(db, query, 1, 4, CountStrategy.EXACT, order_by=order_by, offset=5)
+            assert [item.id for item in items] == [6, 7, 8, 9]
+
+        await self._run(check)
+
+    async def test_estimated_falls_back_to_exact_without_postgres(self):
+        """ESTIMATED counts exactly when no planner estimate is available"""
+        from app.core.pagination import CountStrategy, paginate
+
+        async def check(db, query, order_by):
+            _, info = await paginate(db, query, 1, 10, CountStrategy.ESTIMATED, order_by=order_by)
+            assert (info.total, info.total_is_exact) == (25, True)
+
+        await self._run(check)
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestEntityLoader:
+    """Test request-scoped entity loaders"""
+
+    async def test_same_tick_lookups_share_one_query(self):
+        """Concurrent lookups coalesce into one IN query and are memoized"""
+        import asyncio
+        from sqlalchemy import Column, Integer, String
+        from sqlalchemy.orm import declarative_base
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        from app.core.loaders import get_loader
+
+        LoaderBase = declarative_base()
+
+        class LoaderItem(LoaderBase):
+            __tablename__ = "loader_items"
+            id = Column(Integer, primary_key=True)
+            name = Column(String)
+
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(LoaderBase.metadata.create_all)
+
+            async with async_sessionmaker(engine)() as db:
+                db.add_all([LoaderItem(id=i, name=f"item-{i}") for i in range(1, 6)])
+                await db.commit()
+
+                loader = get_loader(db, LoaderItem)
+                items = await asyncio.gather(*(loader.load(i) for i in (1, 2, 3, 99)))
+
+                assert [item.name if item else None for item in items] == [
+                    "item-1", "item-2", "item-3", None
+                ]
+                assert loader.stats["queries"] == 1
+
+                again = await get_loader(db, LoaderItem).load(2)
+                assert again is items[1]
+                assert loader.stats["memo_hits"] == 1
+                assert loader.stats["queries"] == 1
+        finally:
+            await engine.dispose()
+
+    async def test_batch_runs_on_the_callers_task(self):
+        """The IN query uses the session from the loading task, not a task of its own"""
+        import asyncio
+        from sqlalchemy import Column, Integer
+        from sqlalchemy.orm import declarative_base
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        from app.core.loaders import get_loader
+
+        LoaderBase = declarative_base()
+
+        class LoaderItem(LoaderBase):
+            __tablename__ = "loader_items"
+            id = Column(Integer, primary_key=True)
+
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(LoaderBase.metadata.create_all)
+
+            async with async_sessionmaker(engine)() as db:
+                db.add_all([LoaderItem(id=i) for i in range(1, 4)])
+                await db.commit()
+
+                query_tasks = []
+                execute = db.execute
+
+                async def recording_execute(*args, **kwargs):
+                    query_tasks.append(asyncio.current_task())
+                    return await execute(*args, **kwargs)
+
+                db.execute = recording_execute
+                item = await get_loader(db, LoaderItem).load(3)
+
+                assert item.id == 3
+                assert query_tasks == [asyncio.current_task()]
+        finally:
+            await engine.dispose()
+
+
+@pytest.mark.unit
+class TestColdStart:
+    """Test cold-start instrumentation"""
+
+    def test_startup_timeline_records_imports_and_phases(self):
+        """Imports, phases and the first request are recorded"""
+        from app.core.startup import StartupTimeline
+
+        timeline = StartupTimeline()
+        timeline.import_module("json")
+        with timeline.phase("init_db"):
+            pass
+        timeline.mark_ready()
+        timeline.mark_first_request("/health")
+        timeline.mark_first_request("/later")
+
+        snapshot = timeline.snapshot()
+        assert snapshot["imports"][0]["module"] == "json"
+        assert snapshot["phases"][0]["phase"] == "init_db"
+        assert snapshot["first_request_path"] == "/health"
+        assert snapshot["ready_ms"] <= snapshot["first_request_ms"]
+
+    def test_schema_fingerprint_tracks_model_changes(self):
+        """Adding a column changes the fingerprint"""
+        from sqlalchemy import Column, Integer, MetaData, String, Table
+        from app.core.schema import compute_schema_fingerprint
+
+        def build(extra_column: bool) -> MetaData:
+            metadata = MetaData()
+            columns = [Column("id", Integer, primary_key=True)]
+            if extra_column:
+                columns.append(Column("name", String(50)))
+            Table("items", metadata, *columns)
+            return metadata
+
+        assert compute_schema_fingerprint(build(False)) == compute_schema_fingerprint(build(False))
+        assert compute_schema_fingerprint(build(False)) != compute_schema_fingerprint(build(True))
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestPoolTelemetry:
+    """Test connection pool instrumentation"""
+
+    async def test_wait_timeout_and_hold_time_are_recorded(self, tmp_path):
+        """Checkout waits, timeouts and hold time per source are tracked"""
+        import asyncio
+        from sqlalchemy import exc, text
+        from sqlalchemy.ext.asyncio import create_async_engine
+        from app.core.pool_telemetry import (
+            InstrumentedAsyncQueuePool, PoolTelemetry, connection_source, pool_telemetry
+        )
+
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            poolclass=InstrumentedAsyncQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=0.1
+        )
+        telemetry = PoolTelemetry()
+        telemetry.attach(engine.sync_engine)
+        waits_before = pool_telemetry.wait_histogram.count
+        timeouts_before = pool_telemetry.timeouts
+
+        try:
+            with connection_source("test.holder"):
+                async with engine.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+                    assert telemetry.snapshot()["checked_out"] == 1
+
+                    with pytest.raises(exc.TimeoutError):
+                        async with engine.connect():
+                            pass
+                    await asyncio.sleep(0.01)
+
+            snapshot = telemetry.snapshot()
+            assert snapshot["checked_out"] == 0
+            assert snapshot["queries"]["count"] >= 1
+            assert snapshot["hold_ms_by_route"]["test.holder"]["count"] == 1
+            assert snapshot["hold_ms_by_route"]["test.holder"]["max_ms"] >= 10
+            assert pool_telemetry.wait_histogram.count > waits_before
+            assert pool_telemetry.timeouts == timeouts_before + 1
+        finally:
+            await engine.dispose()
+
+    async def test_adaptive_overflow_stays_within_bounds(self):
+        """The controller raises overflow on timeouts and decays when idle"""
+        from app.core.pool_telemetry import AdaptiveOverflowController, PoolTelemetry, PoolWindow
+
+        class FakePool:
+            _max_overflow = 2
+
+        controller = AdaptiveOverflowController(
+            FakePool(), PoolTelemetry(), min_overflow=2, max_overflow=5, step=2, cooldown_windows=2
+        )
+
+        busy = PoolWindow()
+        busy.checkouts, busy.timeouts, busy.peak_overflow = 100, 3, 2
+        assert controller.evaluate(busy) == 4
+        assert controller.evaluate(busy) == 5
+        assert controller.evaluate(busy) == 5
+
+        idle = PoolWindow()
+        idle.checkouts = 100
+        assert controller.evaluate(idle) == 5
+        assert controller.evaluate(idle) == 4
+
+
+@pytest.mark.unit
+class TestLatencySketch:
+    """Test mergeable latency sketches"""
+
+    def test_quantiles_within_relative_accuracy(self):
+        """Sketch percentiles stay within 1% of exact percentiles"""
+        import random
+        from app.core.sketch import LatencySketch
+
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(3, 1) for _ in range(20000))
+        sketch = LatencySketch(0.01)
+        for value in values:
+            sketch.add(value)
+
+        for q in (0.5, 0.95, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            assert abs(sketch.quantile(q) - exact) / exact <= 0.011
+
+    def test_merge_and_serialization_are_lossless(self):
+        """Merged per-worker sketches equal a sketch of all values"""
+        from app.core.sketch import LatencySketch
+
+        worker_a, worker_b, combined = LatencySketch(), LatencySketch(), LatencySketch()
+        for value in range(1, 1001):
+            (worker_a if value % 2 else worker_b).add(float(value))
+            combined.add(float(value))
+
+        restored = LatencySketch.from_bytes(worker_a.to_bytes())
+        merged = LatencySketch.merged([restored, LatencySketch.from_bytes(worker_b.to_bytes())])
+
+        assert merged.count == combined.count == 1000
+        assert merged.buckets == combined.buckets
+        assert merged.percentile(95) == combined.percentile(95)
+        assert (merged.min, merged.max) == (1.0, 1000.0)
+
+    def test_registry_drains_closed_buckets_only(self):
+        """Only finished time buckets are flushed unless shutting down"""
+        import time
+        from app.services.latency_histogram_service import LatencyHistogramRegistry
+
+        registry = LatencyHistogramRegistry(bucket_seconds=60)
+        registry.observe("GET", "/api/v1/vendors", 12.0, at=time.time() - 120)
+        registry.observe("GET", "/api/v1/vendors", 30.0, error=True, at=time.time() - 120)
+        registry.observe("GET", "/api/v1/vendors", 8.0)
+
+        closed = registry.drain()
+        assert len(closed) == 1
+        assert closed[0]["request_count"] == 2
+        assert closed[0]["error_count"] == 1
+
+        registry.restore(closed)
+        assert len(registry.drain(include_open=True)) == 2
+
+
+@pytest.mark.unit
+class TestMetricRollups:
+    """Test rollup tier planning"""
+
+    def test_plan_segments_prefers_coarsest_tier(self):
+        """Whole days come from 1d, edges from finer tiers, the tail from raw"""
+        from datetime import datetime
+        from app.repositories.metric_rollup_repository import plan_segments
+
+        watermarks = {
+            "1m": datetime(2026, 1, 10, 12, 30),
+            "1h": datetime(2026, 1, 10, 12, 0),
+            "1d": datetime(2026, 1, 10, 0, 0),
+        }
+        segments = plan_segments(datetime(2026, 1, 7, 22, 15), datetime(2026, 1, 10, 12, 45), watermarks)
+
+        assert segments == [
+            ("1m", datetime(2026, 1, 7, 22, 15), datetime(2026, 1, 7, 23, 0)),
+            ("1h", datetime(2026, 1, 7, 23, 0), datetime(2026, 1, 8, 0, 0)),
+            ("1d", datetime(2026, 1, 8, 0, 0), datetime(2026, 1, 10, 0, 0)),
+            ("1h", datetime(2026, 1, 10, 0, 0), datetime(2026, 1, 10, 12, 0)),
+            ("1m", datetime(2026, 1, 10, 12, 0), datetime(2026, 1, 10, 12, 30)),
+            ("raw", datetime(2026, 1, 10, 12, 30), datetime(2026, 1, 10, 12, 45)),
+        ]
+
+    def test_plan_segments_without_rollups_reads_raw(self):
+        """Before the first compaction everything is read from raw data"""
+        from datetime import datetime
+        from app.repositories.metric_rollup_repository import plan_segments
+
+        start, end = datetime(2026, 1, 1), datetime(2026, 1, 2)
+        assert plan_segments(start, end, {}) == [("raw", start, end)]
+
+    def test_rollup_aggregates_merge(self):
+        """Merged aggregates keep exact count, sum, min and max"""
+        from app.repositories.metric_rollup_repository import RollupAggregate
+
+        first, second = RollupAggregate(), RollupAggregate()
+        for value in (5.0, 15.0):
+            first.add(value)
+        second.add(40.0, error=True)
+
+        merged = RollupAggregate().merge(first).merge(second)
+        assert (merged.count, merged.sum, merged.min, merged.max, merged.errors) == (3, 60.0, 5.0, 40.0, 1)
+        assert merged.sketch.count == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestMetricCompaction:
+    """Test compaction of raw points into the rollup tiers"""
+
+    @staticmethod
+    def _points(start):
+        from datetime import timedelta
+        from app.models.performance import PerformanceMetric
+
+        points = []
+        for i in range(300):
+            points.append(PerformanceMetric(
+                metric_type="api_latency",
+                metric_value=0.0005 if i % 50 == 0 else 1.5 * (i % 97) + 0.25,
+                tags={"endpoint": f"/vendors/{i % 3}", "method": "GET", "error": "timeout" if i % 7 == 0 else None},
+                recorded_at=start + timedelta(seconds=i * 1.7)
+            ))
+            points.append(PerformanceMetric(
+                metric_type="db_query_time",
+                metric_value=float(i % 13) + 0.5,
+                tags={"table": "vendors", "type": "SELECT"} if i % 2 else None,
+                recorded_at=start + timedelta(seconds=i * 1.3)
+            ))
+        return points
+
+    async def test_grouped_buckets_match_point_aggregation(self, test_db_session):
+        """Buckets grouped by the database equal aggregating every point"""
+        from datetime import datetime, timedelta
+        from app.repositories.metric_rollup_repository import MetricRollupRepository
+
+        start = datetime(2026, 1, 5, 10, 0)
+        test_db_session.add_all(self._points(start))
+        await test_db_session.commit()
+
+        repo = MetricRollupRepository(test_db_session)
+        end = start + timedelta(minutes=10)
+        grouped = await repo.aggregate_raw_buckets(start, end)
+        expected = await repo.aggregate_raw(start, end, bucket_width=timedelta(minutes=1))
+
+        assert set(grouped) == set(expected)
+        assert ("api_latency", "GET /vendors/1", start) in grouped
+        for key, aggregate in expected.items():
+            assert grouped[key].to_row(*key) == aggregate.to_row(*key)
+
+    async def test_late_points_are_rerolled(self, test_db_session):
+        """A point arriving after its minute was compacted is still rolled up"""
+        from datetime import datetime, timedelta
+        from sqlalchemy import select
+        from app.models.performance import PerformanceMetric, MetricRollupMinute
+        from app.services.metric_rollup_service import MetricRollupService
+
+        minute = datetime(2026, 1, 5, 10, 0)
+        test_db_session.add(PerformanceMetric(metric_type="cache_hit", metric_value=1.0, recorded_at=minute))
+        await test_db_session.commit()
+
+        service = MetricRollupService(test_db_session)
+        await service.compact(now=minute + timedelta(minutes=10))
+
+        test_db_session.add(PerformanceMetric(
+            metric_type="cache_hit", metric_value=1.0, recorded_at=minute + timedelta(seconds=30)
+        ))
+        await test_db_session.commit()
+        await service.compact(now=minute + timedelta(minutes=20))
+
+        count = await test_db_session.scalar(select(MetricRollupMinute.count).where(
+            MetricRollupMinute.metric_type == "cache_hit",
+            MetricRollupMinute.bucket_start == minute
+        ))
+        assert count == 2
+
+
+@pytest.mark.unit
+class TestMetricsCollector:
+    """Test the ring-buffered request metrics collector"""
+
+    def test_drain_returns_entries_once(self):
+        """Entries are drained in order and only once"""
+        from app.services.metrics_collector import RequestMetricsCollector
+
+        collector = RequestMetricsCollector(capacity=8)
+        collector.record("GET", "/vendors/{vendor_id}", 200, 12.5, 512)
+        collector.record("POST", "/events", 201, 30.0, 128)
+
+        entries = collector.drain()
+        assert [(e[1], e[2], e[3], e[4], e[5]) for e in entries] == [
+            ("GET", "/vendors/{vendor_id}", 200, 12.5, 512),
+            ("POST", "/events", 201, 30.0, 128),
+        ]
+        assert collector.drain() == []
+
+    def test_overflow_keeps_newest_and_counts_dropped(self):
+        """A full buffer overwrites the oldest entries"""
+        from app.services.metrics_collector import RequestMetricsCollector
+
+        collector = RequestMetricsCollector(capacity=4)
+        for i in range(10):
+            collector.record("GET", "/events", 200, float(i))
+
+        entries = collector.drain()
+        assert [e[4] for e in entries] == [6.0, 7.0, 8.0, 9.0]
+        assert collector.dropped == 6
+        assert collector.stats()["recorded"] == 10
+
+    def test_aggregate_by_route_and_status_class(self):
+        """Aggregation groups per route and status class"""
+        from app.services.metrics_collector import RequestMetricsCollector
+
+        collector = RequestMetricsCollector(capacity=16)
+        collector.record("GET", "/events", 200, 10.0, 100)
+        collector.record("GET", "/events", 204, 20.0, 0)
+        collector.record("GET", "/events", 503, 50.0, 40)
+
+        groups = {g["status_class"]: g for g in collector.aggregate(collector.drain())}
+        assert groups["2xx"]["count"] == 2
+        assert groups["2xx"]["bytes"] == 100
+        assert groups["5xx"]["latency_ms"] == 50.0
+
+    def test_record_overhead_is_measured(self):
+        """The collector reports its own per-record overhead"""
+        from app.services.metrics_collector import RequestMetricsCollector
+
+        collector = RequestMetricsCollector(capacity=1024)
+        for _ in range(1000):
+            collector.record("GET", "/events", 200, 1.0)
+
+        stats = collector.stats()
+        assert stats["avg_record_overhead_us"] > 0
+        assert stats["pending"] == 1000
+
+    @pytest.mark.asyncio
+    async def test_middleware_records_failures_and_skips_excluded_paths(self):
+        """Raising handlers count as 500s; health and metrics are not recorded"""
+        from fastapi import FastAPI
+        from httpx import AsyncClient
+        from app.middleware.performance_middleware import PerformanceMonitoringMiddleware
+        from app.services.metrics_collector import RequestMetricsCollector
+
+        collector = RequestMetricsCollector(capacity=16)
+        app = FastAPI()
+        app.add_middleware(PerformanceMonitoringMiddleware, collector=collector)
+
+        @app.get("/events/{event_id}")
+        async def get_event(event_id: int):
+            if event_id == 0:
+                raise RuntimeError("boom")
+            return {"id": event_id}
+
+        @app.get("/health")
+        async def health():
+            return {"status": "healthy"}
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            assert (await client.get("/events/1")).status_code == 200
+            assert (await client.get("/health")).status_code == 200
+            with pytest.raises(RuntimeError):
+                await client.get("/events/0")
+
+        assert [(e[1], e[2], e[3]) for e in collector.drain()] == [
+            ("GET", "/events/{event_id}", 200),
+            ("GET", "/events/{event_id}", 500),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_flusher_survives_flush_failures(self):
+        """A failing flush is counted and the flusher keeps running"""
+        import asyncio
+        from app.services.metrics_collector import MetricsCollectorFlusher, RequestMetricsCollector
+
+        class FailingCollector(RequestMetricsCollector):
+            calls = 0
+
+            async def flush(self) -> int:
+                self.calls += 1
+                if self.calls == 1:
+                    raise RuntimeError("drain failed")
+                return 0
+
+        collector = FailingCollector(capacity=8)
+        flusher = MetricsCollectorFlusher(collector, interval_seconds=0.001)
+        flusher.start()
+        for _ in range(100):
+            if collector.calls >= 3:
+                break
+            await asyncio.sleep(0.01)
+
+        assert not flusher._task.done()
+        await flusher.stop()
+        assert collector.calls >= 3
+        assert collector.flush_errors == 1
+
+
+@pytest.mark.unit
+class TestOpenMetrics:
+    """Test the in-process OpenMetrics exposition"""
+
+    def test_render_includes_exported_requests(self):
+        """Drained collector entries show up as counters and histograms"""
+        from app.core.metrics import export_requests, render_metrics
+
+        export_requests([
+            (0.0, "GET", "/metrics-test/{item_id}", 200, 12.0, 256),
+            (0.0, "GET", "/metrics-test/{item_id}", 503, 900.0, 0),
+        ])
+        body, content_type = render_metrics()
+        text = body.decode()
+
+        assert content_type.startswith("application/openmetrics-text")
+        assert 'http_requests_total{method="GET",route="/metrics-test/{item_id}",status_class="5xx"} 1.0' in text
+        assert 'http_request_duration_seconds_count{method="GET",route="/metrics-test/{item_id}"} 2.0' in text
+        assert text.rstrip().endswith("# EOF")
+
+    def test_queue_depths_and_running_totals(self):
+        """Registered queue depths are sampled; totals become increments"""
+        from app.core.metrics import (
+            BACKGROUND_QUEUE_DEPTH, MetricsSampler, register_queue_depth, DB_POOL_CHECKOUTS
+        )
+
+        register_queue_depth("test_queue", lambda: 7)
+        sampler = MetricsSampler()
+        sampler.sample()
+        assert BACKGROUND_QUEUE_DEPTH.labels("test_queue")._value.get() == 7
+
+        before = DB_POOL_CHECKOUTS._value.get()
+        sampler._advance(DB_POOL_CHECKOUTS, ("test", "checkouts"), 5)
+        sampler._advance(DB_POOL_CHECKOUTS, ("test", "checkouts"), 8)
+        assert DB_POOL_CHECKOUTS._value.get() - before == 8
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestBenchmarkEngine:
+    """Test the load benchmark engine"""
+
+    async def test_concurrency_warmup_and_errors(self):
+        """Warm-up calls are not measured; failures are counted by type"""
+        import asyncio
+        from app.services.benchmark_service import run_load, plain_worker
+
+        calls = []
+        in_flight = 0
+        peak = 0
+
+        async def operation():
+            nonlocal in_flight, peak
+            calls.append(1)
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+            if len(calls) % 10 == 0:
+                raise TimeoutError()
+
+        run = await run_load(lambda: plain_worker(operation), iterations=50, concurrency=5, warmup_iterations=5)
+
+        assert len(calls) == 55
+        assert peak == 5
+        assert run.error_count == sum(1 for i in range(6, 56) if i % 10 == 0)
+        assert run.errors == {"TimeoutError": run.error_count}
+        assert len(run.latencies_ms) == 50 - run.error_count
+        assert run.percentile(50) <= run.percentile(95) <= run.percentile(99)
+        assert sum(p["ops_per_second"] for p in run.throughput_curve()) > 0
+
+    async def test_stuck_worker_fails_the_run(self):
+        """Workers do not wait forever for a worker stuck in warm-up"""
+        import asyncio
+        from app.services.benchmark_service import run_load, plain_worker
+
+        calls = []
+
+        async def operation():
+            calls.append(1)
+            if len(calls) == 1:
+                await asyncio.sleep(60)
+
+        with pytest.raises(TimeoutError, match="1 of 2 benchmark workers"):
+            await asyncio.wait_for(
+                run_load(
+                    lambda: plain_worker(operation), iterations=10, concurrency=2,
+                    warmup_iterations=2, ready_timeout_seconds=0.05
+                ),
+                timeout=5
+            )
+        assert len(calls) == 2
+
+    async def test_named_operations_registered(self):
+        """The real repository operations are available by name"""
+        from app.services.benchmark_service import benchmark_operations
+
+        assert {"vendor_search", "conversation_list", "guest_stats", "event_analytics"} <= set(benchmark_operations)
+
+
+@pytest.mark.unit
+class TestSyntheticData:
+    """Test the synthetic dataset generator building blocks"""
+
+    def test_entity_ids_are_deterministic_and_distinct(self):
+        """IDs depend only on (seed, kind, index)"""
+        from app.core.synthetic_data import entity_id
+
+        assert entity_id(22, "event", 5) == entity_id(22, "event", 5)
+        ids = {entity_id(22, kind, i) for kind in ("event", "vendor", "booking") for i in range(1000)}
+        assert len(ids) == 3000
+        assert entity_id(22, "event", 5) != entity_id(23, "event", 5)
+        assert entity_id(22, "event", 5).version == 4
+
+    def test_zipf_popularity_is_skewed(self):
+        """The most popular vendor gets far more picks than the median one"""
+        import random
+        from app.core.synthetic_data import ZipfSampler
+
+        sampler = ZipfSampler(1000, 1.1)
+        rng = random.Random(1)
+        counts = [0] * 1000
+        for _ in range(50_000):
+            counts[sampler.sample(rng)] += 1
+
+        assert counts[0] > 50 * max(counts[500], 1)
+        assert counts[0] > counts[1] > counts[10]
+
+    def test_lognormal_counts_keep_mean_and_bounds(self):
+        """Per-parent counts average to the mean within the bounds"""
+        import random
+        from app.core.synthetic_data import LogNormalCount
+
+        distribution = LogNormalCount(100, 0.7, 5, 2_000)
+        rng = random.Random(2)
+        samples = [distribution.sample(rng) for _ in range(20_000)]
+
+        assert 90 < sum(samples) / len(samples) < 110
+        assert min(samples) >= 5 and max(samples) <= 2_000
+
+    def test_spec_round_trips_to_worker_processes(self):
+        """Specs survive the dict form sent to worker processes"""
+        from dataclasses import asdict
+        from app.core.synthetic_data import DatasetSpec, spec_from_dict
+
+        spec = DatasetSpec().scaled(0.01)
+        assert spec_from_dict(asdict(spec)) == spec
+        assert spec.vendors == 500
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestRequestProfiler:
+    """Test the opt-in request profiler"""
+
+    def test_tokens_are_signed_and_expire(self):
+        """Only unexpired tokens with a valid signature select a request"""
+        from app.core.profiler import PROFILE_HEADER, RequestProfiler
+
+        profiler = RequestProfiler(sample_rate=0.0)
+        token, _ = profiler.sign("admin-1", 60)
+        expired, _ = profiler.sign("admin-1", -1)
+
+        assert profiler.select({PROFILE_HEADER: token}) == ("token", "admin-1")
+        assert profiler.select({PROFILE_HEADER: token.replace("admin-1", "admin-2")}) is None
+        assert profiler.select({PROFILE_HEADER: expired}) is None
+        assert profiler.select({}) is None
+
+    async def test_profile_splits_cpu_and_waits(self, tmp_path):
+        """Samples separate CPU time from awaiting, across child tasks"""
+        import asyncio
+        import time
+        from app.core.profiler import RequestProfiler, STATE_CPU, STATE_IO, current_profile
+
+        profiler = RequestProfiler(interval_ms=1.0, output_dir=str(tmp_path))
+        loop = asyncio.get_running_loop()
+        factory = loop.get_task_factory()
+
+        def busy():
+            deadline = time.perf_counter() + 0.05
+            while time.perf_counter() < deadline:
+                pass
+
+        async def handler():
+            busy()
+            await asyncio.sleep(0.05)
+
+        profile = profiler.start("GET", "/profiled", "sampled")
+        await asyncio.create_task(handler())
+        profiler.finish(profile, 200, "/profiled")
+
+        assert loop.get_task_factory() is factory
+        assert current_profile.get() is None
+        summary = profile.summary()
+        assert summary["breakdown"]["cpu_ms"] > 25
+        assert summary["breakdown"]["awaiting_io_ms"] > 25
+        assert any("busy" in frame for stack in profile.stacks for frame in stack)
+
+        profiler.save(profile)
+        assert profiler.list_profiles()[0]["id"] == profile.id
+        assert profiler.get_collapsed(profile.id).startswith("GET /profiled;")
+        assert profiler.get_summary("../etc/passwd") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestLoopWatchdog:
+    """Test event-loop lag measurement and blocking-call detection"""
+
+    async def test_blocking_call_is_attributed_to_call_site(self):
+        """A stall captures the stack of the code blocking the loop"""
+        import asyncio
+        import time
+        from app.core.loop_watchdog import LoopWatchdog
+
+        watchdog = LoopWatchdog(interval_ms=10, threshold_ms=50)
+        watchdog.start()
+
+        def blocking_hash():
+            time.sleep(0.2)
+
+        try:
+            await asyncio.sleep(0.05)
+            blocking_hash()
+            await asyncio.sleep(0.05)
+        finally:
+            await watchdog.stop()
+
+        snapshot = watchdog.snapshot()
+        assert snapshot["stalls"] >= 1
+        assert snapshot["lag_ms"]["max_ms"] >= 150
+        worst = snapshot["offenders"][0]
+        assert "blocking_hash" in " ".join(worst["stack"])
+        assert worst["max_ms"] >= 150
+
+    def test_offenders_are_bounded(self):
+        """The call site with the least blocked time makes room for new ones"""
+        from app.core.loop_watchdog import LoopWatchdog, UNCAPTURED
+
+        watchdog = LoopWatchdog(threshold_ms=100, max_offenders=2)
+        watchdog._record_offender("a", ("a",), 500)
+        watchdog._record_offender("b", ("b",), 200)
+        watchdog._record_offender("c", ("c",), 300)
+        watchdog.observe(150)
+
+        assert set(watchdog.offenders) == {"a", UNCAPTURED}
+        assert watchdog.take_window_max() == 150
+        assert watchdog.take_window_max() == 0
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestMemoryInspector:
+    """Test the tracemalloc memory inspector"""
+
+    async def test_snapshot_diff_finds_growth(self):
+        """Allocations between snapshots show up by location and by type"""
+        from app.core.memory_inspector import MemoryInspector
+
+        class Tracker:
+            def __init__(self):
+                self.request_tracking = {}
+
+        inspector = MemoryInspector(max_snapshots=2)
+        inspector.start(frames=1)
+        try:
+            before = inspector.take_snapshot("before")
+            tracker = Tracker()
+            for i in range(5000):
+                tracker.request_tracking[f"10.0.{i // 250}.{i % 250}"] = [i]
+            after = inspector.take_snapshot("after")
+
+            diff = inspector.diff(before["id"], after["id"], limit=50)
+            containers = inspector.largest_containers(limit=50)
+        finally:
+            inspector.stop()
+
+        # Unrelated objects may be freed in between: allow a margin
+        assert diff["allocations"][0]["count_diff"] >= 4500
+        assert any(entry["type"] == "list" and entry["count_diff"] >= 4500 for entry in diff["types"])
+        assert any(
+            holder.endswith("Tracker.request_tracking") for c in containers for holder in c["held_by"]
+        )
+
+    async def test_snapshots_are_bounded_and_require_tracing(self):
+        """Old snapshots are dropped; snapshots need tracing"""
+        from fastapi import HTTPException
+        from app.core.memory_inspector import MemoryInspector
+
+        inspector = MemoryInspector(max_snapshots=2)
+        with pytest.raises(HTTPException):
+            inspector.take_snapshot()
+
+        inspector.start()
+        try:
+            ids = [inspector.take_snapshot()["id"] for _ in range(3)]
+        finally:
+            inspector.stop()
+
+        assert list(inspector.snapshots) == ids[1:]
+        with pytest.raises(HTTPException):
+            inspector.diff(ids[0], ids[2])
+
+
+@pytest.mark.unit
+class TestSearchIndexer:
+    """Test outbox batching and bulk actions of the search indexer"""
+
+    def test_latest_entry_per_document_wins(self):
+        """Entries collapse per document; the batch's version applies to all"""
+        from types import SimpleNamespace
+        from app.services.search_indexer_service import collapse_entries, bulk_action
+
+        entries = [
+            SimpleNamespace(id=3, index_name="vendors", document_id="v1", operation="index"),
+            SimpleNamespace(id=7, index_name="vendors", document_id="v1", operation="delete"),
+            SimpleNamespace(id=5, index_name="events", document_id="e1", operation="index"),
+        ]
+        changes = {change.key: change for change in collapse_entries(entries, 42)}
+
+        vendor = changes[("vendors", "v1")]
+        assert (vendor.operation, vendor.version, vendor.entry_ids) == ("delete", 42, [3, 7])
+
+        action = bulk_action(changes[("events", "e1")], {"id": "e1"})
+        assert action["_op_type"] == "index"
+        assert (action["version"], action["version_type"]) == (42, "external")
+        # A row that is gone or not searchable is deleted from the index
+        assert bulk_action(changes[("events", "e1")], None)["_op_type"] == "delete"
+
+    @pytest.mark.asyncio
+    async def test_versions_follow_processing_order(self, test_db_session: AsyncSession):
+        """A later batch gets a higher version, whatever the ids of its entries"""
+        from app.repositories.search_repository import SearchRepository
+
+        repo = SearchRepository(test_db_session)
+        first = await repo.next_document_version()
+        assert await repo.next_document_version() > first
+
+    def test_conflicts_and_missing_deletes_are_not_failures(self):
+        """409s and deletes of missing documents count as done"""
+        from app.services.search_indexer_service import bulk_failures
+
+        failures = bulk_failures([
+            {"index": {"_id": "a", "status": 409, "error": {"type": "version_conflict_engine_exception"}}},
+            {"delete": {"_id": "b", "status": 404}},
+            {"index": {"_id": "c", "status": 400, "error": {"type": "mapper_parsing_exception"}}},
+        ])
+
+        assert list(failures) == ["c"]
+        assert "mapper_parsing_exception" in failures["c"]
+
+    def test_non_public_events_are_not_searchable(self):
+        """Private events and soft-deleted vendors are removed from the index"""
+        from types import SimpleNamespace
+        from app.services.search_indexer_service import event_searchable, vendor_searchable
+
+        assert event_searchable(SimpleNamespace(deleted_at=None, visibility="PUBLIC"))
+        assert not event_searchable(SimpleNamespace(deleted_at=None, visibility="PRIVATE"))
+        assert vendor_searchable(SimpleNamespace(deleted_at=None, status="ACTIVE"))
+        assert not vendor_searchable(SimpleNamespace(deleted_at=None, status="SUSPENDED"))
+
+
+@pytest.mark.unit
+class TestSearchReindex:
+    """Test index rebuild planning"""
+
+    def test_key_ranges_cover_the_uuid_space(self):
+        """Ranges are contiguous, open-ended and about equal"""
+        from uuid import uuid4
+        from app.services.search_reindex_service import key_ranges
+
+        ranges = key_ranges(4)
+        assert ranges[0][0] is None and ranges[-1][1] is None
+        assert all(upper == lower for (_, upper), (lower, _) in zip(ranges, ranges[1:]))
+
+        counts = [0] * 4
+        for _ in range(4000):
+            key = uuid4()
+            counts[next(
+                i for i, (lower, upper) in enumerate(ranges)
+                if (lower is None or key >= lower) and (upper is None or key < upper)
+            )] += 1
+        assert min(counts) > 800
+
+    def test_build_settings_disable_refresh_and_replicas(self):
+        """Bulk-load settings do not modify the shared mapping"""
+        from app.core.elasticsearch import VENDOR_INDEX_MAPPING
+        from app.services.search_reindex_service import build_settings
+
+        settings, replicas = build_settings(VENDOR_INDEX_MAPPING)
+
+        assert settings["index"]["number_of_replicas"] == 0
+        assert settings["index"]["refresh_interval"] == "-1"
+        assert replicas == VENDOR_INDEX_MAPPING["settings"]["index"]["number_of_replicas"]
+        assert "refresh_interval" not in VENDOR_INDEX_MAPPING["settings"]["index"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.unit
+class TestVendorSearchFallback:
+    """Test the database search path used when Elasticsearch fails"""
+
+    async def test_search_request_maps_to_vendor_filters(self, test_db_session: AsyncSession):
+        """Search requests translate to vendor repository filters"""
+        from app.services.search_service import SearchService
+        from app.schemas.search import SearchRequest
+
+        service = SearchService(test_db_session)
+        filters = service._to_vendor_filters(SearchRequest(
+            query="  dugun fotografcisi ", category="photography", city="Istanbul",
+            rating_min=4.5, radius_km=0.4, latitude=41.0, longitude=29.0, sort_by="popularity"
+        ))
+
+        assert filters.query == "dugun fotografcisi"
+        assert filters.category.value == "PHOTOGRAPHY"
+        assert filters.radius_km == 1
+        assert filters.sort_by == "popular"
+
+        # Unknown categories cannot match; one-letter queries are not searched
+        assert service._to_vendor_filters(SearchRequest(category="spaceships")) is None
+        assert service._to_vendor_filters(SearchRequest(query="a")).query is None
+
+    async def test_coordinates_without_radius_sort_by_distance(self, test_db_session: AsyncSession):
+        """Coordinates are forwarded with or without a radius; zero coordinates are kept"""
+        import time
+        from uuid import uuid4
+        from app.models.vendor import Vendor, VendorCategory, VendorStatus
+        from app.services.search_service import SearchService
+        from app.schemas.search import SearchRequest
+
+        service = SearchService(test_db_session)
+        filters = service._to_vendor_filters(SearchRequest(latitude=41.0, longitude=29.0, sort_by="distance"))
+        assert (filters.latitude, filters.longitude, filters.radius_km) == (41, 29, None)
+
+        filters = service._to_vendor_filters(SearchRequest(latitude=0.0, longitude=0.0, radius_km=25))
+        assert (filters.latitude, filters.longitude, filters.radius_km) == (0, 0, 25)
+
+        # From Istanbul: Izmir ~330 km, Ankara ~350 km; none is filtered out
+        test_db_session.add_all([
+            Vendor(
+                user_id=uuid4(), business_name=name, category=VendorCategory.PHOTOGRAPHY,
+                description="Wedding photography", phone="5550000000", email=f"{name.lower()}@example.com",
+                location_city=name, status=VendorStatus.ACTIVE, location_lat=lat, location_lng=lng
+            )
+            for name, lat, lng in [("Ankara", 39.93, 32.86), ("Izmir", 38.42, 27.14), ("Istanbul", 41.01, 28.98)]
+        ])
+        await test_db_session.commit()
+
+        response = await service._search_vendors_in_database(
+            SearchRequest(latitude=41.0, longitude=29.0, sort_by="distance"), time.time()
+        )
+        assert [result["business_name"] for result in response["results"]] == ["Istanbul", "Izmir", "Ankara"]
+
+    async def test_price_filters_and_sorts_are_mapped(self, test_db_session: AsyncSession):
+        """Price range and price sorts reach the vendor filters"""
+        from app.services.search_service import SearchService
+        from app.schemas.search import SearchRequest
+
+        service = SearchService(test_db_session)
+        filters = service._to_vendor_filters(SearchRequest(price_min=0, price_max=500, sort_by="price_high"))
+        assert (filters.min_price, filters.max_price, filters.sort_by) == (0, 500, "price_high")
+        assert service._to_vendor_filters(SearchRequest(sort_by="price_low")).sort_by == "price_low"
+
+    async def test_unaligned_skip_returns_the_requested_window(self, test_db_session: AsyncSession):
+        """A skip that is not a multiple of the limit starts at that row"""
+        import time
+        from decimal import Decimal
+        from uuid import uuid4
+        from app.models.vendor import Vendor, VendorCategory, VendorStatus
+        from app.services.search_service import SearchService
+        from app.schemas.search import SearchRequest
+
+        test_db_session.add_all([
+            Vendor(
+                user_id=uuid4(), business_name=f"Vendor {i}", category=VendorCategory.PHOTOGRAPHY,
+                description="Wedding photography", phone="5550000000", email=f"vendor{i}@example.com",
+                location_city="Istanbul", status=VendorStatus.ACTIVE, avg_rating=Decimal(f"4.{9 - i}")
+            )
+            for i in range(7)
+        ])
+        await test_db_session.commit()
+
+        response = await SearchService(test_db_session)._search_vendors_in_database(
+            SearchRequest(sort_by="rating", skip=3, limit=2), time.time()
+        )
+
+        assert [result["business_name"] for result in response["results"]] == ["Vendor 3", "Vendor 4"]
+        assert response["total_results"] == 7
+
+
+@pytest.mark.unit
+class TestGeoSearch:
+    """Test bounding boxes and haversine distances for radius search"""
+
+    def test_bounding_box_contains_the_search_circle(self):
+        """Every point within the radius lies inside the box, across the antimeridian too"""
+        import random
+        from app.core.geo import bounding_box, haversine_km
+
+        rng = random.Random(44)
+        for lat, lng, radius in [(41.0, 29.0, 50), (-33.9, 179.9, 300), (0.0, -179.5, 1000)]:
+            min_lat, max_lat, lng_ranges = bounding_box(lat, lng, radius)
+            for _ in range(2000):
+                point_lat = lat + rng.uniform(-10, 10)
+                point_lng = (lng + rng.uniform(-10, 10) + 180) % 360 - 180
+                if haversine_km(lat, lng, point_lat, point_lng) <= radius:
+                    assert min_lat <= point_lat <= max_lat
+                    assert any(low <= point_lng <= high for low, high in lng_ranges)
+
+        assert len(bounding_box(-33.9, 179.9, 300)[2]) == 2
+
+    def test_sql_distance_matches_python(self):
+        """The SQL expression used for filtering agrees with the reported distance"""
+        from sqlalchemy import Column, Integer, MetaData, Numeric, Table, create_engine, insert, select
+        from app.core.geo import haversine_km, haversine_sql
+
+        # Istanbul -> Ankara
+        assert round(haversine_km(41.0082, 28.9784, 39.9334, 32.8597)) == 349
+
+        metadata = MetaData()
+        places = Table(
+            "places", metadata,
+            Column("id", Integer, primary_key=True),
+            Column("lat", Numeric(10, 8)),
+            Column("lng", Numeric(11, 8))
+        )
+        engine = create_engine("sqlite://")
+        metadata.create_all(engine)
+        points = [(39.9334, 32.8597), (38.4237, 27.1428), (-41.0, -151.0)]
+        with engine.begin() as conn:
+            conn.execute(insert(places), [{"lat": lat, "lng": lng} for lat, lng in points])
+            distances = conn.execute(select(haversine_sql(places.c.lat, places.c.lng, 41.0082, 28.9784))).scalars().all()
+
+        for (lat, lng), distance in zip(points, distances):
+            assert distance == pytest.approx(haversine_km(41.0082, 28.9784, lat, lng), abs=1e-3)
+
+    def test_location_filters_validation(self):
+        """Coordinates come in pairs, 0 included; a radius needs them, they do not need a radius"""
+        from pydantic import ValidationError
+        from app.schemas.vendor import VendorSearchFilters
+
+        filters = VendorSearchFilters(latitude=0, longitude=0, radius_km=10)
+        assert (filters.latitude, filters.longitude, filters.radius_km) == (0, 0, 10)
+
+        filters = VendorSearchFilters(latitude=41.0, longitude=29.0, sort_by="distance")
+        assert filters.radius_km is None
+
+        with pytest.raises(ValidationError):
+            VendorSearchFilters(radius_km=10)
+        with pytest.raises(ValidationError):
+            VendorSearchFilters(latitude=0, radius_km=10)
+        with pytest.raises(ValidationError):
+            VendorSearchFilters(longitude=29.0)
+
+
+@pytest.mark.unit
+class TestAutocomplete:
+    """Test the in-memory autocomplete tries"""
+
+    def test_trie_keeps_heaviest_completions(self):
+        """Top lists follow adds, reweights and removals; edges stay compressed"""
+        from app.core.autocomplete import PrefixTrie, normalize
+
+        trie = PrefixTrie(top_k=2)
+        for source, (text, weight) in enumerate([
+            ("Düğün Salonu", 5.0), ("Düğün Fotoğrafçısı", 9.0), ("Dugun Pastası", 7.0), ("Kına Gecesi", 3.0)
+        ]):
+            trie.add(normalize(text), str(source), weight, text)
+
+        assert normalize("  İstanbul  Düğün ") == "istanbul dugun"
+        assert trie.complete("dugun", 5) == [(9.0, "Düğün Fotoğrafçısı"), (7.0, "Dugun Pastası")]
+        assert trie.complete("dugun s", 5) == [(5.0, "Düğün Salonu")]
+        assert trie.complete("x", 5) == []
+
+        trie.add(normalize("Düğün Salonu"), "0", 10.0, "Düğün Salonu")
+        assert trie.complete("d", 1) == [(10.0, "Düğün Salonu")]
+        trie.remove(normalize("Düğün Salonu"), "0")
+        assert trie.complete("d", 2) == [(9.0, "Düğün Fotoğrafçısı"), (7.0, "Dugun Pastası")]
+
+        remaining = [("Düğün Fotoğrafçısı", 9.0), ("Dugun Pastası", 7.0), ("Kına Gecesi", 3.0)]
+        rebuilt = PrefixTrie.build([(normalize(t), t, w, t) for t, w in remaining], top_k=2)
+        assert rebuilt.node_count() == trie.node_count() == 5
+        assert rebuilt.complete("dugun", 5) == trie.complete("dugun", 5)
+
+    def test_engine_applies_suggestion_changes(self):
+        """Suggestions move between types, leave when inactive, share keys with vendors"""
+        from types import SimpleNamespace
+        from app.services.autocomplete_service import AutocompleteEngine
+
+        engine = AutocompleteEngine(top_k=5)
+        assert engine.complete("d") is None
+
+        engine.built_at = 0.0
+        suggestion = SimpleNamespace(
+            id=1, suggestion_text="DJ Services", suggestion_type="service", search_count=10,
+            relevance_score=0.0, is_featured=False, is_trending=False, is_active=True
+        )
+        vendor = SimpleNamespace(
+            id=2, business_name="DJ Services", booking_count=3, review_count=0,
+            avg_rating=0, status="ACTIVE", deleted_at=None
+        )
+        engine.apply_suggestion(suggestion)
+        engine.apply_vendor(vendor)
+        assert engine.complete("dj") == ["DJ Services"]
+        assert engine.complete("dj", "vendor") == ["DJ Services"]
+
+        suggestion.suggestion_type = "event"
+        engine.apply_suggestion(suggestion)
+        assert engine.tries["service"].keys == 0
+        assert engine.complete("dj", "event") == ["DJ Services"]
+
+        suggestion.is_active = False
+        vendor.status = "SUSPENDED"
+        engine.apply_suggestion(suggestion)
+        engine.apply_vendor(vendor)
+        assert engine.complete("dj") == []
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSearchResultCache:
+    """Test cached hit windows and versioned documents"""
+
+    def _response(self, start: int, size: int, version: int = 1):
+        hits = [
+            {"_index": "vendors_v1", "_id": str(i), "_version": version, "_source": {"id": str(i), "v": version}}
+            for i in range(start, min(start + size, 250))
+        ]
+        return {"hits": {"total": {"value": 250}, "hits": hits}, "aggregations": {}}
+
+    async def test_pages_share_windows_and_documents(self, test_db_session: AsyncSession):
+        """Equivalent requests reuse windows; writes from the indexer invalidate them"""
+        from types import SimpleNamespace
+        from app.core.search_cache import SearchResultCache, search_cache_key
+        from app.schemas.search import SearchRequest
+        from app.services import search_service as search_module
+        from app.services.search_service import SearchService
+
+        calls = []
+
+        async def search_elasticsearch(index, query, from_, size):
+            calls.append(from_)
+            return self._response(from_, size, version=len(calls))
+
+        async def get_documents(hits):
+            return [{**self._response(int(h["_id"]), 1, version=9)["hits"]["hits"][0], "found": True} for h in hits]
+
+        original = search_module.search_result_cache
+        cache = search_module.search_result_cache = SearchResultCache(window_size=100)
+        try:
+            service = SearchService(test_db_session)
+            service.repo = SimpleNamespace(search_elasticsearch=search_elasticsearch, get_documents=get_documents)
+
+            assert search_cache_key(SearchRequest(query="Düğün  Salonu", tags=["b", "a"], skip=0)) == \
+                search_cache_key(SearchRequest(query="düğün salonu", tags=["a", "b", "a"], skip=40))
+
+            first = await service._cached_search(SearchRequest(query="Dugun", limit=20), "vendors", {})
+            second = await service._cached_search(SearchRequest(query="dugun ", skip=80, limit=40), "vendors", {})
+            assert calls == [0, 100]
+            assert [h["_id"] for h in first["hits"]["hits"]] == [str(i) for i in range(20)]
+            assert [h["_id"] for h in second["hits"]["hits"]] == [str(i) for i in range(80, 120)]
+            assert first["hits"]["total"]["value"] == 250
+
+            cache.refresh_seconds = 0
+            cache.invalidate(["vendors"])
+            await service._cached_search(SearchRequest(query="dugun", limit=20), "vendors", {})
+            assert calls == [0, 100, 0]
+
+            # Evicted documents are fetched by id at their current version
+            cache.max_documents = 0
+            cache.put_documents([])
+            page = await service._cached_search(SearchRequest(query="dugun", limit=5), "vendors", {})
+            assert [h["_source"]["v"] for h in page["hits"]["hits"]] == [9] * 5
+            assert cache.snapshot()["search_types"]["vendor"]["window_hits"] == 2
+        finally:
+            search_module.search_result_cache = original
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSearchAnalytics:
+    """Test queued search analytics and heavy-hitters trending"""
+
+    def test_space_saving_bounds_counts(self):
+        """Counts are upper bounds within their error, also after merging"""
+        import random
+        from collections import Counter
+        from app.core.heavy_hitters import SpaceSaving
+
+        rng = random.Random(47)
+        stream = [f"query {int(rng.paretovariate(1.2))}" for _ in range(20000)]
+        exact = Counter(stream)
+
+        single, left, right = SpaceSaving(40), SpaceSaving(40), SpaceSaving(40)
+        for position, query in enumerate(stream):
+            single.add(query)
+            (left if position % 2 else right).add(query)
+        left.merge(SpaceSaving.from_dict(right.to_dict()))
+
+        for sketch in (single, left):
+            assert sketch.total == len(stream)
+            top = sketch.top(5)
+            assert [query for query, _, _ in top] == [query for query, _ in exact.most_common(5)]
+            for query, count, error in sketch.top(20):
+                assert count - error <= exact[query] <= count
+
+    async def test_trending_merges_worker_sketches(self):
+        """Queued rows feed daily sketches; trending merges workers and compares periods"""
+        from datetime import datetime, timedelta
+        from app.services.search_analytics_service import (
+            SearchAnalyticsQueue, TrendingQueries, bucket_start
+        )
+
+        today = datetime.utcnow()
+        worker_a, worker_b = SearchAnalyticsQueue(capacity=3), SearchAnalyticsQueue()
+        for query in ["Düğün Salonu", "düğün  salonu", "kına", None]:
+            worker_a.record({"query_text": query, "search_type": "vendor", "searched_at": today})
+        assert worker_a.dropped == 1 and worker_a.pending == 3
+
+        worker_a.observe(list(worker_a._rows))
+        worker_b.observe(
+            [{"query_text": "kına", "search_type": "vendor", "searched_at": today}] * 3
+            + [{"query_text": "düğün salonu", "search_type": "vendor", "searched_at": today - timedelta(days=1)}] * 2
+        )
+        rows = [
+            (start, sketch.to_dict())
+            for worker in (worker_a, worker_b)
+            for (start, _), sketch in worker.sketches.items()
+        ]
+        assert {start for start, _ in rows} == {bucket_start(today), bucket_start(today - timedelta(days=1))}
+
+        class Repo:
+            async def get_trending_sketches(self, since, search_type=None):
+                return [row for row in rows if row[0] >= since]
+
+        trending = TrendingQueries()
+        assert await trending.get(Repo(), "vendor", 1, 10) == [
+            {"query": "kına", "count": 4, "trend_percentage": 100.0},
+            {"query": "düğün salonu", "count": 1, "trend_percentage": -50.0}
+        ]
+        assert (await trending.get(Repo(), "vendor", 2, 1))[0]["count"] == 4
+
+
+    async def test_flusher_survives_flush_failures(self):
+        """A flush raising outside its database write is counted; flushing goes on"""
+        import asyncio
+        from app.services.search_analytics_service import SearchAnalyticsFlusher, SearchAnalyticsQueue
+
+        class FailingQueue(SearchAnalyticsQueue):
+            calls = 0
+
+            async def flush(self) -> int:
+                self.calls += 1
+                if self.calls == 1:
+                    raise RuntimeError("observe failed")
+                return 0
+
+        queue = FailingQueue()
+        flusher = SearchAnalyticsFlusher(queue, interval_seconds=0.001)
+        flusher.start()
+        for _ in range(100):
+            if queue.calls >= 3:
+                break
+            await asyncio.sleep(0.01)
+
+        assert not flusher._task.done()
+        await flusher.stop()
+        assert queue.calls >= 3
+        assert queue.flush_errors == 1
+
+@pytest.mark.unit
+class TestSpelling:
+    """Test the symmetric-delete spelling index"""
+
+    def test_index_corrects_misspelled_words(self):
+        """Closest, then most frequent words; surface forms restored; removals unindex"""
+        from app.core.spelling import SymmetricDeleteIndex, edit_distance
+
+        assert edit_distance("fotograf", "fotgoraf", 2) == 1
+        assert edit_distance("catering", "caterer", 1) is None
+
+        index = SymmetricDeleteIndex(max_distance=2)
+        for word, form, count in [
+            ("dugun", "düğün", 5), ("photography", "photography", 3), ("istanbul", "istanbul", 4), ("izmir", "izmir", 1)
+        ]:
+            index.add(word, count, form)
+
+        assert index.lookup("photgraphy") == [("photography", 1, 3)]
+        assert index.lookup("xyzxyz") == []
+        assert index.corrections("Photgrapy Istanbl") == ["photography istanbul"]
+        assert index.corrections("dugun") == ["düğün"]
+        assert index.corrections("photography istanbul") == []
+        # Short words allow a single edit
+        assert index.corrections("izmr") == ["izmir"]
+        assert index.corrections("izr") == []
+
+        deletes = index.delete_count
+        index.add("photographer", 1)
+        index.remove("photographer")
+        assert index.delete_count == deletes
+        assert "photographer" not in index.words
+
+    def test_engine_recounts_changed_vendors(self):
+        """Renamed and hidden vendors leave the index once their last word goes"""
+        from types import SimpleNamespace
+        from app.services.spelling_service import SpellingEngine
+
+        engine = SpellingEngine()
+        assert engine.suggest("Kebap") == []
+
+        engine.built_at = 0.0
+        vendor = SimpleNamespace(
+            id=1, business_name="Lezzet Catering", location_city="İstanbul",
+            category="CATERING", status="ACTIVE", deleted_at=None
+        )
+        engine.apply_vendor(vendor)
+        assert engine.index.words["catering"] == 2
+        assert engine.suggest("lezet catring istanbul") == ["lezzet catering istanbul"]
+
+        vendor.business_name = "Sofra Catering"
+        engine.apply_vendor(vendor)
+        assert "lezzet" not in engine.index.words
+        assert engine.suggest("sofa")[:1] == ["sofra"]
+
+        vendor.status = "SUSPENDED"
+        engine.apply_vendor(vendor)
+        assert engine.index.words == {}
+        assert engine.snapshot()["lookups"] == 2
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestFederatedSearch:
+    """Test federated search merging and batching"""
+
+    def _results(self, search_type: str, scores):
+        return [{"id": f"{search_type}-{rank}", "type": search_type, "score": score} for rank, score in enumerate(scores)]
+
+    def test_interleave_normalizes_scores_with_quotas(self):
+        """Each type's best hit scores 1.0; quotas cap a type per page"""
+        from app.core.federation import interleave, normalize_scores
+
+        assert normalize_scores(self._results("event", [4.0, 1.0, 2.0])) == [1.0, 0.25, 0.25]
+        assert normalize_scores(self._results("event", [None, None])) == [1.0, 1.0]
+
+        results = {"vendor": self._results("vendor", [10.0, 9.0, 8.0, 7.0]), "event": self._results("event", [4.0, 1.0])}
+        page = interleave(results, 0, 4)
+        assert [r["id"] for r in page] == ["vendor-0", "event-0", "vendor-1", "event-1"]
+        assert [r["normalized_score"] for r in page] == [1.0, 1.0, 0.9, 0.25]
+
+        assert [r["id"] for r in interleave(results, 4, 4)] == ["vendor-2", "vendor-3"]
+        assert [r["id"] for r in interleave(results, 0, 4, {"vendor": 4})] == [
+            "vendor-0", "event-0", "vendor-1", "vendor-2"
+        ]
+        # Free slots are filled by score past the quotas
+        assert [r["id"] for r in interleave(results, 0, 5, {"event": 0})] == [
+            "vendor-0", "event-0", "vendor-1", "vendor-2", "vendor-3"
+        ]
+
+    def test_deep_pages_merge_in_one_pass(self):
+        """Deep pages cost one walk up to the page end, not one per page"""
+        import time
+        from app.core.federation import interleave
+
+        results = {
+            search_type: self._results(search_type, [10.0 - rank / 1000 for rank in range(5000)])
+            for search_type in ("vendor", "event", "service")
+        }
+        start = time.perf_counter()
+        page = interleave(results, 4999, 1)
+        assert time.perf_counter() - start < 1.0
+        # Equal shares of one slot: every page is the next best hit overall
+        assert [r["id"] for r in page] == ["event-1666"]
+        assert [r["id"] for r in interleave(results, 4998, 3)] == ["vendor-1666", "event-1666", "service-1666"]
+
+    def test_request_window_and_quotas_are_validated(self):
+        """Pages stay within the result window; quotas only name searched types"""
+        from pydantic import ValidationError
+        from app.schemas.search import FEDERATED_MAX_WINDOW, FederatedSearchRequest
+
+        request = FederatedSearchRequest(skip=FEDERATED_MAX_WINDOW - 100, limit=100, quotas={"event": 2})
+        assert request.skip + request.limit == FEDERATED_MAX_WINDOW
+
+        with pytest.raises(ValidationError, match="skip \\+ limit"):
+            FederatedSearchRequest(skip=FEDERATED_MAX_WINDOW - 99, limit=100)
+        with pytest.raises(ValidationError, match="not searched"):
+            FederatedSearchRequest(search_types=["vendor"], quotas={"event": 2})
+        with pytest.raises(ValidationError):
+            FederatedSearchRequest(quotas={"vendor": -1})
+
+    async def test_missing_windows_share_one_msearch(self, test_db_session: AsyncSession):
+        """All types are fetched in one round trip, then served from the cache"""
+        from types import SimpleNamespace
+        from app.core.elasticsearch import INDEX_VENDORS, INDEX_EVENTS, INDEX_SERVICES
+        from app.core.search_cache import SearchResultCache
+        from fastapi import HTTPException
+        from app.schemas.search import FEDERATED_ANONYMOUS_MAX_WINDOW, FederatedSearchRequest
+        from app.services import search_service as search_module
+        from app.services.search_service import SearchService
+
+        scores = {INDEX_VENDORS: [10.0, 5.0], INDEX_EVENTS: [2.0, 1.8, 0.2], INDEX_SERVICES: []}
+        calls = []
+
+        async def msearch_elasticsearch(searches):
+            calls.append([index for index, _, _, _ in searches])
+            return [
+                {
+                    "hits": {
+                        "total": {"value": len(scores[index])},
+                        "hits": [
+                            {"_index": index, "_id": str(rank), "_version": 1, "_score": score, "_source": {"id": str(rank)}}
+                            for rank, score in enumerate(scores[index])
+                        ]
+                    },
+                    "aggregations": {"categories": {"buckets": [{"key": index, "doc_count": len(scores[index])}]}}
+                }
+                for index, _, _, _ in searches
+            ]
+
+        original = search_module.search_result_cache
+        search_module.search_result_cache = SearchResultCache(window_size=100)
+        try:
+            service = SearchService(test_db_session)
+            service.repo = SimpleNamespace(msearch_elasticsearch=msearch_elasticsearch)
+
+            request = FederatedSearchRequest(query="dugun", limit=4)
+            response = await service.search_federated(request)
+            assert calls == [[INDEX_VENDORS, INDEX_EVENTS, INDEX_SERVICES]]
+            assert [(r["type"], r["normalized_score"]) for r in response["results"]] == [
+                ("vendor", 1.0), ("event", 1.0), ("event", 0.9), ("vendor", 0.5)
+            ]
+            assert response["totals_by_type"] == {"vendor": 2, "event": 3, "service": 0}
+            assert response["facets"]["event"]["categories"] == [{"key": INDEX_EVENTS, "count": 3}]
+
+            await service.search_federated(FederatedSearchRequest(query="Dugun", limit=2, search_types=["event"]))
+            assert len(calls) == 1
+
+            # Anonymous callers get a shorter window, signed-in ones the full one
+            deep = FederatedSearchRequest(query="dugun", skip=FEDERATED_ANONYMOUS_MAX_WINDOW, limit=1)
+            with pytest.raises(HTTPException) as exc_info:
+                await service.search_federated(deep)
+            assert exc_info.value.status_code == 400
+            await service.search_federated(deep, SimpleNamespace(id="user-1"))
+            assert len(calls) == 2
+        finally:
+            search_module.search_result_cache = original
+
+
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestFacetCache:
+    """Test precomputed facets for unfiltered and single-filter searches"""
+
+    def test_only_enumerable_single_filters_are_precomputed(self):
+        """Query text, range filters and filter combinations aggregate live"""
+        from app.core.facet_cache import UNFILTERED, facet_key
+        from app.schemas.search import SearchRequest
+
+        assert facet_key(SearchRequest()) == UNFILTERED
+        assert facet_key(SearchRequest(category="VENUE", sort_by="rating", skip=40)) == ("category", "VENUE")
+        assert facet_key(SearchRequest(verified_only=True)) == ("verified_only", True)
+        # Coordinates without a radius only sort
+        assert facet_key(SearchRequest(latitude=41.0, longitude=29.0)) == UNFILTERED
+
+        assert facet_key(SearchRequest(query="düğün")) is None
+        assert facet_key(SearchRequest(price_max=5000)) is None
+        assert facet_key(SearchRequest(category="VENUE", featured_only=True)) is None
+
+    async def test_precomputed_facets_skip_aggregations(self, test_db_session: AsyncSession):
+        """Searches served from precomputed facets send no aggregations; writes mark indices due"""
+        from types import SimpleNamespace
+        from app.core.elasticsearch import INDEX_VENDORS, INDEX_EVENTS
+        from app.core.facet_cache import FacetCache
+        from app.core.search_cache import SearchResultCache
+        from app.schemas.search import SearchRequest
+        from app.services import search_service as search_module
+        from app.services.search_service import SearchService
+
+        def categories(count: int):
+            return {"categories": {"buckets": [{"key": "VENUE", "doc_count": count}]}}
+
+        bodies = []
+
+        async def search_elasticsearch(index, query, from_=0, size=20):
+            bodies.append(query)
+            if size == 0:
+                return {"aggregations": {
+                    **categories(7),
+                    "by_category": {"buckets": [{"key": "VENUE", "doc_count": 7, **categories(7)}]},
+                    "by_verified_only": {"doc_count": 3, **categories(3)},
+                    "by_featured_only": {"doc_count": 1, **categories(1)},
+                    "by_available_only": {"doc_count": 0, "categories": {"buckets": []}}
+                }}
+            hit = {"_index": index, "_id": "1", "_version": 1, "_score": 1.0, "_source": {"id": "1"}}
+            return {"hits": {"total": {"value": 1}, "hits": [hit]}, "aggregations": categories(1)}
+
+        originals = search_module.facet_cache, search_module.search_result_cache
+        cache = search_module.facet_cache = FacetCache(max_age_seconds=300)
+        search_module.search_result_cache = SearchResultCache()
+        try:
+            service = SearchService(test_db_session)
+            service.repo = SimpleNamespace(search_elasticsearch=search_elasticsearch)
+
+            live = await service.search(SearchRequest(category="VENUE"))
+            assert live["facets_source"] == "live" and "aggs" in bodies[-1]
+
+            assert cache.due([INDEX_VENDORS, INDEX_EVENTS]) == [INDEX_VENDORS, INDEX_EVENTS]
+            assert await service.precompute_facets(INDEX_VENDORS)
+            assert cache.due([INDEX_VENDORS]) == []
+
+            response = await service.search(SearchRequest(category="VENUE"))
+            assert response["facets_source"] == "precomputed" and "aggs" not in bodies[-1]
+            assert response["facets"]["categories"] == [{"key": "VENUE", "count": 7}]
+            verified = await service.search(SearchRequest(verified_only=True))
+            assert verified["facets"]["categories"] == [{"key": "VENUE", "count": 3}]
+
+            searched = await service.search(SearchRequest(query="salon", category="VENUE"))
+            assert searched["facets_source"] == "live" and searched["facets"]["categories"][0]["count"] == 1
+
+            cache.invalidate([INDEX_VENDORS])
+            assert cache.due([INDEX_VENDORS]) == [INDEX_VENDORS]
+            assert cache.snapshot()["hits"] == 2
+        finally:
+            search_module.facet_cache, search_module.search_result_cache = originals